@@ -0,0 +1,41 @@
+"""
+Server-sent events helpers.
+
+EventSource clients send "Accept: text/event-stream", which DRF content
+negotiation rejects unless a renderer for that media type is configured, so
+streaming views list EventStreamRenderer in their renderer_classes. Regular
+responses of such views (e.g. a 404) are rendered as a single 'error' or
+'message' event.
+"""
+import json
+from typing import Any
+
+from rest_framework.renderers import BaseRenderer
+
+
+def format_sse_event(event: str, data: Any) -> str:
+    """
+    Format one server-sent event.
+
+    Args:
+        event: Event name
+        data: JSON-serializable payload
+
+    Returns:
+        Event text, terminated by a blank line
+    """
+    payload = json.dumps(data, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Renders regular API responses as a single server-sent event."""
+
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get('response')
+        event = 'error' if response is not None and response.status_code >= 400 else 'message'
+        return format_sse_event(event, data).encode(self.charset)
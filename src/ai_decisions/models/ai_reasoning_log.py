@@ -7,7 +7,15 @@ class AIReasoningLog(models.Model):
     """
     Full AI reasoning trace for explainability.
     Stores prompts, responses, and model information.
+    Also records the gating policy decision of the eligibility pipeline: when
+    AI reasoning is skipped, the log holds the templated summary instead of
+    an LLM response (model_name 'template', empty prompt).
     """
+    GATING_DECISION_CHOICES = [
+        ('invoked', 'AI Reasoning Invoked'),
+        ('skipped', 'AI Reasoning Skipped'),
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, db_index=True)
     
     case = models.ForeignKey(
@@ -19,7 +27,8 @@ class AIReasoningLog(models.Model):
     )
     
     prompt = models.TextField(
-        help_text="The prompt sent to the LLM"
+        blank=True,
+        help_text="The prompt sent to the LLM (empty when AI reasoning was skipped)"
     )
     
     response = models.TextField(
@@ -38,6 +47,20 @@ class AIReasoningLog(models.Model):
         help_text="Number of tokens used in the API call"
     )
     
+    gating_decision = models.CharField(
+        max_length=20,
+        choices=GATING_DECISION_CHOICES,
+        default='invoked',
+        db_index=True,
+        help_text="Whether the gating policy invoked or skipped AI reasoning"
+    )
+    
+    gating_details = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="Gating policy inputs and reason (confidence band, rule outcome, visa type)"
+    )
+    
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
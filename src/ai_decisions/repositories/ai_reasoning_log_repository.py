@@ -8,7 +8,8 @@ class AIReasoningLogRepository:
 
     @staticmethod
     def create_reasoning_log(case: Case, prompt: str, response: str, model_name: str,
-                            tokens_used: int = None):
+                            tokens_used: int = None, gating_decision: str = 'invoked',
+                            gating_details: dict = None):
         """Create a new AI reasoning log."""
         with transaction.atomic():
             log = AIReasoningLog.objects.create(
@@ -16,7 +17,9 @@ class AIReasoningLogRepository:
                 prompt=prompt,
                 response=response,
                 model_name=model_name,
-                tokens_used=tokens_used
+                tokens_used=tokens_used,
+                gating_decision=gating_decision,
+                gating_details=gating_details
             )
             log.full_clean()
             log.save()
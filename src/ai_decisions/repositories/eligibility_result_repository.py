@@ -27,6 +27,15 @@ class EligibilityResultRepository:
             result.save()
             return result
 
+    @staticmethod
+    def bulk_create_eligibility_results(results: list, batch_size: int = 500):
+        """
+        Create many eligibility results in batched INSERTs.
+        Note: bulk_create does not send post_save signals.
+        """
+        with transaction.atomic():
+            return EligibilityResult.objects.bulk_create(results, batch_size=batch_size)
+
     @staticmethod
     def update_eligibility_result(result: EligibilityResult, **fields):
         """Update eligibility result fields."""
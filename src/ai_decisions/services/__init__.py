@@ -1,16 +1,21 @@
 from .eligibility_result_service import EligibilityResultService
 from .ai_reasoning_log_service import AIReasoningLogService
 from .ai_citation_service import AICitationService
-from .vector_db_service import VectorDBService
+from .vector_db_service import VectorDBService, ChunkSearchResult
 from .embedding_service import EmbeddingService
+from .llm_gateway import LLMGateway
 from .ai_reasoning_service import AIReasoningService
+from .eligibility_pipeline_service import EligibilityPipelineService
 
 __all__ = [
     'EligibilityResultService',
     'AIReasoningLogService',
     'AICitationService',
     'VectorDBService',
+    'ChunkSearchResult',
     'EmbeddingService',
+    'LLMGateway',
     'AIReasoningService',
+    'EligibilityPipelineService',
 ]
 
@@ -13,7 +13,8 @@ class AIReasoningLogService:
 
     @staticmethod
     def create_reasoning_log(case_id: str, prompt: str, response: str, model_name: str,
-                            tokens_used: int = None) -> Optional[AIReasoningLog]:
+                            tokens_used: int = None, gating_decision: str = 'invoked',
+                            gating_details: dict = None) -> Optional[AIReasoningLog]:
         """Create a new AI reasoning log."""
         try:
             case = CaseSelector.get_by_id(case_id)
@@ -22,7 +23,9 @@ class AIReasoningLogService:
                 prompt=prompt,
                 response=response,
                 model_name=model_name,
-                tokens_used=tokens_used
+                tokens_used=tokens_used,
+                gating_decision=gating_decision,
+                gating_details=gating_details
             )
         except Exception as e:
             logger.error(f"Error creating AI reasoning log: {e}")
@@ -7,17 +7,75 @@ This service:
 2. Constructs prompts with context
 3. Calls LLM API
 4. Extracts citations and stores reasoning logs
+
+stream_ai_reasoning runs the same workflow with a streamed LLM call: tokens
+and citations are emitted as they arrive and the reasoning log is persisted
+incrementally.
 """
 import logging
-from typing import Dict, List, Optional, Any
-from django.conf import settings
+import re
+import time
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from ai_decisions.services.vector_db_service import VectorDBService
 from ai_decisions.services.embedding_service import EmbeddingService
+from ai_decisions.services.llm_gateway import LLMGateway
+from ai_decisions.services.prompt_builder import PromptBuilder
 from ai_decisions.services.ai_reasoning_log_service import AIReasoningLogService
 from ai_decisions.services.ai_citation_service import AICitationService
 
 logger = logging.getLogger('django')
 
+URL_PATTERN = re.compile(r'https?://[^\s\)]+')
+CONTEXT_REFERENCE_PATTERN = re.compile(r'Context\s+(\d+)', re.IGNORECASE)
+
+
+class IncrementalCitationExtractor:
+    """
+    Extracts citations from a response while it is being streamed.
+    
+    Only text before the last whitespace is scanned, so a URL or context
+    reference is reported once it is complete. Each reference is reported once.
+    """
+
+    def __init__(self):
+        self.text = ''
+        self._scanned = 0  # Text before this offset has been scanned
+        self._seen = set()
+
+    def feed(self, delta: str) -> List[Dict[str, Any]]:
+        """
+        Add a response delta.
+        
+        Args:
+            delta: Newly received response text
+            
+        Returns:
+            Citations completed by this delta
+        """
+        self.text += delta
+        boundary = max(self.text.rfind(' '), self.text.rfind('\n'))
+        return self._scan(boundary)
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """Scan the remaining text once the response is complete."""
+        return self._scan(len(self.text))
+
+    def _scan(self, boundary: int) -> List[Dict[str, Any]]:
+        if boundary <= self._scanned:
+            return []
+        # Restart from the line start: "Context 3" may straddle the previous boundary
+        start = self.text.rfind('\n', 0, self._scanned) + 1
+        window = self.text[start:boundary]
+        self._scanned = boundary
+        
+        citations = []
+        for citation in AIReasoningService._extract_citations(window):
+            key = (citation['type'], citation['reference'].lower())
+            if key not in self._seen:
+                self._seen.add(key)
+                citations.append(citation)
+        return citations
+
 
 class AIReasoningService:
     """
@@ -30,6 +88,10 @@ class AIReasoningService:
     4. Store reasoning & citations
     """
 
+    SYSTEM_MESSAGE = "You are a helpful immigration eligibility advisor."
+    # Minimum seconds between reasoning log updates while streaming
+    STREAM_PERSIST_INTERVAL_SECONDS = 2.0
+
     @staticmethod
     def retrieve_context(
         case_facts: Dict[str, Any],
@@ -40,7 +102,7 @@ class AIReasoningService:
         similarity_threshold: float = 0.7
     ) -> List[Dict[str, Any]]:
         """
-        Step 1: Retrieve relevant context using vector similarity search.
+        Step 1: Retrieve relevant context using hybrid (vector + full-text) search.
         
         Args:
             case_facts: Dictionary of case facts
@@ -52,6 +114,7 @@ class AIReasoningService:
             
         Returns:
             List of context dicts with 'text', 'source', 'metadata', 'similarity'
+            and 'rrf_score', in hybrid search rank order (best first)
         """
         try:
             # Construct query text from case facts
@@ -70,8 +133,9 @@ class AIReasoningService:
             if jurisdiction:
                 filters['jurisdiction'] = jurisdiction
             
-            # Search similar chunks
-            chunks = VectorDBService.search_similar(
+            # Search chunks by vector similarity and exact terms, fused by rank
+            chunks = VectorDBService.search_hybrid(
+                query_text=query_text,
                 query_embedding=query_embedding,
                 limit=limit,
                 filters=filters,
@@ -84,18 +148,20 @@ class AIReasoningService:
                 # Calculate similarity from distance
                 # distance = 0 means similarity = 1.0
                 # distance = 2 means similarity = 0.0
-                distance = getattr(chunk, 'distance', None)
-                if distance is not None:
-                    similarity = 1.0 - (distance / 2.0)
+                if chunk.distance is not None:
+                    similarity = 1.0 - (chunk.distance / 2.0)
                 else:
                     similarity = 0.8  # Default if distance not available
                 
+                # Source URL is projected by the search query (no per-chunk lookups)
                 context.append({
                     'text': chunk.chunk_text,
-                    'source': chunk.document_version.source_document.source_url,
+                    'source': chunk.source_url,
                     'metadata': chunk.metadata,
                     'similarity': similarity,
-                    'chunk_id': str(chunk.id)
+                    'rrf_score': chunk.rrf_score,
+                    'chunk_id': chunk.chunk_id,
+                    'document_version_id': chunk.document_version_id
                 })
             
             logger.info(f"Retrieved {len(context)} context chunks for reasoning")
@@ -149,67 +215,29 @@ class AIReasoningService:
     def construct_prompt(
         case_facts: Dict[str, Any],
         rule_results: Optional[Dict[str, Any]] = None,
-        context_chunks: List[Dict[str, Any]] = None
+        context_chunks: List[Dict[str, Any]] = None,
+        token_budget: Optional[int] = None
     ) -> str:
         """
         Step 2: Construct AI prompt with context.
         
+        See PromptBuilder.build for the budgeting rules and token reporting.
+        
         Args:
             case_facts: Dictionary of case facts
             rule_results: Optional rule engine evaluation results
             context_chunks: Optional retrieved context chunks
+            token_budget: Maximum prompt tokens (default: PromptBuilder.DEFAULT_TOKEN_BUDGET)
             
         Returns:
             Formatted prompt string
         """
-        prompt_parts = []
-        
-        # System instruction
-        prompt_parts.append(
-            "You are an immigration eligibility advisor. Analyze the case facts and provide "
-            "a reasoned assessment of eligibility based on the provided context."
-        )
-        
-        # Context section
-        if context_chunks:
-            prompt_parts.append("\n## Relevant Context:")
-            for i, chunk in enumerate(context_chunks, 1):
-                prompt_parts.append(f"\n### Context {i} (Similarity: {chunk.get('similarity', 0):.2f}):")
-                prompt_parts.append(chunk['text'])
-                if chunk.get('source'):
-                    prompt_parts.append(f"\nSource: {chunk['source']}")
-        
-        # Rule engine results
-        if rule_results:
-            prompt_parts.append("\n## Rule Engine Evaluation:")
-            prompt_parts.append(f"Overall Outcome: {rule_results.get('outcome', 'unknown')}")
-            prompt_parts.append(f"Confidence: {rule_results.get('confidence', 0):.2f}")
-            
-            requirements = rule_results.get('requirements', [])
-            if requirements:
-                prompt_parts.append("\nRequirement Results:")
-                for req in requirements:
-                    status = req.get('status', 'unknown')
-                    desc = req.get('description', 'N/A')
-                    prompt_parts.append(f"- {desc}: {status}")
-        
-        # Case facts
-        prompt_parts.append("\n## Case Facts:")
-        for key, value in case_facts.items():
-            prompt_parts.append(f"- {key}: {value}")
-        
-        # Instruction
-        prompt_parts.append(
-            "\n## Instruction:\n"
-            "Based on the context, rule engine results, and case facts, provide:\n"
-            "1. A clear eligibility assessment (likely/possible/unlikely)\n"
-            "2. Key factors supporting your assessment\n"
-            "3. Any concerns or missing information\n"
-            "4. Recommendations for the applicant\n\n"
-            "Cite specific context sources when referencing information."
-        )
-        
-        return "\n".join(prompt_parts)
+        return PromptBuilder.build(
+            case_facts=case_facts,
+            rule_results=rule_results,
+            context_chunks=context_chunks,
+            token_budget=token_budget
+        )['prompt']
 
     @staticmethod
     def call_llm(prompt: str, model: str = "gpt-4", temperature: float = 0.3) -> Dict[str, Any]:
@@ -222,38 +250,23 @@ class AIReasoningService:
             temperature: Sampling temperature (default: 0.3 for deterministic)
             
         Returns:
-            Dict with 'response', 'model', 'tokens_used', 'citations'
+            Dict with 'response', 'model', 'tokens_used', 'citations', 'latency_ms', 'cached'
         """
         try:
-            # Import OpenAI client
-            try:
-                from openai import OpenAI
-            except ImportError:
-                logger.error("OpenAI package not installed. Install with: pip install openai")
-                raise ImportError("OpenAI package required for LLM calls")
-            
-            # Get API key from settings
-            api_key = getattr(settings, 'OPENAI_API_KEY', None)
-            if not api_key:
-                logger.error("OPENAI_API_KEY not set in settings")
-                raise ValueError("OPENAI_API_KEY must be set in settings")
-            
-            client = OpenAI(api_key=api_key)
-            
-            # Call LLM
-            response = client.chat.completions.create(
-                model=model,
+            # Shared gateway: pooled client, response cache and request coalescing
+            response = LLMGateway.complete(
                 messages=[
-                    {"role": "system", "content": "You are a helpful immigration eligibility advisor."},
+                    {"role": "system", "content": AIReasoningService.SYSTEM_MESSAGE},
                     {"role": "user", "content": prompt}
                 ],
+                model=model,
                 temperature=temperature,
                 max_tokens=2000
             )
             
             # Extract response
-            llm_response = response.choices[0].message.content
-            tokens_used = response.usage.total_tokens if response.usage else None
+            llm_response = response['content']
+            tokens_used = response['tokens_used']
             
             # Extract citations from response
             citations = AIReasoningService._extract_citations(llm_response)
@@ -264,7 +277,9 @@ class AIReasoningService:
                 'response': llm_response,
                 'model': model,
                 'tokens_used': tokens_used,
-                'citations': citations
+                'citations': citations,
+                'latency_ms': response['latency_ms'],
+                'cached': response['cached']
             }
             
         except Exception as e:
@@ -291,11 +306,9 @@ class AIReasoningService:
         
         # Simple pattern matching for now
         # Can be enhanced with more sophisticated parsing
-        import re
         
         # Look for URLs
-        url_pattern = r'https?://[^\s\)]+'
-        urls = re.findall(url_pattern, response_text)
+        urls = URL_PATTERN.findall(response_text)
         for url in urls:
             citations.append({
                 'type': 'url',
@@ -304,8 +317,7 @@ class AIReasoningService:
             })
         
         # Look for context references
-        context_pattern = r'Context\s+(\d+)'
-        context_refs = re.findall(context_pattern, response_text, re.IGNORECASE)
+        context_refs = CONTEXT_REFERENCE_PATTERN.findall(response_text)
         for ref in context_refs:
             citations.append({
                 'type': 'context',
@@ -315,14 +327,55 @@ class AIReasoningService:
         
         return citations
 
+    @staticmethod
+    def _prepare_prompt(
+        case_id: str,
+        case_facts: Optional[Dict[str, Any]],
+        rule_results: Optional[Dict[str, Any]],
+        visa_code: Optional[str],
+        jurisdiction: Optional[str]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Steps 1-2: retrieve context and build the prompt within the token budget.
+        
+        Returns:
+            Tuple of (retrieved context chunks, PromptBuilder.build result)
+        """
+        if case_facts is None:
+            from immigration_cases.services.case_fact_service import CaseFactService
+            case_facts = CaseFactService.get_current_facts(case_id)
+        
+        # Step 1: Retrieve context
+        context_chunks = AIReasoningService.retrieve_context(
+            case_facts=case_facts,
+            visa_code=visa_code,
+            jurisdiction=jurisdiction,
+            limit=5,
+            similarity_threshold=0.7
+        )
+        
+        # Step 2: Construct prompt within the token budget
+        built_prompt = PromptBuilder.build(
+            case_facts=case_facts,
+            rule_results=rule_results,
+            context_chunks=context_chunks
+        )
+        logger.info(
+            f"Prompt for case {case_id}: {built_prompt['token_count']} tokens "
+            f"(budget {built_prompt['token_budget']}), "
+            f"{len(built_prompt['context_chunks'])}/{len(context_chunks)} context chunks"
+        )
+        return context_chunks, built_prompt
+
     @staticmethod
     def run_ai_reasoning(
         case_id: str,
-        case_facts: Dict[str, Any],
+        case_facts: Optional[Dict[str, Any]] = None,
         rule_results: Optional[Dict[str, Any]] = None,
         visa_type_id: Optional[str] = None,
         visa_code: Optional[str] = None,
-        jurisdiction: Optional[str] = None
+        jurisdiction: Optional[str] = None,
+        gating_details: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Main method: Run complete AI reasoning workflow.
@@ -335,11 +388,13 @@ class AIReasoningService:
         
         Args:
             case_id: UUID of the case
-            case_facts: Dictionary of case facts
+            case_facts: Dictionary of case facts (current facts of the case are
+                loaded when not provided)
             rule_results: Optional rule engine evaluation results
             visa_type_id: Optional visa type ID
             visa_code: Optional visa code for filtering
             jurisdiction: Optional jurisdiction for filtering
+            gating_details: Optional gating policy decision to record in the reasoning log
             
         Returns:
             Dict with reasoning results:
@@ -352,21 +407,15 @@ class AIReasoningService:
             }
         """
         try:
-            # Step 1: Retrieve context
-            context_chunks = AIReasoningService.retrieve_context(
-                case_facts=case_facts,
-                visa_code=visa_code,
-                jurisdiction=jurisdiction,
-                limit=5,
-                similarity_threshold=0.7
-            )
-            
-            # Step 2: Construct prompt
-            prompt = AIReasoningService.construct_prompt(
+            # Steps 1-2: Retrieve context and construct prompt
+            context_chunks, built_prompt = AIReasoningService._prepare_prompt(
+                case_id=case_id,
                 case_facts=case_facts,
                 rule_results=rule_results,
-                context_chunks=context_chunks
+                visa_code=visa_code,
+                jurisdiction=jurisdiction
             )
+            prompt = built_prompt['prompt']
             
             # Step 3: Call LLM
             llm_result = AIReasoningService.call_llm(prompt)
@@ -377,7 +426,8 @@ class AIReasoningService:
                 prompt=prompt,
                 response=llm_result['response'],
                 model_name=llm_result['model'],
-                tokens_used=llm_result.get('tokens_used')
+                tokens_used=llm_result.get('tokens_used'),
+                gating_details=gating_details
             )
             
             # Step 5: Store citations
@@ -404,7 +454,8 @@ class AIReasoningService:
                 'citations': llm_result.get('citations', []),
                 'reasoning_log_id': str(reasoning_log.id) if reasoning_log else None,
                 'model': llm_result['model'],
-                'tokens_used': llm_result.get('tokens_used')
+                'tokens_used': llm_result.get('tokens_used'),
+                'prompt_tokens': built_prompt['token_count']
             }
             
         except Exception as e:
@@ -414,3 +465,126 @@ class AIReasoningService:
                 'error': str(e)
             }
 
+    @staticmethod
+    def stream_ai_reasoning(
+        case_id: str,
+        case_facts: Optional[Dict[str, Any]] = None,
+        rule_results: Optional[Dict[str, Any]] = None,
+        visa_code: Optional[str] = None,
+        jurisdiction: Optional[str] = None,
+        model: str = "gpt-4",
+        temperature: float = 0.3
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Run the AI reasoning workflow with a streamed LLM call.
+        
+        The reasoning log is created with the first tokens and updated at most
+        every STREAM_PERSIST_INTERVAL_SECONDS, so partial reasoning survives a
+        dropped connection; the final update stores the full response.
+        
+        Args:
+            case_id: UUID of the case
+            case_facts: Dictionary of case facts (current facts of the case are
+                loaded when not provided)
+            rule_results: Optional rule engine evaluation results
+            visa_code: Optional visa code for filtering
+            jurisdiction: Optional jurisdiction for filtering
+            model: Model name (default: gpt-4)
+            temperature: Sampling temperature
+            
+        Yields:
+            (event, data) tuples:
+            - ('context', {'chunks': [...], 'prompt_tokens': int})
+            - ('token', {'text': str})
+            - ('citation', citation dict)
+            - ('done', {'reasoning_log_id', 'model', 'tokens_used', 'citations', 'cached'})
+            - ('error', {'message': str})
+        """
+        reasoning_log = None
+        extractor = IncrementalCitationExtractor()
+        try:
+            context_chunks, built_prompt = AIReasoningService._prepare_prompt(
+                case_id=case_id,
+                case_facts=case_facts,
+                rule_results=rule_results,
+                visa_code=visa_code,
+                jurisdiction=jurisdiction
+            )
+            prompt = built_prompt['prompt']
+            yield 'context', {
+                'chunks': [
+                    {
+                        'chunk_id': chunk.get('chunk_id'),
+                        'source': chunk.get('source'),
+                        'similarity': chunk.get('similarity')
+                    }
+                    for chunk in built_prompt['context_chunks']
+                ],
+                'prompt_tokens': built_prompt['token_count']
+            }
+            
+            llm_stream = LLMGateway.stream(
+                messages=[
+                    {"role": "system", "content": AIReasoningService.SYSTEM_MESSAGE},
+                    {"role": "user", "content": prompt}
+                ],
+                model=model,
+                temperature=temperature,
+                max_tokens=2000
+            )
+            
+            last_persisted = time.monotonic()
+            for delta in llm_stream:
+                yield 'token', {'text': delta}
+                for citation in extractor.feed(delta):
+                    yield 'citation', citation
+                
+                # Persist partial reasoning
+                now = time.monotonic()
+                if reasoning_log is None:
+                    reasoning_log = AIReasoningLogService.create_reasoning_log(
+                        case_id=case_id,
+                        prompt=prompt,
+                        response=extractor.text,
+                        model_name=model
+                    )
+                    last_persisted = now
+                elif now - last_persisted >= AIReasoningService.STREAM_PERSIST_INTERVAL_SECONDS:
+                    AIReasoningLogService.update_reasoning_log(str(reasoning_log.id), response=extractor.text)
+                    last_persisted = now
+            
+            for citation in extractor.finish():
+                yield 'citation', citation
+            
+            response = llm_stream.response
+            if reasoning_log is not None:
+                AIReasoningLogService.update_reasoning_log(
+                    str(reasoning_log.id),
+                    response=response['content'],
+                    tokens_used=response.get('tokens_used')
+                )
+            
+            citations = AIReasoningService._extract_citations(response['content'] or '')
+            logger.info(
+                f"Streamed AI reasoning completed for case {case_id}: "
+                f"{len(built_prompt['context_chunks'])} context chunks, {len(citations)} citations"
+            )
+            yield 'done', {
+                'reasoning_log_id': str(reasoning_log.id) if reasoning_log else None,
+                'model': response['model'],
+                'tokens_used': response.get('tokens_used'),
+                'citations': citations,
+                'cached': response['cached']
+            }
+            
+        except GeneratorExit:
+            # Client went away: keep what was generated so far
+            if reasoning_log is not None:
+                AIReasoningLogService.update_reasoning_log(str(reasoning_log.id), response=extractor.text)
+            raise
+        except Exception as e:
+            logger.error(f"Error streaming AI reasoning for case {case_id}: {e}", exc_info=True)
+            yield 'error', {
+                'message': str(e),
+                'reasoning_log_id': str(reasoning_log.id) if reasoning_log else None
+            }
@@ -0,0 +1,183 @@
+"""
+Eligibility Pipeline Service
+
+Steps of the asynchronous eligibility check
+(ai_decisions.tasks.ai_reasoning_tasks.run_eligibility_check_task):
+
+1. resolve the visa types to check (one, or all active visa types of the
+   case's jurisdiction)
+2. per visa type, in parallel subtasks: run the rule engine incrementally
+   (only requirements referencing facts changed since the case's last
+   evaluation are re-evaluated), then AI reasoning only when
+   ReasoningGatingPolicy puts the rule engine confidence inside the visa
+   type's band (a templated summary otherwise); either way the decision is
+   recorded in an AIReasoningLog
+3. in the chord callback: write all results with one bulk insert, then
+   send post_save for each created row so the EligibilityResult signal
+   handlers (notification, email, review escalation) still run
+
+Subtask results travel through the Celery result backend, so they are plain
+JSON-serializable dicts (see evaluate_visa_type).
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from ai_decisions.services.ai_reasoning_log_service import AIReasoningLogService
+from ai_decisions.services.ai_reasoning_service import AIReasoningService
+from ai_decisions.services.eligibility_result_service import EligibilityResultService
+from ai_decisions.services.reasoning_gating_policy import ReasoningGatingPolicy
+from rules_knowledge.services.rule_engine_service import RuleEngineService
+from rules_knowledge.selectors.visa_type_selector import VisaTypeSelector
+
+logger = logging.getLogger('django')
+
+
+class EligibilityPipelineService:
+    """Rule engine + AI reasoning pipeline for eligibility checks."""
+
+    # AIReasoningLog.model_name of templated (skipped) reasoning
+    TEMPLATE_MODEL_NAME = 'template'
+
+    @staticmethod
+    def get_visa_type_ids(case, visa_type_id: Optional[str] = None) -> List[str]:
+        """
+        Visa types to check for a case.
+
+        Args:
+            case: Case instance
+            visa_type_id: Optional single visa type to check
+
+        Returns:
+            List of visa type IDs: the active visa types of the case's
+            jurisdiction, or only visa_type_id when given (empty if it is
+            inactive or belongs to another jurisdiction)
+        """
+        visa_types = VisaTypeSelector.get_by_jurisdiction(case.jurisdiction)
+        if visa_type_id:
+            visa_types = visa_types.filter(id=visa_type_id)
+        return [str(type_id) for type_id in visa_types.values_list('id', flat=True)]
+
+    @staticmethod
+    def evaluate_visa_type(case_id: str, visa_type_id: str) -> Dict[str, Any]:
+        """
+        Evaluate one visa type for a case: rule engine, then AI reasoning if the
+        gating policy says so.
+
+        Args:
+            case_id: UUID of the case
+            visa_type_id: UUID of the visa type
+
+        Returns:
+            Dict with 'case_id', 'visa_type_id', 'rule_version_id', 'outcome',
+            'confidence', 'reasoning_summary', 'missing_facts', 'gating'
+            (ReasoningGatingPolicy.decide result), 'ai_reasoning' (None when
+            not run) and 'error' (None on success). Results without a
+            rule_version_id are not persisted.
+        """
+        result = {
+            'case_id': str(case_id),
+            'visa_type_id': str(visa_type_id),
+            'rule_version_id': None,
+            'outcome': None,
+            'confidence': 0.0,
+            'reasoning_summary': None,
+            'missing_facts': None,
+            'gating': None,
+            'ai_reasoning': None,
+            'error': None,
+        }
+
+        try:
+            # Only requirements whose facts changed since the case's last check are re-evaluated
+            evaluation = RuleEngineService.run_incremental_evaluation(case_id, visa_type_id)
+        except ValueError as e:
+            result['error'] = str(e)
+            return result
+
+        if evaluation is None:
+            result['error'] = 'No active rule version or evaluation failed'
+            return result
+
+        result['rule_version_id'] = str(evaluation.rule_version_id) if evaluation.rule_version_id else None
+        result['outcome'] = EligibilityResultService.map_rule_engine_outcome(evaluation)
+        result['confidence'] = round(evaluation.confidence, 2)
+        result['reasoning_summary'] = EligibilityResultService.build_rule_engine_summary(evaluation)
+        result['missing_facts'] = sorted(set(evaluation.missing_facts)) or None
+
+        if not result['rule_version_id']:
+            return result
+
+        visa_type = VisaTypeSelector.get_by_id(visa_type_id)
+        decision = ReasoningGatingPolicy.decide(evaluation, visa_type.jurisdiction, visa_type.code)
+        result['gating'] = decision
+        gating_details = {
+            **{key: value for key, value in decision.items() if key != 'invoke'},
+            'visa_type_id': str(visa_type_id),
+            'rule_version_id': result['rule_version_id'],
+        }
+
+        if not decision['invoke']:
+            result['reasoning_summary'] = ReasoningGatingPolicy.build_template_summary(evaluation, decision)
+            AIReasoningLogService.create_reasoning_log(
+                case_id=case_id,
+                prompt='',
+                response=result['reasoning_summary'],
+                model_name=EligibilityPipelineService.TEMPLATE_MODEL_NAME,
+                gating_decision='skipped',
+                gating_details=gating_details
+            )
+            logger.info(
+                f"Skipped AI reasoning for case {case_id}, visa type {visa_type_id}: {decision['reason']}"
+            )
+            return result
+
+        ai_result = AIReasoningService.run_ai_reasoning(
+            case_id=case_id,
+            rule_results=evaluation.to_dict(),
+            visa_type_id=visa_type_id,
+            visa_code=visa_type.code,
+            jurisdiction=visa_type.jurisdiction,
+            gating_details=gating_details
+        )
+        result['ai_reasoning'] = {
+            'success': ai_result.get('success', False),
+            'reasoning_log_id': ai_result.get('reasoning_log_id'),
+            'model': ai_result.get('model'),
+            'tokens_used': ai_result.get('tokens_used'),
+            'error': ai_result.get('error'),
+        }
+        if ai_result.get('success') and ai_result.get('response'):
+            result['reasoning_summary'] = ai_result['response']
+
+        return result
+
+    @staticmethod
+    def persist_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Write subtask results with one bulk insert.
+
+        Args:
+            results: evaluate_visa_type results (None entries are ignored)
+
+        Returns:
+            Dict with 'results_created', 'result_ids', 'skipped' (visa types
+            without a persistable result, with their errors) and 'ai_reasoning_runs'
+        """
+        rows = []
+        skipped = []
+        for result in results:
+            if not result:
+                continue
+            if result.get('error') or not result.get('rule_version_id'):
+                skipped.append({'visa_type_id': result.get('visa_type_id'), 'error': result.get('error')})
+                continue
+            rows.append(result)
+
+        created = EligibilityResultService.bulk_create_eligibility_results(rows)
+        EligibilityResultService.send_created_signals(created)
+        return {
+            'results_created': len(created),
+            'result_ids': [str(result.id) for result in created],
+            'skipped': skipped,
+            'ai_reasoning_runs': sum(1 for result in rows if result.get('ai_reasoning')),
+        }
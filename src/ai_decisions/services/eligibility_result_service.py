@@ -1,5 +1,6 @@
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
+from django.db.models.signals import post_save
 from ai_decisions.models.eligibility_result import EligibilityResult
 from ai_decisions.repositories.eligibility_result_repository import EligibilityResultRepository
 from ai_decisions.selectors.eligibility_result_selector import EligibilityResultSelector
@@ -13,6 +14,164 @@ logger = logging.getLogger('django')
 class EligibilityResultService:
     """Service for EligibilityResult business logic."""
 
+    # Rule engine outcome -> EligibilityResult outcome
+    RULE_ENGINE_OUTCOME_MAP = {
+        'likely': 'eligible',
+        'possible': 'requires_review',
+        'unlikely': 'not_eligible',
+    }
+
+    @staticmethod
+    def map_rule_engine_outcome(evaluation) -> str:
+        """
+        Map a RuleEngineEvaluationResult to an EligibilityResult outcome.
+        
+        An 'unlikely' outcome caused only by missing facts (nothing actually
+        failed) is reported as 'missing_facts' rather than 'not_eligible'.
+        An evaluation without any requirements decides nothing and is sent
+        to review.
+        """
+        if evaluation.requirements_total == 0:
+            return 'requires_review'
+        if (
+            evaluation.outcome == 'unlikely'
+            and evaluation.requirements_failed == 0
+            and evaluation.requirements_with_missing_facts > 0
+            and evaluation.requirements_with_errors < evaluation.requirements_total
+        ):
+            return 'missing_facts'
+        return EligibilityResultService.RULE_ENGINE_OUTCOME_MAP.get(evaluation.outcome, 'requires_review')
+
+    @staticmethod
+    def build_rule_engine_summary(evaluation) -> str:
+        """Build a short reasoning summary from a rule engine evaluation."""
+        summary = (
+            f"Rule engine: {evaluation.requirements_passed}/{evaluation.requirements_total} "
+            f"requirements passed (outcome: {evaluation.outcome}, confidence: {evaluation.confidence:.2f})."
+        )
+        if evaluation.warnings:
+            summary += " " + " ".join(evaluation.warnings)
+        return summary
+
+    @staticmethod
+    def bulk_create_from_rule_engine_results(
+        evaluations: Dict[Tuple[str, str], Any],
+        batch_size: int = 500
+    ) -> List[EligibilityResult]:
+        """
+        Persist rule engine evaluations for many (case, visa type) pairs at once.
+        
+        Args:
+            evaluations: Mapping (case_id, visa_type_id) -> RuleEngineEvaluationResult
+            batch_size: Rows per INSERT statement
+            
+        Returns:
+            List of created EligibilityResult objects
+        
+        Rows are written with bulk_create, then post_save is sent for each
+        created row (see send_created_signals), so batch results notify and
+        escalate to review like single-case results.
+        """
+        rows = []
+        for (case_id, visa_type_id), evaluation in evaluations.items():
+            # Evaluations without a rule version cannot be persisted (FK is required)
+            if evaluation is None or not evaluation.rule_version_id:
+                continue
+            rows.append({
+                'case_id': case_id,
+                'visa_type_id': visa_type_id,
+                'rule_version_id': evaluation.rule_version_id,
+                'outcome': EligibilityResultService.map_rule_engine_outcome(evaluation),
+                'confidence': round(evaluation.confidence, 2),
+                'reasoning_summary': EligibilityResultService.build_rule_engine_summary(evaluation),
+                'missing_facts': sorted(set(evaluation.missing_facts)) or None
+            })
+        
+        created = EligibilityResultService.bulk_create_eligibility_results(rows, batch_size=batch_size)
+        EligibilityResultService.send_created_signals(created)
+        return created
+
+    @staticmethod
+    def bulk_create_eligibility_results(rows: List[Dict[str, Any]], batch_size: int = 500) -> List[EligibilityResult]:
+        """
+        Create many eligibility results with batched INSERTs.
+        
+        Args:
+            rows: Dicts with 'case_id', 'visa_type_id', 'rule_version_id',
+                'outcome', 'confidence', 'reasoning_summary' and 'missing_facts'
+            batch_size: Rows per INSERT statement
+            
+        Returns:
+            List of created EligibilityResult objects
+        
+        Raises:
+            Exception: Insert errors are logged and re-raised, so callers can
+                retry instead of treating the batch as empty
+        
+        Note: rows are written with bulk_create, so per-row post_save handlers
+        (notifications, auto-review) are not triggered; callers send them with
+        send_created_signals.
+        """
+        results = [
+            EligibilityResult(
+                case_id=row['case_id'],
+                visa_type_id=row['visa_type_id'],
+                rule_version_id=row['rule_version_id'],
+                outcome=row['outcome'],
+                confidence=row.get('confidence', 0.0),
+                reasoning_summary=row.get('reasoning_summary'),
+                missing_facts=row.get('missing_facts')
+            )
+            for row in rows
+        ]
+        
+        if not results:
+            return []
+        
+        try:
+            created = EligibilityResultRepository.bulk_create_eligibility_results(results, batch_size=batch_size)
+            logger.info(f"Bulk created {len(created)} eligibility results")
+            return created
+        except Exception as e:
+            logger.error(f"Error bulk creating eligibility results: {e}")
+            raise
+
+    @staticmethod
+    def send_created_signals(results: List[EligibilityResult]):
+        """
+        Send post_save(created=True) for bulk-created results (bulk_create does not).
+        
+        The EligibilityResult signal handlers (notification, email, review
+        escalation) then run as for a row created with save(). A failing
+        handler is logged and does not stop the other rows.
+        
+        Args:
+            results: EligibilityResult objects returned by bulk_create
+        """
+        if not results:
+            return
+        
+        # Attach related objects with one query each instead of a lazy load per handler call
+        cases = {
+            str(case.id): case
+            for case in CaseSelector.get_by_ids({result.case_id for result in results})
+        }
+        visa_types = {
+            str(visa_type.id): visa_type
+            for visa_type in VisaTypeSelector.get_by_ids({result.visa_type_id for result in results})
+        }
+        
+        for result in results:
+            result.case = cases[str(result.case_id)]
+            result.visa_type = visa_types[str(result.visa_type_id)]
+            try:
+                post_save.send(
+                    sender=EligibilityResult, instance=result, created=True,
+                    raw=False, using='default', update_fields=None
+                )
+            except Exception as e:
+                logger.error(f"Error handling created eligibility result {result.id}: {e}")
+
     @staticmethod
     def create_eligibility_result(case_id: str, visa_type_id: str, rule_version_id: str,
                                  outcome: str, confidence: float = 0.0, reasoning_summary: str = None,
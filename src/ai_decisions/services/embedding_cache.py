@@ -0,0 +1,146 @@
+"""
+Embedding Cache
+
+Two-tier cache of embeddings keyed by (model, sha256(text)):
+
+- front tier: the shared Redis cache (django cache), entries expire after
+  FRONT_TIER_TIMEOUT and are evicted by Redis' LRU policy under memory pressure
+- back tier: the embedding_cache table (EmbeddingCacheEntry, pgvector), which
+  survives Redis evictions and restarts
+
+Lookups go front tier first, then the back tier for the remaining misses
+(one query), and back-tier hits are promoted to Redis. Cache errors are
+logged and treated as misses so embedding generation never fails because
+of the cache.
+"""
+import hashlib
+import logging
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+from django.core.cache import cache
+
+logger = logging.getLogger('django')
+
+
+class EmbeddingCache:
+    """Two-tier (Redis + Postgres) embedding cache."""
+
+    CACHE_PREFIX = 'embedding'
+    FRONT_TIER_TIMEOUT = 60 * 60 * 24 * 7  # 7 days
+    # Only vectors matching the back-tier column dimensions are persisted
+    BACK_TIER_DIMENSIONS = 1536
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """SHA-256 hex digest of a text."""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _cache_key(model: str, text_hash: str) -> str:
+        return f"{EmbeddingCache.CACHE_PREFIX}:{model}:{text_hash}"
+
+    @staticmethod
+    def _pack(embedding: List[float]) -> bytes:
+        # Packed doubles are ~3x smaller than a pickled list of floats
+        return array('d', embedding).tobytes()
+
+    @staticmethod
+    def _unpack(data: bytes) -> List[float]:
+        values = array('d')
+        values.frombytes(data)
+        return values.tolist()
+
+    @staticmethod
+    def get_many(model: str, text_hashes: Iterable[str]) -> Dict[str, List[float]]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            model: Embedding model name
+            text_hashes: SHA-256 digests of the texts
+
+        Returns:
+            Dictionary mapping text_hash -> embedding for the hits
+        """
+        text_hashes = list(dict.fromkeys(text_hashes))
+        if not text_hashes:
+            return {}
+
+        found: Dict[str, List[float]] = {}
+
+        # Front tier: Redis
+        keys = {EmbeddingCache._cache_key(model, text_hash): text_hash for text_hash in text_hashes}
+        try:
+            for key, data in cache.get_many(list(keys.keys())).items():
+                found[keys[key]] = EmbeddingCache._unpack(data)
+        except Exception as e:
+            logger.warning(f"Error reading embeddings from Redis cache: {e}")
+
+        # Back tier: Postgres
+        remaining = [text_hash for text_hash in text_hashes if text_hash not in found]
+        if remaining:
+            promoted = {}
+            try:
+                from data_ingestion.models.embedding_cache_entry import EmbeddingCacheEntry
+                rows = EmbeddingCacheEntry.objects.filter(
+                    model=model,
+                    text_hash__in=remaining
+                ).values_list('text_hash', 'embedding')
+                for text_hash, embedding in rows:
+                    embedding = [float(value) for value in embedding]
+                    found[text_hash] = embedding
+                    promoted[EmbeddingCache._cache_key(model, text_hash)] = EmbeddingCache._pack(embedding)
+            except Exception as e:
+                logger.warning(f"Error reading embeddings from embedding cache table: {e}")
+
+            if promoted:
+                try:
+                    cache.set_many(promoted, EmbeddingCache.FRONT_TIER_TIMEOUT)
+                except Exception as e:
+                    logger.warning(f"Error promoting embeddings to Redis cache: {e}")
+
+        logger.debug(f"Embedding cache: {len(found)}/{len(text_hashes)} hits for model {model}")
+        return found
+
+    @staticmethod
+    def set_many(model: str, embeddings: Dict[str, List[float]]):
+        """
+        Store embeddings in both tiers.
+
+        Args:
+            model: Embedding model name
+            embeddings: Dictionary mapping text_hash -> embedding
+        """
+        if not embeddings:
+            return
+
+        try:
+            cache.set_many(
+                {
+                    EmbeddingCache._cache_key(model, text_hash): EmbeddingCache._pack(embedding)
+                    for text_hash, embedding in embeddings.items()
+                },
+                EmbeddingCache.FRONT_TIER_TIMEOUT
+            )
+        except Exception as e:
+            logger.warning(f"Error writing embeddings to Redis cache: {e}")
+
+        try:
+            from data_ingestion.models.embedding_cache_entry import EmbeddingCacheEntry
+            EmbeddingCacheEntry.objects.bulk_create(
+                [
+                    EmbeddingCacheEntry(model=model, text_hash=text_hash, embedding=embedding)
+                    for text_hash, embedding in embeddings.items()
+                    if len(embedding) == EmbeddingCache.BACK_TIER_DIMENSIONS
+                ],
+                ignore_conflicts=True
+            )
+        except Exception as e:
+            logger.warning(f"Error writing embeddings to embedding cache table: {e}")
+
+    @staticmethod
+    def get(model: str, text: str) -> Optional[List[float]]:
+        """Look up the cached embedding of a single text."""
+        text_hash = EmbeddingCache.text_hash(text)
+        return EmbeddingCache.get_many(model, [text_hash]).get(text_hash)
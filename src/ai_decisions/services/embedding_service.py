@@ -1,6 +1,10 @@
 import logging
-from typing import List, Dict, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Dict, Optional
 from django.conf import settings
+from ai_decisions.services.embedding_cache import EmbeddingCache
 
 logger = logging.getLogger('django')
 
@@ -17,6 +21,21 @@ class EmbeddingService:
     MAX_CHUNK_SIZE = 8000
     # Overlap between chunks for context preservation
     CHUNK_OVERLAP = 200
+    # Approximate characters per token (used for request token budgets)
+    CHARS_PER_TOKEN = 4
+    # Per-request limits for batched embedding generation
+    MAX_BATCH_TOKENS = 100000
+    MAX_BATCH_INPUTS = 256
+    # Concurrent embedding requests per pipeline run
+    MAX_EMBEDDING_WORKERS = 4
+    # Attempts per text when a batch fails and its texts are retried individually
+    MAX_RETRIES = 3
+    RETRY_BACKOFF_SECONDS = 1.0
+
+    # Shared OpenAI client (keeps the HTTP connection pool across calls)
+    _client = None
+    _client_api_key = None
+    _client_lock = threading.Lock()
 
     @staticmethod
     def chunk_document(text: str, chunk_size: int = None, overlap: int = None) -> List[Dict]:
@@ -77,13 +96,60 @@ class EmbeddingService:
         return chunks
 
     @staticmethod
-    def generate_embeddings(texts: List[str], model: str = "text-embedding-ada-002") -> List[List[float]]:
+    def _get_client():
+        """Return the shared OpenAI client, creating it on first use."""
+        # Import OpenAI client (will be available when openai package is installed)
+        try:
+            from openai import OpenAI
+        except ImportError:
+            logger.error("OpenAI package not installed. Install with: pip install openai")
+            raise ImportError("OpenAI package required for embedding generation")
+        
+        # Get API key from settings
+        api_key = getattr(settings, 'OPENAI_API_KEY', None)
+        if not api_key:
+            logger.error("OPENAI_API_KEY not set in settings")
+            raise ValueError("OPENAI_API_KEY must be set in settings")
+        
+        with EmbeddingService._client_lock:
+            if EmbeddingService._client is None or EmbeddingService._client_api_key != api_key:
+                EmbeddingService._client = OpenAI(api_key=api_key)
+                EmbeddingService._client_api_key = api_key
+            return EmbeddingService._client
+
+    @staticmethod
+    def _request_embeddings(texts: List[str], model: str) -> List[List[float]]:
+        """Call the embeddings API for texts (no caching)."""
+        client = EmbeddingService._get_client()
+        
+        # Generate embeddings
+        response = client.embeddings.create(
+            model=model,
+            input=texts
+        )
+        
+        embeddings = [item.embedding for item in response.data]
+        
+        logger.info(f"Generated {len(embeddings)} embeddings using {model}")
+        return embeddings
+
+    @staticmethod
+    def generate_embeddings(
+        texts: List[str],
+        model: str = "text-embedding-ada-002",
+        use_cache: bool = True
+    ) -> List[List[float]]:
         """
         Generate embeddings for a list of texts using OpenAI API.
         
+        Embeddings are looked up in the embedding cache by (model, sha256(text))
+        first; only the misses (deduplicated) are sent to the API, in one call,
+        and written back to the cache.
+        
         Args:
             texts: List of text strings to embed
             model: OpenAI embedding model (default: text-embedding-ada-002)
+            use_cache: Whether to use the embedding cache
             
         Returns:
             List of embedding vectors (each is a list of 1536 floats)
@@ -95,49 +161,212 @@ class EmbeddingService:
             return []
         
         try:
-            # Import OpenAI client (will be available when openai package is installed)
-            try:
-                from openai import OpenAI
-            except ImportError:
-                logger.error("OpenAI package not installed. Install with: pip install openai")
-                raise ImportError("OpenAI package required for embedding generation")
-            
-            # Get API key from settings
-            api_key = getattr(settings, 'OPENAI_API_KEY', None)
-            if not api_key:
-                logger.error("OPENAI_API_KEY not set in settings")
-                raise ValueError("OPENAI_API_KEY must be set in settings")
-            
-            client = OpenAI(api_key=api_key)
-            
-            # Generate embeddings
-            response = client.embeddings.create(
-                model=model,
-                input=texts
-            )
+            if not use_cache:
+                return EmbeddingService._request_embeddings(texts, model)
             
-            embeddings = [item.embedding for item in response.data]
+            text_hashes = [EmbeddingCache.text_hash(text) for text in texts]
+            embeddings_by_hash = EmbeddingCache.get_many(model, text_hashes)
             
-            logger.info(f"Generated {len(embeddings)} embeddings using {model}")
-            return embeddings
+            # Identical texts are only embedded once
+            misses: Dict[str, str] = {}
+            for text, text_hash in zip(texts, text_hashes):
+                if text_hash not in embeddings_by_hash and text_hash not in misses:
+                    misses[text_hash] = text
+            
+            if misses:
+                generated = EmbeddingService._request_embeddings(list(misses.values()), model)
+                new_embeddings = dict(zip(misses.keys(), generated))
+                EmbeddingCache.set_many(model, new_embeddings)
+                embeddings_by_hash.update(new_embeddings)
+            
+            logger.debug(
+                f"Embeddings for {len(texts)} texts: {len(texts) - len(misses)} from cache, "
+                f"{len(misses)} generated"
+            )
+            return [embeddings_by_hash[text_hash] for text_hash in text_hashes]
             
         except Exception as e:
             logger.error(f"Error generating embeddings: {e}")
             raise
 
     @staticmethod
-    def generate_embedding(text: str, model: str = "text-embedding-ada-002") -> List[float]:
+    def estimate_tokens(text: str) -> int:
+        """Estimate the token count of a text (roughly 4 characters per token)."""
+        return len(text) // EmbeddingService.CHARS_PER_TOKEN + 1
+
+    @staticmethod
+    def pack_batches(
+        texts: List[str],
+        max_batch_tokens: Optional[int] = None,
+        max_batch_inputs: Optional[int] = None
+    ) -> List[List[int]]:
+        """
+        Pack texts into request batches within a token budget.
+        
+        Texts keep their order; a text larger than the budget gets a batch of its own.
+        
+        Args:
+            texts: Texts to embed
+            max_batch_tokens: Token budget per request (default: MAX_BATCH_TOKENS)
+            max_batch_inputs: Maximum texts per request (default: MAX_BATCH_INPUTS)
+            
+        Returns:
+            List of batches, each a list of indexes into texts
+        """
+        max_batch_tokens = max_batch_tokens or EmbeddingService.MAX_BATCH_TOKENS
+        max_batch_inputs = max_batch_inputs or EmbeddingService.MAX_BATCH_INPUTS
+        
+        batches = []
+        batch: List[int] = []
+        batch_tokens = 0
+        for index, text in enumerate(texts):
+            tokens = EmbeddingService.estimate_tokens(text)
+            if batch and (batch_tokens + tokens > max_batch_tokens or len(batch) >= max_batch_inputs):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(index)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    @staticmethod
+    def _request_with_retries(text: str, model: str) -> Optional[List[float]]:
+        """Embed a single text, retrying with backoff; None if all attempts fail."""
+        for attempt in range(1, EmbeddingService.MAX_RETRIES + 1):
+            try:
+                return EmbeddingService._request_embeddings([text], model)[0]
+            except Exception as e:
+                logger.warning(
+                    f"Embedding attempt {attempt}/{EmbeddingService.MAX_RETRIES} failed "
+                    f"for text of {len(text)} characters: {e}"
+                )
+                if attempt < EmbeddingService.MAX_RETRIES:
+                    time.sleep(EmbeddingService.RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+        return None
+
+    @staticmethod
+    def _request_batch(texts: List[str], model: str) -> List[Optional[List[float]]]:
+        """Embed a batch; if the request fails, retry its texts individually."""
+        try:
+            return EmbeddingService._request_embeddings(texts, model)
+        except Exception as e:
+            logger.warning(f"Embedding batch of {len(texts)} texts failed, retrying individually: {e}")
+            return [EmbeddingService._request_with_retries(text, model) for text in texts]
+
+    @staticmethod
+    def generate_embeddings_batched(
+        texts: List[str],
+        model: str = "text-embedding-ada-002",
+        on_batch: Optional[Callable[[List[int], List[List[float]]], None]] = None,
+        max_workers: Optional[int] = None,
+        use_cache: bool = True
+    ) -> List[Optional[List[float]]]:
+        """
+        Generate embeddings for many texts with concurrent, token-budgeted requests.
+        
+        Cached embeddings are served first. The remaining (deduplicated) texts
+        are packed into requests by pack_batches and sent from a bounded thread
+        pool. A failed request is retried text by text so one bad input does not
+        lose the whole batch. Results are handed to on_batch as each batch
+        completes; the callback runs in the calling thread, so it may use the
+        database connection (e.g. to store chunks).
+        
+        Args:
+            texts: List of text strings to embed
+            model: OpenAI embedding model (default: text-embedding-ada-002)
+            on_batch: Optional callback(indexes, embeddings) for completed results;
+                indexes refer to positions in texts, failed texts are left out
+            max_workers: Concurrent requests (default: MAX_EMBEDDING_WORKERS)
+            use_cache: Whether to use the embedding cache
+            
+        Returns:
+            List of embedding vectors aligned with texts (None where embedding failed)
+        """
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        if not texts:
+            return results
+        
+        text_hashes = [EmbeddingCache.text_hash(text) for text in texts]
+        cached = EmbeddingCache.get_many(model, text_hashes) if use_cache else {}
+        
+        # Indexes of every occurrence of each text still to embed
+        pending: Dict[str, List[int]] = {}
+        cached_indexes = []
+        for index, text_hash in enumerate(text_hashes):
+            if text_hash in cached:
+                results[index] = cached[text_hash]
+                cached_indexes.append(index)
+            else:
+                pending.setdefault(text_hash, []).append(index)
+        
+        if cached_indexes and on_batch:
+            on_batch(cached_indexes, [results[index] for index in cached_indexes])
+        
+        pending_hashes = list(pending.keys())
+        pending_texts = [texts[pending[text_hash][0]] for text_hash in pending_hashes]
+        batches = EmbeddingService.pack_batches(pending_texts)
+        
+        failed = 0
+        with ThreadPoolExecutor(max_workers=max_workers or EmbeddingService.MAX_EMBEDDING_WORKERS) as executor:
+            futures = {
+                executor.submit(
+                    EmbeddingService._request_batch,
+                    [pending_texts[i] for i in batch],
+                    model
+                ): batch
+                for batch in batches
+            }
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    embeddings = future.result()
+                except Exception as e:
+                    logger.error(f"Embedding batch of {len(batch)} texts failed: {e}")
+                    embeddings = [None] * len(batch)
+                
+                new_embeddings = {}
+                completed_indexes = []
+                for i, embedding in zip(batch, embeddings):
+                    if embedding is None:
+                        failed += 1
+                        continue
+                    text_hash = pending_hashes[i]
+                    new_embeddings[text_hash] = embedding
+                    for index in pending[text_hash]:
+                        results[index] = embedding
+                        completed_indexes.append(index)
+                
+                if use_cache:
+                    EmbeddingCache.set_many(model, new_embeddings)
+                if completed_indexes and on_batch:
+                    on_batch(completed_indexes, [results[index] for index in completed_indexes])
+        
+        logger.info(
+            f"Embedding pipeline: {len(texts)} texts, {len(cached_indexes)} cached, "
+            f"{len(pending_texts)} requested in {len(batches)} batches, {failed} failed"
+        )
+        return results
+
+    @staticmethod
+    def generate_embedding(
+        text: str,
+        model: str = "text-embedding-ada-002",
+        use_cache: bool = True
+    ) -> List[float]:
         """
         Generate a single embedding for text.
         
         Args:
             text: Text to embed
             model: OpenAI embedding model
+            use_cache: Whether to use the embedding cache
             
         Returns:
             Embedding vector (list of 1536 floats)
         """
-        embeddings = EmbeddingService.generate_embeddings([text], model=model)
+        embeddings = EmbeddingService.generate_embeddings([text], model=model, use_cache=use_cache)
         return embeddings[0] if embeddings else []
 
     @staticmethod
@@ -0,0 +1,411 @@
+"""
+LLM Gateway
+
+Single entry point for chat completion calls to the LLM provider (OpenAI),
+shared by AI reasoning, document classification and rule extraction:
+
+- one pooled client per process (keeps the HTTP connection pool across calls)
+- response cache keyed by (model, temperature, prompt hash):
+  an in-process LRU bounded to LOCAL_CACHE_MAX_ENTRIES entries in front of the
+  shared Redis cache (django cache), both expiring after the cache timeout
+- single-flight coalescing: concurrent identical requests in a process wait
+  for the first one instead of calling the provider again
+- per-call latency and token metrics, logged and aggregated in-process
+  (see LLMGateway.get_metrics)
+- streaming completions (LLMGateway.stream): deltas are yielded as they
+  arrive and the finished response is written to the same cache; cached
+  responses are replayed as a single delta. Streams are not coalesced, since
+  a waiting caller would lose the incremental output.
+
+Failed calls are never cached. Cache errors are logged and treated as misses.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger('django')
+
+
+class _Flight:
+    """An in-progress provider call that identical requests can wait on."""
+
+    __slots__ = ('done', 'response', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class LLMStream:
+    """
+    Iterable over the content deltas of a streamed completion.
+
+    After iteration has finished, `response` holds the same dict
+    LLMGateway.complete returns (plus 'time_to_first_token_ms').
+    """
+
+    def __init__(self, deltas: Iterator[str]):
+        self._deltas = deltas
+        self.response: Optional[Dict[str, Any]] = None
+
+    def __iter__(self) -> Iterator[str]:
+        return self._deltas
+
+
+class LLMGateway:
+    """Pooled, cached and coalescing client for chat completions."""
+
+    CACHE_PREFIX = 'llm:response'
+    CACHE_TIMEOUT = 60 * 60 * 24  # 24 hours
+    LOCAL_CACHE_MAX_ENTRIES = 512
+
+    # Shared OpenAI client
+    _client = None
+    _client_api_key = None
+    _client_lock = threading.Lock()
+
+    # In-process LRU: cache key -> (expires_at, response)
+    _local_cache: 'OrderedDict[str, tuple]' = OrderedDict()
+    _local_cache_lock = threading.Lock()
+
+    # Single-flight: cache key -> _Flight
+    _in_flight: Dict[str, _Flight] = {}
+    _in_flight_lock = threading.Lock()
+
+    _metrics_lock = threading.Lock()
+    _metrics: Dict[str, float] = {
+        'calls': 0,
+        'provider_calls': 0,
+        'local_cache_hits': 0,
+        'shared_cache_hits': 0,
+        'coalesced': 0,
+        'errors': 0,
+        'prompt_tokens': 0,
+        'completion_tokens': 0,
+        'provider_latency_ms': 0.0,
+        'streams': 0,
+        'time_to_first_token_ms': 0.0,
+    }
+
+    @staticmethod
+    def get_client():
+        """Return the shared OpenAI client, creating it on first use."""
+        try:
+            from openai import OpenAI
+        except ImportError:
+            logger.error("OpenAI package not installed. Install with: pip install openai")
+            raise ImportError("OpenAI package required for LLM calls")
+
+        api_key = getattr(settings, 'OPENAI_API_KEY', None)
+        if not api_key:
+            logger.error("OPENAI_API_KEY not set in settings")
+            raise ValueError("OPENAI_API_KEY must be set in settings")
+
+        with LLMGateway._client_lock:
+            if LLMGateway._client is None or LLMGateway._client_api_key != api_key:
+                LLMGateway._client = OpenAI(api_key=api_key)
+                LLMGateway._client_api_key = api_key
+            return LLMGateway._client
+
+    @staticmethod
+    def cache_key(model: str, temperature: float, messages: List[Dict[str, str]], max_tokens: Optional[int]) -> str:
+        """Cache key of a request: model, temperature and a hash of the prompt."""
+        prompt = json.dumps({'messages': messages, 'max_tokens': max_tokens}, sort_keys=True)
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        return f"{LLMGateway.CACHE_PREFIX}:{model}:{float(temperature)}:{prompt_hash}"
+
+    @staticmethod
+    def _local_get(key: str) -> Optional[Dict[str, Any]]:
+        with LLMGateway._local_cache_lock:
+            entry = LLMGateway._local_cache.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if expires_at < time.monotonic():
+                del LLMGateway._local_cache[key]
+                return None
+            LLMGateway._local_cache.move_to_end(key)
+            return response
+
+    @staticmethod
+    def _local_set(key: str, response: Dict[str, Any], timeout: int):
+        with LLMGateway._local_cache_lock:
+            LLMGateway._local_cache[key] = (time.monotonic() + timeout, response)
+            LLMGateway._local_cache.move_to_end(key)
+            while len(LLMGateway._local_cache) > LLMGateway.LOCAL_CACHE_MAX_ENTRIES:
+                LLMGateway._local_cache.popitem(last=False)
+
+    @staticmethod
+    def _shared_get(key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return cache.get(key)
+        except Exception as e:
+            logger.warning(f"Error reading LLM response cache: {e}")
+            return None
+
+    @staticmethod
+    def _shared_set(key: str, response: Dict[str, Any], timeout: int):
+        try:
+            cache.set(key, response, timeout)
+        except Exception as e:
+            logger.warning(f"Error writing LLM response cache: {e}")
+
+    @staticmethod
+    def _record(**counts):
+        with LLMGateway._metrics_lock:
+            for name, value in counts.items():
+                LLMGateway._metrics[name] += value
+
+    @staticmethod
+    def get_metrics() -> Dict[str, float]:
+        """Snapshot of the in-process gateway counters."""
+        with LLMGateway._metrics_lock:
+            return dict(LLMGateway._metrics)
+
+    @staticmethod
+    def clear_local_cache():
+        """Drop the in-process response cache (the shared cache expires on its own)."""
+        with LLMGateway._local_cache_lock:
+            LLMGateway._local_cache.clear()
+
+    @staticmethod
+    def _request(model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: Optional[int]) -> Dict[str, Any]:
+        """Call the provider (no caching) and measure the call."""
+        client = LLMGateway.get_client()
+
+        started = time.perf_counter()
+        try:
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+        except Exception:
+            LLMGateway._record(provider_calls=1, errors=1)
+            raise
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        usage = response.usage
+        prompt_tokens = getattr(usage, 'prompt_tokens', None) if usage else None
+        completion_tokens = getattr(usage, 'completion_tokens', None) if usage else None
+        total_tokens = getattr(usage, 'total_tokens', None) if usage else None
+
+        LLMGateway._record(
+            provider_calls=1,
+            prompt_tokens=prompt_tokens or 0,
+            completion_tokens=completion_tokens or 0,
+            provider_latency_ms=latency_ms
+        )
+        logger.info(
+            f"LLM call to {model}: {latency_ms:.0f} ms, "
+            f"{prompt_tokens} prompt + {completion_tokens} completion tokens"
+        )
+
+        return {
+            'content': response.choices[0].message.content,
+            'model': model,
+            'tokens_used': total_tokens,
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'latency_ms': latency_ms,
+        }
+
+    @staticmethod
+    def complete(
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        use_cache: bool = True,
+        cache_timeout: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a chat completion through the cache and single-flight layers.
+
+        Args:
+            messages: Chat messages ({'role': ..., 'content': ...})
+            model: Model name
+            temperature: Sampling temperature
+            max_tokens: Maximum completion tokens
+            use_cache: Read and write the response cache (default: True)
+            cache_timeout: Cache TTL in seconds (default: CACHE_TIMEOUT)
+
+        Returns:
+            Dict with 'content', 'model', 'tokens_used', 'prompt_tokens',
+            'completion_tokens', 'latency_ms' and 'cached' (True when the
+            response did not come from a provider call made for this request)
+
+        Raises:
+            ImportError: If the openai package is not installed
+            ValueError: If OPENAI_API_KEY is not set
+            Exception: Provider errors are propagated
+        """
+        LLMGateway._record(calls=1)
+
+        if not use_cache:
+            return {**LLMGateway._request(model, messages, temperature, max_tokens), 'cached': False}
+
+        timeout = cache_timeout or LLMGateway.CACHE_TIMEOUT
+        key = LLMGateway.cache_key(model, temperature, messages, max_tokens)
+
+        response = LLMGateway._local_get(key)
+        if response is not None:
+            LLMGateway._record(local_cache_hits=1)
+            logger.debug(f"LLM response cache hit (local) for {model}")
+            return {**response, 'cached': True}
+
+        with LLMGateway._in_flight_lock:
+            flight = LLMGateway._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                LLMGateway._in_flight[key] = flight
+
+        if not leader:
+            LLMGateway._record(coalesced=1)
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return {**flight.response, 'cached': True}
+
+        try:
+            response = LLMGateway._shared_get(key)
+            if response is not None:
+                LLMGateway._record(shared_cache_hits=1)
+                logger.debug(f"LLM response cache hit (shared) for {model}")
+                LLMGateway._local_set(key, response, timeout)
+                flight.response = response
+                return {**response, 'cached': True}
+
+            response = LLMGateway._request(model, messages, temperature, max_tokens)
+            LLMGateway._local_set(key, response, timeout)
+            LLMGateway._shared_set(key, response, timeout)
+            flight.response = response
+            return {**response, 'cached': False}
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with LLMGateway._in_flight_lock:
+                LLMGateway._in_flight.pop(key, None)
+            flight.done.set()
+
+    @staticmethod
+    def stream(
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        use_cache: bool = True,
+        cache_timeout: Optional[int] = None
+    ) -> LLMStream:
+        """
+        Run a chat completion, yielding content deltas as they arrive.
+
+        Args:
+            messages: Chat messages ({'role': ..., 'content': ...})
+            model: Model name
+            temperature: Sampling temperature
+            max_tokens: Maximum completion tokens
+            use_cache: Replay cached responses and cache the finished one (default: True)
+            cache_timeout: Cache TTL in seconds (default: CACHE_TIMEOUT)
+
+        Returns:
+            LLMStream; iterate it to consume the deltas, then read .response
+
+        Raises:
+            ImportError: If the openai package is not installed (on iteration)
+            ValueError: If OPENAI_API_KEY is not set (on iteration)
+            Exception: Provider errors are propagated (on iteration)
+        """
+        timeout = cache_timeout or LLMGateway.CACHE_TIMEOUT
+        key = LLMGateway.cache_key(model, temperature, messages, max_tokens)
+        llm_stream = None
+
+        def deltas() -> Iterator[str]:
+            LLMGateway._record(calls=1, streams=1)
+
+            if use_cache:
+                response = LLMGateway._local_get(key)
+                if response is not None:
+                    LLMGateway._record(local_cache_hits=1)
+                else:
+                    response = LLMGateway._shared_get(key)
+                    if response is not None:
+                        LLMGateway._record(shared_cache_hits=1)
+                        LLMGateway._local_set(key, response, timeout)
+                if response is not None:
+                    logger.debug(f"LLM response cache hit for streamed call to {model}")
+                    llm_stream.response = {**response, 'cached': True, 'time_to_first_token_ms': 0.0}
+                    yield response['content'] or ''
+                    return
+
+            client = LLMGateway.get_client()
+            started = time.perf_counter()
+            first_token_ms = None
+            parts: List[str] = []
+            usage = None
+            try:
+                chunks = client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True,
+                    stream_options={"include_usage": True}
+                )
+                for chunk in chunks:
+                    if getattr(chunk, 'usage', None):
+                        usage = chunk.usage
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    if first_token_ms is None:
+                        first_token_ms = (time.perf_counter() - started) * 1000
+                    parts.append(delta)
+                    yield delta
+            except Exception:
+                LLMGateway._record(provider_calls=1, errors=1)
+                raise
+            latency_ms = (time.perf_counter() - started) * 1000
+
+            prompt_tokens = getattr(usage, 'prompt_tokens', None) if usage else None
+            completion_tokens = getattr(usage, 'completion_tokens', None) if usage else None
+            LLMGateway._record(
+                provider_calls=1,
+                prompt_tokens=prompt_tokens or 0,
+                completion_tokens=completion_tokens or 0,
+                provider_latency_ms=latency_ms,
+                time_to_first_token_ms=first_token_ms or 0.0
+            )
+            logger.info(
+                f"Streamed LLM call to {model}: first token after {first_token_ms or 0:.0f} ms, "
+                f"{latency_ms:.0f} ms total, {prompt_tokens} prompt + {completion_tokens} completion tokens"
+            )
+
+            response = {
+                'content': ''.join(parts),
+                'model': model,
+                'tokens_used': getattr(usage, 'total_tokens', None) if usage else None,
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'latency_ms': latency_ms,
+            }
+            if use_cache:
+                LLMGateway._local_set(key, response, timeout)
+                LLMGateway._shared_set(key, response, timeout)
+            llm_stream.response = {**response, 'cached': False, 'time_to_first_token_ms': first_token_ms}
+
+        llm_stream = LLMStream(deltas())
+        return llm_stream
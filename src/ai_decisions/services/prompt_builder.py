@@ -0,0 +1,238 @@
+"""
+Prompt Builder
+
+Assembles the AI reasoning prompt within a token budget. Sections are added
+in priority order:
+
+1. instructions (always included)
+2. rule engine summary and a compact requirement table
+3. case facts (long values are truncated)
+4. context chunks, in the order the retriever ranked them (reciprocal rank
+   fusion of vector and full-text search), until the budget is spent; the
+   last chunk that fits partially is truncated
+
+Chunks of the same document overlap by up to EmbeddingService.CHUNK_OVERLAP
+characters (more when the chunk boundary moved to a sentence break), so text
+shared with an already included chunk is cut before the chunk is counted.
+
+Token counts use EmbeddingService.estimate_tokens (about 4 characters per token).
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from ai_decisions.services.embedding_service import EmbeddingService
+
+logger = logging.getLogger('django')
+
+
+class PromptBuilder:
+    """Token-budgeted prompt assembly for AI reasoning."""
+
+    # Prompt tokens for gpt-4 (8k context) leaving room for 2000 completion tokens
+    DEFAULT_TOKEN_BUDGET = 5000
+    # Longest overlap searched for between chunks (chunk boundaries may move)
+    MAX_OVERLAP_CHARS = EmbeddingService.CHUNK_OVERLAP * 2
+    # Shorter shared prefixes/suffixes are coincidence, not chunk overlap
+    MIN_OVERLAP_CHARS = 20
+    # Partially fitting chunks are dropped when less than this fits
+    MIN_CHUNK_TOKENS = 50
+    MAX_FACT_VALUE_CHARS = 200
+    MAX_DESCRIPTION_CHARS = 80
+
+    HEADER = (
+        "You are an immigration eligibility advisor. Analyze the case facts and provide "
+        "a reasoned assessment of eligibility based on the provided context."
+    )
+    INSTRUCTION = (
+        "\n## Instruction:\n"
+        "Based on the context, rule engine results, and case facts, provide:\n"
+        "1. A clear eligibility assessment (likely/possible/unlikely)\n"
+        "2. Key factors supporting your assessment\n"
+        "3. Any concerns or missing information\n"
+        "4. Recommendations for the applicant\n\n"
+        "Cite specific context sources when referencing information."
+    )
+
+    @staticmethod
+    def count_tokens(text: str) -> int:
+        """Estimated token count of a prompt part (including its joining newline)."""
+        return EmbeddingService.estimate_tokens(text)
+
+    @staticmethod
+    def _truncate(text: str, max_chars: int) -> str:
+        if len(text) <= max_chars:
+            return text
+        return text[:max_chars - 3].rstrip() + "..."
+
+    @staticmethod
+    def _requirement_status(requirement: Dict[str, Any]) -> str:
+        if requirement.get('status'):
+            return requirement['status']
+        if requirement.get('error'):
+            return 'error'
+        if requirement.get('missing_facts'):
+            return 'missing_fact'
+        return 'pass' if requirement.get('passed') else 'fail'
+
+    @staticmethod
+    def requirement_table(rule_results: Dict[str, Any]) -> List[str]:
+        """
+        Compact requirement table, one line per requirement.
+
+        Accepts requirement lists in the 'requirements' key or, for
+        RuleEngineEvaluationResult.to_dict() output, 'requirement_details'.
+        Passed requirements are listed after the others.
+
+        Args:
+            rule_results: Rule engine evaluation results
+
+        Returns:
+            Table lines (empty if there are no requirements)
+        """
+        requirements = rule_results.get('requirements') or rule_results.get('requirement_details') or []
+        if not requirements:
+            return []
+
+        rows = []
+        for requirement in requirements:
+            status = PromptBuilder._requirement_status(requirement)
+            label = requirement.get('requirement_code') or PromptBuilder._truncate(
+                str(requirement.get('description', 'N/A')), PromptBuilder.MAX_DESCRIPTION_CHARS
+            )
+            mandatory = 'Y' if requirement.get('is_mandatory', True) else 'N'
+            missing = ','.join(requirement.get('missing_facts') or [])
+            rows.append((status == 'pass', f"{label}|{status}|{mandatory}|{missing}"))
+
+        rows.sort(key=lambda row: row[0])
+        return ["code|status|mandatory|missing_facts"] + [line for _, line in rows]
+
+    @staticmethod
+    def _strip_overlap(text: str, included: List[str]) -> str:
+        """Cut text shared with already included chunks at either end of text."""
+        max_overlap = PromptBuilder.MAX_OVERLAP_CHARS
+        minimum = PromptBuilder.MIN_OVERLAP_CHARS
+        for previous in included:
+            if text in previous:
+                return ''
+            # previous ... | overlap | ... text
+            for size in range(min(max_overlap, len(text), len(previous)), minimum - 1, -1):
+                if previous.endswith(text[:size]):
+                    text = text[size:]
+                    break
+            # text ... | overlap | ... previous
+            for size in range(min(max_overlap, len(text), len(previous)), minimum - 1, -1):
+                if previous.startswith(text[-size:]):
+                    text = text[:-size]
+                    break
+        return text.strip()
+
+    @staticmethod
+    def build(
+        case_facts: Dict[str, Any],
+        rule_results: Optional[Dict[str, Any]] = None,
+        context_chunks: Optional[List[Dict[str, Any]]] = None,
+        token_budget: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the reasoning prompt within a token budget.
+
+        Args:
+            case_facts: Dictionary of case facts
+            rule_results: Optional rule engine evaluation results
+            context_chunks: Optional retrieved context chunks, best first ('text',
+                'source', optional 'rrf_score')
+            token_budget: Maximum prompt tokens (default: DEFAULT_TOKEN_BUDGET)
+
+        Returns:
+            Dict with 'prompt', 'token_count', 'token_budget', 'context_chunks'
+            (the chunks included, in prompt order), 'chunks_dropped' and
+            'chunks_truncated'
+        """
+        token_budget = token_budget or PromptBuilder.DEFAULT_TOKEN_BUDGET
+        count = PromptBuilder.count_tokens
+
+        # Rule engine results
+        rule_parts = []
+        if rule_results:
+            rule_parts.append("\n## Rule Engine Evaluation:")
+            rule_parts.append(f"Overall Outcome: {rule_results.get('outcome', 'unknown')}")
+            rule_parts.append(f"Confidence: {rule_results.get('confidence', 0):.2f}")
+            table = PromptBuilder.requirement_table(rule_results)
+            if table:
+                rule_parts.append("\nRequirement Results:")
+                rule_parts.extend(table)
+
+        # Case facts
+        fact_parts = ["\n## Case Facts:"]
+        for key, value in case_facts.items():
+            fact_parts.append(f"- {key}: {PromptBuilder._truncate(str(value), PromptBuilder.MAX_FACT_VALUE_CHARS)}")
+
+        fixed_parts = [PromptBuilder.HEADER, PromptBuilder.INSTRUCTION] + rule_parts + fact_parts
+        remaining = token_budget - sum(count(part) for part in fixed_parts)
+
+        # Context: in retrieval rank order, overlap removed, truncated to the budget
+        context_parts = []
+        used_chunks = []
+        included_texts: List[str] = []
+        chunks_truncated = 0
+        ranked = list(context_chunks or [])
+        if ranked:
+            remaining -= count("\n## Relevant Context:")
+
+        for chunk in ranked:
+            text = PromptBuilder._strip_overlap(chunk.get('text') or '', included_texts)
+            if not text:
+                continue
+
+            index = len(used_chunks) + 1
+            heading = (
+                f"\n### Context {index} (Relevance: {chunk['rrf_score']:.4f}):"
+                if chunk.get('rrf_score') is not None else f"\n### Context {index}:"
+            )
+            source = f"\nSource: {chunk['source']}" if chunk.get('source') else None
+            overhead = count(heading) + (count(source) if source else 0)
+            available = remaining - overhead
+            if available < PromptBuilder.MIN_CHUNK_TOKENS:
+                break
+
+            if count(text) > available:
+                text = PromptBuilder._truncate(text, available * EmbeddingService.CHARS_PER_TOKEN - 4)
+                chunks_truncated += 1
+
+            included_texts.append(chunk.get('text') or '')
+            context_parts.append(heading)
+            context_parts.append(text)
+            if source:
+                context_parts.append(source)
+            remaining -= overhead + count(text)
+            used_chunks.append(chunk)
+
+        prompt_parts = [PromptBuilder.HEADER]
+        if context_parts:
+            prompt_parts.append("\n## Relevant Context:")
+            prompt_parts.extend(context_parts)
+        prompt_parts.extend(rule_parts)
+        prompt_parts.extend(fact_parts)
+        prompt_parts.append(PromptBuilder.INSTRUCTION)
+
+        prompt = "\n".join(prompt_parts)
+        token_count = count(prompt)
+        chunks_dropped = len(ranked) - len(used_chunks)
+
+        if token_count > token_budget:
+            logger.warning(
+                f"Prompt exceeds token budget: {token_count} > {token_budget} tokens"
+            )
+        logger.debug(
+            f"Built prompt: {token_count}/{token_budget} tokens, {len(used_chunks)} context chunks "
+            f"({chunks_truncated} truncated, {chunks_dropped} dropped)"
+        )
+
+        return {
+            'prompt': prompt,
+            'token_count': token_count,
+            'token_budget': token_budget,
+            'context_chunks': used_chunks,
+            'chunks_dropped': chunks_dropped,
+            'chunks_truncated': chunks_truncated,
+        }
@@ -0,0 +1,143 @@
+"""
+Reasoning Gating Policy
+
+Decides whether the eligibility pipeline calls the LLM for a rule engine
+evaluation. AI reasoning is invoked only when the rule engine confidence is
+inside the confidence band of the visa type, i.e. low <= confidence < high.
+Decisive evaluations are summarised from a template instead:
+
+- every requirement is missing facts (nothing for the LLM to reason about)
+- 'unlikely' with a failed mandatory requirement
+- confidence outside the band
+
+Bands come from settings.AI_REASONING_CONFIDENCE_BANDS, looked up by
+'<JURISDICTION>:<VISA_CODE>', then '<JURISDICTION>', then 'default'.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger('django')
+
+
+class ReasoningGatingPolicy:
+    """Confidence-band gating of AI reasoning in the eligibility pipeline."""
+
+    DEFAULT_BAND = (0.5, 0.8)
+
+    @staticmethod
+    def get_band(jurisdiction: Optional[str], visa_code: Optional[str]) -> Tuple[str, Tuple[float, float]]:
+        """
+        Confidence band for a visa type.
+
+        Args:
+            jurisdiction: Jurisdiction code (e.g. 'UK')
+            visa_code: Visa type code (e.g. 'SKILLED_WORKER')
+
+        Returns:
+            Tuple of (matched policy key, (low, high))
+        """
+        bands = getattr(settings, 'AI_REASONING_CONFIDENCE_BANDS', None) or {}
+        candidates = []
+        if jurisdiction and visa_code:
+            candidates.append(f"{jurisdiction}:{visa_code}")
+        if jurisdiction:
+            candidates.append(jurisdiction)
+        candidates.append('default')
+
+        for key in candidates:
+            if key in bands:
+                low, high = bands[key]
+                return key, (float(low), float(high))
+        return 'default', ReasoningGatingPolicy.DEFAULT_BAND
+
+    @staticmethod
+    def _failed_mandatory_requirements(evaluation) -> List[str]:
+        return [
+            detail.get('requirement_code')
+            for detail in evaluation.requirement_details
+            if detail.get('is_mandatory', True)
+            and not detail.get('passed', False)
+            and not detail.get('missing_facts')
+            and not detail.get('error')
+        ]
+
+    @staticmethod
+    def decide(evaluation, jurisdiction: Optional[str] = None, visa_code: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Decide whether to invoke AI reasoning for an evaluation.
+
+        Args:
+            evaluation: RuleEngineEvaluationResult
+            jurisdiction: Jurisdiction of the visa type
+            visa_code: Code of the visa type
+
+        Returns:
+            Dict with 'invoke' (bool), 'reason', 'policy_key', 'band',
+            'confidence' and 'rule_outcome' (recorded in AIReasoningLog.gating_details)
+        """
+        policy_key, (low, high) = ReasoningGatingPolicy.get_band(jurisdiction, visa_code)
+        confidence = evaluation.confidence
+
+        if evaluation.requirements_total and evaluation.requirements_with_missing_facts == evaluation.requirements_total:
+            invoke, reason = False, 'all_facts_missing'
+        elif evaluation.outcome == 'unlikely' and ReasoningGatingPolicy._failed_mandatory_requirements(evaluation):
+            invoke, reason = False, 'mandatory_failure'
+        elif confidence < low:
+            invoke, reason = False, 'below_band'
+        elif confidence >= high:
+            invoke, reason = False, 'above_band'
+        else:
+            invoke, reason = True, 'within_band'
+
+        decision = {
+            'invoke': invoke,
+            'reason': reason,
+            'policy_key': policy_key,
+            'band': [low, high],
+            'confidence': round(confidence, 4),
+            'rule_outcome': evaluation.outcome,
+        }
+        logger.debug(f"AI reasoning gating: {decision}")
+        return decision
+
+    @staticmethod
+    def build_template_summary(evaluation, decision: Dict[str, Any]) -> str:
+        """
+        Templated reasoning summary used when AI reasoning is skipped.
+
+        Args:
+            evaluation: RuleEngineEvaluationResult
+            decision: Result of decide()
+
+        Returns:
+            Summary text
+        """
+        summary = [
+            f"Rule engine outcome: {evaluation.outcome} "
+            f"(confidence {evaluation.confidence:.2f}); "
+            f"{evaluation.requirements_passed} of {evaluation.requirements_total} requirements passed."
+        ]
+
+        failed_mandatory = [code for code in ReasoningGatingPolicy._failed_mandatory_requirements(evaluation) if code]
+        if failed_mandatory:
+            summary.append(f"Mandatory requirements not met: {', '.join(failed_mandatory)}.")
+
+        missing_facts = sorted(set(evaluation.missing_facts))
+        if missing_facts:
+            summary.append(f"Missing information: {', '.join(missing_facts)}.")
+
+        if evaluation.warnings:
+            summary.append(" ".join(evaluation.warnings))
+
+        reasons = {
+            'all_facts_missing': "AI review was not run because the case is missing the facts every requirement needs.",
+            'mandatory_failure': "AI review was not run because a mandatory requirement clearly failed.",
+            'below_band': "AI review was not run because the rule engine result is clearly negative.",
+            'above_band': "AI review was not run because the rule engine result is clearly positive.",
+        }
+        if decision['reason'] in reasons:
+            summary.append(reasons[decision['reason']])
+
+        return " ".join(summary)
@@ -1,6 +1,10 @@
 import logging
-from typing import List, Dict, Optional
-from django.db.models import Q
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Dict, Optional, Set
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection, connections, transaction
+from django.db.models import F, Q
 from pgvector.django import CosineDistance
 from data_ingestion.models.document_chunk import DocumentChunk
 from data_ingestion.models.document_version import DocumentVersion
@@ -8,25 +12,86 @@ from data_ingestion.models.document_version import DocumentVersion
 logger = logging.getLogger('django')
 
 
+class ChunkSearchResult:
+    """Slim search hit: the chunk fields retrieval needs, projected in the search query."""
+
+    __slots__ = ('chunk_id', 'chunk_text', 'metadata', 'distance', 'source_url', 'document_version_id', 'rrf_score')
+
+    # Columns projected by search queries (annotations added per query)
+    FIELDS = ('id', 'chunk_text', 'metadata', 'document_version_id')
+
+    def __init__(
+        self,
+        chunk_id: str,
+        chunk_text: str,
+        metadata: Dict[str, Any],
+        distance: Optional[float],
+        source_url: Optional[str],
+        document_version_id: str,
+        rrf_score: Optional[float] = None
+    ):
+        self.chunk_id = chunk_id
+        self.chunk_text = chunk_text
+        self.metadata = metadata
+        self.distance = distance  # Cosine distance (0 = identical, 2 = opposite), if computed
+        self.source_url = source_url
+        self.document_version_id = document_version_id
+        self.rrf_score = rrf_score  # Set by hybrid search
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> 'ChunkSearchResult':
+        """Build a result from a projected values() row."""
+        distance = row.get('distance')
+        return cls(
+            chunk_id=str(row['id']),
+            chunk_text=row['chunk_text'],
+            metadata=row['metadata'] or {},
+            distance=float(distance) if distance is not None else None,
+            source_url=row.get('source_url'),
+            document_version_id=str(row['document_version_id'])
+        )
+
+    def __repr__(self) -> str:
+        return f"ChunkSearchResult(chunk_id={self.chunk_id!r}, distance={self.distance!r})"
+
+
 class VectorDBService:
     """
     Service for vector similarity search using pgvector.
     Handles storing and querying document chunks with embeddings.
     """
 
+    # Rows per INSERT when storing chunks (each row carries a 1536-dim vector)
+    STORE_BATCH_SIZE = 200
+    # Metadata filter keys backed by DocumentChunk columns
+    COLUMN_FILTERS = ('jurisdiction', 'visa_code', 'document_version_id')
+    # hnsw.ef_search values tried in turn until `limit` results pass the threshold
+    EF_SEARCH_STEPS = (40, 100, 200, 400)
+    # Reciprocal-rank fusion constant (score = sum of 1 / (RRF_K + rank))
+    RRF_K = 60
+    # Candidates fetched per retrieval leg, as a multiple of the final limit
+    HYBRID_CANDIDATE_FACTOR = 4
+    # Full-text search configuration (matches DocumentChunk.search_vector)
+    SEARCH_CONFIG = 'english'
+
     @staticmethod
     def store_chunks(
         document_version: DocumentVersion,
         chunks: List[Dict],
-        embeddings: List[List[float]]
+        embeddings: List[List[float]],
+        batch_size: Optional[int] = None
     ) -> List[DocumentChunk]:
         """
         Store document chunks with embeddings.
         
+        Rows are written with bulk_create in batches of batch_size, so storing
+        a document takes one INSERT per batch instead of one per chunk.
+        
         Args:
             document_version: DocumentVersion instance
             chunks: List of dicts with 'text' and 'metadata'
             embeddings: List of embedding vectors (1536 dims for ada-002)
+            batch_size: Rows per INSERT (default: STORE_BATCH_SIZE)
             
         Returns:
             List of created DocumentChunk objects
@@ -44,14 +109,22 @@ class VectorDBService:
                     )
                     continue
                 
-                chunk = DocumentChunk.objects.create(
+                metadata = chunk_data.get('metadata', {})
+                chunk_objects.append(DocumentChunk(
                     document_version=document_version,
                     chunk_text=chunk_data.get('text', ''),
-                    chunk_index=chunk_data.get('metadata', {}).get('chunk_index', i),
+                    chunk_index=metadata.get('chunk_index', i),
                     embedding=embedding,
-                    metadata=chunk_data.get('metadata', {})
+                    jurisdiction=metadata.get('jurisdiction'),
+                    visa_code=metadata.get('visa_code'),
+                    metadata=metadata
+                ))
+            
+            with transaction.atomic():
+                chunk_objects = DocumentChunk.objects.bulk_create(
+                    chunk_objects,
+                    batch_size=batch_size or VectorDBService.STORE_BATCH_SIZE
                 )
-                chunk_objects.append(chunk)
             
             logger.info(
                 f"Stored {len(chunk_objects)} chunks for document version {document_version.id}"
@@ -69,19 +142,24 @@ class VectorDBService:
         filters: Optional[Dict] = None,
         similarity_threshold: float = 0.7,
         document_version_id: Optional[str] = None
-    ) -> List[DocumentChunk]:
+    ) -> List[ChunkSearchResult]:
         """
         Search for similar chunks using cosine similarity.
         
+        Results are projected to ChunkSearchResult in the search query itself
+        (including the source URL), so no model instances are built and no
+        further queries are needed to read them.
+        
         Args:
             query_embedding: Query vector (1536 dims)
             limit: Maximum number of results
-            filters: Optional metadata filters (e.g., {'visa_code': 'SKILLED_WORKER'})
+            filters: Optional filters (e.g., {'visa_code': 'SKILLED_WORKER'}); jurisdiction,
+                visa_code and document_version_id use indexed columns, other keys metadata
             similarity_threshold: Minimum similarity score (0-1, where 1 is identical)
             document_version_id: Optional filter by specific document version
             
         Returns:
-            List of DocumentChunk objects ordered by similarity (most similar first)
+            List of ChunkSearchResult ordered by similarity (most similar first)
         """
         if not query_embedding:
             return []
@@ -91,25 +169,12 @@ class VectorDBService:
             return []
         
         try:
-            # Start with base query
-            queryset = DocumentChunk.objects.filter(
-                embedding__isnull=False
-            )
-            
-            # Filter by document version if specified
-            if document_version_id:
-                queryset = queryset.filter(document_version_id=document_version_id)
-            
-            # Apply metadata filters
-            if filters:
-                for key, value in filters.items():
-                    # Use JSON field contains lookup
-                    queryset = queryset.filter(metadata__contains={key: value})
+            candidates = VectorDBService._filtered_queryset(filters, document_version_id)
             
             # Vector similarity search using cosine distance
             # Lower distance = higher similarity
             # Cosine distance ranges from 0 (identical) to 2 (opposite)
-            queryset = queryset.annotate(
+            queryset = candidates.annotate(
                 distance=CosineDistance('embedding', query_embedding)
             ).order_by('distance')
             
@@ -118,10 +183,12 @@ class VectorDBService:
             # Similarity = 1 - (distance / 2)
             # So distance <= 0.6 means similarity >= 0.7
             max_distance = 2 * (1 - similarity_threshold)
-            queryset = queryset.filter(distance__lte=max_distance)
+            queryset = VectorDBService._project(queryset.filter(distance__lte=max_distance), 'distance')
             
-            # Limit results
-            results = list(queryset[:limit])
+            results = [
+                ChunkSearchResult.from_row(row)
+                for row in VectorDBService._search_with_widening(queryset, limit, candidates)
+            ]
             
             logger.info(
                 f"Found {len(results)} similar chunks "
@@ -133,6 +200,245 @@ class VectorDBService:
             logger.error(f"Error searching similar chunks: {e}", exc_info=True)
             return []
 
+    @staticmethod
+    def _filtered_queryset(filters: Optional[Dict] = None, document_version_id: Optional[str] = None):
+        """Chunks with embeddings matching the search filters."""
+        # Start with base query
+        queryset = DocumentChunk.objects.filter(
+            embedding__isnull=False
+        )
+        
+        # Filter by document version if specified
+        if document_version_id:
+            queryset = queryset.filter(document_version_id=document_version_id)
+        
+        # Apply filters: promoted keys hit indexed columns (and let the
+        # planner pick the partial HNSW index of the jurisdiction), any
+        # other key falls back to a JSON contains lookup on metadata
+        if filters:
+            for key, value in filters.items():
+                if key in VectorDBService.COLUMN_FILTERS:
+                    queryset = queryset.filter(**{key: value})
+                else:
+                    queryset = queryset.filter(metadata__contains={key: value})
+        
+        return queryset
+
+    @staticmethod
+    def _project(queryset, *annotations: str):
+        """Project a search queryset to the ChunkSearchResult columns (one query, no instances)."""
+        return queryset.values(
+            *ChunkSearchResult.FIELDS,
+            *annotations,
+            source_url=F('document_version__source_document__source_url')
+        )
+
+    @staticmethod
+    def _search_with_widening(queryset, limit: int, candidates=None) -> List:
+        """
+        Run an ordered, filtered vector query, widening the HNSW search as needed.
+        
+        The HNSW index scan only returns ef_search candidates, and the filters
+        and distance threshold are applied to those candidates, so selective
+        filters can leave fewer than `limit` results. The query is retried with
+        increasing hnsw.ef_search (SET LOCAL, scoped to the transaction) until
+        enough results pass, a wider search finds no more rows than the
+        previous one, ef_search covers every candidate row, or the largest
+        step has been tried.
+        
+        Args:
+            queryset: Filtered queryset ordered by distance
+            limit: Maximum number of results
+            candidates: Optional queryset of the rows matching the filters
+                (without the distance threshold), counted once a search comes
+                up short
+            
+        Returns:
+            List of results (at most limit)
+        """
+        if connection.vendor != 'postgresql':
+            return list(queryset[:limit])
+        
+        # ef_search must be at least limit to be able to return limit rows
+        ef_search_steps = sorted({max(step, limit) for step in VectorDBService.EF_SEARCH_STEPS})
+        
+        results = None
+        candidate_count = None
+        with transaction.atomic():
+            for ef_search in ef_search_steps:
+                with connection.cursor() as cursor:
+                    # Equivalent to SET LOCAL, but accepts a bound parameter
+                    cursor.execute("SELECT set_config('hnsw.ef_search', %s, true)", [str(ef_search)])
+                previous_count = None if results is None else len(results)
+                results = list(queryset[:limit])
+                if len(results) >= limit:
+                    break
+                if previous_count is not None and len(results) <= previous_count:
+                    # Widening did not surface more rows passing the filters
+                    break
+                if candidates is not None and candidate_count is None:
+                    # Bounded count: only whether the largest step would cover all rows matters
+                    candidate_count = candidates.order_by().values('pk')[:ef_search_steps[-1] + 1].count()
+                if candidate_count is not None and ef_search >= candidate_count:
+                    break
+                logger.debug(
+                    f"Vector search returned {len(results)}/{limit} results "
+                    f"with hnsw.ef_search={ef_search}, widening"
+                )
+        return results
+
+    @staticmethod
+    def search_lexical(
+        query_text: str,
+        limit: int = 10,
+        filters: Optional[Dict] = None,
+        document_version_id: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[ChunkSearchResult]:
+        """
+        Search chunks by full-text match on DocumentChunk.search_vector.
+        
+        Any query term may match (terms are OR-ed); results are ranked by ts_rank.
+        
+        Args:
+            query_text: Free-text query
+            limit: Maximum number of results
+            filters: Optional filters, as for search_similar
+            document_version_id: Optional filter by specific document version
+            query_embedding: Optional query vector; when given, results are
+                annotated with their cosine distance
+            
+        Returns:
+            List of ChunkSearchResult ordered by rank (best first)
+        """
+        terms = re.findall(r'\w+', query_text or '')
+        if not terms:
+            return []
+        
+        try:
+            # websearch_to_tsquery with "or" between terms: safe for any input
+            search_query = SearchQuery(
+                ' or '.join(terms),
+                config=VectorDBService.SEARCH_CONFIG,
+                search_type='websearch'
+            )
+            queryset = VectorDBService._filtered_queryset(filters, document_version_id).filter(
+                search_vector=search_query
+            ).annotate(
+                rank=SearchRank(F('search_vector'), search_query)
+            )
+            annotations = ('rank',)
+            if query_embedding:
+                queryset = queryset.annotate(distance=CosineDistance('embedding', query_embedding))
+                annotations += ('distance',)
+            
+            queryset = VectorDBService._project(queryset.order_by('-rank'), *annotations)
+            results = [ChunkSearchResult.from_row(row) for row in queryset[:limit]]
+            logger.info(f"Found {len(results)} chunks by full-text search (limit: {limit})")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error searching chunks by full text: {e}", exc_info=True)
+            return []
+
+    @staticmethod
+    def _in_own_connection(function, *args, **kwargs):
+        """Run a query function in a worker thread and release its DB connection."""
+        try:
+            return function(*args, **kwargs)
+        finally:
+            connections.close_all()
+
+    @staticmethod
+    def fuse_rankings(rankings: List[List[ChunkSearchResult]], limit: int) -> List[ChunkSearchResult]:
+        """
+        Combine ranked result lists with reciprocal-rank fusion.
+        
+        Each result gets its rrf_score set; a chunk found by several legs keeps
+        the first result (taking the distance from a later one if it has none).
+        
+        Args:
+            rankings: Ranked result lists (best first)
+            limit: Maximum number of results
+            
+        Returns:
+            Fused list ordered by rrf_score (best first)
+        """
+        scores: Dict[str, float] = {}
+        results: Dict[str, ChunkSearchResult] = {}
+        for ranking in rankings:
+            for rank, result in enumerate(ranking, start=1):
+                chunk_id = result.chunk_id
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (VectorDBService.RRF_K + rank)
+                if chunk_id not in results:
+                    results[chunk_id] = result
+                elif results[chunk_id].distance is None:
+                    results[chunk_id].distance = result.distance
+        
+        fused = sorted(results.values(), key=lambda result: scores[result.chunk_id], reverse=True)[:limit]
+        for result in fused:
+            result.rrf_score = scores[result.chunk_id]
+        return fused
+
+    @staticmethod
+    def search_hybrid(
+        query_text: str,
+        query_embedding: List[float],
+        limit: int = 10,
+        filters: Optional[Dict] = None,
+        similarity_threshold: float = 0.7,
+        document_version_id: Optional[str] = None
+    ) -> List[ChunkSearchResult]:
+        """
+        Hybrid retrieval: vector similarity and full-text search fused with RRF.
+        
+        Both legs fetch limit * HYBRID_CANDIDATE_FACTOR candidates and run
+        concurrently, each on its own database connection. The similarity
+        threshold applies to the vector leg only, so exact-term matches (e.g.
+        "Appendix Skilled Occupations", fee amounts) can still be returned.
+        
+        Args:
+            query_text: Free-text query for the lexical leg
+            query_embedding: Query vector (1536 dims) for the vector leg
+            limit: Maximum number of results
+            filters: Optional filters, as for search_similar
+            similarity_threshold: Minimum similarity for vector leg results
+            document_version_id: Optional filter by specific document version
+            
+        Returns:
+            List of ChunkSearchResult ordered by fused rank (best first)
+        """
+        candidate_limit = limit * VectorDBService.HYBRID_CANDIDATE_FACTOR
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            vector_future = executor.submit(
+                VectorDBService._in_own_connection,
+                VectorDBService.search_similar,
+                query_embedding=query_embedding,
+                limit=candidate_limit,
+                filters=filters,
+                similarity_threshold=similarity_threshold,
+                document_version_id=document_version_id
+            )
+            lexical_future = executor.submit(
+                VectorDBService._in_own_connection,
+                VectorDBService.search_lexical,
+                query_text=query_text,
+                limit=candidate_limit,
+                filters=filters,
+                document_version_id=document_version_id,
+                query_embedding=query_embedding
+            )
+            vector_results = vector_future.result()
+            lexical_results = lexical_future.result()
+        
+        results = VectorDBService.fuse_rankings([vector_results, lexical_results], limit)
+        logger.info(
+            f"Hybrid search: {len(vector_results)} vector and {len(lexical_results)} lexical "
+            f"candidates fused into {len(results)} results (limit: {limit})"
+        )
+        return results
+
     @staticmethod
     def get_chunks_by_document_version(
         document_version: DocumentVersion
@@ -152,6 +458,23 @@ class VectorDBService:
             ).order_by('chunk_index')
         )
 
+    @staticmethod
+    def get_chunk_indexes_by_document_version(document_version: DocumentVersion) -> Set[int]:
+        """
+        Get the chunk_index values stored for a document version.
+        
+        Args:
+            document_version: DocumentVersion instance
+            
+        Returns:
+            Set of stored chunk indexes
+        """
+        return set(
+            DocumentChunk.objects.filter(
+                document_version=document_version
+            ).values_list('chunk_index', flat=True)
+        )
+
     @staticmethod
     def delete_chunks_by_document_version(document_version: DocumentVersion) -> int:
         """
@@ -181,6 +504,9 @@ class VectorDBService:
         """
         Update chunks for a document version (delete old, create new).
         
+        Delete and insert run in one transaction, so searches never see the
+        document version without chunks and a failed insert keeps the old ones.
+        
         Args:
             document_version: DocumentVersion instance
             chunks: List of dicts with 'text' and 'metadata'
@@ -189,9 +515,10 @@ class VectorDBService:
         Returns:
             List of created DocumentChunk objects
         """
-        # Delete existing chunks
-        VectorDBService.delete_chunks_by_document_version(document_version)
-        
-        # Create new chunks
-        return VectorDBService.store_chunks(document_version, chunks, embeddings)
+        with transaction.atomic():
+            # Delete existing chunks
+            VectorDBService.delete_chunks_by_document_version(document_version)
+            
+            # Create new chunks
+            return VectorDBService.store_chunks(document_version, chunks, embeddings)
 
@@ -1,9 +1,10 @@
-from celery import shared_task
+from celery import chord, group, shared_task
 import logging
 from main_system.tasks_base import BaseTaskWithMeta
-from ai_decisions.services.eligibility_result_service import EligibilityResultService
+from ai_decisions.services.eligibility_pipeline_service import EligibilityPipelineService
+from immigration_cases.models.case import Case
 from immigration_cases.selectors.case_selector import CaseSelector
-from rules_knowledge.selectors.visa_type_selector import VisaTypeSelector
+from rules_knowledge.models.visa_type import VisaType
 
 logger = logging.getLogger('django')
 
@@ -13,59 +14,109 @@ def run_eligibility_check_task(self, case_id: str, visa_type_id: str = None):
     """
     Celery task to run eligibility check for a case.
     This runs the rule engine + AI reasoning asynchronously.
-    
+
+    One evaluate_visa_type_eligibility_task per visa type runs in parallel
+    (a chord); persist_eligibility_results_task writes all results once
+    every visa type has been evaluated.
+
     Args:
         case_id: UUID of the case
-        visa_type_id: Optional visa type ID to check (if None, checks all active visa types)
-        
+        visa_type_id: Optional visa type ID to check (if None, checks all active
+            visa types of the case's jurisdiction)
+
     Returns:
-        Dict with eligibility results
+        Dict with the dispatched visa types and the chord result ID
     """
     try:
         logger.info(f"Starting eligibility check for case: {case_id}, visa_type: {visa_type_id}")
-        
-        case = CaseSelector.get_by_id(case_id)
-        if not case:
+
+        try:
+            case = CaseSelector.get_by_id(case_id)
+        except Case.DoesNotExist:
             logger.error(f"Case {case_id} not found")
             return {'success': False, 'error': 'Case not found'}
-        
+
         # If visa_type_id provided, check only that visa type
-        if visa_type_id:
-            visa_type = VisaTypeSelector.get_by_id(visa_type_id)
-            if not visa_type:
-                logger.error(f"Visa type {visa_type_id} not found")
-                return {'success': False, 'error': 'Visa type not found'}
-            
-            # Run eligibility check for this visa type
-            # This is a placeholder - implement actual rule engine + AI reasoning
-            # For now, we'll create a basic eligibility result
-            result = EligibilityResultService.create_eligibility_result(
-                case_id=case_id,
-                visa_type_id=visa_type_id,
-                rule_version_id=None,  # Get active rule version
-                outcome='requires_review',  # Placeholder
-                confidence=0.5,  # Placeholder
-                reasoning_summary='Eligibility check completed. Review required.',
-                missing_facts=None
+        if visa_type_id and not VisaType.objects.filter(id=visa_type_id).exists():
+            logger.error(f"Visa type {visa_type_id} not found")
+            return {'success': False, 'error': 'Visa type not found'}
+
+        visa_type_ids = EligibilityPipelineService.get_visa_type_ids(case, visa_type_id)
+        if visa_type_id and not visa_type_ids:
+            logger.error(
+                f"Visa type {visa_type_id} is not active in jurisdiction {case.jurisdiction} of case {case_id}"
             )
-            
-            return {
-                'success': True,
-                'case_id': case_id,
-                'visa_type_id': visa_type_id,
-                'result_id': str(result.id) if result else None
-            }
-        else:
-            # Check all active visa types for the jurisdiction
-            # This is a placeholder - implement actual logic
-            logger.info(f"Checking all visa types for case {case_id}")
+            return {'success': False, 'error': 'Visa type is not active in the case jurisdiction'}
+        if not visa_type_ids:
+            logger.warning(f"No active visa types in jurisdiction {case.jurisdiction} for case {case_id}")
             return {
                 'success': True,
                 'case_id': case_id,
-                'message': 'Eligibility check initiated for all visa types'
+                'visa_type_ids': [],
+                'message': f'No active visa types for jurisdiction {case.jurisdiction}'
             }
-        
+
+        chord_result = chord(
+            group(
+                evaluate_visa_type_eligibility_task.s(case_id, type_id)
+                for type_id in visa_type_ids
+            )
+        )(persist_eligibility_results_task.s(case_id))
+
+        logger.info(f"Dispatched eligibility check for case {case_id} over {len(visa_type_ids)} visa types")
+        return {
+            'success': True,
+            'case_id': case_id,
+            'visa_type_ids': visa_type_ids,
+            'chord_id': chord_result.id
+        }
+
     except Exception as e:
         logger.error(f"Error running eligibility check for case {case_id}: {e}")
         raise self.retry(exc=e, countdown=60, max_retries=3)
 
+
+@shared_task(bind=True, base=BaseTaskWithMeta)
+def evaluate_visa_type_eligibility_task(self, case_id: str, visa_type_id: str):
+    """
+    Chord header task: rule engine + (borderline only) AI reasoning for one visa type.
+
+    Never raises, so one failing visa type does not stop the chord callback;
+    failures are returned in the result's 'error' field.
+
+    Args:
+        case_id: UUID of the case
+        visa_type_id: UUID of the visa type
+
+    Returns:
+        EligibilityPipelineService.evaluate_visa_type result dict
+    """
+    try:
+        return EligibilityPipelineService.evaluate_visa_type(case_id, visa_type_id)
+    except Exception as e:
+        logger.error(f"Error evaluating visa type {visa_type_id} for case {case_id}: {e}", exc_info=True)
+        return {'case_id': case_id, 'visa_type_id': visa_type_id, 'error': str(e)}
+
+
+@shared_task(bind=True, base=BaseTaskWithMeta)
+def persist_eligibility_results_task(self, results: list, case_id: str):
+    """
+    Chord callback: write the eligibility results of all visa types in bulk.
+
+    Args:
+        results: Results of the evaluate_visa_type_eligibility_task header tasks
+        case_id: UUID of the case
+
+    Returns:
+        Dict with created result IDs and skipped visa types
+    """
+    try:
+        summary = EligibilityPipelineService.persist_results(results)
+        logger.info(
+            f"Eligibility check for case {case_id} complete: {summary['results_created']} results, "
+            f"{summary['ai_reasoning_runs']} with AI reasoning, {len(summary['skipped'])} skipped"
+        )
+        return {'success': True, 'case_id': case_id, **summary}
+    except Exception as e:
+        logger.error(f"Error persisting eligibility results for case {case_id}: {e}")
+        raise self.retry(exc=e, countdown=60, max_retries=3)
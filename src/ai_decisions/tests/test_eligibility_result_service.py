@@ -0,0 +1,111 @@
+import uuid
+from types import SimpleNamespace
+from unittest import mock
+
+from ai_decisions.models.eligibility_result import EligibilityResult
+from ai_decisions.services.eligibility_result_service import EligibilityResultService
+from immigration_cases.models.case import Case
+from main_system.tests_base import NoDatabaseTestCase
+from rules_knowledge.models.visa_type import VisaType
+
+SERVICE = 'ai_decisions.services.eligibility_result_service'
+
+
+def make_evaluation(**overrides):
+    evaluation = SimpleNamespace(
+        outcome='likely',
+        confidence=0.9,
+        requirements_passed=3,
+        requirements_total=3,
+        requirements_failed=0,
+        requirements_with_missing_facts=0,
+        requirements_with_errors=0,
+        missing_facts=[],
+        warnings=[],
+        rule_version_id=uuid.uuid4(),
+    )
+    for key, value in overrides.items():
+        setattr(evaluation, key, value)
+    return evaluation
+
+
+class MapRuleEngineOutcomeTests(NoDatabaseTestCase):
+
+    def test_maps_rule_engine_outcomes(self):
+        self.assertEqual(EligibilityResultService.map_rule_engine_outcome(make_evaluation()), 'eligible')
+        self.assertEqual(
+            EligibilityResultService.map_rule_engine_outcome(make_evaluation(outcome='possible')),
+            'requires_review'
+        )
+        self.assertEqual(
+            EligibilityResultService.map_rule_engine_outcome(
+                make_evaluation(outcome='unlikely', requirements_failed=2)
+            ),
+            'not_eligible'
+        )
+
+    def test_only_missing_facts_maps_to_missing_facts(self):
+        evaluation = make_evaluation(
+            outcome='unlikely', requirements_passed=0, requirements_with_missing_facts=3
+        )
+        self.assertEqual(EligibilityResultService.map_rule_engine_outcome(evaluation), 'missing_facts')
+
+    def test_no_requirements_requires_review(self):
+        evaluation = make_evaluation(outcome='unlikely', requirements_passed=0, requirements_total=0)
+        self.assertEqual(EligibilityResultService.map_rule_engine_outcome(evaluation), 'requires_review')
+
+
+class BulkCreateFromRuleEngineResultsTests(NoDatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.case = Case(id=uuid.uuid4())
+        self.visa_type = VisaType(id=uuid.uuid4(), name='Skilled Worker')
+        mock.patch(f'{SERVICE}.CaseSelector.get_by_ids', return_value=[self.case]).start()
+        mock.patch(f'{SERVICE}.VisaTypeSelector.get_by_ids', return_value=[self.visa_type]).start()
+        mock.patch(
+            f'{SERVICE}.EligibilityResultRepository.bulk_create_eligibility_results',
+            side_effect=lambda results, batch_size: results
+        ).start()
+        self.post_save = mock.patch(f'{SERVICE}.post_save').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_sends_post_save_for_each_created_row(self):
+        evaluations = {
+            (str(self.case.id), str(self.visa_type.id)): make_evaluation(),
+            (str(self.case.id), str(uuid.uuid4())): None,
+        }
+
+        created = EligibilityResultService.bulk_create_from_rule_engine_results(evaluations)
+
+        self.assertEqual(len(created), 1)
+        self.post_save.send.assert_called_once()
+        kwargs = self.post_save.send.call_args.kwargs
+        self.assertIs(kwargs['sender'], EligibilityResult)
+        self.assertTrue(kwargs['created'])
+        self.assertIs(kwargs['instance'], created[0])
+        self.assertIs(created[0].case, self.case)
+        self.assertIs(created[0].visa_type, self.visa_type)
+        self.assertEqual(created[0].outcome, 'eligible')
+
+    def test_failing_handler_does_not_stop_other_rows(self):
+        other_visa_type = VisaType(id=uuid.uuid4(), name='Student')
+        evaluations = {
+            (str(self.case.id), str(self.visa_type.id)): make_evaluation(),
+            (str(self.case.id), str(other_visa_type.id)): make_evaluation(outcome='possible', confidence=0.5),
+        }
+        self.post_save.send.side_effect = [RuntimeError('handler failed'), None]
+
+        with mock.patch(
+            f'{SERVICE}.VisaTypeSelector.get_by_ids', return_value=[self.visa_type, other_visa_type]
+        ):
+            created = EligibilityResultService.bulk_create_from_rule_engine_results(evaluations)
+
+        self.assertEqual(len(created), 2)
+        self.assertEqual(self.post_save.send.call_count, 2)
+
+    def test_no_rows_sends_nothing(self):
+        created = EligibilityResultService.bulk_create_from_rule_engine_results({('a', 'b'): None})
+
+        self.assertEqual(created, [])
+        self.post_save.send.assert_not_called()
@@ -0,0 +1,125 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from ai_decisions.services.llm_gateway import LLMGateway
+from main_system.tests_base import NoDatabaseTestCase
+
+MODEL = 'gpt-4'
+MESSAGES = [{'role': 'user', 'content': 'Is the applicant eligible?'}]
+WAITERS = 4
+TIMEOUT = 5
+
+
+def provider_response(content='Likely eligible.'):
+    return {
+        'content': content,
+        'model': MODEL,
+        'tokens_used': 30,
+        'prompt_tokens': 20,
+        'completion_tokens': 10,
+        'latency_ms': 12.0,
+    }
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class LLMGatewayCoalescingTests(NoDatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        LLMGateway.clear_local_cache()
+        self.addCleanup(LLMGateway.clear_local_cache)
+        self.metrics = LLMGateway.get_metrics()
+        self.release = threading.Event()
+        self.request = mock.patch.object(LLMGateway, '_request').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def metric(self, name):
+        return LLMGateway.get_metrics()[name] - self.metrics[name]
+
+    def wait_for_waiters(self, count):
+        """Block the provider call until `count` identical requests are waiting on it."""
+        for _ in range(TIMEOUT * 100):
+            if self.metric('coalesced') >= count:
+                return
+            self.release.wait(0.01)
+        raise AssertionError(f"{count} requests were not coalesced")
+
+    def complete_concurrently(self, count, **kwargs):
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(LLMGateway.complete, MESSAGES, MODEL, **kwargs) for _ in range(count)]
+            return [future.exception(timeout=TIMEOUT) or future.result() for future in futures]
+
+    def test_identical_concurrent_requests_share_one_provider_call(self):
+        def request(model, messages, temperature, max_tokens):
+            self.wait_for_waiters(WAITERS)
+            return provider_response()
+        self.request.side_effect = request
+
+        results = self.complete_concurrently(WAITERS + 1)
+
+        self.request.assert_called_once()
+        self.assertEqual({result['content'] for result in results}, {'Likely eligible.'})
+        self.assertEqual(sorted(result['cached'] for result in results), [False] + [True] * WAITERS)
+        self.assertEqual(self.metric('coalesced'), WAITERS)
+        self.assertEqual(LLMGateway._in_flight, {})
+
+    def test_provider_error_is_raised_to_every_waiter_and_not_cached(self):
+        def request(model, messages, temperature, max_tokens):
+            self.wait_for_waiters(WAITERS)
+            raise RuntimeError('rate limited')
+        self.request.side_effect = request
+
+        results = self.complete_concurrently(WAITERS + 1)
+
+        self.request.assert_called_once()
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(LLMGateway._in_flight, {})
+
+        self.request.side_effect = None
+        self.request.return_value = provider_response()
+        self.assertFalse(LLMGateway.complete(MESSAGES, MODEL)['cached'])
+        self.assertEqual(self.request.call_count, 2)
+
+    def test_different_requests_are_not_coalesced(self):
+        both_started = threading.Barrier(2, timeout=TIMEOUT)
+
+        def request(model, messages, temperature, max_tokens):
+            both_started.wait()
+            return provider_response(messages[0]['content'])
+        self.request.side_effect = request
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(LLMGateway.complete, MESSAGES, MODEL)
+            second = executor.submit(LLMGateway.complete, [{'role': 'user', 'content': 'Other case'}], MODEL)
+            results = [first.result(timeout=TIMEOUT), second.result(timeout=TIMEOUT)]
+
+        self.assertEqual(self.request.call_count, 2)
+        self.assertEqual([result['content'] for result in results], ['Is the applicant eligible?', 'Other case'])
+        self.assertEqual(self.metric('coalesced'), 0)
+
+    def test_later_requests_are_served_from_the_local_then_shared_cache(self):
+        self.request.return_value = provider_response()
+
+        self.assertFalse(LLMGateway.complete(MESSAGES, MODEL)['cached'])
+        self.assertTrue(LLMGateway.complete(MESSAGES, MODEL)['cached'])
+        LLMGateway.clear_local_cache()
+        self.assertTrue(LLMGateway.complete(MESSAGES, MODEL)['cached'])
+
+        self.request.assert_called_once()
+        self.assertEqual(self.metric('local_cache_hits'), 1)
+        self.assertEqual(self.metric('shared_cache_hits'), 1)
+
+    def test_uncached_requests_always_call_the_provider(self):
+        self.request.return_value = provider_response()
+
+        LLMGateway.complete(MESSAGES, MODEL, use_cache=False)
+        result = LLMGateway.complete(MESSAGES, MODEL, use_cache=False)
+
+        self.assertFalse(result['cached'])
+        self.assertEqual(self.request.call_count, 2)
+        self.assertIsNone(cache.get(LLMGateway.cache_key(MODEL, 0.0, MESSAGES, None)))
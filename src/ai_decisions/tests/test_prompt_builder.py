@@ -0,0 +1,141 @@
+from ai_decisions.services.embedding_service import EmbeddingService
+from ai_decisions.services.prompt_builder import PromptBuilder
+from main_system.tests_base import NoDatabaseTestCase
+
+CASE_FACTS = {'salary': 40000, 'nationality': 'NG', 'job_title': 'Engineer'}
+
+RULE_RESULTS = {
+    'outcome': 'possible',
+    'confidence': 0.72,
+    'requirements': [
+        {'requirement_code': 'MIN_SALARY', 'passed': True, 'is_mandatory': True},
+        {'requirement_code': 'ENGLISH', 'passed': False, 'missing_facts': ['english_level'], 'is_mandatory': True},
+        {'requirement_code': 'SPONSOR', 'passed': False, 'is_mandatory': False},
+    ],
+}
+
+DOCUMENT = ' '.join(
+    f"Sentence {index:03d} explains part of the Skilled Worker visa guidance." for index in range(60)
+)
+
+
+def make_chunks(count, length=800, prefix='Chunk'):
+    return [
+        {'text': f"{prefix} {index}: " + 'x' * length, 'source': f"https://www.gov.uk/doc-{index}",
+         'rrf_score': 1.0 / (index + 1)}
+        for index in range(count)
+    ]
+
+
+class PromptBuilderBudgetTests(NoDatabaseTestCase):
+
+    def test_prompt_stays_within_budget_and_keeps_retrieval_order(self):
+        chunks = make_chunks(20)
+
+        result = PromptBuilder.build(CASE_FACTS, RULE_RESULTS, chunks, token_budget=1500)
+
+        self.assertLessEqual(result['token_count'], 1500)
+        self.assertEqual(result['token_count'], PromptBuilder.count_tokens(result['prompt']))
+        included = result['context_chunks']
+        self.assertEqual(included, chunks[:len(included)])
+        self.assertGreater(result['chunks_dropped'], 0)
+        self.assertEqual(result['chunks_dropped'], len(chunks) - len(included))
+        self.assertNotIn(chunks[len(included)]['source'], result['prompt'])
+
+    def test_fixed_sections_are_always_included(self):
+        result = PromptBuilder.build(CASE_FACTS, RULE_RESULTS, make_chunks(3), token_budget=100)
+
+        prompt = result['prompt']
+        self.assertTrue(prompt.startswith(PromptBuilder.HEADER))
+        self.assertTrue(prompt.endswith(PromptBuilder.INSTRUCTION))
+        self.assertIn('- salary: 40000', prompt)
+        self.assertNotIn('## Relevant Context:', prompt)
+        self.assertEqual(result['context_chunks'], [])
+        self.assertEqual(result['chunks_dropped'], 3)
+
+    def test_last_fitting_chunk_is_truncated(self):
+        chunks = make_chunks(1, length=20000)
+
+        result = PromptBuilder.build(CASE_FACTS, None, chunks, token_budget=2000)
+
+        self.assertEqual(result['chunks_truncated'], 1)
+        self.assertEqual(result['context_chunks'], chunks)
+        self.assertLessEqual(result['token_count'], 2000)
+        self.assertIn('x...\n', result['prompt'])
+
+    def test_chunk_with_too_little_room_is_dropped_not_truncated(self):
+        base = PromptBuilder.build(CASE_FACTS, None, None)['token_count']
+        budget = base + PromptBuilder.MIN_CHUNK_TOKENS  # less than a heading plus MIN_CHUNK_TOKENS
+
+        result = PromptBuilder.build(CASE_FACTS, None, make_chunks(1), token_budget=budget)
+
+        self.assertEqual(result['chunks_truncated'], 0)
+        self.assertEqual(result['chunks_dropped'], 1)
+
+    def test_long_fact_values_are_truncated(self):
+        result = PromptBuilder.build({'notes': 'n' * 1000}, None, None)
+
+        line = next(line for line in result['prompt'].splitlines() if line.startswith('- notes: '))
+        self.assertEqual(len(line), len('- notes: ') + PromptBuilder.MAX_FACT_VALUE_CHARS)
+        self.assertTrue(line.endswith('...'))
+
+
+class PromptBuilderOverlapTests(NoDatabaseTestCase):
+
+    def test_overlapping_document_chunks_are_included_once(self):
+        chunks = EmbeddingService.chunk_document(DOCUMENT, chunk_size=600, overlap=EmbeddingService.CHUNK_OVERLAP)
+        self.assertGreater(len(chunks), 3)
+
+        result = PromptBuilder.build({}, None, chunks, token_budget=100000)
+
+        prompt = result['prompt']
+        for index in range(60):
+            with self.subTest(sentence=index):
+                self.assertEqual(prompt.count(f"Sentence {index:03d} explains"), 1)
+
+    def test_overlap_is_cut_at_either_end(self):
+        shared_start = 'shared opening text of the previous chunk'
+        shared_end = 'shared closing text of the previous chunk'
+        previous = f"{shared_end} middle of the document {shared_start}"
+
+        self.assertEqual(
+            PromptBuilder._strip_overlap(f"{shared_start} new text {shared_end}", [previous]),
+            'new text'
+        )
+
+    def test_contained_chunk_is_skipped(self):
+        chunks = [
+            {'text': 'The applicant must earn at least 38,700 pounds a year.'},
+            {'text': 'must earn at least 38,700 pounds'},
+            {'text': 'Processing takes 3 weeks.'},
+        ]
+
+        result = PromptBuilder.build({}, None, chunks, token_budget=100000)
+
+        self.assertEqual(result['context_chunks'], [chunks[0], chunks[2]])
+        self.assertEqual(result['chunks_dropped'], 1)
+        self.assertIn('### Context 2:', result['prompt'])
+
+    def test_short_coincidental_overlap_is_kept(self):
+        text = 'a year. Processing takes 3 weeks.'
+
+        self.assertEqual(PromptBuilder._strip_overlap(text, ['The fee is 719 pounds a year.']), text)
+
+
+class RequirementTableTests(NoDatabaseTestCase):
+
+    def test_passed_requirements_are_listed_last(self):
+        self.assertEqual(PromptBuilder.requirement_table(RULE_RESULTS), [
+            'code|status|mandatory|missing_facts',
+            'ENGLISH|missing_fact|Y|english_level',
+            'SPONSOR|fail|N|',
+            'MIN_SALARY|pass|Y|',
+        ])
+
+    def test_reads_rule_engine_requirement_details(self):
+        rule_results = {'requirement_details': [{'description': 'd' * 200, 'passed': True}]}
+
+        table = PromptBuilder.requirement_table(rule_results)
+
+        self.assertEqual(table[1], 'd' * (PromptBuilder.MAX_DESCRIPTION_CHARS - 3) + '...|pass|Y|')
+        self.assertEqual(PromptBuilder.requirement_table({}), [])
@@ -0,0 +1,117 @@
+from types import SimpleNamespace
+
+from django.test import override_settings
+
+from ai_decisions.services.reasoning_gating_policy import ReasoningGatingPolicy
+from main_system.tests_base import NoDatabaseTestCase
+
+BANDS = {
+    'default': (0.4, 0.9),
+    'UK': (0.5, 0.8),
+    'UK:SKILLED_WORKER': (0.6, 0.85),
+}
+
+
+def make_evaluation(confidence, outcome='possible', requirement_details=None, **overrides):
+    requirement_details = requirement_details if requirement_details is not None else [
+        {'requirement_code': 'MIN_SALARY', 'passed': True, 'is_mandatory': True},
+        {'requirement_code': 'ENGLISH', 'passed': False, 'is_mandatory': False},
+    ]
+    evaluation = SimpleNamespace(
+        outcome=outcome,
+        confidence=confidence,
+        requirement_details=requirement_details,
+        requirements_total=len(requirement_details),
+        requirements_passed=sum(1 for detail in requirement_details if detail.get('passed')),
+        requirements_with_missing_facts=sum(1 for detail in requirement_details if detail.get('missing_facts')),
+        missing_facts=[fact for detail in requirement_details for fact in detail.get('missing_facts', [])],
+        warnings=[],
+    )
+    for key, value in overrides.items():
+        setattr(evaluation, key, value)
+    return evaluation
+
+
+@override_settings(AI_REASONING_CONFIDENCE_BANDS=BANDS)
+class ReasoningGatingPolicyTests(NoDatabaseTestCase):
+
+    def test_band_lookup_order(self):
+        self.assertEqual(
+            ReasoningGatingPolicy.get_band('UK', 'SKILLED_WORKER'), ('UK:SKILLED_WORKER', (0.6, 0.85))
+        )
+        self.assertEqual(ReasoningGatingPolicy.get_band('UK', 'STUDENT'), ('UK', (0.5, 0.8)))
+        self.assertEqual(ReasoningGatingPolicy.get_band('CA', 'EXPRESS_ENTRY'), ('default', (0.4, 0.9)))
+        self.assertEqual(ReasoningGatingPolicy.get_band(None, 'SKILLED_WORKER'), ('default', (0.4, 0.9)))
+
+    @override_settings(AI_REASONING_CONFIDENCE_BANDS=None)
+    def test_falls_back_to_default_band_without_settings(self):
+        self.assertEqual(ReasoningGatingPolicy.get_band('UK', 'SKILLED_WORKER'), ('default', (0.5, 0.8)))
+
+    def test_confidence_bands_are_half_open(self):
+        expected = [
+            (0.59, False, 'below_band'),
+            (0.6, True, 'within_band'),
+            (0.7, True, 'within_band'),
+            (0.8499, True, 'within_band'),
+            (0.85, False, 'above_band'),
+            (1.0, False, 'above_band'),
+        ]
+        for confidence, invoke, reason in expected:
+            with self.subTest(confidence=confidence):
+                decision = ReasoningGatingPolicy.decide(make_evaluation(confidence), 'UK', 'SKILLED_WORKER')
+                self.assertEqual((decision['invoke'], decision['reason']), (invoke, reason))
+                self.assertEqual(decision['policy_key'], 'UK:SKILLED_WORKER')
+                self.assertEqual(decision['band'], [0.6, 0.85])
+
+    def test_same_confidence_is_gated_by_the_visa_type_band(self):
+        evaluation = make_evaluation(0.55)
+
+        self.assertFalse(ReasoningGatingPolicy.decide(evaluation, 'UK', 'SKILLED_WORKER')['invoke'])
+        self.assertTrue(ReasoningGatingPolicy.decide(evaluation, 'UK', 'STUDENT')['invoke'])
+        self.assertTrue(ReasoningGatingPolicy.decide(evaluation, 'CA', 'EXPRESS_ENTRY')['invoke'])
+
+    def test_all_facts_missing_skips_reasoning_inside_the_band(self):
+        evaluation = make_evaluation(0.7, requirement_details=[
+            {'requirement_code': 'MIN_SALARY', 'passed': False, 'missing_facts': ['salary']},
+            {'requirement_code': 'ENGLISH', 'passed': False, 'missing_facts': ['english_level']},
+        ])
+
+        decision = ReasoningGatingPolicy.decide(evaluation, 'UK', 'SKILLED_WORKER')
+
+        self.assertEqual((decision['invoke'], decision['reason']), (False, 'all_facts_missing'))
+
+    def test_unlikely_with_failed_mandatory_requirement_skips_reasoning(self):
+        evaluation = make_evaluation(0.7, outcome='unlikely', requirement_details=[
+            {'requirement_code': 'MIN_SALARY', 'passed': False, 'is_mandatory': True},
+            {'requirement_code': 'ENGLISH', 'passed': True, 'is_mandatory': True},
+        ])
+
+        decision = ReasoningGatingPolicy.decide(evaluation, 'UK', 'SKILLED_WORKER')
+
+        self.assertEqual((decision['invoke'], decision['reason']), (False, 'mandatory_failure'))
+
+    def test_failures_that_are_not_decisive_keep_the_band_decision(self):
+        # Optional, missing-fact and errored requirements are not clear mandatory failures
+        evaluation = make_evaluation(0.7, outcome='unlikely', requirement_details=[
+            {'requirement_code': 'SPONSOR', 'passed': False, 'is_mandatory': False},
+            {'requirement_code': 'ENGLISH', 'passed': False, 'missing_facts': ['english_level']},
+            {'requirement_code': 'AGE', 'passed': False, 'error': 'bad expression'},
+        ])
+
+        decision = ReasoningGatingPolicy.decide(evaluation, 'UK', 'SKILLED_WORKER')
+
+        self.assertEqual((decision['invoke'], decision['reason']), (True, 'within_band'))
+
+    def test_template_summary_explains_the_skip(self):
+        evaluation = make_evaluation(0.3, outcome='unlikely', requirement_details=[
+            {'requirement_code': 'MIN_SALARY', 'passed': False, 'is_mandatory': True},
+            {'requirement_code': 'ENGLISH', 'passed': False, 'missing_facts': ['english_level']},
+        ])
+        decision = ReasoningGatingPolicy.decide(evaluation, 'UK', 'SKILLED_WORKER')
+
+        summary = ReasoningGatingPolicy.build_template_summary(evaluation, decision)
+
+        self.assertIn('Rule engine outcome: unlikely (confidence 0.30); 0 of 2 requirements passed.', summary)
+        self.assertIn('Mandatory requirements not met: MIN_SALARY.', summary)
+        self.assertIn('Missing information: english_level.', summary)
+        self.assertIn('a mandatory requirement clearly failed', summary)
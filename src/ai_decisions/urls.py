@@ -5,6 +5,7 @@ from ai_decisions.views import (
     EligibilityResultDetailAPI,
     EligibilityResultUpdateAPI,
     EligibilityResultDeleteAPI,
+    EligibilityResultReasoningStreamAPI,
 )
 
 app_name = 'ai_decisions'
@@ -15,5 +16,6 @@ urlpatterns = [
     path('eligibility-results/<uuid:id>/', EligibilityResultDetailAPI.as_view(), name='eligibility-result-detail'),
     path('eligibility-results/<uuid:id>/update/', EligibilityResultUpdateAPI.as_view(), name='eligibility-result-update'),
     path('eligibility-results/<uuid:id>/delete/', EligibilityResultDeleteAPI.as_view(), name='eligibility-result-delete'),
+    path('eligibility-results/<uuid:id>/reasoning/stream/', EligibilityResultReasoningStreamAPI.as_view(), name='eligibility-result-reasoning-stream'),
 ]
 
@@ -1,6 +1,7 @@
 from .eligibility_result.create import EligibilityResultCreateAPI
 from .eligibility_result.read import EligibilityResultListAPI, EligibilityResultDetailAPI
 from .eligibility_result.update_delete import EligibilityResultUpdateAPI, EligibilityResultDeleteAPI
+from .eligibility_result.stream import EligibilityResultReasoningStreamAPI
 
 __all__ = [
     'EligibilityResultCreateAPI',
@@ -8,5 +9,6 @@ __all__ = [
     'EligibilityResultDetailAPI',
     'EligibilityResultUpdateAPI',
     'EligibilityResultDeleteAPI',
+    'EligibilityResultReasoningStreamAPI',
 ]
 
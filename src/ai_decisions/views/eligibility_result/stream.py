@@ -0,0 +1,46 @@
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from main_system.base.auth_api import AuthAPI
+from ai_decisions.helpers.event_stream import EventStreamRenderer, format_sse_event
+from ai_decisions.services.ai_reasoning_service import AIReasoningService
+from ai_decisions.services.eligibility_result_service import EligibilityResultService
+
+
+class EligibilityResultReasoningStreamAPI(AuthAPI):
+    """
+    Stream AI reasoning for an eligibility result as server-sent events.
+
+    Events: 'context', 'token', 'citation', then 'done' or 'error'
+    (see AIReasoningService.stream_ai_reasoning).
+    """
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    def get(self, request, id):
+        result = EligibilityResultService.get_by_id(id)
+        if not result:
+            return self.api_response(
+                message=f"Eligibility result with ID '{id}' not found.",
+                data=None,
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+
+        events = AIReasoningService.stream_ai_reasoning(
+            case_id=str(result.case_id),
+            rule_results={
+                'outcome': result.outcome,
+                'confidence': result.confidence,
+                'missing_facts': result.missing_facts or [],
+            },
+            visa_code=result.visa_type.code,
+            jurisdiction=result.visa_type.jurisdiction
+        )
+
+        response = StreamingHttpResponse(
+            (format_sse_event(event, data) for event, data in events),
+            content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        # Disable proxy buffering (nginx) so events reach the client as they are sent
+        response['X-Accel-Buffering'] = 'no'
+        return response
@@ -0,0 +1,66 @@
+"""
+Compression of stored document content (ContentBlob).
+
+zstd when the zstandard package is installed, zlib otherwise; the codec is
+stored with every blob so both kinds can be read back.
+"""
+import logging
+import zlib
+from typing import Tuple
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+logger = logging.getLogger('django')
+
+CODEC_ZSTD = 'zstd'
+CODEC_ZLIB = 'zlib'
+CODEC_NONE = 'none'
+
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 6
+
+
+def compress_text(text: str) -> Tuple[str, bytes]:
+    """
+    Compress text (UTF-8) with the best available codec.
+
+    Args:
+        text: Text to compress
+
+    Returns:
+        Tuple of (codec, compressed bytes)
+    """
+    data = text.encode('utf-8')
+    if zstandard is not None:
+        # Compressor objects are not thread-safe, so one per call
+        return CODEC_ZSTD, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return CODEC_ZLIB, zlib.compress(data, ZLIB_LEVEL)
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    """
+    Decompress text stored by compress_text.
+
+    Args:
+        codec: Codec recorded with the data
+        data: Compressed bytes
+
+    Returns:
+        Decompressed text
+
+    Raises:
+        ValueError: If the codec is unknown or zstandard is not installed for zstd data
+    """
+    data = bytes(data)
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstd-compressed content requires the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data).decode('utf-8')
+    if codec == CODEC_NONE:
+        return data.decode('utf-8')
+    raise ValueError(f"Unknown content codec: {codec}")
@@ -0,0 +1,90 @@
+"""
+Token bucket rate limiter shared by the threads of a crawler.
+
+Tokens refill continuously at `rate` per second up to `capacity` (the burst
+size); every request takes one token. pause() holds back all callers until a
+point in time, used for HTTP 429/503 responses with a Retry-After header.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+logger = logging.getLogger('django')
+
+
+class TokenBucketRateLimiter:
+    """Thread-safe token bucket with a global back-off."""
+
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        """
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum tokens held (burst size, default: one second of rate)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                    self._updated_at = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """
+        Hold back every caller for `seconds` (extends, never shortens, a running pause).
+
+        Args:
+            seconds: Back-off duration
+        """
+        with self._lock:
+            until = time.monotonic() + max(0.0, seconds)
+            if until > self._paused_until:
+                self._paused_until = until
+                # Resume with an empty bucket rather than a burst
+                self._tokens = 0.0
+                self._updated_at = until
+                logger.warning(f"Rate limited, pausing requests for {seconds:.1f}s")
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Seconds to wait from a Retry-After header (delta-seconds or HTTP-date).
+
+        Args:
+            value: Header value
+
+        Returns:
+            Seconds (>= 0), or None if the header is missing or invalid
+        """
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, List
+from datetime import datetime
+from typing import Dict, Iterator, Optional, List, Tuple
 import logging
 
 logger = logging.getLogger('django')
@@ -22,15 +23,19 @@ class BaseIngestionSystem(ABC):
         self.jurisdiction = data_source.jurisdiction
     
     @abstractmethod
-    def fetch_content(self, url: str) -> Optional[Dict]:
+    def fetch_content(self, url: str, validators: Optional[Dict] = None) -> Optional[Dict]:
         """
         Fetch content from the source URL.
         
         Args:
             url: URL to fetch from
+            validators: Optional {'etag', 'last_modified'} of the last fetch, sent as
+                If-None-Match / If-Modified-Since (status_code 304 and no content
+                when the document is unchanged)
             
         Returns:
-            Dict with keys: 'content', 'content_type', 'status_code', 'error' (if any)
+            Dict with keys: 'content', 'content_type', 'status_code', 'error' (if any),
+            'headers' (response headers)
             Returns None if fetch failed
         """
         pass
@@ -63,15 +68,64 @@ class BaseIngestionSystem(ABC):
         pass
     
     @abstractmethod
-    def get_document_urls(self) -> List[str]:
+    def get_document_urls(self, since: Optional[datetime] = None) -> List[str]:
         """
         Get list of document URLs to fetch from the data source.
         
+        Args:
+            since: Optional time of the last known update; systems with a change
+                feed then return only documents updated since (others ignore it)
+            
         Returns:
             List of URLs to fetch
         """
         pass
     
+    def get_prefetched_urls(self) -> List[str]:
+        """
+        URLs whose content get_document_urls already fetched, so fetch_content
+        returns it without a new request. None by default.
+        
+        Returns:
+            List of URLs
+        """
+        return []
+    
+    def fetch_many(self, urls: List[str],
+                   validators: Optional[Dict[str, Dict]] = None) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """
+        Fetch several URLs. Sequential by default; systems with a worker pool
+        override this to fetch concurrently.
+        
+        Args:
+            urls: URLs to fetch
+            validators: Optional dict of url to fetch_content validators
+            
+        Yields:
+            Tuples of (url, fetch_content result), in the order of urls
+        """
+        validators = validators or {}
+        for url in urls:
+            yield url, self.fetch_content(url, validators.get(url))
+    
+    @staticmethod
+    def get_header(result: Dict, name: str) -> Optional[str]:
+        """
+        Case-insensitive lookup of a response header in a fetch_content result.
+        
+        Args:
+            result: fetch_content result
+            name: Header name
+            
+        Returns:
+            Header value, or None if absent
+        """
+        name = name.lower()
+        for key, value in (result.get('headers') or {}).items():
+            if key.lower() == name:
+                return value
+        return None
+    
     def get_base_url(self) -> str:
         """Get the base URL for this data source."""
         return self.data_source.base_url
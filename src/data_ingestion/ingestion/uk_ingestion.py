@@ -1,9 +1,15 @@
 import json
 import logging
-import time
-from typing import Dict, Optional, List
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, Optional, List, Tuple
+from requests import Session
+from requests.adapters import HTTPAdapter
 from django.conf import settings
 from helpers.request.client import Client
+from data_ingestion.helpers.rate_limiter import TokenBucketRateLimiter
 from .base_ingestion import BaseIngestionSystem
 
 UK_GOV_BASE = "https://www.gov.uk"
@@ -15,8 +21,27 @@ class UKIngestionSystem(BaseIngestionSystem):
     """
     Optimized UK-specific ingestion system for gov.uk API.
     Efficiently fetches and stores all endpoint data including nested child taxons.
+
+    Requests run on a bounded thread pool (UK_GOV_CRAWL_WORKERS) and share one
+    token bucket per API host (UK_GOV_API_RATE_LIMIT requests per second), so
+    concurrent ingestions in a worker process stay within the gov.uk limits.
+    HTTP 429/503 responses pause every thread for the Retry-After period.
     """
 
+    # gov.uk allows 10 requests per second per client
+    DEFAULT_RATE_LIMIT = 10
+    DEFAULT_WORKERS = 8
+    MAX_RETRIES = 3
+    # Back-off when a 429/503 response has no Retry-After header (doubles per retry)
+    DEFAULT_RETRY_AFTER_SECONDS = 5
+    RETRY_STATUS_CODES = (429, 503)
+    MAX_TAXON_DEPTH = 15
+    SEARCH_PAGE_SIZE = 50
+    MAX_SEARCH_PAGES = 100
+
+    _rate_limiters: Dict[str, TokenBucketRateLimiter] = {}
+    _rate_limiters_lock = threading.Lock()
+
     def __init__(self, data_source):
         super().__init__(data_source)
         # Use settings key or fallback to default
@@ -32,36 +57,146 @@ class UKIngestionSystem(BaseIngestionSystem):
             self.api_base = UK_GOV_BASE
             logger.warning("UK_GOV_API_BASE_URL not set in settings, using default: https://www.gov.uk")
         
-        self.client = Client(base_url=self.api_base)
+        self.session = Session()
+        self.session.mount('https://', HTTPAdapter(pool_maxsize=self._max_workers()))
+        self.client = Client(base_url=self.api_base, session=self.session)
         self.headers = {
             'User-Agent': 'ImmigrationIntelligenceBot/1.0',
             'Accept': 'application/json'
         }
+        self.rate_limiter = self._get_rate_limiter(self.api_base)
+        # Successful taxon responses from get_document_urls, handed out once by fetch_content
+        self._discovered_responses: Dict[str, Dict] = {}
+        self._discovered_lock = threading.Lock()
+
+    @classmethod
+    def _get_rate_limiter(cls, api_base: str) -> TokenBucketRateLimiter:
+        """Token bucket shared by every ingestion system of an API host."""
+        with cls._rate_limiters_lock:
+            if api_base not in cls._rate_limiters:
+                rate = getattr(settings, 'UK_GOV_API_RATE_LIMIT', None) or cls.DEFAULT_RATE_LIMIT
+                cls._rate_limiters[api_base] = TokenBucketRateLimiter(rate=rate)
+            return cls._rate_limiters[api_base]
 
-    def fetch_content(self, url: str) -> Optional[Dict]:
+    @classmethod
+    def _max_workers(cls) -> int:
+        return getattr(settings, 'UK_GOV_CRAWL_WORKERS', None) or cls.DEFAULT_WORKERS
+
+    def _executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self._max_workers(), thread_name_prefix='uk-ingestion')
+
+    def _get(self, endpoint: str, extra_headers: Optional[Dict] = None) -> Dict:
         """
-        Fetch content from gov.uk API.
-        
+        Rate-limited GET, retried after the Retry-After period on 429/503.
+
         Args:
-            url: Full API URL or endpoint path
-            
+            endpoint: API endpoint path
+            extra_headers: Optional headers added to the default headers
+
         Returns:
-            Dict with 'content', 'content_type', 'status_code', 'error'
+            Client.get_with_details result
         """
-        # Extract endpoint from full URL
-        endpoint = url.replace(self.api_base, '') if url.startswith('http') else url
-        
-        try:
+        headers = {**self.headers, **(extra_headers or {})}
+        for attempt in range(self.MAX_RETRIES + 1):
+            self.rate_limiter.acquire()
             result = self.client.get_with_details(
                 endpoint=endpoint,
-                headers=self.headers,
+                headers=headers,
                 timeout=30
             )
-            return result
+            if result.get('status_code') not in self.RETRY_STATUS_CODES or attempt == self.MAX_RETRIES:
+                return result
+
+            retry_after = TokenBucketRateLimiter.parse_retry_after(self.get_header(result, 'Retry-After'))
+            if retry_after is None:
+                retry_after = self.DEFAULT_RETRY_AFTER_SECONDS * 2 ** attempt
+            logger.warning(
+                f"gov.uk returned {result['status_code']} for {endpoint}, "
+                f"retrying in {retry_after:.1f}s (attempt {attempt + 1}/{self.MAX_RETRIES})"
+            )
+            self.rate_limiter.pause(retry_after)
+        return result
+
+    def _fetch(self, url: str, validators: Optional[Dict] = None) -> Dict:
+        """Fetch a URL from the API (never served from the discovery responses)."""
+        # Extract endpoint from full URL
+        endpoint = url.replace(self.api_base, '') if url.startswith('http') else url
+
+        conditional_headers = {}
+        if validators:
+            if validators.get('etag'):
+                conditional_headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                conditional_headers['If-Modified-Since'] = validators['last_modified']
+        
+        try:
+            return self._get(endpoint, conditional_headers)
         except Exception as e:
             logger.error(f"Error fetching {url}: {e}")
             return {'error': str(e), 'content': None, 'content_type': None, 'status_code': None}
 
+    def fetch_content(self, url: str, validators: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Fetch content from gov.uk API.
+
+        Taxon pages already fetched by get_document_urls are returned from
+        the discovery responses (once) instead of being requested again; their
+        ETag is compared with the validators by the caller. IngestionService
+        ingests them right after discovery (see get_prefetched_urls), on the
+        same instance.
+        
+        Args:
+            url: Full API URL or endpoint path
+            validators: Optional {'etag', 'last_modified'} for a conditional request
+            
+        Returns:
+            Dict with 'content', 'content_type', 'status_code', 'error', 'headers'
+        """
+        with self._discovered_lock:
+            discovered = self._discovered_responses.pop(url, None)
+        if discovered is not None:
+            return discovered
+        return self._fetch(url, validators)
+
+    def get_prefetched_urls(self) -> List[str]:
+        """Taxon URLs fetched by get_document_urls and not yet handed out by fetch_content."""
+        with self._discovered_lock:
+            return list(self._discovered_responses)
+
+    def fetch_many(self, urls: List[str],
+                   validators: Optional[Dict[str, Dict]] = None) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """
+        Fetch URLs on the worker pool, yielding results in the order of urls.
+
+        At most twice the pool size of responses are held ahead of the consumer;
+        closing the generator cancels look-ahead requests not yet started.
+
+        Args:
+            urls: URLs to fetch
+            validators: Optional dict of url to fetch_content validators
+
+        Yields:
+            Tuples of (url, fetch_content result)
+        """
+        validators = validators or {}
+        window = self._max_workers() * 2
+        with self._executor() as executor:
+            pending = deque()
+            try:
+                for url in urls:
+                    pending.append((url, executor.submit(self.fetch_content, url, validators.get(url))))
+                    if len(pending) >= window:
+                        done_url, future = pending.popleft()
+                        yield done_url, future.result()
+                while pending:
+                    done_url, future = pending.popleft()
+                    yield done_url, future.result()
+            except GeneratorExit:
+                # Consumer stopped early: drop look-ahead requests that have not started
+                for _, future in pending:
+                    future.cancel()
+                raise
+
     def extract_text(self, raw_content: str, content_type: str) -> str:
         """
         Extract comprehensive text from JSON API response for hashing.
@@ -270,6 +405,98 @@ class UKIngestionSystem(BaseIngestionSystem):
                     urls.append(child['api_url'])
         return urls
     
+    def _search_page(self, taxon_content_id: str, page: int,
+                     since: Optional[datetime] = None) -> Tuple[List[str], int, Optional[str]]:
+        """
+        Fetch one Search API page of content pages tagged to a taxon.
+
+        Args:
+            taxon_content_id: Content ID of the taxon (from Content API)
+            page: 1-based page number
+            since: Optional date; only pages updated on or after it are returned,
+                most recently updated first
+
+        Returns:
+            Tuple of (content page API URLs, total results, error or None)
+        """
+        # Search API endpoint
+        endpoint = (
+            f"/api/search.json?filter_taxons={taxon_content_id}"
+            f"&count={self.SEARCH_PAGE_SIZE}&page={page}"
+        )
+        if since:
+            # public_timestamp is the Search API name of public_updated_at
+            endpoint += f"&order=-public_timestamp&filter_public_timestamp=from:{since.date().isoformat()}"
+        try:
+            result = self._get(endpoint)
+            if result.get('error'):
+                return [], 0, result['error']
+            if not result.get('content'):
+                return [], 0, None
+
+            data = json.loads(result['content'])
+            # Convert to Content API URLs
+            content_urls = [
+                f"{self.api_base}/api/content{item['base_path']}"
+                for item in data.get('results', [])
+                if item.get('base_path')
+            ]
+            return content_urls, data.get('total', 0), None
+        except json.JSONDecodeError as e:
+            logger.warning(f"Invalid JSON from search API for taxon {taxon_content_id}, page {page}: {e}")
+            return [], 0, f"JSON decode error: {e}"
+        except Exception as e:
+            logger.error(f"Error fetching search results for taxon {taxon_content_id}, page {page}: {e}")
+            return [], 0, str(e)
+
+    def _search_taxons(self, taxon_content_ids: List[str], executor: ThreadPoolExecutor,
+                       errors: Optional[List[str]] = None,
+                       since: Optional[datetime] = None) -> Dict[str, List[str]]:
+        """
+        Content pages of several taxons, with all Search API pages fetched in parallel.
+
+        The first page of every taxon is fetched first (it carries the total);
+        the remaining pages are then fetched together.
+
+        Args:
+            taxon_content_ids: Taxon content IDs
+            executor: Worker pool
+            errors: Optional list that search errors are appended to
+            since: Optional date to only find pages updated since (see _search_page)
+
+        Returns:
+            Dict of taxon content ID to content page URLs (in page order)
+        """
+        pages: Dict[Tuple[str, int], List[str]] = {}
+        remaining = []
+
+        first_pages = executor.map(lambda taxon_id: self._search_page(taxon_id, 1, since), taxon_content_ids)
+        for taxon_id, (content_urls, total, error) in zip(taxon_content_ids, first_pages):
+            if error and errors is not None:
+                errors.append(f"Error fetching content for taxon {taxon_id}: {error}")
+            pages[(taxon_id, 1)] = content_urls
+            page_count = min(
+                self.MAX_SEARCH_PAGES,
+                -(-total // self.SEARCH_PAGE_SIZE)
+            )
+            if len(content_urls) >= self.SEARCH_PAGE_SIZE:
+                remaining.extend((taxon_id, page) for page in range(2, page_count + 1))
+
+        later_pages = executor.map(lambda key: self._search_page(*key, since), remaining)
+        for key, (content_urls, _, error) in zip(remaining, later_pages):
+            if error and errors is not None:
+                errors.append(f"Error fetching content for taxon {key[0]}, page {key[1]}: {error}")
+            pages[key] = content_urls
+
+        content_pages = {}
+        for taxon_id in taxon_content_ids:
+            taxon_pages = sorted(page for (page_taxon, page) in pages if page_taxon == taxon_id)
+            content_pages[taxon_id] = [
+                url for page in taxon_pages for url in pages[(taxon_id, page)]
+            ]
+            logger.info(f"Found {len(content_pages[taxon_id])} content pages for taxon {taxon_id}")
+        return content_pages
+
     def get_content_pages_by_taxon(self, taxon_content_id: str) -> List[str]:
         """
         Use Search API to find all content pages tagged to a taxon.
@@ -281,67 +508,23 @@ class UKIngestionSystem(BaseIngestionSystem):
         Returns:
             List of content page API URLs
         """
-        content_urls = []
-        page = 1
-        max_pages = 100  # Safety limit
-        
-        while page <= max_pages:
-            try:
-                # Search API endpoint
-                endpoint = f"/api/search.json?filter_taxons={taxon_content_id}&count=50&page={page}"
-                
-                result = self.client.get_with_details(
-                    endpoint=endpoint,
-                    headers=self.headers,
-                    timeout=30
-                )
-                
-                if not result or not result.get('content'):
-                    break
-                
-                data = json.loads(result['content'])
-                results = data.get('results', [])
-                
-                if not results:
-                    break
-                
-                # Extract content page URLs from search results
-                for item in results:
-                    base_path = item.get('base_path')
-                    if base_path:
-                        # Convert to Content API URL
-                        content_url = f"{self.api_base}/api/content{base_path}"
-                        content_urls.append(content_url)
-                
-                # Check if there are more pages
-                total_results = data.get('total', 0)
-                current_count = len(results)
-                
-                if page * 50 >= total_results or current_count < 50:
-                    break
-                
-                page += 1
-                time.sleep(1)  # Rate limiting for search API
-                
-            except json.JSONDecodeError as e:
-                logger.warning(f"Invalid JSON from search API for taxon {taxon_content_id}, page {page}: {e}")
-                break
-            except Exception as e:
-                logger.error(f"Error fetching search results for taxon {taxon_content_id}, page {page}: {e}")
-                break
-        
-        logger.info(f"Found {len(content_urls)} content pages for taxon {taxon_content_id}")
-        return content_urls
+        with self._executor() as executor:
+            return self._search_taxons([taxon_content_id], executor)[taxon_content_id]
 
-    def get_document_urls(self) -> List[str]:
+    def get_document_urls(self, since: Optional[datetime] = None) -> List[str]:
         """
         Discover all URLs using both Content API (for taxons) and Search API (for content pages).
         
         Process:
-        1. Use Content API to discover taxon hierarchy
-        2. For each taxon, use Search API to find actual content pages
+        1. Walk the taxon hierarchy breadth-first with the Content API, one
+           parallel batch per level; taxon responses are kept for fetch_content
+        2. For all taxons, use Search API to find actual content pages (pages in parallel)
         3. Fetch all content pages
         
+        Args:
+            since: Optional last known public_updated_at; content pages are then
+                limited to those updated since that day (change feed)
+        
         Returns:
             List of all URLs to fetch (taxons + content pages)
         """
@@ -362,92 +545,43 @@ class UKIngestionSystem(BaseIngestionSystem):
                 logger.warning(f"Using fallback base URL: {base_url}")
         
         errors = []
-        
-        def fetch_taxons_recursive(url: str, depth: int = 0, max_depth: int = 15):
-            """
-            Recursively fetch taxon structure from Content API.
-            Collects taxon content_ids for later Search API queries.
-            """
-            # Safety checks
-            if depth > max_depth:
-                logger.warning(f"Max depth reached for {url}")
-                return
-            
-            if url in visited:
-                return
-            
-            visited.add(url)
-            urls.append(url)  # Add taxon URL to fetch list
-            
-            # Rate limiting: 2 seconds between requests
-            if len(urls) > 1:
-                time.sleep(2)
-            
-            # Fetch the taxon from Content API
-            response = self.fetch_content(url)
-            
-            if not response:
-                errors.append(f"Failed to fetch {url}: No response")
-                return
-            
-            if response.get('error'):
-                errors.append(f"Error fetching {url}: {response.get('error')}")
-                return
-            
-            if not response.get('content'):
-                logger.warning(f"No content returned for {url}")
-                return
-            
-            # Parse response and extract child taxon URLs
-            try:
-                data = json.loads(response['content'])
-                
-                # Extract content_id for Search API
-                content_id = data.get('content_id')
-                if content_id:
-                    taxon_content_ids.append(content_id)
-                
-                # Extract child taxon URLs
-                child_urls = self.parse_api_response(data)
-                
-                # Recursively process child taxons
-                for child_url in child_urls:
-                    if child_url not in visited:
-                        fetch_taxons_recursive(child_url, depth + 1, max_depth)
-                        
-            except json.JSONDecodeError as e:
-                logger.warning(f"Invalid JSON response from {url}: {e}")
-                errors.append(f"JSON decode error for {url}: {e}")
-            except KeyError as e:
-                logger.warning(f"Missing key in response from {url}: {e}")
-                errors.append(f"Key error for {url}: {e}")
-            except Exception as e:
-                logger.error(f"Unexpected error processing {url}: {e}")
-                errors.append(f"Unexpected error for {url}: {e}")
-        
-        # Step 1: Discover taxon hierarchy using Content API
-        logger.info(f"Step 1: Discovering taxon hierarchy from {base_url}")
-        fetch_taxons_recursive(base_url)
-        
-        logger.info(
-            f"Taxon discovery complete: {len(urls)} taxons found, {len(taxon_content_ids)} taxon IDs collected"
-        )
-        
-        # Step 2: Use Search API to find actual content pages for each taxon
-        logger.info(f"Step 2: Discovering content pages using Search API for {len(taxon_content_ids)} taxons")
+
+        with self._executor() as executor:
+            # Step 1: Discover taxon hierarchy using Content API
+            logger.info(f"Step 1: Discovering taxon hierarchy from {base_url}")
+            frontier = [base_url]
+            visited.add(base_url)
+            depth = 0
+            while frontier:
+                if depth > self.MAX_TAXON_DEPTH:
+                    logger.warning(f"Max depth reached, {len(frontier)} taxons not fetched")
+                    break
+
+                urls.extend(frontier)
+                next_frontier = []
+                for url, response in zip(frontier, executor.map(self._fetch, frontier)):
+                    for child_url in self._process_taxon_response(url, response, taxon_content_ids, errors):
+                        if child_url not in visited:
+                            visited.add(child_url)
+                            next_frontier.append(child_url)
+                frontier = next_frontier
+                depth += 1
+
+            logger.info(
+                f"Taxon discovery complete: {len(urls)} taxons found, {len(taxon_content_ids)} taxon IDs collected"
+            )
+
+            # Step 2: Use Search API to find actual content pages for each taxon
+            logger.info(f"Step 2: Discovering content pages using Search API for {len(taxon_content_ids)} taxons")
+            content_pages = self._search_taxons(taxon_content_ids, executor, errors, since)
+
         content_pages_found = 0
-        
         for taxon_id in taxon_content_ids:
-            try:
-                content_page_urls = self.get_content_pages_by_taxon(taxon_id)
-                for content_url in content_page_urls:
-                    if content_url not in visited:
-                        visited.add(content_url)
-                        urls.append(content_url)
-                        content_pages_found += 1
-            except Exception as e:
-                logger.error(f"Error fetching content pages for taxon {taxon_id}: {e}")
-                errors.append(f"Error fetching content for taxon {taxon_id}: {e}")
+            for content_url in content_pages[taxon_id]:
+                if content_url not in visited:
+                    visited.add(content_url)
+                    urls.append(content_url)
+                    content_pages_found += 1
         
         # Log final results
         logger.info(
@@ -460,3 +594,51 @@ class UKIngestionSystem(BaseIngestionSystem):
             logger.warning(f"Errors during URL discovery: {errors[:5]}...")  # Log first 5 errors
         
         return urls
+
+    def _process_taxon_response(self, url: str, response: Optional[Dict],
+                                taxon_content_ids: List[str], errors: List[str]) -> List[str]:
+        """
+        Keep a taxon response for fetch_content and extract its child taxon URLs.
+
+        Args:
+            url: Taxon URL
+            response: _fetch result
+            taxon_content_ids: List the taxon content_id is appended to
+            errors: List errors are appended to
+
+        Returns:
+            Child taxon URLs
+        """
+        if not response:
+            errors.append(f"Failed to fetch {url}: No response")
+            return []
+        
+        if response.get('error'):
+            errors.append(f"Error fetching {url}: {response.get('error')}")
+            return []
+        
+        if not response.get('content'):
+            logger.warning(f"No content returned for {url}")
+            return []
+
+        with self._discovered_lock:
+            self._discovered_responses[url] = response
+        
+        # Parse response and extract child taxon URLs
+        try:
+            data = json.loads(response['content'])
+            
+            # Extract content_id for Search API
+            content_id = data.get('content_id')
+            if content_id and content_id not in taxon_content_ids:
+                taxon_content_ids.append(content_id)
+            
+            return self.parse_api_response(data)
+                    
+        except json.JSONDecodeError as e:
+            logger.warning(f"Invalid JSON response from {url}: {e}")
+            errors.append(f"JSON decode error for {url}: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error processing {url}: {e}")
+            errors.append(f"Unexpected error for {url}: {e}")
+        return []
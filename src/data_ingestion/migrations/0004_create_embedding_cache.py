@@ -0,0 +1,33 @@
+# Generated migration for EmbeddingCacheEntry model
+
+import uuid
+from django.db import migrations, models
+import pgvector.django
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_ingestion', '0003_create_vector_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmbeddingCacheEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, db_index=True)),
+                ('model', models.CharField(help_text="Embedding model that produced the vector (e.g. 'text-embedding-ada-002')", max_length=100)),
+                ('text_hash', models.CharField(help_text='SHA-256 hex digest of the embedded text', max_length=64)),
+                ('embedding', pgvector.django.VectorField(dimensions=1536, help_text='Cached embedding vector')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'embedding_cache',
+                'verbose_name_plural': 'Embedding Cache Entries',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='embeddingcacheentry',
+            constraint=models.UniqueConstraint(fields=('model', 'text_hash'), name='embedding_cache_model_hash_uniq'),
+        ),
+    ]
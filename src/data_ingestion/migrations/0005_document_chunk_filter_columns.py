@@ -0,0 +1,59 @@
+# Generated migration promoting DocumentChunk filter fields out of metadata
+# and creating partial HNSW indexes per jurisdiction
+
+from django.db import migrations, models
+
+JURISDICTIONS = ['UK', 'US', 'CA', 'AU']
+
+
+def _partial_index_sql(jurisdiction):
+    return (
+        f"CREATE INDEX IF NOT EXISTS document_chunks_embedding_{jurisdiction.lower()}_idx "
+        f"ON document_chunks USING hnsw (embedding vector_cosine_ops) "
+        f"WHERE jurisdiction = '{jurisdiction}';"
+    )
+
+
+def _drop_partial_index_sql(jurisdiction):
+    return f"DROP INDEX IF EXISTS document_chunks_embedding_{jurisdiction.lower()}_idx;"
+
+
+class Migration(migrations.Migration):
+    """
+    Add jurisdiction and visa_code columns to document_chunks, backfill them
+    from metadata and create one partial HNSW index per jurisdiction so
+    filtered similarity searches use an index over the matching rows only.
+    """
+    dependencies = [
+        ('data_ingestion', '0004_create_embedding_cache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentchunk',
+            name='jurisdiction',
+            field=models.CharField(blank=True, db_index=True, help_text="Jurisdiction of the source document (e.g. 'UK')", max_length=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='documentchunk',
+            name='visa_code',
+            field=models.CharField(blank=True, db_index=True, help_text="Visa code the chunk relates to (e.g. 'SKILLED_WORKER')", max_length=100, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='documentchunk',
+            index=models.Index(fields=['jurisdiction', 'visa_code'], name='document_ch_jur_visa_idx'),
+        ),
+        migrations.RunSQL(
+            sql="""
+            UPDATE document_chunks
+            SET jurisdiction = metadata->>'jurisdiction',
+                visa_code = metadata->>'visa_code'
+            WHERE jurisdiction IS NULL AND visa_code IS NULL;
+            """,
+            reverse_sql=migrations.RunSQL.noop
+        ),
+        migrations.RunSQL(
+            sql=[_partial_index_sql(jurisdiction) for jurisdiction in JURISDICTIONS],
+            reverse_sql=[_drop_partial_index_sql(jurisdiction) for jurisdiction in JURISDICTIONS]
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated migration adding a full-text search vector to DocumentChunk
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Add a stored generated tsvector column over chunk_text with a GIN index,
+    used by the lexical leg of hybrid retrieval.
+    """
+    dependencies = [
+        ('data_ingestion', '0005_document_chunk_filter_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentchunk',
+            name='search_vector',
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.SearchVector('chunk_text', config='english'),
+                help_text='English tsvector of chunk_text, maintained by the database',
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='documentchunk',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='document_ch_search_gin_idx'),
+        ),
+    ]
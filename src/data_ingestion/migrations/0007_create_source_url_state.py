@@ -0,0 +1,37 @@
+# Generated migration for SourceUrlState model
+
+import uuid
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_ingestion', '0006_document_chunk_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SourceUrlState',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, db_index=True)),
+                ('source_url', models.URLField(help_text='Full URL of the document', max_length=1000)),
+                ('etag', models.CharField(blank=True, help_text='ETag response header of the last full fetch', max_length=255, null=True)),
+                ('last_modified', models.CharField(blank=True, help_text='Last-Modified response header of the last full fetch (HTTP-date)', max_length=100, null=True)),
+                ('public_updated_at', models.DateTimeField(blank=True, db_index=True, help_text="Publisher's last update time (gov.uk public_updated_at)", null=True)),
+                ('last_status_code', models.IntegerField(blank=True, help_text='HTTP status code of the last fetch (304 when not modified)', null=True)),
+                ('last_checked_at', models.DateTimeField(auto_now=True, db_index=True, help_text='When this URL was last requested')),
+                ('last_changed_at', models.DateTimeField(blank=True, help_text='When a content change was last stored for this URL', null=True)),
+                ('data_source', models.ForeignKey(help_text='The data source this URL belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='url_states', to='data_ingestion.datasource')),
+            ],
+            options={
+                'db_table': 'source_url_states',
+                'verbose_name_plural': 'Source URL States',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='sourceurlstate',
+            constraint=models.UniqueConstraint(fields=('data_source', 'source_url'), name='source_url_state_source_url_uniq'),
+        ),
+    ]
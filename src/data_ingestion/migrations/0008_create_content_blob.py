@@ -0,0 +1,30 @@
+# Generated migration for ContentBlob model
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_ingestion', '0007_create_source_url_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentBlob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, db_index=True)),
+                ('content_hash', models.CharField(help_text='SHA-256 hash of the uncompressed UTF-8 text', max_length=64, unique=True)),
+                ('codec', models.CharField(choices=[('zstd', 'Zstandard'), ('zlib', 'zlib'), ('none', 'Uncompressed')], default='zstd', help_text='Compression codec of data', max_length=10)),
+                ('data', models.BinaryField(help_text='Compressed content')),
+                ('size', models.IntegerField(help_text='Uncompressed size in bytes')),
+                ('compressed_size', models.IntegerField(help_text='Compressed size in bytes')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'content_blobs',
+                'verbose_name_plural': 'Content Blobs',
+            },
+        ),
+    ]
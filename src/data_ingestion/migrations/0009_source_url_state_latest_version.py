@@ -0,0 +1,24 @@
+# Generated migration adding the latest content hash index to SourceUrlState
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_ingestion', '0008_create_content_blob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sourceurlstate',
+            name='latest_content_hash',
+            field=models.CharField(blank=True, help_text="Content hash of the URL's latest DocumentVersion", max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='sourceurlstate',
+            name='latest_version',
+            field=models.ForeignKey(blank=True, help_text='Latest DocumentVersion of the URL (previous version of the next diff)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='data_ingestion.documentversion'),
+        ),
+    ]
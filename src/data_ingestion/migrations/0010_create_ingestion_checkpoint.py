@@ -0,0 +1,36 @@
+# Generated migration for IngestionCheckpoint model
+
+import uuid
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_ingestion', '0009_source_url_state_latest_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestionCheckpoint',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, db_index=True)),
+                ('changed_only', models.BooleanField(default=False, help_text='Whether the run only ingests documents reported as updated')),
+                ('urls', models.JSONField(default=list, help_text='Document URLs discovered at the start of the run, in processing order')),
+                ('next_index', models.PositiveIntegerField(default=0, help_text='Index in urls of the first URL not yet processed')),
+                ('results', models.JSONField(default=dict, help_text="Result counts accumulated over the run's slices")),
+                ('is_complete', models.BooleanField(db_index=True, default=False, help_text='Whether every URL of the run has been processed')),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('data_source', models.ForeignKey(help_text='The data source being ingested', on_delete=django.db.models.deletion.CASCADE, related_name='ingestion_checkpoints', to='data_ingestion.datasource')),
+            ],
+            options={
+                'db_table': 'ingestion_checkpoints',
+                'ordering': ['-started_at'],
+                'verbose_name_plural': 'Ingestion Checkpoints',
+                'indexes': [models.Index(fields=['data_source', 'is_complete'], name='ingestion_ch_source_open_idx')],
+            },
+        ),
+    ]
@@ -1,18 +1,26 @@
 from .data_source import DataSource
+from .content_blob import ContentBlob
 from .source_document import SourceDocument
 from .document_version import DocumentVersion
 from .document_diff import DocumentDiff
 from .parsed_rule import ParsedRule
 from .rule_validation_task import RuleValidationTask
 from .document_chunk import DocumentChunk
+from .embedding_cache_entry import EmbeddingCacheEntry
+from .source_url_state import SourceUrlState
+from .ingestion_checkpoint import IngestionCheckpoint
 
 __all__ = [
     'DataSource',
+    'ContentBlob',
     'SourceDocument',
     'DocumentVersion',
     'DocumentDiff',
     'ParsedRule',
     'RuleValidationTask',
     'DocumentChunk',
+    'EmbeddingCacheEntry',
+    'SourceUrlState',
+    'IngestionCheckpoint',
 ]
 
@@ -0,0 +1,56 @@
+import uuid
+from django.db import models
+from data_ingestion.helpers.content_compression import decompress_text
+
+
+class ContentBlob(models.Model):
+    """
+    Compressed, content-addressed document content (immutable).
+    One row per distinct text (sha256), shared by every SourceDocument and
+    DocumentVersion with the same content.
+    """
+    CODEC_CHOICES = [
+        ('zstd', 'Zstandard'),
+        ('zlib', 'zlib'),
+        ('none', 'Uncompressed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, db_index=True)
+
+    content_hash = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text="SHA-256 hash of the uncompressed UTF-8 text"
+    )
+
+    codec = models.CharField(
+        max_length=10,
+        choices=CODEC_CHOICES,
+        default='zstd',
+        help_text="Compression codec of data"
+    )
+
+    data = models.BinaryField(
+        help_text="Compressed content"
+    )
+
+    size = models.IntegerField(
+        help_text="Uncompressed size in bytes"
+    )
+
+    compressed_size = models.IntegerField(
+        help_text="Compressed size in bytes"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = 'content_blobs'
+        verbose_name_plural = 'Content Blobs'
+
+    def __str__(self):
+        return f"Blob {self.content_hash[:8]}... ({self.compressed_size}/{self.size} bytes)"
+
+    def get_text(self) -> str:
+        """Decompressed content."""
+        return decompress_text(self.codec, self.data)
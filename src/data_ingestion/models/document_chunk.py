@@ -1,4 +1,6 @@
 import uuid
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from pgvector.django import VectorField
 from .document_version import DocumentVersion
@@ -38,6 +40,32 @@ class DocumentChunk(models.Model):
         help_text="Vector embedding for semantic search"
     )
     
+    # Full-text search vector over chunk_text (lexical leg of hybrid retrieval)
+    search_vector = models.GeneratedField(
+        expression=SearchVector('chunk_text', config='english'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        help_text="English tsvector of chunk_text, maintained by the database"
+    )
+    
+    # Filter columns promoted out of metadata so vector search can pre-filter
+    # (partial HNSW indexes per jurisdiction, see migration 0005)
+    jurisdiction = models.CharField(
+        max_length=10,
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="Jurisdiction of the source document (e.g. 'UK')"
+    )
+    
+    visa_code = models.CharField(
+        max_length=100,
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="Visa code the chunk relates to (e.g. 'SKILLED_WORKER')"
+    )
+    
     # Metadata for filtering
     metadata = models.JSONField(
         default=dict,
@@ -53,10 +81,13 @@ class DocumentChunk(models.Model):
         ordering = ['document_version', 'chunk_index']
         indexes = [
             models.Index(fields=['document_version', 'chunk_index']),
+            models.Index(fields=['jurisdiction', 'visa_code'], name='document_ch_jur_visa_idx'),
+            GinIndex(fields=['search_vector'], name='document_ch_search_gin_idx'),
         ]
         verbose_name_plural = 'Document Chunks'
-        # Note: HNSW index for embedding will be created in a separate migration
+        # Note: HNSW indexes for embedding are created in separate migrations
         # CREATE INDEX document_chunks_embedding_idx ON document_chunks USING hnsw (embedding vector_cosine_ops);
+        # plus one partial HNSW index per jurisdiction (WHERE jurisdiction = '<code>')
 
     def __str__(self):
         return f"Chunk {self.chunk_index} of {self.document_version.id}"
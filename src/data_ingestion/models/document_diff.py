@@ -37,6 +37,12 @@ class DocumentDiff(models.Model):
         help_text="Unified diff showing changes between versions"
     )
     
+    structured_diff = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Changed sections, numeric deltas and line counts (DocumentDiffEngine output)"
+    )
+    
     change_type = models.CharField(
         max_length=50,
         choices=CHANGE_TYPE_CHOICES,
@@ -2,6 +2,7 @@ import uuid
 import hashlib
 from django.db import models
 from .source_document import SourceDocument
+from .content_blob import ContentBlob
 
 
 class DocumentVersion(models.Model):
@@ -27,7 +28,18 @@ class DocumentVersion(models.Model):
     )
     
     raw_text = models.TextField(
-        help_text="Extracted text content (cleaned HTML, PDF text, etc.)"
+        blank=True,
+        default='',
+        help_text="Extracted text stored inline (versions created before raw_text_blob)"
+    )
+    
+    raw_text_blob = models.ForeignKey(
+        ContentBlob,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='document_versions',
+        help_text="Compressed extracted text content (cleaned HTML, PDF text, etc.)"
     )
     
     extracted_at = models.DateTimeField(
@@ -54,3 +66,10 @@ class DocumentVersion(models.Model):
     def __str__(self):
         return f"Version {self.content_hash[:8]}... ({self.extracted_at})"
 
+    @property
+    def text(self) -> str:
+        """Extracted text, from the blob store or the legacy inline column."""
+        if self.raw_text_blob_id:
+            return self.raw_text_blob.get_text()
+        return self.raw_text
+
@@ -0,0 +1,38 @@
+import uuid
+from django.db import models
+from pgvector.django import VectorField
+
+
+class EmbeddingCacheEntry(models.Model):
+    """
+    Persistent embedding cache (back tier behind the Redis cache).
+    One row per (embedding model, sha256 of the embedded text).
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, db_index=True)
+
+    model = models.CharField(
+        max_length=100,
+        help_text="Embedding model that produced the vector (e.g. 'text-embedding-ada-002')"
+    )
+
+    text_hash = models.CharField(
+        max_length=64,
+        help_text="SHA-256 hex digest of the embedded text"
+    )
+
+    embedding = VectorField(
+        dimensions=1536,  # OpenAI text-embedding-ada-002 dimension
+        help_text="Cached embedding vector"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = 'embedding_cache'
+        constraints = [
+            models.UniqueConstraint(fields=['model', 'text_hash'], name='embedding_cache_model_hash_uniq'),
+        ]
+        verbose_name_plural = 'Embedding Cache Entries'
+
+    def __str__(self):
+        return f"{self.model}:{self.text_hash[:12]}"
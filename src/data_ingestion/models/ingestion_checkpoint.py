@@ -0,0 +1,61 @@
+import uuid
+from django.db import models
+from .data_source import DataSource
+
+
+class IngestionCheckpoint(models.Model):
+    """
+    Progress of one ingestion run of a data source.
+    A run that stops before its last URL (time budget, worker restart) leaves
+    an open checkpoint; the next ingest_data_source call resumes from it with
+    the same URL list instead of discovering and fetching everything again.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, db_index=True)
+
+    data_source = models.ForeignKey(
+        DataSource,
+        on_delete=models.CASCADE,
+        related_name='ingestion_checkpoints',
+        help_text="The data source being ingested"
+    )
+
+    changed_only = models.BooleanField(
+        default=False,
+        help_text="Whether the run only ingests documents reported as updated"
+    )
+
+    urls = models.JSONField(
+        default=list,
+        help_text="Document URLs discovered at the start of the run, in processing order"
+    )
+
+    next_index = models.PositiveIntegerField(
+        default=0,
+        help_text="Index in urls of the first URL not yet processed"
+    )
+
+    results = models.JSONField(
+        default=dict,
+        help_text="Result counts accumulated over the run's slices"
+    )
+
+    is_complete = models.BooleanField(
+        default=False,
+        db_index=True,
+        help_text="Whether every URL of the run has been processed"
+    )
+
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'ingestion_checkpoints'
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['data_source', 'is_complete'], name='ingestion_ch_source_open_idx'),
+        ]
+        verbose_name_plural = 'Ingestion Checkpoints'
+
+    def __str__(self):
+        return f"{self.data_source_id} run {self.started_at} ({self.next_index}/{len(self.urls)})"
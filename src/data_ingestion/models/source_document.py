@@ -1,6 +1,7 @@
 import uuid
 from django.db import models
 from .data_source import DataSource
+from .content_blob import ContentBlob
 
 
 class SourceDocument(models.Model):
@@ -31,7 +32,18 @@ class SourceDocument(models.Model):
     )
     
     raw_content = models.TextField(
-        help_text="Raw content as fetched (HTML, JSON, PDF text, etc.)"
+        blank=True,
+        default='',
+        help_text="Raw content stored inline (documents fetched before raw_content_blob)"
+    )
+    
+    raw_content_blob = models.ForeignKey(
+        ContentBlob,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='source_documents',
+        help_text="Compressed raw content as fetched (HTML, JSON, PDF text, etc.)"
     )
     
     content_type = models.CharField(
@@ -64,3 +76,10 @@ class SourceDocument(models.Model):
     def __str__(self):
         return f"{self.source_url} ({self.fetched_at})"
 
+    @property
+    def content(self) -> str:
+        """Raw content as fetched, from the blob store or the legacy inline column."""
+        if self.raw_content_blob_id:
+            return self.raw_content_blob.get_text()
+        return self.raw_content
+
@@ -0,0 +1,92 @@
+import uuid
+from django.db import models
+from .data_source import DataSource
+from .document_version import DocumentVersion
+
+
+class SourceUrlState(models.Model):
+    """
+    Fetch state of one URL of a data source (mutable, one row per URL).
+    Holds the HTTP validators sent as If-None-Match / If-Modified-Since on the
+    next fetch, so unchanged pages are skipped without storing a new SourceDocument,
+    and the hash of the URL's latest version, so a fetched page is classified as
+    new, changed or unchanged with one lookup.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, db_index=True)
+
+    data_source = models.ForeignKey(
+        DataSource,
+        on_delete=models.CASCADE,
+        related_name='url_states',
+        help_text="The data source this URL belongs to"
+    )
+
+    source_url = models.URLField(
+        max_length=1000,
+        help_text="Full URL of the document"
+    )
+
+    etag = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        help_text="ETag response header of the last full fetch"
+    )
+
+    last_modified = models.CharField(
+        max_length=100,
+        null=True,
+        blank=True,
+        help_text="Last-Modified response header of the last full fetch (HTTP-date)"
+    )
+
+    public_updated_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="Publisher's last update time (gov.uk public_updated_at)"
+    )
+
+    latest_content_hash = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        help_text="Content hash of the URL's latest DocumentVersion"
+    )
+
+    latest_version = models.ForeignKey(
+        DocumentVersion,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="Latest DocumentVersion of the URL (previous version of the next diff)"
+    )
+
+    last_status_code = models.IntegerField(
+        null=True,
+        blank=True,
+        help_text="HTTP status code of the last fetch (304 when not modified)"
+    )
+
+    last_checked_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        help_text="When this URL was last requested"
+    )
+
+    last_changed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When a content change was last stored for this URL"
+    )
+
+    class Meta:
+        db_table = 'source_url_states'
+        constraints = [
+            models.UniqueConstraint(fields=['data_source', 'source_url'], name='source_url_state_source_url_uniq'),
+        ]
+        verbose_name_plural = 'Source URL States'
+
+    def __str__(self):
+        return f"{self.source_url} ({self.last_status_code})"
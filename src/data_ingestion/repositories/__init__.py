@@ -1,16 +1,22 @@
 from .data_source_repository import DataSourceRepository
+from .content_blob_repository import ContentBlobRepository
 from .source_document_repository import SourceDocumentRepository
 from .document_version_repository import DocumentVersionRepository
 from .document_diff_repository import DocumentDiffRepository
 from .parsed_rule_repository import ParsedRuleRepository
 from .rule_validation_task_repository import RuleValidationTaskRepository
+from .source_url_state_repository import SourceUrlStateRepository
+from .ingestion_checkpoint_repository import IngestionCheckpointRepository
 
 __all__ = [
     'DataSourceRepository',
+    'ContentBlobRepository',
     'SourceDocumentRepository',
     'DocumentVersionRepository',
     'DocumentDiffRepository',
     'ParsedRuleRepository',
     'RuleValidationTaskRepository',
+    'SourceUrlStateRepository',
+    'IngestionCheckpointRepository',
 ]
 
@@ -0,0 +1,40 @@
+from typing import Optional
+from django.db import transaction
+from data_ingestion.helpers.content_compression import compress_text
+from data_ingestion.models.content_blob import ContentBlob
+from helpers.file_hashing import ContentHash
+
+
+class ContentBlobRepository:
+    """Repository for ContentBlob write operations."""
+
+    @staticmethod
+    def get_or_create_blob(text: str, content_hash: Optional[str] = None) -> ContentBlob:
+        """
+        Store text as a compressed blob, deduplicated by its sha256.
+
+        Args:
+            text: Text to store
+            content_hash: Optional precomputed ContentHash.compute_sha256(text)
+
+        Returns:
+            The existing or created ContentBlob
+        """
+        content_hash = content_hash or ContentHash.compute_sha256(text)
+        existing = ContentBlob.objects.filter(content_hash=content_hash).first()
+        if existing:
+            return existing
+
+        codec, data = compress_text(text)
+        with transaction.atomic():
+            # get_or_create: a concurrent insert of the same content wins
+            blob, _ = ContentBlob.objects.get_or_create(
+                content_hash=content_hash,
+                defaults={
+                    'codec': codec,
+                    'data': data,
+                    'size': len(text.encode('utf-8')),
+                    'compressed_size': len(data),
+                }
+            )
+            return blob
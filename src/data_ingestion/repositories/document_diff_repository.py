@@ -8,7 +8,8 @@ class DocumentDiffRepository:
 
     @staticmethod
     def create_document_diff(old_version: DocumentVersion, new_version: DocumentVersion,
-                            diff_text: str, change_type: str = 'minor_text'):
+                            diff_text: str, change_type: str = 'minor_text',
+                            structured_diff: dict = None):
         """Create a new document diff."""
         with transaction.atomic():
             # Check if diff already exists
@@ -23,7 +24,8 @@ class DocumentDiffRepository:
                 old_version=old_version,
                 new_version=new_version,
                 diff_text=diff_text,
-                change_type=change_type
+                change_type=change_type,
+                structured_diff=structured_diff or {}
             )
             diff.full_clean()
             diff.save()
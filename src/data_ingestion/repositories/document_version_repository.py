@@ -2,6 +2,7 @@ from django.db import transaction
 from data_ingestion.models.document_version import DocumentVersion
 from data_ingestion.models.source_document import SourceDocument
 from helpers.file_hashing import ContentHash
+from data_ingestion.repositories.content_blob_repository import ContentBlobRepository
 
 
 class DocumentVersionRepository:
@@ -10,7 +11,7 @@ class DocumentVersionRepository:
     @staticmethod
     def create_document_version(source_document: SourceDocument, raw_text: str, 
                                metadata: dict = None):
-        """Create a new document version."""
+        """Create a new document version (text goes to the blob store)."""
         with transaction.atomic():
             content_hash = ContentHash.compute_sha256(raw_text)
             
@@ -19,13 +20,17 @@ class DocumentVersionRepository:
             if existing:
                 return existing
             
-            version = DocumentVersion.objects.create(
-                source_document=source_document,
+            # get_or_create: concurrent persist workers may insert the same content
+            version, created = DocumentVersion.objects.get_or_create(
                 content_hash=content_hash,
-                raw_text=raw_text,
-                metadata=metadata or {}
+                defaults={
+                    'source_document': source_document,
+                    'raw_text_blob': ContentBlobRepository.get_or_create_blob(raw_text, content_hash),
+                    'metadata': metadata or {},
+                }
             )
-            version.full_clean()
-            version.save()
+            if created:
+                version.full_clean()
+                version.save()
             return version
 
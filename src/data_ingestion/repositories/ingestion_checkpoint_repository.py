@@ -0,0 +1,52 @@
+from typing import Dict, List
+from django.db import transaction
+from django.utils import timezone
+from data_ingestion.models.data_source import DataSource
+from data_ingestion.models.ingestion_checkpoint import IngestionCheckpoint
+
+
+class IngestionCheckpointRepository:
+    """Repository for IngestionCheckpoint write operations."""
+
+    # Errors kept in a checkpoint's results (the run's counts stay exact)
+    MAX_ERRORS = 100
+
+    @staticmethod
+    def start_run(data_source: DataSource, urls: List[str], changed_only: bool = False) -> IngestionCheckpoint:
+        """Open a checkpoint for a new run, discarding unfinished runs of the data source."""
+        with transaction.atomic():
+            IngestionCheckpoint.objects.filter(data_source=data_source, is_complete=False).delete()
+            return IngestionCheckpoint.objects.create(
+                data_source=data_source,
+                changed_only=changed_only,
+                urls=list(urls)
+            )
+
+    @staticmethod
+    def record_slice(checkpoint: IngestionCheckpoint, next_index: int, slice_results: Dict) -> IngestionCheckpoint:
+        """
+        Advance a checkpoint past the URLs processed by one slice of the run.
+
+        Args:
+            checkpoint: IngestionCheckpoint instance
+            next_index: Index in checkpoint.urls of the first unprocessed URL
+            slice_results: IngestionPipeline.run result of the slice; its
+                counts are added to the checkpoint's results
+
+        Returns:
+            Updated IngestionCheckpoint
+        """
+        results = dict(checkpoint.results)
+        for key, value in slice_results.items():
+            if key == 'errors':
+                results['errors'] = (results.get('errors', []) + value)[-IngestionCheckpointRepository.MAX_ERRORS:]
+            elif isinstance(value, int) and not isinstance(value, bool):
+                results[key] = results.get(key, 0) + value
+        with transaction.atomic():
+            checkpoint.next_index = max(checkpoint.next_index, next_index)
+            checkpoint.results = results
+            if checkpoint.next_index >= len(checkpoint.urls):
+                checkpoint.is_complete = True
+                checkpoint.completed_at = timezone.now()
+            checkpoint.save()
+            return checkpoint
@@ -1,6 +1,7 @@
 from django.db import transaction
 from data_ingestion.models.source_document import SourceDocument
 from data_ingestion.models.data_source import DataSource
+from data_ingestion.repositories.content_blob_repository import ContentBlobRepository
 
 
 class SourceDocumentRepository:
@@ -10,12 +11,13 @@ class SourceDocumentRepository:
     def create_source_document(data_source: DataSource, source_url: str, raw_content: str,
                                content_type: str = 'text/html', http_status_code: int = None,
                                fetch_error: str = None):
-        """Create a new source document."""
+        """Create a new source document (raw content goes to the blob store)."""
         with transaction.atomic():
+            raw_content_blob = ContentBlobRepository.get_or_create_blob(raw_content) if raw_content else None
             source_doc = SourceDocument.objects.create(
                 data_source=data_source,
                 source_url=source_url,
-                raw_content=raw_content,
+                raw_content_blob=raw_content_blob,
                 content_type=content_type,
                 http_status_code=http_status_code,
                 fetch_error=fetch_error
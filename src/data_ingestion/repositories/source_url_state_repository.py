@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import Optional
+from django.db import transaction
+from django.utils import timezone
+from data_ingestion.models.data_source import DataSource
+from data_ingestion.models.document_version import DocumentVersion
+from data_ingestion.models.source_url_state import SourceUrlState
+
+
+class SourceUrlStateRepository:
+    """Repository for SourceUrlState write operations."""
+
+    @staticmethod
+    def record_fetch(data_source: DataSource, source_url: str, status_code: Optional[int],
+                     etag: Optional[str] = None, last_modified: Optional[str] = None,
+                     public_updated_at: Optional[datetime] = None,
+                     latest_version: Optional[DocumentVersion] = None, changed: bool = False):
+        """
+        Create or update the fetch state of a URL (one UPDATE for known URLs).
+
+        Validators, public_updated_at and latest_version are only overwritten
+        when given, so a 304 response keeps the state of the last full fetch.
+        latest_version also sets latest_content_hash.
+        """
+        defaults = {'last_status_code': status_code, 'last_checked_at': timezone.now()}
+        if etag is not None:
+            defaults['etag'] = etag
+        if last_modified is not None:
+            defaults['last_modified'] = last_modified
+        if public_updated_at is not None:
+            defaults['public_updated_at'] = public_updated_at
+        if latest_version is not None:
+            defaults['latest_version'] = latest_version
+            defaults['latest_content_hash'] = latest_version.content_hash
+        if changed:
+            defaults['last_changed_at'] = timezone.now()
+
+        with transaction.atomic():
+            updated = SourceUrlState.objects.filter(
+                data_source=data_source, source_url=source_url
+            ).update(**defaults)
+            if not updated:
+                # New URL (update_or_create covers a concurrent insert)
+                SourceUrlState.objects.update_or_create(
+                    data_source=data_source,
+                    source_url=source_url,
+                    defaults=defaults
+                )
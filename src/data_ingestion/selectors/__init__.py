@@ -4,6 +4,8 @@ from .document_version_selector import DocumentVersionSelector
 from .document_diff_selector import DocumentDiffSelector
 from .parsed_rule_selector import ParsedRuleSelector
 from .rule_validation_task_selector import RuleValidationTaskSelector
+from .source_url_state_selector import SourceUrlStateSelector
+from .ingestion_checkpoint_selector import IngestionCheckpointSelector
 
 __all__ = [
     'DataSourceSelector',
@@ -12,5 +14,7 @@ __all__ = [
     'DocumentDiffSelector',
     'ParsedRuleSelector',
     'RuleValidationTaskSelector',
+    'SourceUrlStateSelector',
+    'IngestionCheckpointSelector',
 ]
 
@@ -30,6 +30,16 @@ class DocumentVersionSelector:
             'source_document', 'source_document__data_source'
         ).filter(source_document=source_document).order_by('-extracted_at').first()
 
+    @staticmethod
+    def get_latest_by_source_url(data_source, source_url: str):
+        """Get latest document version of a URL across all of its source documents."""
+        return DocumentVersion.objects.select_related(
+            'source_document', 'source_document__data_source', 'raw_text_blob'
+        ).filter(
+            source_document__data_source=data_source,
+            source_document__source_url=source_url
+        ).order_by('-extracted_at').first()
+
     @staticmethod
     def get_by_id(version_id):
         """Get document version by ID."""
@@ -0,0 +1,23 @@
+from data_ingestion.models.ingestion_checkpoint import IngestionCheckpoint
+
+
+class IngestionCheckpointSelector:
+    """Selector for IngestionCheckpoint read operations."""
+
+    @staticmethod
+    def get_by_data_source(data_source):
+        """Get ingestion checkpoints by data source (latest first)."""
+        return IngestionCheckpoint.objects.filter(data_source=data_source).order_by('-started_at')
+
+    @staticmethod
+    def get_open(data_source):
+        """Get the unfinished run of a data source (None if there is none)."""
+        return IngestionCheckpoint.objects.filter(
+            data_source=data_source,
+            is_complete=False
+        ).order_by('-started_at').first()
+
+    @staticmethod
+    def get_by_id(checkpoint_id):
+        """Get ingestion checkpoint by ID."""
+        return IngestionCheckpoint.objects.select_related('data_source').get(id=checkpoint_id)
@@ -0,0 +1,47 @@
+from typing import Dict, Set
+from django.db.models import Max
+from data_ingestion.models.source_url_state import SourceUrlState
+
+
+class SourceUrlStateSelector:
+    """Selector for SourceUrlState read operations."""
+
+    @staticmethod
+    def get_by_data_source(data_source):
+        """Get URL states by data source."""
+        return SourceUrlState.objects.filter(data_source=data_source)
+
+    @staticmethod
+    def get_by_url(data_source, source_url: str):
+        """Get the state of a URL (None if the URL was never fetched)."""
+        return SourceUrlState.objects.filter(data_source=data_source, source_url=source_url).first()
+
+    @staticmethod
+    def get_state_index(data_source) -> Dict[str, Dict]:
+        """
+        Fetch state of all URLs of a data source, loaded in one query.
+
+        Returns:
+            Dict of source_url to {'etag', 'last_modified', 'latest_content_hash',
+            'latest_version_id'} (usable as fetch_content validators)
+        """
+        rows = SourceUrlState.objects.filter(data_source=data_source).values(
+            'source_url', 'etag', 'last_modified', 'latest_content_hash', 'latest_version_id'
+        )
+        return {row.pop('source_url'): row for row in rows}
+
+    @staticmethod
+    def get_latest_public_updated_at(data_source):
+        """Latest public_updated_at seen for a data source (None if unknown)."""
+        return SourceUrlState.objects.filter(data_source=data_source).aggregate(
+            latest=Max('public_updated_at')
+        )['latest']
+
+    @staticmethod
+    def get_urls_checked_since(data_source, since) -> Set[str]:
+        """URLs of a data source requested at or after a point in time."""
+        return set(
+            SourceUrlState.objects.filter(
+                data_source=data_source, last_checked_at__gte=since
+            ).values_list('source_url', flat=True)
+        )
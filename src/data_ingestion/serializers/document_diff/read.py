@@ -21,6 +21,7 @@ class DocumentDiffSerializer(serializers.ModelSerializer):
             'new_version_hash',
             'new_version_url',
             'diff_text',
+            'structured_diff',
             'change_type',
             'created_at',
         ]
@@ -7,6 +7,7 @@ class DocumentVersionSerializer(serializers.ModelSerializer):
     
     source_url = serializers.CharField(source='source_document.source_url', read_only=True)
     data_source_name = serializers.CharField(source='source_document.data_source.name', read_only=True)
+    raw_text = serializers.CharField(source='text', read_only=True)
     
     class Meta:
         model = DocumentVersion
@@ -1,19 +1,23 @@
 from .ingestion_service import IngestionService
+from .ingestion_pipeline import IngestionPipeline
 from .data_source_service import DataSourceService
 from .rule_parsing_service import RuleParsingService
 from .source_document_service import SourceDocumentService
 from .document_version_service import DocumentVersionService
 from .document_diff_service import DocumentDiffService
+from .document_diff_engine import DocumentDiffEngine
 from .parsed_rule_service import ParsedRuleService
 from .rule_validation_task_service import RuleValidationTaskService
 
 __all__ = [
     'IngestionService',
+    'IngestionPipeline',
     'DataSourceService',
     'RuleParsingService',
     'SourceDocumentService',
     'DocumentVersionService',
     'DocumentDiffService',
+    'DocumentDiffEngine',
     'ParsedRuleService',
     'RuleValidationTaskService',
 ]
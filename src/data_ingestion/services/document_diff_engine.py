@@ -0,0 +1,473 @@
+"""
+Document Diff Engine
+
+Computes DocumentDiff content for two versions of a document:
+
+- line diff: lines are interned to integers, the common prefix and suffix
+  are trimmed, and the rest is diffed with Myers' O(ND) algorithm; past
+  MAX_EDIT_DISTANCE edits (or MAX_DIFF_LINES lines) the remaining block is
+  reported as one replacement instead of searching further
+- section diff: for JSON content (gov.uk Content API), title, description
+  and every leaf under details (body, parts, ...) are compared by path, so a
+  change is attributed to the section it happened in
+- classification with precompiled patterns over the changed lines only
+- structured output (changed sections, numeric deltas such as fees and
+  processing times), stored in DocumentDiff.structured_diff next to diff_text
+"""
+import html
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger('django')
+
+Opcode = Tuple[str, int, int, int, int]
+
+# Classifier patterns (same keywords as the original substring checks)
+REQUIREMENT_KEYWORDS = re.compile(r'salary|threshold|minimum|requirement|must|need')
+FEE_KEYWORDS = re.compile(r'fee|cost|charge|payment')
+TIME_KEYWORDS = re.compile(r'day|week|month|processing|time|duration')
+MONEY_PATTERN = re.compile(r'[£$€]\s*\d+|\d+\s*(pound|dollar|euro)')
+DURATION_PATTERN = re.compile(r'\d+\s*(day|week|month|hour)')
+
+# Numeric delta extraction
+MONEY_VALUE = re.compile(
+    r'(?:[£$€]\s*(\d[\d,]*(?:\.\d+)?))|(?:(\d[\d,]*(?:\.\d+)?)\s*(?:pounds?|dollars?|euros?)\b)',
+    re.IGNORECASE
+)
+DURATION_VALUE = re.compile(r'(\d+(?:\.\d+)?)\s*(hours?|days?|weeks?|months?|years?)\b', re.IGNORECASE)
+
+# HTML bodies are compared as text lines
+BLOCK_TAG = re.compile(r'<\s*(?:br|/p|/li|/h[1-6]|/tr|/div|/ul|/ol|/table)\s*/?\s*>', re.IGNORECASE)
+ANY_TAG = re.compile(r'<[^>]+>')
+BLANK_LINES = re.compile(r'\n\s*\n+')
+
+
+class DocumentDiffEngine:
+    """Line and section diffs, classification and structured output for DocumentDiff."""
+
+    # Edit scripts longer than this are not searched further (Myers is O(ND))
+    MAX_EDIT_DISTANCE = 1000
+    # Blocks with more lines than this (after trimming) are replaced wholesale
+    MAX_DIFF_LINES = 50000
+    CONTEXT_LINES = 3
+    # Top-level Content API keys compared section by section
+    SECTION_KEYS = ('title', 'description', 'details')
+    MAJOR_UPDATE_CHANGED_CHARS = 10000
+    MAX_REPORTED_SECTIONS = 100
+    MAX_REPORTED_DELTAS = 50
+
+    @staticmethod
+    def _myers(a: Sequence[int], b: Sequence[int], max_edits: int) -> Optional[List[Tuple[str, int, int]]]:
+        """
+        Myers shortest edit script.
+
+        Returns:
+            Edits ('equal' | 'delete' | 'insert', index in a, index in b) in
+            order, or None if more than max_edits edits are needed
+        """
+        n, m = len(a), len(b)
+        v = {1: 0}
+        trace = []
+        for d in range(min(n + m, max_edits) + 1):
+            trace.append(v.copy())
+            for k in range(-d, d + 1, 2):
+                if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                    x = v[k + 1]
+                else:
+                    x = v[k - 1] + 1
+                y = x - k
+                while x < n and y < m and a[x] == b[y]:
+                    x += 1
+                    y += 1
+                v[k] = x
+                if x >= n and y >= m:
+                    return DocumentDiffEngine._backtrack(trace, n, m)
+        return None
+
+    @staticmethod
+    def _backtrack(trace: List[Dict[int, int]], n: int, m: int) -> List[Tuple[str, int, int]]:
+        edits = []
+        x, y = n, m
+        for d in range(len(trace) - 1, -1, -1):
+            v = trace[d]
+            k = x - y
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                prev_k = k + 1
+            else:
+                prev_k = k - 1
+            prev_x = v[prev_k]
+            prev_y = prev_x - prev_k
+            while x > prev_x and y > prev_y:
+                x -= 1
+                y -= 1
+                edits.append(('equal', x, y))
+            if d > 0:
+                if x == prev_x:
+                    edits.append(('insert', x, prev_y))
+                else:
+                    edits.append(('delete', prev_x, y))
+            x, y = prev_x, prev_y
+        edits.reverse()
+        return edits
+
+    @staticmethod
+    def line_opcodes(old_lines: Sequence[str], new_lines: Sequence[str]) -> Tuple[List[Opcode], bool]:
+        """
+        difflib-style opcodes between two line lists.
+
+        Args:
+            old_lines: Lines of the old text
+            new_lines: Lines of the new text
+
+        Returns:
+            Tuple of (opcodes, truncated); truncated is True when the size cap
+            replaced part of the diff with one 'replace' block
+        """
+        # Intern lines so the diff compares integers
+        ids: Dict[str, int] = {}
+        a = [ids.setdefault(line, len(ids)) for line in old_lines]
+        b = [ids.setdefault(line, len(ids)) for line in new_lines]
+
+        prefix = 0
+        while prefix < len(a) and prefix < len(b) and a[prefix] == b[prefix]:
+            prefix += 1
+        suffix = 0
+        while (suffix < len(a) - prefix and suffix < len(b) - prefix
+               and a[-1 - suffix] == b[-1 - suffix]):
+            suffix += 1
+
+        a_mid = a[prefix:len(a) - suffix]
+        b_mid = b[prefix:len(b) - suffix]
+        truncated = False
+        edits = None
+        if len(a_mid) + len(b_mid) <= DocumentDiffEngine.MAX_DIFF_LINES:
+            if a_mid and b_mid and set(a_mid).isdisjoint(b_mid):
+                # Nothing in common: one replacement block is the exact answer
+                edits = [('delete', i, 0) for i in range(len(a_mid))] + [('insert', len(a_mid), j) for j in range(len(b_mid))]
+            else:
+                edits = DocumentDiffEngine._myers(a_mid, b_mid, DocumentDiffEngine.MAX_EDIT_DISTANCE)
+        if edits is None and (a_mid or b_mid):
+            truncated = True
+            logger.warning(
+                f"Diff exceeds size cap ({len(a_mid)} x {len(b_mid)} lines), reporting one replacement block"
+            )
+
+        opcodes: List[Opcode] = []
+        if prefix:
+            opcodes.append(('equal', 0, prefix, 0, prefix))
+
+        if edits is None:
+            if a_mid or b_mid:
+                tag = 'replace' if a_mid and b_mid else ('delete' if a_mid else 'insert')
+                opcodes.append((tag, prefix, prefix + len(a_mid), prefix, prefix + len(b_mid)))
+        else:
+            i = j = 0
+            start_i = start_j = 0
+            in_change = False
+            for edit, _, _ in edits:
+                is_equal = edit == 'equal'
+                if is_equal == in_change:
+                    # Run boundary: close the previous run
+                    DocumentDiffEngine._append_run(opcodes, in_change, prefix, start_i, i, start_j, j)
+                    start_i, start_j = i, j
+                    in_change = not is_equal
+                if edit in ('equal', 'delete'):
+                    i += 1
+                if edit in ('equal', 'insert'):
+                    j += 1
+            DocumentDiffEngine._append_run(opcodes, in_change, prefix, start_i, i, start_j, j)
+
+        if suffix:
+            opcodes.append(('equal', len(a) - suffix, len(a), len(b) - suffix, len(b)))
+        return opcodes, truncated
+
+    @staticmethod
+    def _append_run(opcodes: List[Opcode], is_change: bool, offset: int, i1: int, i2: int, j1: int, j2: int):
+        if i1 == i2 and j1 == j2:
+            return
+        if not is_change:
+            tag = 'equal'
+        elif i1 < i2 and j1 < j2:
+            tag = 'replace'
+        else:
+            tag = 'delete' if i1 < i2 else 'insert'
+        opcodes.append((tag, i1 + offset, i2 + offset, j1 + offset, j2 + offset))
+
+    @staticmethod
+    def group_opcodes(opcodes: List[Opcode], context: int) -> List[List[Opcode]]:
+        """Hunks of changes with up to `context` equal lines around them (as difflib)."""
+        codes = list(opcodes) or [('equal', 0, 1, 0, 1)]
+        if codes[0][0] == 'equal':
+            tag, i1, i2, j1, j2 = codes[0]
+            codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+        if codes[-1][0] == 'equal':
+            tag, i1, i2, j1, j2 = codes[-1]
+            codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+
+        groups = []
+        group = []
+        for tag, i1, i2, j1, j2 in codes:
+            if tag == 'equal' and i2 - i1 > context * 2:
+                group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+                groups.append(group)
+                group = []
+                i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+            group.append((tag, i1, i2, j1, j2))
+        if group and not (len(group) == 1 and group[0][0] == 'equal'):
+            groups.append(group)
+        return groups
+
+    @staticmethod
+    def _range(start: int, stop: int) -> str:
+        length = stop - start
+        beginning = start + 1
+        if length == 1:
+            return f"{beginning}"
+        if not length:
+            beginning -= 1
+        return f"{beginning},{length}"
+
+    @staticmethod
+    def unified_diff(old_lines: Sequence[str], new_lines: Sequence[str], groups: List[List[Opcode]]) -> str:
+        """Unified diff text (fromfile old_version, tofile new_version) of grouped opcodes."""
+        if not groups:
+            return ''
+        out = ['--- old_version', '+++ new_version']
+        for group in groups:
+            first, last = group[0], group[-1]
+            old_range = DocumentDiffEngine._range(first[1], last[2])
+            new_range = DocumentDiffEngine._range(first[3], last[4])
+            out.append(f"@@ -{old_range} +{new_range} @@")
+            for tag, i1, i2, j1, j2 in group:
+                if tag == 'equal':
+                    out.extend(' ' + line for line in old_lines[i1:i2])
+                    continue
+                if tag in ('replace', 'delete'):
+                    out.extend('-' + line for line in old_lines[i1:i2])
+                if tag in ('replace', 'insert'):
+                    out.extend('+' + line for line in new_lines[j1:j2])
+        return '\n'.join(out) + '\n'
+
+    @staticmethod
+    def _html_to_lines(value: str) -> List[str]:
+        if '<' not in value:
+            return [line.strip() for line in value.splitlines() if line.strip()]
+        text = BLOCK_TAG.sub('\n', value)
+        text = html.unescape(ANY_TAG.sub('', text))
+        text = BLANK_LINES.sub('\n', text)
+        return [line.strip() for line in text.splitlines() if line.strip()]
+
+    @staticmethod
+    def _flatten(value: Any, path: str, out: Dict[str, str]):
+        if isinstance(value, dict):
+            for key in sorted(value):
+                DocumentDiffEngine._flatten(value[key], f"{path}.{key}" if path else key, out)
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                # Keyed by slug where available so reordered parts are matched
+                label = item.get('slug') if isinstance(item, dict) and item.get('slug') else index
+                DocumentDiffEngine._flatten(item, f"{path}[{label}]", out)
+        elif value is not None:
+            out[path] = str(value)
+
+    @staticmethod
+    def _sections(content: Optional[str]) -> Optional[Dict[str, str]]:
+        """Comparable leaves of a Content API response, by path (None if not JSON)."""
+        if not content:
+            return None
+        try:
+            data = json.loads(content)
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        sections: Dict[str, str] = {}
+        for key in DocumentDiffEngine.SECTION_KEYS:
+            if key in data:
+                DocumentDiffEngine._flatten(data[key], key, sections)
+        return sections
+
+    @staticmethod
+    def diff_sections(old_content: Optional[str], new_content: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Section-level changes between two Content API responses.
+
+        Args:
+            old_content: Raw JSON of the old version
+            new_content: Raw JSON of the new version
+
+        Returns:
+            List of {'section', 'change' ('added' | 'removed' | 'modified'),
+            'lines_added', 'lines_removed', 'removed', 'added'}; 'removed' and
+            'added' are the changed lines of the section. Empty if either side
+            is not JSON.
+        """
+        old_sections = DocumentDiffEngine._sections(old_content)
+        new_sections = DocumentDiffEngine._sections(new_content)
+        if old_sections is None or new_sections is None:
+            return []
+
+        changes = []
+        for path in sorted(old_sections.keys() | new_sections.keys()):
+            old_value, new_value = old_sections.get(path), new_sections.get(path)
+            if old_value == new_value:
+                continue
+            old_lines = DocumentDiffEngine._html_to_lines(old_value) if old_value is not None else []
+            new_lines = DocumentDiffEngine._html_to_lines(new_value) if new_value is not None else []
+            removed, added = DocumentDiffEngine._changed_lines(
+                old_lines, new_lines, DocumentDiffEngine.line_opcodes(old_lines, new_lines)[0]
+            )
+            if old_value is None:
+                change = 'added'
+            elif new_value is None:
+                change = 'removed'
+            else:
+                change = 'modified'
+            changes.append({
+                'section': path,
+                'change': change,
+                'lines_added': len(added),
+                'lines_removed': len(removed),
+                'removed': removed,
+                'added': added,
+            })
+        return changes
+
+    @staticmethod
+    def _changed_lines(old_lines: Sequence[str], new_lines: Sequence[str],
+                       opcodes: List[Opcode]) -> Tuple[List[str], List[str]]:
+        removed, added = [], []
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag in ('replace', 'delete'):
+                removed.extend(old_lines[i1:i2])
+            if tag in ('replace', 'insert'):
+                added.extend(new_lines[j1:j2])
+        return removed, added
+
+    @staticmethod
+    def _parse_number(value: str) -> Optional[float]:
+        try:
+            return float(value.replace(',', ''))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _numeric_tokens(line: str) -> List[Tuple[str, str, Optional[float]]]:
+        tokens = []
+        for match in MONEY_VALUE.finditer(line):
+            amount = match.group(1) or match.group(2)
+            tokens.append(('money', match.group(0).strip(), DocumentDiffEngine._parse_number(amount)))
+        for match in DURATION_VALUE.finditer(line):
+            tokens.append((
+                f"duration_{match.group(2).lower().rstrip('s')}",
+                match.group(0).strip(),
+                DocumentDiffEngine._parse_number(match.group(1))
+            ))
+        return tokens
+
+    @staticmethod
+    def numeric_deltas(removed: Sequence[str], added: Sequence[str],
+                       section: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Amounts and durations whose value changed, paired by kind in order of appearance.
+
+        Args:
+            removed: Removed lines
+            added: Added lines
+            section: Section the lines belong to
+
+        Returns:
+            List of {'kind', 'old', 'new', 'old_value', 'new_value', 'section'}
+        """
+        old_tokens: Dict[str, List[Tuple[str, Optional[float]]]] = {}
+        new_tokens: Dict[str, List[Tuple[str, Optional[float]]]] = {}
+        for lines, tokens in ((removed, old_tokens), (added, new_tokens)):
+            for line in lines:
+                for kind, text, value in DocumentDiffEngine._numeric_tokens(line):
+                    tokens.setdefault(kind, []).append((text, value))
+
+        deltas = []
+        for kind in sorted(old_tokens.keys() & new_tokens.keys()):
+            for (old_text, old_value), (new_text, new_value) in zip(old_tokens[kind], new_tokens[kind]):
+                if old_value == new_value:
+                    continue
+                deltas.append({
+                    'kind': kind,
+                    'old': old_text,
+                    'new': new_text,
+                    'old_value': old_value,
+                    'new_value': new_value,
+                    'section': section,
+                })
+        return deltas
+
+    @staticmethod
+    def classify(changed_text: str, truncated: bool = False) -> str:
+        """
+        Classify a change from its changed (added and removed) lines.
+
+        Args:
+            changed_text: Changed lines joined by newlines
+            truncated: Whether the diff hit the size cap
+
+        Returns:
+            DocumentDiff change type
+        """
+        changed = changed_text.lower()
+        if REQUIREMENT_KEYWORDS.search(changed) and MONEY_PATTERN.search(changed):
+            return 'requirement_change'
+        if FEE_KEYWORDS.search(changed) and MONEY_PATTERN.search(changed):
+            return 'fee_change'
+        if TIME_KEYWORDS.search(changed) and DURATION_PATTERN.search(changed):
+            return 'processing_time_change'
+        if truncated or len(changed) > DocumentDiffEngine.MAJOR_UPDATE_CHANGED_CHARS:
+            return 'major_update'
+        return 'minor_text'
+
+    @staticmethod
+    def compute(old_text: str, new_text: str, old_content: Optional[str] = None,
+                new_content: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Diff two document versions.
+
+        Args:
+            old_text: Extracted text of the old version
+            new_text: Extracted text of the new version
+            old_content: Optional raw content of the old version (section diff if JSON)
+            new_content: Optional raw content of the new version
+
+        Returns:
+            Dict with 'diff_text' (unified diff of the extracted text),
+            'change_type' and 'structured' (DocumentDiff.structured_diff)
+        """
+        old_lines = (old_text or '').splitlines()
+        new_lines = (new_text or '').splitlines()
+        opcodes, truncated = DocumentDiffEngine.line_opcodes(old_lines, new_lines)
+        groups = DocumentDiffEngine.group_opcodes(opcodes, DocumentDiffEngine.CONTEXT_LINES)
+        diff_text = DocumentDiffEngine.unified_diff(old_lines, new_lines, groups)
+        removed, added = DocumentDiffEngine._changed_lines(old_lines, new_lines, opcodes)
+
+        sections = DocumentDiffEngine.diff_sections(old_content, new_content)
+        deltas = DocumentDiffEngine.numeric_deltas(removed, added)
+        changed_parts = removed + added
+        for section in sections:
+            deltas.extend(DocumentDiffEngine.numeric_deltas(section['removed'], section['added'], section['section']))
+            changed_parts.extend(section['removed'])
+            changed_parts.extend(section['added'])
+
+        change_type = DocumentDiffEngine.classify('\n'.join(changed_parts), truncated)
+        structured = {
+            'truncated': truncated,
+            'hunks': len(groups),
+            'lines_added': len(added),
+            'lines_removed': len(removed),
+            'changed_sections': [
+                {key: value for key, value in section.items() if key not in ('removed', 'added')}
+                for section in sections[:DocumentDiffEngine.MAX_REPORTED_SECTIONS]
+            ],
+            'sections_changed': len(sections),
+            'numeric_deltas': deltas[:DocumentDiffEngine.MAX_REPORTED_DELTAS],
+        }
+        return {'diff_text': diff_text, 'change_type': change_type, 'structured': structured}
@@ -0,0 +1,285 @@
+"""
+Ingestion Pipeline
+
+Processes the URLs of one data source run in stages connected by bounded
+queues, each stage with its own concurrency:
+
+1. fetch: the ingestion system's fetch_many (its own rate-limited pool)
+2. normalize: extract text and metadata, hash (IngestionService.prepare_url)
+3. persist: classify and write state, source document, version and diff
+   (IngestionService.persist_url); the worker count bounds the database
+   connections used by a run
+4. parse: rule parsing of new versions, dispatched as
+   parse_document_version_task Celery tasks (inline if dispatch fails)
+
+A full queue blocks the stage feeding it, so a slow stage throttles the
+stages before it instead of buffering the whole crawl in memory.
+
+With a deadline, the fetch stage stops taking new URLs once it has passed;
+URLs already fetched are still processed, and the count left over is
+returned as 'urls_remaining' (IngestionService resumes from there).
+
+Per-stage throughput and queue depth are recorded as Prometheus metrics
+(ingestion_stage_items_total, ingestion_stage_seconds, ingestion_queue_depth),
+served by the Celery worker's exporter (CELERY_METRICS_PORT with
+PROMETHEUS_MULTIPROC_DIR, see main_system/celery.py), and returned in the run
+results ('stage_metrics').
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connection
+from prometheus_client import Counter, Gauge, Histogram
+
+from data_ingestion.services.ingestion_service import IngestionService
+
+logger = logging.getLogger('django')
+
+INGESTION_STAGE_ITEMS = Counter(
+    'ingestion_stage_items_total',
+    'URLs processed per ingestion stage',
+    ['stage', 'jurisdiction']
+)
+INGESTION_STAGE_SECONDS = Histogram(
+    'ingestion_stage_seconds',
+    'Processing time of one URL per ingestion stage',
+    ['stage']
+)
+INGESTION_QUEUE_DEPTH = Gauge(
+    'ingestion_queue_depth',
+    'URLs waiting between ingestion stages',
+    ['queue'],
+    # Summed over the worker's live pool processes in multiprocess mode
+    multiprocess_mode='livesum'
+)
+
+_DONE = object()
+
+
+class IngestionPipeline:
+    """Staged, concurrent processing of the URLs of one data source run."""
+
+    DEFAULT_NORMALIZE_WORKERS = 2
+    DEFAULT_PERSIST_WORKERS = 4
+    DEFAULT_QUEUE_SIZE = 100
+    STAGES = ('fetch', 'normalize', 'persist', 'parse')
+
+    def __init__(self, data_source, ingestion_system, url_states: Optional[Dict[str, Dict]] = None):
+        """
+        Args:
+            data_source: DataSource instance
+            ingestion_system: Ingestion system of the data source
+            url_states: SourceUrlStateSelector.get_state_index result
+        """
+        self.data_source = data_source
+        self.ingestion_system = ingestion_system
+        self.url_states = url_states or {}
+        self.normalize_workers = getattr(settings, 'INGESTION_NORMALIZE_WORKERS', None) or self.DEFAULT_NORMALIZE_WORKERS
+        self.persist_workers = getattr(settings, 'INGESTION_PERSIST_WORKERS', None) or self.DEFAULT_PERSIST_WORKERS
+        queue_size = getattr(settings, 'INGESTION_QUEUE_SIZE', None) or self.DEFAULT_QUEUE_SIZE
+        self.queues = {
+            'normalize': queue.Queue(maxsize=queue_size),
+            'persist': queue.Queue(maxsize=queue_size),
+        }
+
+        self.results = {
+            'urls_processed': 0,
+            'urls_not_modified': 0,
+            'urls_unchanged': 0,
+            'new_versions': 0,
+            'diffs_created': 0,
+            'rules_parsed': 0,
+            'validation_tasks_created': 0,
+            'parse_tasks_dispatched': 0,
+            'urls_remaining': 0,
+            'errors': []
+        }
+        self._lock = threading.Lock()
+        self._stage_items = {stage: 0 for stage in self.STAGES}
+        self._stage_seconds = {stage: 0.0 for stage in self.STAGES}
+        self._max_queue_depth = {name: 0 for name in self.queues}
+
+    def run(self, urls: List[str], deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Process URLs through all stages and wait for the run to finish.
+
+        Args:
+            urls: URLs to ingest
+            deadline: Optional time.monotonic() value after which no further
+                URLs are fetched
+
+        Returns:
+            Aggregated results (IngestionService.ingest_data_source keys) with
+            'parse_tasks_dispatched', 'urls_remaining' (URLs not fetched
+            before the deadline or a fetch stage failure, the tail of urls)
+            and 'stage_metrics'
+        """
+        started_at = time.monotonic()
+        fetcher = threading.Thread(target=self._fetch_stage, args=(urls, deadline), name='ingestion-fetch')
+        normalizers = [
+            threading.Thread(target=self._normalize_stage, name=f'ingestion-normalize-{index}')
+            for index in range(self.normalize_workers)
+        ]
+        persisters = [
+            threading.Thread(target=self._persist_stage, name=f'ingestion-persist-{index}')
+            for index in range(self.persist_workers)
+        ]
+
+        for thread in [fetcher] + normalizers + persisters:
+            thread.start()
+
+        fetcher.join()
+        for thread in normalizers:
+            thread.join()
+        # Normalizers are done, so the persist queue only gets the stop markers now
+        for _ in persisters:
+            self.queues['persist'].put(_DONE)
+        for thread in persisters:
+            thread.join()
+
+        elapsed = time.monotonic() - started_at
+        self.results['stage_metrics'] = {
+            'elapsed_seconds': round(elapsed, 2),
+            'stages': {
+                stage: {
+                    'items': self._stage_items[stage],
+                    'busy_seconds': round(self._stage_seconds[stage], 2),
+                    'items_per_second': round(self._stage_items[stage] / elapsed, 2) if elapsed else 0.0,
+                }
+                for stage in self.STAGES
+            },
+            'max_queue_depth': dict(self._max_queue_depth),
+            'workers': {'normalize': self.normalize_workers, 'persist': self.persist_workers},
+        }
+        logger.info(
+            f"Ingestion pipeline for data source {self.data_source.id} finished in {elapsed:.1f}s: "
+            f"{self.results['stage_metrics']['stages']}"
+        )
+        return self.results
+
+    def _put(self, name: str, item):
+        stage_queue = self.queues[name]
+        stage_queue.put(item)
+        depth = stage_queue.qsize()
+        INGESTION_QUEUE_DEPTH.labels(queue=name).set(depth)
+        with self._lock:
+            self._max_queue_depth[name] = max(self._max_queue_depth[name], depth)
+
+    def _get(self, name: str):
+        item = self.queues[name].get()
+        INGESTION_QUEUE_DEPTH.labels(queue=name).set(self.queues[name].qsize())
+        return item
+
+    def _count(self, stage: str, seconds: float):
+        with self._lock:
+            self._stage_items[stage] += 1
+            self._stage_seconds[stage] += seconds
+        INGESTION_STAGE_ITEMS.labels(stage=stage, jurisdiction=self.data_source.jurisdiction).inc()
+        INGESTION_STAGE_SECONDS.labels(stage=stage).observe(seconds)
+
+    def _record_error(self, url: Optional[str], error: str):
+        with self._lock:
+            self.results['errors'].append({'url': url, 'error': error})
+
+    def _fetch_stage(self, urls: List[str], deadline: Optional[float] = None):
+        fetched = 0
+        results = None
+        try:
+            started_at = time.monotonic()
+            results = self.ingestion_system.fetch_many(urls, self.url_states)
+            for url, fetch_result in results:
+                # Time spent fetching (and waiting for the fetch pool), not waiting on a full queue
+                self._count('fetch', time.monotonic() - started_at)
+                self._put('normalize', (url, fetch_result))
+                fetched += 1
+                if deadline is not None and time.monotonic() >= deadline:
+                    logger.info(
+                        f"Ingestion of data source {self.data_source.id} reached its time budget "
+                        f"after {fetched} of {len(urls)} URLs"
+                    )
+                    break
+                started_at = time.monotonic()
+        except Exception as e:
+            logger.error(f"Error fetching URLs for data source {self.data_source.id}: {e}", exc_info=True)
+            self._record_error(None, f"Fetch stage failed: {e}")
+        finally:
+            # Stops the look-ahead of fetch_many when the deadline cut the run short
+            if results is not None and hasattr(results, 'close'):
+                results.close()
+            self.results['urls_remaining'] = len(urls) - fetched
+            for _ in range(self.normalize_workers):
+                self._put('normalize', _DONE)
+
+    def _normalize_stage(self):
+        while True:
+            item = self._get('normalize')
+            if item is _DONE:
+                return
+            url, fetch_result = item
+            started_at = time.monotonic()
+            try:
+                prepared = IngestionService.prepare_url(
+                    self.ingestion_system, url, fetch_result, self.url_states.get(url, {})
+                )
+            except Exception as e:
+                logger.error(f"Error normalizing URL {url}: {e}")
+                prepared = {'url': url, 'url_state': {}, 'error': str(e)}
+            self._count('normalize', time.monotonic() - started_at)
+            self._put('persist', prepared)
+
+    def _persist_stage(self):
+        try:
+            while True:
+                prepared = self._get('persist')
+                if prepared is _DONE:
+                    return
+                url = prepared['url']
+                started_at = time.monotonic()
+                try:
+                    result, new_version = IngestionService.persist_url(self.data_source, prepared)
+                    self._count('persist', time.monotonic() - started_at)
+                    if new_version:
+                        result.update(self._parse_stage(new_version, url))
+                    self._record_result(result)
+                except Exception as e:
+                    logger.error(f"Error processing URL {url}: {e}")
+                    self._record_error(url, str(e))
+        finally:
+            # Each persist thread has its own database connection
+            connection.close()
+
+    def _parse_stage(self, new_version, url: str) -> Dict[str, Any]:
+        started_at = time.monotonic()
+        try:
+            from data_ingestion.tasks.ingestion_tasks import parse_document_version_task
+            parse_document_version_task.delay(str(new_version.id))
+            result = {'parse_task_dispatched': True}
+        except Exception as e:
+            logger.warning(f"Could not dispatch rule parsing for {url}, parsing inline: {e}")
+            result = IngestionService.parse_document_version(new_version, url)
+        self._count('parse', time.monotonic() - started_at)
+        return result
+
+    def _record_result(self, result: Dict[str, Any]):
+        with self._lock:
+            results = self.results
+            if result.get('error'):
+                results['errors'].append({'url': result['url'], 'error': result['error']})
+                return
+            results['urls_processed'] += 1
+            if result.get('not_modified'):
+                results['urls_not_modified'] += 1
+            if result.get('unchanged'):
+                results['urls_unchanged'] += 1
+            if result.get('new_version'):
+                results['new_versions'] += 1
+            if result.get('diff_created'):
+                results['diffs_created'] += 1
+            if result.get('parse_task_dispatched'):
+                results['parse_tasks_dispatched'] += 1
+            results['rules_parsed'] += result.get('rules_parsed', 0)
+            results['validation_tasks_created'] += result.get('validation_tasks_created', 0)
@@ -1,14 +1,26 @@
-import difflib
 import logging
-from typing import Dict
+import time
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from data_ingestion.models.data_source import DataSource
+from data_ingestion.models.document_version import DocumentVersion
+from data_ingestion.models.ingestion_checkpoint import IngestionCheckpoint
 from data_ingestion.ingestion.factory import IngestionSystemFactory
+from data_ingestion.services.document_diff_engine import DocumentDiffEngine
 from data_ingestion.repositories.data_source_repository import DataSourceRepository
 from data_ingestion.repositories.source_document_repository import SourceDocumentRepository
 from data_ingestion.repositories.document_version_repository import DocumentVersionRepository
 from data_ingestion.repositories.document_diff_repository import DocumentDiffRepository
+from data_ingestion.repositories.source_url_state_repository import SourceUrlStateRepository
+from data_ingestion.repositories.ingestion_checkpoint_repository import IngestionCheckpointRepository
 from data_ingestion.selectors.data_source_selector import DataSourceSelector
 from data_ingestion.selectors.document_version_selector import DocumentVersionSelector
+from data_ingestion.selectors.source_url_state_selector import SourceUrlStateSelector
+from data_ingestion.selectors.ingestion_checkpoint_selector import IngestionCheckpointSelector
 
 logger = logging.getLogger('django')
 
@@ -17,110 +29,373 @@ class IngestionService:
     """
     Main service for orchestrating the ingestion pipeline.
     Handles: Fetch → Hash → Diff → Parse → Validate
+
+    The steps of a URL are split into prepare_url (normalize and hash, no
+    database access), persist_url and parse_document_version, which
+    IngestionPipeline runs as concurrent stages.
+
+    Ingestion is incremental: URLs are requested with the ETag/Last-Modified
+    validators of their last fetch (SourceUrlState), and pages that are not
+    modified, or whose extracted text hashes to the URL's latest version,
+    are skipped before anything is written besides their fetch state.
+
+    The SourceUrlState rows of a data source are loaded once per run (the
+    URL state index), so classifying a fetched page as new, changed or
+    unchanged is a dict lookup rather than a query per URL.
     """
 
+    # Result counts of a run, accumulated over its slices in the checkpoint
+    RESULT_COUNT_KEYS = (
+        'urls_processed', 'urls_not_modified', 'urls_unchanged', 'new_versions', 'diffs_created',
+        'rules_parsed', 'validation_tasks_created', 'parse_tasks_dispatched',
+    )
+    # Unfinished runs older than this are restarted instead of resumed
+    CHECKPOINT_MAX_AGE = timedelta(days=1)
+    # Expiry of the per-source lock of runs without a time budget
+    LOCK_TIMEOUT = 60 * 60
+
     @staticmethod
-    def ingest_data_source(data_source_id: str) -> Dict:
+    def ingest_data_source(data_source_id: str, changed_only: bool = False,
+                           time_budget: Optional[float] = None, discover: bool = True) -> Dict:
         """
         Main ingestion method for a data source.
         
+        Runs are checkpointed (IngestionCheckpoint): the URLs discovered at
+        the start of a run and the index of the first unprocessed URL are
+        saved after every call, so a call that stops early (time budget,
+        error, killed worker) is resumed by the next call rather than
+        restarted. Only one call per data source runs at a time.
+        
         Args:
             data_source_id: UUID of the data source to ingest
+            changed_only: Only discover documents updated since the latest
+                public_updated_at seen for the source (change feed), instead of
+                revalidating every document (ignored when resuming a run)
+            time_budget: Optional seconds after which no further URLs are
+                fetched; the rest of the run is left to the next call
+            discover: Discover URLs when there is no open run; when False,
+                such a call returns 'needs_discovery' and discovery is left to
+                discover_urls (run as its own task)
+            
+        Returns:
+            Dict with ingestion results, counted over the whole run; 'complete'
+            is False while URLs remain ('urls_remaining')
+            
+        Raises:
+            Exception: Unexpected errors are raised (after logging), so a task
+                can retry; the retry resumes from the checkpoint
+        """
+        deadline = time.monotonic() + time_budget if time_budget else None
+        lock_timeout = getattr(settings, 'CELERY_TASK_TIME_LIMIT', None) if time_budget else None
+        return IngestionService._run_locked(
+            data_source_id, lock_timeout,
+            IngestionService._ingest_data_source, data_source_id, changed_only, deadline, discover
+        )
+
+    @staticmethod
+    def discover_urls(data_source_id: str, changed_only: bool = False) -> Dict:
+        """
+        Discover the URLs of a data source and open a run checkpoint for them.
+        
+        Discovery (e.g. the gov.uk taxon walk and Search API paging) is not
+        bounded by the ingestion time budget, so it runs as its own task; an
+        open, recent checkpoint is kept instead of discovering again. Documents
+        discovery already fetched are ingested before returning (see _start_run).
+        
+        Args:
+            data_source_id: UUID of the data source
+            changed_only: Only discover documents updated since the latest
+                public_updated_at seen for the source
             
         Returns:
-            Dict with ingestion results
+            Dict with 'success', 'checkpoint_id', 'urls_total', 'resumed' and
+            'urls_processed' (documents of the run ingested so far)
+            
+        Raises:
+            Exception: Unexpected errors are raised (after logging)
+        """
+        return IngestionService._run_locked(
+            data_source_id, getattr(settings, 'INGESTION_DISCOVERY_TIME_LIMIT', None),
+            IngestionService._discover_urls, data_source_id, changed_only
+        )
+
+    @staticmethod
+    def _run_locked(data_source_id: str, lock_timeout: Optional[int], func, *args) -> Dict:
+        """Run func(*args) holding the data source's ingestion lock (skipped if already held)."""
+        lock_key = f"data_ingestion:ingest:{data_source_id}"
+        if not cache.add(lock_key, 'locked', timeout=lock_timeout or IngestionService.LOCK_TIMEOUT):
+            logger.warning(f"Ingestion of data source {data_source_id} is already running")
+            return {
+                'success': False,
+                'data_source_id': str(data_source_id),
+                'already_running': True,
+                'message': 'Ingestion already running'
+            }
+        try:
+            return func(*args)
+        finally:
+            cache.delete(lock_key)
+
+    @staticmethod
+    def _get_ingestion_system(data_source_id: str):
+        """
+        Load an active data source and its ingestion system.
+        
+        Returns:
+            Tuple of (DataSource, ingestion system, None), or
+            (None, None, failure result) when ingestion is not possible
         """
         try:
             data_source = DataSourceSelector.get_by_id(data_source_id)
+        except DataSource.DoesNotExist:
+            logger.error(f"Data source {data_source_id} not found")
+            return None, None, {'success': False, 'message': 'Data source not found'}
+        
+        if not data_source.is_active:
+            logger.warning(f"Data source {data_source_id} is not active")
+            return None, None, {'success': False, 'message': 'Data source is not active'}
+        
+        # Get the appropriate ingestion system
+        ingestion_system = IngestionSystemFactory.create(data_source)
+        if not ingestion_system:
+            logger.error(f"Could not create ingestion system for {data_source.jurisdiction}")
+            return None, None, {'success': False, 'message': f'Unsupported jurisdiction: {data_source.jurisdiction}'}
+        return data_source, ingestion_system, None
+
+    @staticmethod
+    def _discover_urls(data_source_id: str, changed_only: bool) -> Dict:
+        try:
+            data_source, ingestion_system, failure = IngestionService._get_ingestion_system(data_source_id)
+            if failure:
+                return failure
             
-            if not data_source.is_active:
-                logger.warning(f"Data source {data_source_id} is not active")
-                return {'success': False, 'message': 'Data source is not active'}
+            checkpoint, resumed = IngestionService._get_checkpoint(data_source, ingestion_system, changed_only)
+            logger.info(
+                f"{'Kept open run' if resumed else 'Discovered'} {len(checkpoint.urls)} URLs "
+                f"for data source {data_source_id}"
+            )
+            return {
+                'success': True,
+                'data_source_id': str(data_source_id),
+                'checkpoint_id': str(checkpoint.id),
+                'urls_total': len(checkpoint.urls),
+                'resumed': resumed,
+                'urls_processed': checkpoint.results.get('urls_processed', 0),
+            }
+        except Exception as e:
+            logger.error(f"Error discovering URLs of data source {data_source_id}: {e}")
+            raise
+
+    @staticmethod
+    def _ingest_data_source(data_source_id: str, changed_only: bool, deadline: Optional[float],
+                            discover: bool = True) -> Dict:
+        try:
+            data_source, ingestion_system, failure = IngestionService._get_ingestion_system(data_source_id)
+            if failure:
+                return failure
             
-            # Get the appropriate ingestion system
-            ingestion_system = IngestionSystemFactory.create(data_source)
-            if not ingestion_system:
-                logger.error(f"Could not create ingestion system for {data_source.jurisdiction}")
-                return {'success': False, 'message': f'Unsupported jurisdiction: {data_source.jurisdiction}'}
+            # Get document URLs to fetch (from the open checkpoint when resuming)
+            checkpoint, _ = IngestionService._get_checkpoint(
+                data_source, ingestion_system, changed_only, discover=discover
+            )
+            if checkpoint is None:
+                return {
+                    'success': True,
+                    'data_source_id': str(data_source_id),
+                    'data_source_name': data_source.name,
+                    'complete': False,
+                    'needs_discovery': True,
+                }
+            url_states = SourceUrlStateSelector.get_state_index(data_source)
+            
+            # Skip URLs this run already processed past its checkpoint (by an
+            # interrupted call, or during discovery; see _start_run)
+            checked = SourceUrlStateSelector.get_urls_checked_since(data_source, checkpoint.started_at)
+            pending = [
+                (index, url)
+                for index, url in enumerate(checkpoint.urls[checkpoint.next_index:], start=checkpoint.next_index)
+                if url not in checked
+            ]
             
-            # Get document URLs to fetch
-            urls = ingestion_system.get_document_urls()
+            # Fetch, normalize, persist and parse concurrently (see IngestionPipeline)
+            from data_ingestion.services.ingestion_pipeline import IngestionPipeline
+            slice_results = IngestionPipeline(data_source, ingestion_system, url_states).run(
+                [url for _, url in pending], deadline=deadline
+            )
+            stage_metrics = slice_results.pop('stage_metrics')
+            done = len(pending) - slice_results.pop('urls_remaining')
+            next_index = pending[done][0] if done < len(pending) else len(checkpoint.urls)
+            checkpoint = IngestionCheckpointRepository.record_slice(checkpoint, next_index, slice_results)
             
             results = {
                 'success': True,
                 'data_source_id': str(data_source_id),
-                'urls_processed': 0,
-                'new_versions': 0,
-                'diffs_created': 0,
-                'rules_parsed': 0,
-                'validation_tasks_created': 0,
-                'errors': []
+                'data_source_name': data_source.name,
+                'checkpoint_id': str(checkpoint.id),
+                'complete': checkpoint.is_complete,
+                'urls_total': len(checkpoint.urls),
+                'urls_remaining': len(checkpoint.urls) - checkpoint.next_index,
+                'slice_urls_processed': done,
+                **{key: checkpoint.results.get(key, 0) for key in IngestionService.RESULT_COUNT_KEYS},
+                'errors': checkpoint.results.get('errors', []),
+                'stage_metrics': stage_metrics,
             }
             
-            # Process each URL
-            for url in urls:
-                try:
-                    result = IngestionService._process_url(
-                        data_source, ingestion_system, url
-                    )
-                    results['urls_processed'] += 1
-                    if result.get('new_version'):
-                        results['new_versions'] += 1
-                    if result.get('diff_created'):
-                        results['diffs_created'] += 1
-                    if result.get('rules_parsed'):
-                        results['rules_parsed'] += result.get('rules_parsed', 0)
-                    if result.get('validation_tasks_created'):
-                        results['validation_tasks_created'] += result.get('validation_tasks_created', 0)
-                except Exception as e:
-                    logger.error(f"Error processing URL {url}: {e}")
-                    results['errors'].append({'url': url, 'error': str(e)})
+            if not checkpoint.is_complete:
+                logger.info(
+                    f"Ingestion of data source {data_source_id} paused: "
+                    f"{results['urls_remaining']} of {results['urls_total']} URLs remaining"
+                )
+                return results
             
             # Update last_fetched_at
             DataSourceRepository.update_last_fetched(data_source)
+
+            logger.info(
+                f"Ingested data source {data_source_id}: {results['urls_processed']} URLs, "
+                f"{results['urls_not_modified']} not modified, {results['urls_unchanged']} unchanged, "
+                f"{results['new_versions']} new versions, "
+                f"{results['parse_tasks_dispatched']} parse tasks dispatched"
+            )
             
             return results
             
-        except DataSource.DoesNotExist:
-            logger.error(f"Data source {data_source_id} not found")
-            return {'success': False, 'message': 'Data source not found'}
         except Exception as e:
             logger.error(f"Error ingesting data source {data_source_id}: {e}")
-            return {'success': False, 'message': str(e)}
+            raise
+
+    @staticmethod
+    def _get_checkpoint(data_source: DataSource, ingestion_system, changed_only: bool,
+                        discover: bool = True) -> Tuple[Optional[IngestionCheckpoint], bool]:
+        """
+        Open checkpoint of a data source, or a new run with freshly discovered URLs.
+        
+        Returns:
+            Tuple of (IngestionCheckpoint, whether an unfinished run is resumed);
+            the checkpoint is None when there is no open run and discover is False
+        """
+        checkpoint = IngestionCheckpointSelector.get_open(data_source)
+        if checkpoint and checkpoint.started_at >= timezone.now() - IngestionService.CHECKPOINT_MAX_AGE:
+            logger.info(
+                f"Resuming ingestion of data source {data_source.id} at URL "
+                f"{checkpoint.next_index + 1} of {len(checkpoint.urls)}"
+            )
+            return checkpoint, True
+        if not discover:
+            return None, False
+        return IngestionService._start_run(data_source, ingestion_system, changed_only), False
 
     @staticmethod
-    def _process_url(data_source: DataSource, ingestion_system, url: str) -> Dict:
+    def _start_run(data_source: DataSource, ingestion_system, changed_only: bool) -> IngestionCheckpoint:
         """
-        Process a single URL: fetch, extract, hash, compare, create version/diff.
+        Discover the URLs of a new run and open its checkpoint.
+        
+        Documents whose content discovery already fetched (e.g. gov.uk taxon
+        pages, see get_prefetched_urls) are ingested right away with the same
+        ingestion system, so no later slice requests them again. next_index is
+        left at 0: slices skip the URLs checked since the run started.
+        
+        Returns:
+            New IngestionCheckpoint, with the counts of the prefetched documents
+        """
+        since = SourceUrlStateSelector.get_latest_public_updated_at(data_source) if changed_only else None
+        urls = ingestion_system.get_document_urls(since=since)
+        checkpoint = IngestionCheckpointRepository.start_run(data_source, urls, changed_only)
+        
+        prefetched = set(ingestion_system.get_prefetched_urls())
+        prefetched_urls = [url for url in checkpoint.urls if url in prefetched]
+        if not prefetched_urls:
+            return checkpoint
+        
+        from data_ingestion.services.ingestion_pipeline import IngestionPipeline
+        url_states = SourceUrlStateSelector.get_state_index(data_source)
+        slice_results = IngestionPipeline(data_source, ingestion_system, url_states).run(prefetched_urls)
+        slice_results.pop('stage_metrics')
+        slice_results.pop('urls_remaining')
+        logger.info(
+            f"Ingested {len(prefetched_urls)} documents fetched during discovery of data source {data_source.id}"
+        )
+        return IngestionCheckpointRepository.record_slice(checkpoint, 0, slice_results)
+
+    @staticmethod
+    def summarize_runs(results: List[Dict]) -> Dict:
+        """
+        Combine the results of ingest_data_source calls over several data sources.
         
         Args:
-            data_source: DataSource instance
-            ingestion_system: Ingestion system instance
-            url: URL to process
+            results: ingest_data_source results (None entries count as failed)
             
         Returns:
-            Dict with processing results
+            Dict with 'total_sources', 'processed', 'successful', 'failed',
+            'incomplete', the summed 'urls_processed', 'new_versions' and
+            'rules_parsed', and per-source 'details'
         """
-        result = {
-            'url': url,
-            'new_version': False,
-            'diff_created': False
+        summary = {
+            'total_sources': len(results),
+            'processed': 0,
+            'successful': 0,
+            'failed': 0,
+            'incomplete': 0,
+            'urls_processed': 0,
+            'new_versions': 0,
+            'rules_parsed': 0,
+            'details': []
         }
+        for result in results:
+            result = result or {'success': False, 'message': 'No result'}
+            summary['processed'] += 1
+            if result.get('success'):
+                summary['successful'] += 1
+                summary['urls_processed'] += result.get('urls_processed', 0)
+                summary['new_versions'] += result.get('new_versions', 0)
+                summary['rules_parsed'] += result.get('rules_parsed', 0)
+                if not result.get('complete', True):
+                    summary['incomplete'] += 1
+            else:
+                summary['failed'] += 1
+            summary['details'].append({
+                'data_source_id': result.get('data_source_id'),
+                'name': result.get('data_source_name'),
+                'result': {key: value for key, value in result.items() if key != 'stage_metrics'}
+            })
+        return summary
+
+    @staticmethod
+    def prepare_url(ingestion_system, url: str, fetch_result: Optional[Dict],
+                    url_state: Optional[Dict] = None) -> Dict:
+        """
+        Normalize and hash a fetched URL (no database access).
         
-        # 1. Fetch content
-        fetch_result = ingestion_system.fetch_content(url)
+        Args:
+            ingestion_system: Ingestion system instance
+            url: URL that was fetched
+            fetch_result: fetch_content result
+            url_state: The URL's SourceUrlStateSelector.get_state_index entry
+            
+        Returns:
+            Dict with 'url', 'url_state', 'status_code', 'etag', 'last_modified'
+            and either 'error', 'not_modified' or the fetched 'content',
+            'content_type', 'extracted_text', 'metadata', 'public_updated_at'
+            and 'content_hash'
+        """
+        url_state = url_state or {}
+        prepared = {'url': url, 'url_state': url_state}
         if not fetch_result or fetch_result.get('error'):
-            result['error'] = fetch_result.get('error', 'Unknown fetch error')
-            return result
-        
-        # 2. Create source document
-        source_doc = SourceDocumentRepository.create_source_document(
-            data_source=data_source,
-            source_url=url,
-            raw_content=fetch_result['content'],
-            content_type=fetch_result['content_type'],
-            http_status_code=fetch_result['status_code']
-        )
+            prepared['error'] = (fetch_result or {}).get('error') or 'Unknown fetch error'
+            return prepared
+
+        etag = ingestion_system.get_header(fetch_result, 'ETag')
+        status_code = fetch_result.get('status_code')
+        prepared.update({
+            'status_code': status_code,
+            'etag': etag,
+            'last_modified': ingestion_system.get_header(fetch_result, 'Last-Modified'),
+        })
+
+        # 2. Not modified: 304, or a response reused from URL discovery with the same ETag
+        if status_code == 304 or (etag and etag == url_state.get('etag')):
+            prepared['not_modified'] = True
+            return prepared
         
         # 3. Extract text for hashing
         extracted_text = ingestion_system.extract_text(
@@ -135,125 +410,138 @@ class IngestionService:
         
         # 5. Compute hash
         from helpers.file_hashing import ContentHash
-        content_hash = ContentHash.compute_sha256(extracted_text)
+        prepared.update({
+            'content': fetch_result['content'],
+            'content_type': fetch_result['content_type'],
+            'extracted_text': extracted_text,
+            'metadata': metadata,
+            'public_updated_at': parse_datetime(metadata['public_updated_at']) if metadata.get('public_updated_at') else None,
+            'content_hash': ContentHash.compute_sha256(extracted_text),
+        })
+        return prepared
+
+    @staticmethod
+    def persist_url(data_source: DataSource, prepared: Dict) -> Tuple[Dict, Optional[DocumentVersion]]:
+        """
+        Classify a prepared URL and write its fetch state, source document, version and diff.
         
-        # 6. Check if version already exists for this source document
-        # We check by source_document to ensure each URL maintains its own version history
-        existing_versions = DocumentVersionSelector.get_by_source_document(source_doc)
-        for existing_version in existing_versions:
-            if existing_version.content_hash == content_hash:
-                logger.info(f"Content unchanged for {url}, hash: {content_hash[:8]}...")
-                return result
+        Args:
+            data_source: DataSource instance
+            prepared: prepare_url result
+            
+        Returns:
+            Tuple of (processing results, the new DocumentVersion to parse or None);
+            'classification' in the results is 'not_modified', 'unchanged',
+            'changed' or 'new'
+        """
+        url = prepared['url']
+        url_state = prepared['url_state']
+        result = {
+            'url': url,
+            'new_version': False,
+            'diff_created': False
+        }
+        if prepared.get('error'):
+            result['error'] = prepared['error']
+            return result, None
+
+        status_code = prepared['status_code']
+        if prepared.get('not_modified'):
+            SourceUrlStateRepository.record_fetch(data_source, url, status_code)
+            result['not_modified'] = True
+            result['classification'] = 'not_modified'
+            return result, None
+
+        content_hash = prepared['content_hash']
+        extracted_text = prepared['extracted_text']
+        fetch_state = {
+            'etag': prepared['etag'],
+            'last_modified': prepared['last_modified'],
+            'public_updated_at': prepared['public_updated_at'],
+        }
         
-        # 7. Create new document version with metadata
+        # 6. Classify against the URL's latest content hash before writing anything
+        latest_content_hash = url_state.get('latest_content_hash')
+        latest_version_id = url_state.get('latest_version_id')
+        previous_version = None
+        if not latest_content_hash:
+            # URL without an indexed hash (first run, or state from before the index)
+            previous_version = DocumentVersionSelector.get_latest_by_source_url(data_source, url)
+            latest_content_hash = previous_version.content_hash if previous_version else None
+
+        if latest_content_hash == content_hash:
+            logger.info(f"Content unchanged for {url}, hash: {content_hash[:8]}...")
+            SourceUrlStateRepository.record_fetch(
+                data_source, url, status_code, latest_version=previous_version, **fetch_state
+            )
+            result['unchanged'] = True
+            result['classification'] = 'unchanged'
+            return result, None
+
+        result['classification'] = 'changed' if latest_content_hash else 'new'
+        if latest_content_hash and previous_version is None and latest_version_id:
+            previous_version = DocumentVersionSelector.get_by_id(latest_version_id)
+
+        # 7. Create source document
+        source_doc = SourceDocumentRepository.create_source_document(
+            data_source=data_source,
+            source_url=url,
+            raw_content=prepared['content'],
+            content_type=prepared['content_type'],
+            http_status_code=status_code
+        )
+        
+        # 8. Create new document version with metadata
         new_version = DocumentVersionRepository.create_document_version(
             source_document=source_doc,
             raw_text=extracted_text,
-            metadata=metadata
+            metadata=prepared['metadata']
         )
         result['new_version'] = True
-        
-        # 8. Get previous version for diff
-        previous_version = DocumentVersionSelector.get_latest_by_source_document(source_doc)
-        change_detected = False
-        change_type = None
+        SourceUrlStateRepository.record_fetch(
+            data_source, url, status_code, latest_version=new_version, changed=True, **fetch_state
+        )
         
         if previous_version and previous_version.id != new_version.id:
-            # 9. Create diff
-            diff_text = IngestionService._compute_diff(
-                previous_version.raw_text,
-                new_version.raw_text
+            # 9. Create diff against the URL's previous version
+            diff = DocumentDiffEngine.compute(
+                previous_version.text,
+                extracted_text,
+                old_content=previous_version.source_document.content,
+                new_content=prepared['content']
             )
             
-            change_type = IngestionService._classify_change(diff_text)
-            
             DocumentDiffRepository.create_document_diff(
                 old_version=previous_version,
                 new_version=new_version,
-                diff_text=diff_text,
-                change_type=change_type
+                diff_text=diff['diff_text'],
+                change_type=diff['change_type'],
+                structured_diff=diff['structured']
             )
             result['diff_created'] = True
-            change_detected = True
-        
-        # 10. Trigger AI Rule Parsing (as per implementation.md flow)
-        # Parse rules for new document versions (especially when change is detected)
-        if new_version:
-            try:
-                from data_ingestion.services.rule_parsing_service import RuleParsingService
-                parse_result = RuleParsingService.parse_document_version(new_version)
-                result['rules_parsed'] = parse_result.get('rules_created', 0)
-                result['validation_tasks_created'] = parse_result.get('validation_tasks_created', 0)
-            except Exception as e:
-                logger.error(f"Error triggering rule parsing for {url}: {e}")
-                result['parsing_error'] = str(e)
-        
-        return result
-
-    @staticmethod
-    def _compute_diff(old_text: str, new_text: str) -> str:
-        """
-        Compute unified diff between two text versions.
+            result['change_type'] = diff['change_type']
         
-        Args:
-            old_text: Previous version text
-            new_text: New version text
-            
-        Returns:
-            Unified diff string
-        """
-        old_lines = old_text.splitlines(keepends=True)
-        new_lines = new_text.splitlines(keepends=True)
-        
-        diff = difflib.unified_diff(
-            old_lines,
-            new_lines,
-            fromfile='old_version',
-            tofile='new_version',
-            lineterm=''
-        )
-        
-        return ''.join(diff)
+        return result, new_version
 
     @staticmethod
-    def _classify_change(diff_text: str) -> str:
+    def parse_document_version(new_version: DocumentVersion, url: str) -> Dict:
         """
-        Classify the type of change detected.
+        10. Trigger AI Rule Parsing (as per implementation.md flow) for a new document version.
         
         Args:
-            diff_text: Diff text to analyze
+            new_version: DocumentVersion to parse
+            url: URL of the version (for logging)
             
         Returns:
-            Change type classification
+            Dict with 'rules_parsed' and 'validation_tasks_created', or 'parsing_error'
         """
-        diff_lower = diff_text.lower()
-        
-        # Check for requirement changes (salary, threshold, etc.)
-        requirement_keywords = ['salary', 'threshold', 'minimum', 'requirement', 'must', 'need']
-        if any(keyword in diff_lower for keyword in requirement_keywords):
-            # Check for numeric patterns
-            import re
-            if re.search(r'[£$€]\s*\d+|\d+\s*(pound|dollar|euro)', diff_lower):
-                return 'requirement_change'
-        
-        # Check for fee changes
-        fee_keywords = ['fee', 'cost', 'charge', 'payment']
-        if any(keyword in diff_lower for keyword in fee_keywords):
-            import re
-            if re.search(r'[£$€]\s*\d+|\d+\s*(pound|dollar|euro)', diff_lower):
-                return 'fee_change'
-        
-        # Check for processing time changes
-        time_keywords = ['day', 'week', 'month', 'processing', 'time', 'duration']
-        if any(keyword in diff_lower for keyword in time_keywords):
-            import re
-            if re.search(r'\d+\s*(day|week|month|hour)', diff_lower):
-                return 'processing_time_change'
-        
-        # Check for major updates (large diff)
-        if len(diff_text) > 10000:
-            return 'major_update'
-        
-        # Default to minor text change
-        return 'minor_text'
-
+        try:
+            from data_ingestion.services.rule_parsing_service import RuleParsingService
+            parse_result = RuleParsingService.parse_document_version(new_version)
+            return {
+                'rules_parsed': parse_result.get('rules_created', 0),
+                'validation_tasks_created': parse_result.get('validation_tasks_created', 0),
+            }
+        except Exception as e:
+            logger.error(f"Error triggering rule parsing for {url}: {e}")
+            return {'parsing_error': str(e)}
@@ -1,6 +1,7 @@
 import json
 import logging
-from typing import Dict, List, Optional
+from typing import Dict
+from ai_decisions.services.llm_gateway import LLMGateway
 from data_ingestion.models.document_version import DocumentVersion
 from data_ingestion.repositories.parsed_rule_repository import ParsedRuleRepository
 from data_ingestion.repositories.rule_validation_task_repository import RuleValidationTaskRepository
@@ -18,6 +19,9 @@ class RuleParsingService:
     Based on implementation.md Section 5.4.
     """
 
+    EXTRACTION_MODEL = "gpt-4o-mini"
+    EXTRACTION_MAX_TOKENS = 2000
+
     @staticmethod
     def parse_document_version(document_version: DocumentVersion) -> Dict:
         """
@@ -41,7 +45,7 @@ class RuleParsingService:
                 }
             
             # Extract text from document version
-            extracted_text = document_version.raw_text
+            extracted_text = document_version.text
             
             if not extracted_text or len(extracted_text.strip()) < 50:
                 logger.warning(f"Document version {document_version.id} has insufficient text for parsing")
@@ -122,10 +126,6 @@ class RuleParsingService:
             Dict with 'success', 'rules' (list), or 'error'
         """
         try:
-            # TODO: Integrate with actual LLM service when available
-            # For now, return a placeholder structure
-            # This should be replaced with actual LLM API call
-            
             # Prompt template from implementation.md
             prompt = f"""You are an immigration rule extraction system. Extract structured eligibility 
 requirements from the following UK immigration rule text.
@@ -140,7 +140,7 @@ Rules:
     {{
       "requirement_code": "MIN_SALARY",
       "description": "Minimum salary threshold",
-      "condition_expression": {{">=": [{{"var": "salary"}, 38700]}},
+      "condition_expression": {{">=": [{{"var": "salary"}}, 38700]}},
       "source_excerpt": "Applicants must earn at least £38,700 per year"
     }}
   ]
@@ -149,15 +149,43 @@ Rules:
 Text to extract from:
 {extracted_text[:5000]}"""  # Limit to 5000 chars for now
             
-            # Placeholder: This should call actual LLM service
-            # For now, return empty rules (will be implemented when LLM service is available)
-            logger.info("LLM rule extraction called (placeholder - needs LLM service integration)")
+            # Deterministic call through the shared gateway: re-parsing the
+            # same text is served from the response cache
+            response = LLMGateway.complete(
+                model=RuleParsingService.EXTRACTION_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.0,
+                max_tokens=RuleParsingService.EXTRACTION_MAX_TOKENS
+            )
+            
+            response_text = (response['content'] or '').strip()
+            # Remove markdown code blocks if present
+            if response_text.startswith('```'):
+                response_text = response_text.split('```')[1]
+                if response_text.startswith('json'):
+                    response_text = response_text[4:]
+                response_text = response_text.strip()
+            
+            result = json.loads(response_text)
+            visa_code = result.get('visa_code', 'UNKNOWN')
+            rules = [
+                {'visa_code': visa_code, **requirement}
+                for requirement in result.get('requirements', [])
+                if isinstance(requirement, dict)
+            ]
             
+            logger.info(f"LLM rule extraction returned {len(rules)} rules for {visa_code}")
             return {
                 'success': True,
-                'rules': []  # Empty for now, will be populated when LLM service is integrated
+                'rules': rules
             }
             
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse LLM rule extraction response as JSON: {e}")
+            return {
+                'success': False,
+                'error': f"Invalid JSON from LLM: {e}"
+            }
         except Exception as e:
             logger.error(f"Error calling LLM for rule extraction: {e}")
             return {
@@ -1,4 +1,5 @@
-from celery import shared_task
+from celery import chord, group, shared_task
+from django.conf import settings
 import logging
 from main_system.tasks_base import BaseTaskWithMeta
 from data_ingestion.services.ingestion_service import IngestionService
@@ -7,23 +8,125 @@ logger = logging.getLogger('django')
 
 
 @shared_task(bind=True, base=BaseTaskWithMeta)
-def ingest_data_source_task(self, data_source_id: str):
+def ingest_data_source_task(self, data_source_id: str, changed_only: bool = False):
     """
     Celery task to ingest a data source.
     
+    Each run works for at most settings.INGESTION_TASK_TIME_BUDGET seconds
+    (under CELERY_TASK_TIME_LIMIT), then replaces itself with a new run that
+    resumes from the data source's checkpoint, so a large source is ingested
+    over several tasks; as a chord header task, the chord waits for the last one.
+    A retry after an error resumes from the checkpoint as well. Without an open
+    checkpoint, URL discovery is handed to discover_data_source_urls_task first.
+    
     Args:
         data_source_id: UUID of the data source to ingest
+        changed_only: Only ingest documents the change feed reports as updated
         
     Returns:
-        Dict with ingestion results
+        Dict with ingestion results (a failed result instead of raising once
+        retries are exhausted, so a chord callback still runs)
     """
     try:
         logger.info(f"Starting ingestion task for data source: {data_source_id}")
-        result = IngestionService.ingest_data_source(data_source_id)
-        logger.info(f"Ingestion task completed for data source: {data_source_id}")
-        return result
+        result = IngestionService.ingest_data_source(
+            data_source_id,
+            changed_only=changed_only,
+            time_budget=getattr(settings, 'INGESTION_TASK_TIME_BUDGET', None),
+            discover=False
+        )
     except Exception as e:
         logger.error(f"Error in ingestion task for data source {data_source_id}: {e}")
+        if self.request.retries >= 3:
+            return {'success': False, 'data_source_id': data_source_id, 'message': str(e)}
+        raise self.retry(exc=e, countdown=60, max_retries=3)
+    
+    if result.get('needs_discovery'):
+        logger.info(f"Discovering URLs of data source {data_source_id} before ingesting")
+        raise self.replace(discover_data_source_urls_task.s(data_source_id, changed_only=changed_only))
+    
+    if result.get('success') and not result.get('complete', True):
+        if not result.get('slice_urls_processed'):
+            logger.error(f"Ingestion of data source {data_source_id} made no progress, not continuing")
+            return result
+        logger.info(
+            f"Continuing ingestion of data source {data_source_id}: "
+            f"{result['urls_remaining']} URLs remaining"
+        )
+        raise self.replace(ingest_data_source_task.s(data_source_id, changed_only=changed_only))
+    
+    logger.info(f"Ingestion task completed for data source: {data_source_id}")
+    return result
+
+
+@shared_task(
+    bind=True,
+    base=BaseTaskWithMeta,
+    time_limit=getattr(settings, 'INGESTION_DISCOVERY_TIME_LIMIT', None)
+)
+def discover_data_source_urls_task(self, data_source_id: str, changed_only: bool = False):
+    """
+    Celery task to discover the URLs of a data source and open a run checkpoint.
+    
+    Discovery (taxon walk, Search API paging) is not bounded by the ingestion
+    time budget, so it runs under its own settings.INGESTION_DISCOVERY_TIME_LIMIT.
+    Documents fetched during discovery (gov.uk taxon pages) are ingested here,
+    by the ingestion system holding them; once the checkpoint exists, the task
+    replaces itself with ingest_data_source_task, which ingests the rest of the
+    run in time-budgeted slices.
+    
+    Args:
+        data_source_id: UUID of the data source
+        changed_only: Only discover documents the change feed reports as updated
+        
+    Returns:
+        Dict with the failed result when discovery is not possible (a failed
+        result instead of raising once retries are exhausted)
+    """
+    try:
+        logger.info(f"Starting URL discovery for data source: {data_source_id}")
+        result = IngestionService.discover_urls(data_source_id, changed_only=changed_only)
+    except Exception as e:
+        logger.error(f"Error in URL discovery task for data source {data_source_id}: {e}")
+        if self.request.retries >= 3:
+            return {'success': False, 'data_source_id': data_source_id, 'message': str(e)}
+        raise self.retry(exc=e, countdown=60, max_retries=3)
+    
+    if not result.get('success'):
+        return result
+    
+    logger.info(
+        f"Discovered {result['urls_total']} URLs for data source {data_source_id}, starting ingestion"
+    )
+    raise self.replace(ingest_data_source_task.s(data_source_id, changed_only=changed_only))
+
+
+@shared_task(bind=True, base=BaseTaskWithMeta)
+def parse_document_version_task(self, document_version_id: str):
+    """
+    Celery task to parse rules from a new document version.
+    Dispatched by the parse stage of IngestionPipeline.
+    
+    Args:
+        document_version_id: UUID of the document version to parse
+        
+    Returns:
+        Dict with parsing results
+    """
+    try:
+        from data_ingestion.selectors.document_version_selector import DocumentVersionSelector
+        from data_ingestion.services.rule_parsing_service import RuleParsingService
+        
+        document_version = DocumentVersionSelector.get_by_id(document_version_id)
+        result = RuleParsingService.parse_document_version(document_version)
+        logger.info(
+            f"Parsed document version {document_version_id}: "
+            f"{result.get('rules_created', 0)} rules, "
+            f"{result.get('validation_tasks_created', 0)} validation tasks"
+        )
+        return result
+    except Exception as e:
+        logger.error(f"Error parsing document version {document_version_id}: {e}")
         raise self.retry(exc=e, countdown=60, max_retries=3)
 
 
@@ -34,61 +137,18 @@ def ingest_uk_sources_weekly_task(self):
     Optimized for weekly schedule - processes all active UK sources.
     Runs every Sunday at 2 AM UTC via Celery Beat.
     
+    Each source is ingested by its own ingest_data_source_task (a chord);
+    aggregate_ingestion_results_task summarizes them once all are done.
+    
     Returns:
-        Dict with results for UK sources
+        Dict with the dispatched data sources and the chord result ID
     """
     try:
         from data_ingestion.selectors.data_source_selector import DataSourceSelector
         
         logger.info("Starting weekly UK ingestion task")
         uk_sources = DataSourceSelector.get_by_jurisdiction('UK').filter(is_active=True)
-        
-        results = {
-            'jurisdiction': 'UK',
-            'total_sources': uk_sources.count(),
-            'processed': 0,
-            'successful': 0,
-            'failed': 0,
-            'urls_processed': 0,
-            'new_versions': 0,
-            'rules_parsed': 0,
-            'details': []
-        }
-        
-        for source in uk_sources:
-            try:
-                logger.info(f"Processing UK source: {source.name} ({source.id})")
-                result = IngestionService.ingest_data_source(str(source.id))
-                results['processed'] += 1
-                
-                if result.get('success'):
-                    results['successful'] += 1
-                    results['urls_processed'] += result.get('urls_processed', 0)
-                    results['new_versions'] += result.get('new_versions', 0)
-                    results['rules_parsed'] += result.get('rules_parsed', 0)
-                else:
-                    results['failed'] += 1
-                
-                results['details'].append({
-                    'data_source_id': str(source.id),
-                    'name': source.name,
-                    'result': result
-                })
-            except Exception as e:
-                logger.error(f"Error ingesting UK source {source.id}: {e}", exc_info=True)
-                results['failed'] += 1
-                results['details'].append({
-                    'data_source_id': str(source.id),
-                    'name': source.name,
-                    'error': str(e)
-                })
-        
-        logger.info(
-            f"Weekly UK ingestion completed: {results['successful']}/{results['total_sources']} successful, "
-            f"{results['urls_processed']} URLs processed, {results['new_versions']} new versions, "
-            f"{results['rules_parsed']} rules parsed"
-        )
-        return results
+        return _dispatch_ingestion(uk_sources, jurisdiction='UK')
         
     except Exception as e:
         logger.error(f"Error in weekly UK ingestion task: {e}", exc_info=True)
@@ -101,49 +161,62 @@ def ingest_all_active_sources_task(self):
     Celery task to ingest all active data sources.
     This is typically called by Celery Beat on a schedule.
     
+    Each source is ingested by its own ingest_data_source_task (a chord);
+    aggregate_ingestion_results_task summarizes them once all are done.
+    
     Returns:
-        Dict with results for all sources
+        Dict with the dispatched data sources and the chord result ID
     """
     try:
         from data_ingestion.selectors.data_source_selector import DataSourceSelector
         
         logger.info("Starting ingestion task for all active data sources")
-        active_sources = DataSourceSelector.get_active()
-        
-        results = {
-            'total_sources': active_sources.count(),
-            'processed': 0,
-            'successful': 0,
-            'failed': 0,
-            'details': []
-        }
-        
-        for source in active_sources:
-            try:
-                result = IngestionService.ingest_data_source(str(source.id))
-                results['processed'] += 1
-                if result.get('success'):
-                    results['successful'] += 1
-                else:
-                    results['failed'] += 1
-                results['details'].append({
-                    'data_source_id': str(source.id),
-                    'name': source.name,
-                    'result': result
-                })
-            except Exception as e:
-                logger.error(f"Error ingesting source {source.id}: {e}")
-                results['failed'] += 1
-                results['details'].append({
-                    'data_source_id': str(source.id),
-                    'name': source.name,
-                    'error': str(e)
-                })
-        
-        logger.info(f"Ingestion task completed: {results['successful']}/{results['total_sources']} successful")
-        return results
+        return _dispatch_ingestion(DataSourceSelector.get_active())
         
     except Exception as e:
         logger.error(f"Error in bulk ingestion task: {e}")
         raise self.retry(exc=e, countdown=300, max_retries=3)
 
+
+@shared_task(bind=True, base=BaseTaskWithMeta)
+def aggregate_ingestion_results_task(self, results: list, jurisdiction: str = None):
+    """
+    Chord callback: summarize the ingestion results of all dispatched data sources.
+    
+    Args:
+        results: Results of the ingest_data_source_task header tasks
+        jurisdiction: Jurisdiction of the sources, if dispatched by jurisdiction
+        
+    Returns:
+        Dict with results for all sources (IngestionService.summarize_runs)
+    """
+    summary = IngestionService.summarize_runs(results)
+    if jurisdiction:
+        summary = {'jurisdiction': jurisdiction, **summary}
+    logger.info(
+        f"Ingestion of {jurisdiction or 'all'} sources completed: "
+        f"{summary['successful']}/{summary['total_sources']} successful, "
+        f"{summary['urls_processed']} URLs processed, {summary['new_versions']} new versions, "
+        f"{summary['rules_parsed']} rules parsed"
+    )
+    return summary
+
+
+def _dispatch_ingestion(sources, jurisdiction: str = None) -> dict:
+    """Dispatch one ingest_data_source_task per data source, aggregated by a chord callback."""
+    source_ids = [str(source_id) for source_id in sources.values_list('id', flat=True)]
+    if not source_ids:
+        logger.info(f"No active data sources to ingest (jurisdiction: {jurisdiction or 'all'})")
+        return {'success': True, 'jurisdiction': jurisdiction, 'data_source_ids': [], 'chord_id': None}
+    
+    chord_result = chord(
+        group(ingest_data_source_task.s(source_id) for source_id in source_ids)
+    )(aggregate_ingestion_results_task.s(jurisdiction=jurisdiction))
+    
+    logger.info(f"Dispatched ingestion of {len(source_ids)} data sources")
+    return {
+        'success': True,
+        'jurisdiction': jurisdiction,
+        'data_source_ids': source_ids,
+        'chord_id': chord_result.id
+    }
@@ -0,0 +1,178 @@
+import difflib
+import json
+import random
+from unittest import mock
+
+from data_ingestion.services.document_diff_engine import DocumentDiffEngine
+from main_system.tests_base import NoDatabaseTestCase
+
+
+def apply_opcodes(old_lines, new_lines, opcodes):
+    """Rebuild the new lines from the old ones, checking the opcodes tile both sides."""
+    rebuilt = []
+    i = j = 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert (i1, j1) == (i, j), (tag, i1, i2, j1, j2)
+        if tag == 'equal':
+            assert old_lines[i1:i2] == new_lines[j1:j2]
+            rebuilt.extend(old_lines[i1:i2])
+        else:
+            rebuilt.extend(new_lines[j1:j2])
+        i, j = i2, j2
+    assert (i, j) == (len(old_lines), len(new_lines))
+    return rebuilt
+
+
+def edit_distance(old_lines, new_lines):
+    """Minimum number of inserted plus deleted lines (via the longest common subsequence)."""
+    lcs = [[0] * (len(new_lines) + 1) for _ in range(len(old_lines) + 1)]
+    for i, old_line in enumerate(old_lines):
+        for j, new_line in enumerate(new_lines):
+            if old_line == new_line:
+                lcs[i + 1][j + 1] = lcs[i][j] + 1
+            else:
+                lcs[i + 1][j + 1] = max(lcs[i][j + 1], lcs[i + 1][j])
+    return len(old_lines) + len(new_lines) - 2 * lcs[-1][-1]
+
+
+def changed_line_count(opcodes):
+    return sum((i2 - i1) + (j2 - j1) for tag, i1, i2, j1, j2 in opcodes if tag != 'equal')
+
+
+class LineOpcodesTests(NoDatabaseTestCase):
+
+    def assertMinimalDiff(self, old_lines, new_lines):
+        opcodes, truncated = DocumentDiffEngine.line_opcodes(old_lines, new_lines)
+        self.assertFalse(truncated)
+        self.assertEqual(apply_opcodes(old_lines, new_lines, opcodes), list(new_lines))
+        self.assertEqual(changed_line_count(opcodes), edit_distance(old_lines, new_lines))
+        return opcodes
+
+    def test_identical_and_empty_inputs(self):
+        self.assertEqual(DocumentDiffEngine.line_opcodes([], []), ([], False))
+        self.assertEqual(DocumentDiffEngine.line_opcodes(['a', 'b'], ['a', 'b']), ([('equal', 0, 2, 0, 2)], False))
+        self.assertEqual(DocumentDiffEngine.line_opcodes([], ['a']), ([('insert', 0, 0, 0, 1)], False))
+        self.assertEqual(DocumentDiffEngine.line_opcodes(['a'], []), ([('delete', 0, 1, 0, 0)], False))
+
+    def test_single_replacement_between_common_prefix_and_suffix(self):
+        opcodes = self.assertMinimalDiff(['a', 'b', 'c', 'd'], ['a', 'x', 'c', 'd'])
+
+        self.assertEqual(opcodes, [('equal', 0, 1, 0, 1), ('replace', 1, 2, 1, 2), ('equal', 2, 4, 2, 4)])
+
+    def test_disjoint_middles_are_one_replacement(self):
+        opcodes = self.assertMinimalDiff(['a', 'b', 'c', 'z'], ['a', 'x', 'y', 'z'])
+
+        self.assertEqual(opcodes, [('equal', 0, 1, 0, 1), ('replace', 1, 3, 1, 3), ('equal', 3, 4, 3, 4)])
+
+    def test_random_edits_give_minimal_valid_opcodes(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            old_lines = [rng.choice('abcde') for _ in range(rng.randint(0, 15))]
+            new_lines = [rng.choice('abcde') for _ in range(rng.randint(0, 15))]
+            with self.subTest(old=old_lines, new=new_lines):
+                self.assertMinimalDiff(old_lines, new_lines)
+
+    def test_unified_diff_matches_difflib_for_a_single_change(self):
+        old_lines = [f'line {index}' for index in range(20)]
+        new_lines = list(old_lines)
+        new_lines[10] = 'changed line'
+        new_lines.insert(15, 'inserted line')
+
+        opcodes, _ = DocumentDiffEngine.line_opcodes(old_lines, new_lines)
+        groups = DocumentDiffEngine.group_opcodes(opcodes, DocumentDiffEngine.CONTEXT_LINES)
+
+        expected = '\n'.join(difflib.unified_diff(
+            old_lines, new_lines, 'old_version', 'new_version', n=DocumentDiffEngine.CONTEXT_LINES, lineterm=''
+        )) + '\n'
+        self.assertEqual(DocumentDiffEngine.unified_diff(old_lines, new_lines, groups), expected)
+
+
+class LineOpcodesSizeCapTests(NoDatabaseTestCase):
+
+    def test_edit_distance_cap_reports_one_replacement_inside_prefix_and_suffix(self):
+        old_lines = ['header'] + [f'old {index}' if index % 2 else 'same' for index in range(10)] + ['footer']
+        new_lines = ['header'] + [f'new {index}' if index % 2 else 'same' for index in range(10)] + ['footer']
+
+        with mock.patch.object(DocumentDiffEngine, 'MAX_EDIT_DISTANCE', 3):
+            opcodes, truncated = DocumentDiffEngine.line_opcodes(old_lines, new_lines)
+
+        self.assertTrue(truncated)
+        self.assertEqual(opcodes, [('equal', 0, 2, 0, 2), ('replace', 2, 11, 2, 11), ('equal', 11, 12, 11, 12)])
+        self.assertEqual(apply_opcodes(old_lines, new_lines, opcodes), new_lines)
+
+    def test_within_edit_distance_cap_is_exact(self):
+        old_lines = ['a', 'b', 'c', 'd']
+        new_lines = ['a', 'c', 'd', 'e']
+
+        with mock.patch.object(DocumentDiffEngine, 'MAX_EDIT_DISTANCE', 2):
+            opcodes, truncated = DocumentDiffEngine.line_opcodes(old_lines, new_lines)
+
+        self.assertFalse(truncated)
+        self.assertEqual(changed_line_count(opcodes), 2)
+
+    def test_line_count_cap_skips_the_search(self):
+        old_lines = ['same', 'a', 'b', 'c']
+        new_lines = ['same', 'b', 'c', 'd']
+
+        with mock.patch.object(DocumentDiffEngine, 'MAX_DIFF_LINES', 5), \
+                mock.patch.object(DocumentDiffEngine, '_myers') as myers:
+            opcodes, truncated = DocumentDiffEngine.line_opcodes(old_lines, new_lines)
+
+        myers.assert_not_called()
+        self.assertTrue(truncated)
+        self.assertEqual(opcodes, [('equal', 0, 1, 0, 1), ('replace', 1, 4, 1, 4)])
+
+    def test_pure_insertion_past_the_cap_stays_an_insertion(self):
+        new_lines = ['same'] + [f'added {index}' for index in range(10)]
+
+        with mock.patch.object(DocumentDiffEngine, 'MAX_DIFF_LINES', 5):
+            opcodes, truncated = DocumentDiffEngine.line_opcodes(['same'], new_lines)
+
+        self.assertTrue(truncated)
+        self.assertEqual(opcodes, [('equal', 0, 1, 0, 1), ('insert', 1, 1, 1, 11)])
+
+    def test_truncated_diff_is_classified_as_major_update(self):
+        old_text = '\n'.join(['intro'] + [f'paragraph {index}' for index in range(10)])
+        new_text = '\n'.join(['intro'] + [f'rewritten {index}' if index % 2 else f'paragraph {index}' for index in range(10)])
+
+        with mock.patch.object(DocumentDiffEngine, 'MAX_EDIT_DISTANCE', 2):
+            result = DocumentDiffEngine.compute(old_text, new_text)
+
+        self.assertTrue(result['structured']['truncated'])
+        self.assertEqual(result['change_type'], 'major_update')
+        self.assertEqual(result['structured']['lines_removed'], 9)
+        self.assertEqual(result['structured']['lines_added'], 9)
+
+
+class ComputeTests(NoDatabaseTestCase):
+
+    def test_section_changes_and_numeric_deltas(self):
+        old_content = json.dumps({
+            'title': 'Skilled Worker visa',
+            'details': {'parts': [
+                {'slug': 'eligibility', 'body': '<p>You must earn at least £38,700 a year.</p>'},
+                {'slug': 'how-long', 'body': '<p>You will usually get a decision within 3 weeks.</p>'},
+            ]},
+        })
+        new_content = json.dumps({
+            'title': 'Skilled Worker visa',
+            'details': {'parts': [
+                {'slug': 'how-long', 'body': '<p>You will usually get a decision within 3 weeks.</p>'},
+                {'slug': 'eligibility', 'body': '<p>You must earn at least £41,700 a year.</p>'},
+            ]},
+        })
+
+        result = DocumentDiffEngine.compute(
+            'You must earn at least £38,700 a year.', 'You must earn at least £41,700 a year.',
+            old_content, new_content
+        )
+
+        structured = result['structured']
+        self.assertEqual(result['change_type'], 'requirement_change')
+        self.assertEqual(structured['sections_changed'], 1)
+        self.assertEqual(structured['changed_sections'][0]['section'], 'details.parts[eligibility].body')
+        self.assertEqual(structured['changed_sections'][0]['change'], 'modified')
+        self.assertEqual(
+            [(delta['old_value'], delta['new_value'], delta['section']) for delta in structured['numeric_deltas']],
+            [(38700.0, 41700.0, None), (38700.0, 41700.0, 'details.parts[eligibility].body')]
+        )
@@ -0,0 +1,211 @@
+import contextlib
+import uuid
+from unittest import mock
+
+from django.test import override_settings
+from django.utils import timezone
+
+from data_ingestion.ingestion.base_ingestion import BaseIngestionSystem
+from data_ingestion.ingestion.uk_ingestion import UKIngestionSystem
+from data_ingestion.models.data_source import DataSource
+from data_ingestion.models.ingestion_checkpoint import IngestionCheckpoint
+from data_ingestion.services.ingestion_service import IngestionService
+from main_system.tests_base import NoDatabaseTestCase
+
+SERVICE = 'data_ingestion.services.ingestion_service'
+
+TAXON_URLS = ['https://www.gov.uk/api/content/visas', 'https://www.gov.uk/api/content/visas/work']
+PAGE_URLS = [f'https://www.gov.uk/api/content/page-{index}' for index in range(3)]
+
+
+class FakeIngestionSystem(BaseIngestionSystem):
+    """Ingestion system whose discovery fetches the taxon pages (like UKIngestionSystem)."""
+
+    def __init__(self, data_source, requested):
+        super().__init__(data_source)
+        self.requested = requested
+        self.discovered = {}
+
+    def get_document_urls(self, since=None):
+        self.discovered = {url: self._response(url) for url in TAXON_URLS}
+        return TAXON_URLS + PAGE_URLS
+
+    def get_prefetched_urls(self):
+        return list(self.discovered)
+
+    def fetch_content(self, url, validators=None):
+        if url in self.discovered:
+            return self.discovered.pop(url)
+        self.requested.append(url)
+        return self._response(url)
+
+    def extract_text(self, raw_content, content_type):
+        return raw_content
+
+    def parse_api_response(self, response):
+        return []
+
+    @staticmethod
+    def _response(url):
+        return {'content': url, 'content_type': 'application/json', 'status_code': 200, 'error': None, 'headers': {}}
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class IngestionCheckpointResumeTests(NoDatabaseTestCase):
+    """Discovery, slicing and resume of checkpointed runs, with storage mocked out."""
+
+    def setUp(self):
+        super().setUp()
+        self.data_source = DataSource(id=uuid.uuid4(), name='UK visas', jurisdiction='UK', is_active=True)
+        self.checkpoint = None
+        self.checked = set()  # URLs with a SourceUrlState written since the run started
+        self.requested = []  # URLs requested from the source (not served from discovery)
+        self.systems = []
+
+        mock.patch(f'{SERVICE}.DataSourceSelector.get_by_id', return_value=self.data_source).start()
+        # Every call builds its own ingestion system, as separate Celery tasks do
+        mock.patch(f'{SERVICE}.IngestionSystemFactory.create', side_effect=self.create_system).start()
+        mock.patch(f'{SERVICE}.IngestionCheckpointSelector.get_open', side_effect=self.get_open).start()
+        mock.patch(f'{SERVICE}.IngestionCheckpointRepository.start_run', side_effect=self.start_run).start()
+        mock.patch(
+            'data_ingestion.repositories.ingestion_checkpoint_repository.transaction.atomic',
+            side_effect=contextlib.nullcontext
+        ).start()
+        mock.patch.object(IngestionCheckpoint, 'save').start()
+        mock.patch(f'{SERVICE}.SourceUrlStateSelector.get_state_index', return_value={}).start()
+        mock.patch(
+            f'{SERVICE}.SourceUrlStateSelector.get_urls_checked_since',
+            side_effect=lambda data_source, since: set(self.checked)
+        ).start()
+        mock.patch.object(
+            IngestionService, 'prepare_url',
+            side_effect=lambda system, url, fetch_result, url_state=None: {'url': url, 'url_state': {}}
+        ).start()
+        mock.patch.object(IngestionService, 'persist_url', side_effect=self.persist_url).start()
+        self.update_last_fetched = mock.patch(f'{SERVICE}.DataSourceRepository.update_last_fetched').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def create_system(self, data_source):
+        system = FakeIngestionSystem(data_source, self.requested)
+        self.systems.append(system)
+        return system
+
+    def get_open(self, data_source):
+        if self.checkpoint is not None and not self.checkpoint.is_complete:
+            return self.checkpoint
+        return None
+
+    def start_run(self, data_source, urls, changed_only=False):
+        self.checkpoint = IngestionCheckpoint(
+            data_source=data_source, urls=list(urls), changed_only=changed_only, started_at=timezone.now()
+        )
+        return self.checkpoint
+
+    def persist_url(self, data_source, prepared):
+        self.checked.add(prepared['url'])
+        return {'url': prepared['url'], 'new_version': False, 'diff_created': False, 'classification': 'new'}, None
+
+    def ingest(self, **kwargs):
+        return IngestionService.ingest_data_source(str(self.data_source.id), discover=False, **kwargs)
+
+    def test_discovery_ingests_the_documents_it_fetched(self):
+        result = IngestionService.discover_urls(str(self.data_source.id))
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['urls_total'], 5)
+        self.assertEqual(result['urls_processed'], 2)
+        self.assertEqual(self.requested, [])
+        self.assertEqual(self.checked, set(TAXON_URLS))
+        self.assertFalse(self.checkpoint.is_complete)
+
+    def test_ingest_slices_do_not_fetch_discovered_documents_again(self):
+        IngestionService.discover_urls(str(self.data_source.id))
+
+        result = self.ingest()
+
+        self.assertTrue(result['complete'])
+        self.assertEqual(self.requested, PAGE_URLS)
+        self.assertEqual(result['urls_processed'], 5)
+        self.assertEqual(result['slice_urls_processed'], 3)
+        self.update_last_fetched.assert_called_once_with(self.data_source)
+
+    def test_resumes_from_checkpoint_after_time_budget(self):
+        IngestionService.discover_urls(str(self.data_source.id))
+
+        # A budget that has run out once the first URL is fetched
+        first = self.ingest(time_budget=1e-9)
+
+        self.assertFalse(first['complete'])
+        self.assertEqual(first['slice_urls_processed'], 1)
+        self.assertEqual(first['urls_remaining'], 2)
+        self.assertEqual(self.checkpoint.next_index, 3)
+        self.update_last_fetched.assert_not_called()
+
+        second = self.ingest()
+
+        self.assertTrue(second['complete'])
+        self.assertEqual(second['slice_urls_processed'], 2)
+        self.assertEqual(second['urls_processed'], 5)
+        self.assertEqual(self.requested, PAGE_URLS)
+        self.assertEqual(len(self.systems), 3)
+
+    def test_resume_skips_urls_processed_after_the_last_checkpoint(self):
+        IngestionService.discover_urls(str(self.data_source.id))
+        # An interrupted call processed the first page but never recorded its slice
+        self.checked.add(PAGE_URLS[0])
+
+        result = self.ingest()
+
+        self.assertTrue(result['complete'])
+        self.assertEqual(self.requested, PAGE_URLS[1:])
+
+    def test_without_open_run_asks_for_discovery(self):
+        result = self.ingest()
+
+        self.assertTrue(result['needs_discovery'])
+        self.assertFalse(result['complete'])
+        self.assertIsNone(self.checkpoint)
+
+    def test_synchronous_ingestion_discovers_and_completes_the_run(self):
+        result = IngestionService.ingest_data_source(str(self.data_source.id))
+
+        self.assertTrue(result['complete'])
+        self.assertEqual(result['urls_processed'], 5)
+        self.assertEqual(self.requested, PAGE_URLS)
+
+    def test_unexpected_errors_are_raised_for_the_task_to_retry(self):
+        IngestionService.discover_urls(str(self.data_source.id))
+
+        with mock.patch.object(IngestionService, 'persist_url', side_effect=RuntimeError('boom')), \
+                mock.patch(f'{SERVICE}.IngestionCheckpointRepository.record_slice', side_effect=RuntimeError('db down')):
+            with self.assertRaises(RuntimeError):
+                self.ingest()
+
+        # The lock is released, so the retry can run
+        self.assertTrue(self.ingest()['complete'])
+
+
+class UKIngestionDiscoveredResponsesTests(NoDatabaseTestCase):
+
+    def test_discovered_taxon_is_served_once_without_a_request(self):
+        system = UKIngestionSystem(DataSource(id=uuid.uuid4(), name='UK visas', jurisdiction='UK'))
+        url = TAXON_URLS[0]
+        response = {
+            'content': '{"content_id": "abc", "links": {"child_taxons": []}}',
+            'content_type': 'application/json',
+            'status_code': 200,
+            'error': None,
+            'headers': {},
+        }
+        taxon_content_ids = []
+
+        system._process_taxon_response(url, response, taxon_content_ids, [])
+
+        self.assertEqual(taxon_content_ids, ['abc'])
+        self.assertEqual(system.get_prefetched_urls(), [url])
+        with mock.patch.object(system, '_fetch', return_value={'status_code': 304}) as fetch:
+            self.assertIs(system.fetch_content(url), response)
+            fetch.assert_not_called()
+            self.assertEqual(system.get_prefetched_urls(), [])
+            self.assertEqual(system.fetch_content(url, {'etag': '"1"'}), {'status_code': 304})
+            fetch.assert_called_once_with(url, {'etag': '"1"'})
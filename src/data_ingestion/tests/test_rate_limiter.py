@@ -0,0 +1,171 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest import mock
+
+from data_ingestion.helpers.rate_limiter import TokenBucketRateLimiter
+from data_ingestion.ingestion.uk_ingestion import UKIngestionSystem
+from data_ingestion.models.data_source import DataSource
+from main_system.tests_base import NoDatabaseTestCase
+
+LIMITER = 'data_ingestion.helpers.rate_limiter'
+
+
+class FakeClock:
+    """time.monotonic/time.sleep pair where sleeping advances the clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TokenBucketRateLimiterTests(NoDatabaseTestCase):
+    # Rates are powers of two so the fake clock's arithmetic is exact
+
+    def setUp(self):
+        super().setUp()
+        self.clock = FakeClock()
+        mock.patch(f'{LIMITER}.time.monotonic', side_effect=self.clock.monotonic).start()
+        mock.patch(f'{LIMITER}.time.sleep', side_effect=self.clock.sleep).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_rejects_non_positive_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucketRateLimiter(rate=0)
+
+    def test_burst_up_to_capacity_then_waits_for_refill(self):
+        limiter = TokenBucketRateLimiter(rate=2, capacity=3)
+
+        for _ in range(3):
+            limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+
+        limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [0.5])
+
+    def test_sustained_rate(self):
+        limiter = TokenBucketRateLimiter(rate=8)
+        start = self.clock.now
+
+        for _ in range(24):
+            limiter.acquire()
+
+        # The first second's burst is free, the remaining 16 requests take 2 seconds
+        self.assertAlmostEqual(self.clock.now - start, 2.0)
+
+    def test_idle_time_refills_only_up_to_capacity(self):
+        limiter = TokenBucketRateLimiter(rate=4, capacity=2)
+        limiter.acquire()
+        limiter.acquire()
+
+        self.clock.now += 60
+        for _ in range(3):
+            limiter.acquire()
+
+        self.assertEqual(self.clock.sleeps, [0.25])
+
+    def test_pause_holds_back_callers_and_resumes_with_an_empty_bucket(self):
+        limiter = TokenBucketRateLimiter(rate=4, capacity=4)
+
+        limiter.pause(10)
+        limiter.acquire()
+
+        self.assertEqual(self.clock.sleeps, [10, 0.25])
+
+    def test_shorter_pause_does_not_shorten_a_running_pause(self):
+        limiter = TokenBucketRateLimiter(rate=4, capacity=4)
+
+        limiter.pause(10)
+        limiter.pause(2)
+        limiter.acquire()
+
+        self.assertAlmostEqual(sum(self.clock.sleeps), 10.25)
+
+
+class ParseRetryAfterTests(NoDatabaseTestCase):
+
+    def test_delta_seconds(self):
+        self.assertEqual(TokenBucketRateLimiter.parse_retry_after('120'), 120.0)
+        self.assertEqual(TokenBucketRateLimiter.parse_retry_after(' 5 '), 5.0)
+
+    def test_http_date(self):
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+        seconds = TokenBucketRateLimiter.parse_retry_after(format_datetime(retry_at, usegmt=True))
+
+        self.assertTrue(25 <= seconds <= 30, seconds)
+
+    def test_http_date_in_the_past_is_zero(self):
+        self.assertEqual(TokenBucketRateLimiter.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+
+    def test_missing_or_invalid_values(self):
+        for value in (None, '', 'soon', '-5', '1.5'):
+            with self.subTest(value=value):
+                self.assertIsNone(TokenBucketRateLimiter.parse_retry_after(value))
+
+
+def response(status_code, headers=None):
+    return {'content': '{}', 'content_type': 'application/json', 'status_code': status_code,
+            'error': None, 'headers': headers or {}}
+
+
+class UKIngestionRetryTests(NoDatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.system = UKIngestionSystem(DataSource(id=uuid.uuid4(), name='UK visas', jurisdiction='UK'))
+        self.system.rate_limiter = mock.Mock(spec=TokenBucketRateLimiter)
+        self.get_with_details = mock.patch.object(self.system.client, 'get_with_details').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_retries_after_the_retry_after_period(self):
+        self.get_with_details.side_effect = [response(429, {'retry-after': '7'}), response(200)]
+
+        result = self.system._get('/api/content/visas', {'If-None-Match': '"1"'})
+
+        self.assertEqual(result['status_code'], 200)
+        self.assertEqual(self.get_with_details.call_count, 2)
+        self.assertEqual(self.system.rate_limiter.acquire.call_count, 2)
+        self.system.rate_limiter.pause.assert_called_once_with(7.0)
+        self.assertEqual(self.get_with_details.call_args.kwargs['headers']['If-None-Match'], '"1"')
+
+    def test_backs_off_exponentially_without_retry_after(self):
+        self.get_with_details.side_effect = [response(503), response(503), response(200)]
+
+        result = self.system._get('/api/content/visas')
+
+        self.assertEqual(result['status_code'], 200)
+        delay = UKIngestionSystem.DEFAULT_RETRY_AFTER_SECONDS
+        self.assertEqual(
+            self.system.rate_limiter.pause.call_args_list,
+            [mock.call(delay), mock.call(delay * 2)]
+        )
+
+    def test_gives_up_after_max_retries(self):
+        self.get_with_details.return_value = response(429, {'Retry-After': '1'})
+
+        result = self.system._get('/api/content/visas')
+
+        self.assertEqual(result['status_code'], 429)
+        self.assertEqual(self.get_with_details.call_count, UKIngestionSystem.MAX_RETRIES + 1)
+        self.assertEqual(self.system.rate_limiter.pause.call_count, UKIngestionSystem.MAX_RETRIES)
+
+    def test_other_errors_are_not_retried(self):
+        self.get_with_details.return_value = response(404)
+
+        result = self.system._get('/api/content/visas')
+
+        self.assertEqual(result['status_code'], 404)
+        self.system.rate_limiter.pause.assert_not_called()
+
+    def test_rate_limiter_is_shared_per_api_host(self):
+        other = UKIngestionSystem(DataSource(id=uuid.uuid4(), name='UK visas', jurisdiction='UK'))
+
+        self.assertIs(other.rate_limiter, UKIngestionSystem._get_rate_limiter(self.system.api_base))
@@ -4,9 +4,10 @@ Document Classification Service
 Service for classifying document types using AI/LLM.
 Uses OCR text and file metadata to predict document type.
 """
+import json
 import logging
 from typing import Tuple, Optional, Dict
-from django.conf import settings
+from ai_decisions.services.llm_gateway import LLMGateway
 from rules_knowledge.selectors.document_type_selector import DocumentTypeSelector
 from document_handling.helpers.prompts import build_document_classification_prompt, get_system_message
 
@@ -21,6 +22,8 @@ class DocumentClassificationService:
 
     # Minimum confidence threshold for auto-classification
     CONFIDENCE_THRESHOLD = 0.7
+    # Use cheaper model for classification
+    CLASSIFICATION_MODEL = "gpt-4o-mini"
 
     @staticmethod
     def classify_document(
@@ -105,21 +108,6 @@ class DocumentClassificationService:
             Dict with 'document_type', 'confidence', 'metadata'
         """
         try:
-            # Import OpenAI client
-            try:
-                from openai import OpenAI
-            except ImportError:
-                logger.error("OpenAI package not installed. Install with: pip install openai")
-                return None
-            
-            # Get API key from settings
-            api_key = getattr(settings, 'OPENAI_API_KEY', None)
-            if not api_key:
-                logger.error("OPENAI_API_KEY not set in settings")
-                return None
-            
-            client = OpenAI(api_key=api_key)
-            
             # Build comprehensive prompt using helper
             prompt = build_document_classification_prompt(
                 ocr_text=ocr_text,
@@ -127,9 +115,10 @@ class DocumentClassificationService:
                 possible_types=possible_types
             )
             
-            # Call LLM
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",  # Use cheaper model for classification
+            # Call LLM through the shared gateway; identical OCR text is
+            # served from the response cache instead of the provider
+            response = LLMGateway.complete(
+                model=DocumentClassificationService.CLASSIFICATION_MODEL,
                 messages=[
                     {
                         "role": "system", 
@@ -137,12 +126,12 @@ class DocumentClassificationService:
                     },
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.1,  # Low temperature for consistent classification
+                temperature=0.0,  # Deterministic, so cached responses are exact
                 max_tokens=300  # Increased for detailed reasoning
             )
             
             # Parse response
-            response_text = response.choices[0].message.content.strip()
+            response_text = (response['content'] or '').strip()
             
             # Remove markdown code blocks if present
             if response_text.startswith('```'):
@@ -151,7 +140,6 @@ class DocumentClassificationService:
                     response_text = response_text[4:]
                 response_text = response_text.strip()
             
-            import json
             result = json.loads(response_text)
             
             # Validate result
@@ -168,7 +156,7 @@ class DocumentClassificationService:
                 'confidence': float(confidence),
                 'metadata': {
                     'reasoning': result.get('reasoning', ''),
-                    'model': 'gpt-4o-mini'
+                    'model': DocumentClassificationService.CLASSIFICATION_MODEL
                 }
             }
             
@@ -5,8 +5,15 @@ import logging
 logger = logging.getLogger("django")
 
 class Client:
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, session: Optional[requests.Session] = None):
+        """
+        Args:
+            base_url: Base URL prepended to every endpoint
+            session: Optional requests.Session for get_with_details (reuses
+                pooled connections across requests)
+        """
         self.base_url = base_url
+        self.session = session
 
     def get(self, endpoint: str, headers: Optional[dict] = None, params: Optional[str] = None):
         """
@@ -38,29 +45,43 @@ class Client:
             timeout: Request timeout in seconds (default: 30)
             
         Returns:
-            Dict with keys: 'content', 'content_type', 'status_code', 'error'
-            - On success: content is JSON string, status_code is 200, error is None
+            Dict with keys: 'content', 'content_type', 'status_code', 'error', 'headers'
+            - On success: content is the JSON body as received, status_code is 200, error is None
+            - On 304 Not Modified: content is None, error is None
             - On error: content is None, status_code may be set, error contains message
+            - headers: response headers (empty if no response was received)
         """
         import json
         
         try:
-            response = requests.get(
+            response = (self.session or requests).get(
                 f"{self.base_url}{endpoint}",
                 headers=headers,
                 params=params,
                 timeout=timeout
             )
             response.raise_for_status()
+
+            # Conditional request (If-None-Match / If-Modified-Since): no body
+            if response.status_code == 304:
+                return {
+                    'content': None,
+                    'content_type': None,
+                    'status_code': 304,
+                    'error': None,
+                    'headers': dict(response.headers)
+                }
             
             # Try to parse as JSON
             try:
-                content = response.json()
+                # Validate, but return the body as received (no re-serialization)
+                response.json()
                 return {
-                    'content': json.dumps(content, indent=2),
+                    'content': response.text,
                     'content_type': 'application/json',
                     'status_code': response.status_code,
-                    'error': None
+                    'error': None,
+                    'headers': dict(response.headers)
                 }
             except json.JSONDecodeError as e:
                 logger.error(f"Error parsing JSON from {endpoint}: {e}")
@@ -68,19 +89,23 @@ class Client:
                     'content': response.text,
                     'content_type': response.headers.get('Content-Type', 'text/plain'),
                     'status_code': response.status_code,
-                    'error': f"JSON decode error: {e}"
+                    'error': f"JSON decode error: {e}",
+                    'headers': dict(response.headers)
                 }
                 
         except requests.exceptions.RequestException as e:
             logger.error(f"Error while making GET request to {endpoint}: {e}")
             status_code = None
+            response_headers = {}
             if hasattr(e, 'response') and e.response is not None:
                 status_code = e.response.status_code
+                response_headers = dict(e.response.headers)
             return {
                 'content': None,
                 'content_type': None,
                 'status_code': status_code,
-                'error': str(e)
+                'error': str(e),
+                'headers': response_headers
             }
         except Exception as e:
             logger.error(f"Unexpected error making GET request to {endpoint}: {e}")
@@ -88,7 +113,8 @@ class Client:
                 'content': None,
                 'content_type': None,
                 'status_code': None,
-                'error': str(e)
+                'error': str(e),
+                'headers': {}
             }
 
     def post(self, endpoint, data, headers:Optional[dict] = None):
@@ -17,6 +17,35 @@ class CaseFactSelector:
             case=case
         ).order_by('-created_at')
 
+    @staticmethod
+    def get_latest_by_case(case_id):
+        """
+        Get the current facts of a case: only the latest fact per fact_key.
+        Uses Postgres DISTINCT ON (fact_key) over the (case, fact_key) index.
+        """
+        return CaseFact.objects.select_related('case').filter(
+            case_id=case_id
+        ).order_by('fact_key', '-created_at').distinct('fact_key')
+
+    @staticmethod
+    def get_latest_values_by_case(case_id):
+        """Get (fact_key, fact_value) of the latest fact per fact_key for a case."""
+        return CaseFact.objects.filter(
+            case_id=case_id
+        ).order_by('fact_key', '-created_at').distinct('fact_key').values_list('fact_key', 'fact_value')
+
+    @staticmethod
+    def get_latest_values_by_cases(case_ids):
+        """
+        Get (case_id, fact_key, fact_value) of the latest fact per fact_key
+        for many cases in one query (DISTINCT ON (case_id, fact_key)).
+        """
+        return CaseFact.objects.filter(
+            case_id__in=case_ids
+        ).order_by('case_id', 'fact_key', '-created_at').distinct(
+            'case_id', 'fact_key'
+        ).values_list('case_id', 'fact_key', 'fact_value')
+
     @staticmethod
     def get_by_fact_key(case: Case, fact_key: str):
         """Get facts by case and fact key."""
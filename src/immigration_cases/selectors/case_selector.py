@@ -35,6 +35,11 @@ class CaseSelector:
         """Get case by ID."""
         return Case.objects.select_related('user', 'user__profile').get(id=case_id)
 
+    @staticmethod
+    def get_by_ids(case_ids):
+        """Get cases by IDs."""
+        return Case.objects.select_related('user', 'user__profile').filter(id__in=case_ids)
+
     @staticmethod
     def get_by_user_and_status(user, status: str):
         """Get cases by user and status."""
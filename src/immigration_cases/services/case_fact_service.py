@@ -1,5 +1,5 @@
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
 from immigration_cases.models.case_fact import CaseFact
 from immigration_cases.repositories.case_fact_repository import CaseFactRepository
 from immigration_cases.selectors.case_fact_selector import CaseFactSelector
@@ -40,6 +40,24 @@ class CaseFactService:
             logger.error(f"Error fetching facts for case {case_id}: {e}")
             return CaseFact.objects.none()
 
+    @staticmethod
+    def get_latest_by_case(case_id: str):
+        """Get the current facts of a case (latest fact per fact_key)."""
+        try:
+            return CaseFactSelector.get_latest_by_case(case_id)
+        except Exception as e:
+            logger.error(f"Error fetching current facts for case {case_id}: {e}")
+            return CaseFact.objects.none()
+
+    @staticmethod
+    def get_current_facts(case_id: str) -> Dict[str, Any]:
+        """Get the current facts of a case as a fact_key -> fact_value dictionary."""
+        try:
+            return dict(CaseFactSelector.get_latest_values_by_case(case_id))
+        except Exception as e:
+            logger.error(f"Error fetching current facts for case {case_id}: {e}")
+            return {}
+
     @staticmethod
     def get_by_id(fact_id: str) -> Optional[CaseFact]:
         """Get case fact by ID."""
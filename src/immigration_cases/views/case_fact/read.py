@@ -5,12 +5,18 @@ from immigration_cases.serializers.case_fact.read import CaseFactSerializer, Cas
 
 
 class CaseFactListAPI(AuthAPI):
-    """Get list of case facts. Supports filtering by case_id."""
+    """
+    Get list of case facts. Supports filtering by case_id.
+    With case_id and current=true, only the latest fact per fact_key is returned.
+    """
 
     def get(self, request):
         case_id = request.query_params.get('case_id', None)
+        current_only = request.query_params.get('current', '').lower() in ('true', '1', 'yes')
 
-        if case_id:
+        if case_id and current_only:
+            facts = CaseFactService.get_latest_by_case(case_id)
+        elif case_id:
             facts = CaseFactService.get_by_case(case_id)
         else:
             facts = CaseFactService.get_all()
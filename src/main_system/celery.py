@@ -1,9 +1,16 @@
+import glob
+import logging
 import os
 import django
 from celery import Celery
+from celery.signals import worker_init, worker_process_shutdown
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "main_system.settings")
 
+# Prometheus multiprocess mode writes metric files here as soon as metrics are used
+if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
 # Ensure Django is fully initialized before importing models
 django.setup()
 
@@ -20,3 +27,44 @@ app.Task = BaseTaskWithMeta
 # Configure Celery Beat schedule
 app.conf.beat_schedule = CELERY_BEAT_SCHEDULE
 app.conf.timezone = 'UTC'
+
+
+logger = logging.getLogger('django')
+
+
+@worker_init.connect
+def start_metrics_exporter(**kwargs):
+    """
+    Serve the Prometheus metrics recorded by tasks (e.g. the ingestion
+    pipeline) from the worker, since the web process's /metrics endpoint
+    never sees them. Pool processes write to PROMETHEUS_MULTIPROC_DIR and the
+    main worker process serves their aggregate on CELERY_METRICS_PORT.
+    """
+    from django.conf import settings
+
+    port = getattr(settings, 'CELERY_METRICS_PORT', 0)
+    multiproc_dir = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if not port:
+        return
+    if not multiproc_dir:
+        logger.warning("CELERY_METRICS_PORT is set without PROMETHEUS_MULTIPROC_DIR, worker metrics not exported")
+        return
+
+    from prometheus_client import CollectorRegistry, multiprocess, start_http_server
+
+    # Files of a previous worker run would be aggregated as live processes
+    for path in glob.glob(os.path.join(multiproc_dir, '*.db')):
+        os.remove(path)
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    start_http_server(port, registry=registry)
+    logger.info(f"Serving worker Prometheus metrics on port {port}")
+
+
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(pid=None, **kwargs):
+    """Drop the live gauges of an exiting pool process from the aggregate."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -101,6 +101,26 @@ OPEN_EXCHANGE_RATE_BASE_URL=env('OPEN_EXCHANGE_RATE_BASE_URL')
 
 # UK INGESTION API
 UK_GOV_API_BASE_URL = env('UK_GOV_API_BASE_URL')
+# gov.uk API requests per second (shared by all crawler threads) and crawler threads
+UK_GOV_API_RATE_LIMIT = 10
+UK_GOV_CRAWL_WORKERS = 8
+# Ingestion pipeline: normalize/persist threads per run and bounded queue size between stages
+INGESTION_NORMALIZE_WORKERS = 2
+INGESTION_PERSIST_WORKERS = 4
+INGESTION_QUEUE_SIZE = 100
+# Seconds an ingest_data_source_task fetches before handing the rest of the run
+# to a new task (below CELERY_TASK_TIME_LIMIT, leaving time to drain the pipeline)
+INGESTION_TASK_TIME_BUDGET = 240
+# Hard time limit (seconds) of discover_data_source_urls_task, which walks the
+# source's document index before a run is checkpointed
+INGESTION_DISCOVERY_TIME_LIMIT = 1800
+
+# AI REASONING GATING
+# Rule engine confidence band [low, high) inside which eligibility checks call
+# the LLM. Keys: 'default', '<JURISDICTION>' or '<JURISDICTION>:<VISA_CODE>'.
+AI_REASONING_CONFIDENCE_BANDS = {
+    'default': (0.5, 0.8),
+}
 
 
 # Application definition
@@ -177,6 +197,10 @@ CELERY_CACHE_BACKEND = 'django-cache'
 DJANGO_CELERY_RESULTS_TASK_ID_MAX_LENGTH = 255
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 300  # 5 minutes
+# Port of the worker's Prometheus exporter (task metrics such as the ingestion
+# pipeline's); requires PROMETHEUS_MULTIPROC_DIR so all pool processes are
+# collected. 0 disables the exporter.
+CELERY_METRICS_PORT = env.int("CELERY_METRICS_PORT", default=0)
 
 # Celery Beat Schedule (imported from celery_beat_schedule.py)
 from main_system.celery_beat_schedule import CELERY_BEAT_SCHEDULE
@@ -0,0 +1,17 @@
+import logging
+from django.test import SimpleTestCase
+
+
+class NoDatabaseTestCase(SimpleTestCase):
+    """
+    SimpleTestCase for services that log.
+
+    The 'django' logger also writes to the database (compliance
+    DatabaseLogHandler), which SimpleTestCase forbids, so log records are
+    dropped for the duration of each test.
+    """
+
+    def setUp(self):
+        super().setUp()
+        logging.disable(logging.CRITICAL)
+        self.addCleanup(logging.disable, logging.NOTSET)
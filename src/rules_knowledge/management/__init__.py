@@ -0,0 +1 @@
+# Management commands for rules_knowledge app
@@ -0,0 +1,107 @@
+"""
+Management command to benchmark the rule engine with synthetic rules and facts.
+
+Usage:
+    python manage.py benchmark_rule_engine
+    python manage.py benchmark_rule_engine --requirements 100 --depth 3 --cases 500 --missing-ratio 0.2
+    python manage.py benchmark_rule_engine --with-db --output rule_engine_benchmark.json
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rules_knowledge.services.rule_engine_benchmark import RuleEngineBenchmark
+
+
+class Command(BaseCommand):
+    help = 'Benchmark rule engine throughput, latency and allocations and emit the results as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requirements',
+            type=int,
+            default=25,
+            help='Number of requirements in the synthetic rule version (default: 25)',
+        )
+        parser.add_argument(
+            '--depth',
+            type=int,
+            default=2,
+            help='Expression depth; 1 is a single comparison (default: 2)',
+        )
+        parser.add_argument(
+            '--cases',
+            type=int,
+            default=100,
+            help='Number of synthetic fact sets / cases (default: 100)',
+        )
+        parser.add_argument(
+            '--missing-ratio',
+            type=float,
+            default=0.1,
+            help='Fraction of facts missing from each fact set (default: 0.1)',
+        )
+        parser.add_argument(
+            '--facts',
+            type=int,
+            default=20,
+            help='Number of distinct fact keys (default: 20)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=5,
+            help='Timed passes over the inputs (default: 5)',
+        )
+        parser.add_argument(
+            '--allocation-iterations',
+            type=int,
+            default=1,
+            help='Passes measured under tracemalloc; 0 disables allocation tracking (default: 1)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for the synthetic data (default: 42)',
+        )
+        parser.add_argument(
+            '--with-db',
+            action='store_true',
+            help='Also benchmark database-backed entry points (rows are rolled back)',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Write the JSON report to this file instead of stdout',
+        )
+
+    def handle(self, *args, **options):
+        if not 0.0 <= options['missing_ratio'] <= 1.0:
+            raise CommandError('--missing-ratio must be between 0 and 1')
+        if options['requirements'] < 1 or options['cases'] < 1 or options['depth'] < 1:
+            raise CommandError('--requirements, --cases and --depth must be at least 1')
+        if options['iterations'] < 1 or options['facts'] < 1:
+            raise CommandError('--iterations and --facts must be at least 1')
+        if options['allocation_iterations'] < 0:
+            raise CommandError('--allocation-iterations must not be negative')
+
+        benchmark = RuleEngineBenchmark(
+            requirement_count=options['requirements'],
+            depth=options['depth'],
+            case_count=options['cases'],
+            missing_ratio=options['missing_ratio'],
+            fact_count=options['facts'],
+            iterations=options['iterations'],
+            allocation_iterations=options['allocation_iterations'],
+            seed=options['seed'],
+        )
+        report = benchmark.run(with_db=options['with_db'])
+        output = json.dumps(report, indent=2, default=str)
+
+        if options.get('output'):
+            with open(options['output'], 'w') as output_file:
+                output_file.write(output)
+            self.stdout.write(self.style.SUCCESS(f"Benchmark report written to {options['output']}"))
+        else:
+            self.stdout.write(output)
@@ -21,6 +21,14 @@ class VisaRequirementSelector:
             'rule_version__visa_type'
         ).filter(rule_version=rule_version).order_by('requirement_code')
 
+    @staticmethod
+    def get_by_rule_versions(rule_versions):
+        """Get requirements for many rule versions in one query."""
+        return VisaRequirement.objects.select_related(
+            'rule_version',
+            'rule_version__visa_type'
+        ).filter(rule_version__in=rule_versions).order_by('rule_version_id', 'requirement_code')
+
     @staticmethod
     def get_mandatory_by_rule_version(rule_version: VisaRuleVersion):
         """Get mandatory requirements by rule version."""
@@ -41,6 +41,20 @@ class VisaRuleVersionSelector:
             models.Q(effective_to__isnull=True) | models.Q(effective_to__gte=now)
         ).order_by('-effective_from').first()
 
+    @staticmethod
+    def get_active_by_visa_types(visa_type_ids, evaluation_date):
+        """Get published rule versions effective on a date for many visa types."""
+        return VisaRuleVersion.objects.select_related(
+            'visa_type',
+            'source_document_version'
+        ).filter(
+            visa_type_id__in=visa_type_ids,
+            is_published=True,
+            effective_from__lte=evaluation_date
+        ).filter(
+            models.Q(effective_to__isnull=True) | models.Q(effective_to__gte=evaluation_date)
+        ).order_by('visa_type_id', '-effective_from')
+
     @staticmethod
     def get_published():
         """Get all published rule versions."""
@@ -30,3 +30,8 @@ class VisaTypeSelector:
         """Get visa type by ID."""
         return VisaType.objects.select_related().get(id=type_id)
 
+    @staticmethod
+    def get_by_ids(type_ids):
+        """Get visa types by IDs."""
+        return VisaType.objects.filter(id__in=type_ids)
+
@@ -0,0 +1,210 @@
+"""
+Active Rule Version Resolver
+
+Resolves (visa_type_id, evaluation date) to the active published
+VisaRuleVersion through a shared Redis cache, so the eligibility path does
+not have to run the filtered VisaRuleVersion query (and the VisaType lookup)
+on every evaluation.
+
+For each visa type the cache holds the intervals over which a rule version is
+the one RuleEngineService.load_active_rule_version would pick, together with
+the version's own field values. Any evaluation date inside a cached interval
+resolves without a database hit. An interval ends at the version's
+effective_to or at the effective_from of the next published version of the
+same visa type, whichever comes first.
+
+Entries are invalidated per visa type from the VisaRuleVersion signal
+handlers in rules_knowledge.signals.rule_publishing_signals (immediately and
+again once the surrounding transaction commits), and expire after
+CACHE_TIMEOUT as a safety net for bulk updates that bypass signals.
+"""
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from rules_knowledge.models.visa_rule_version import VisaRuleVersion
+from rules_knowledge.models.visa_type import VisaType
+
+logger = logging.getLogger('django')
+
+
+class ActiveRuleVersionResolver:
+    """Redis-backed resolver of the active rule version for a visa type and date."""
+
+    CACHE_PREFIX = 'rule_engine:active_rule_version'
+    CACHE_TIMEOUT = 60 * 60  # 1 hour
+    MAX_INTERVALS = 16  # Per visa type, most recently resolved first
+
+    @staticmethod
+    def _cache_key(visa_type_id: str) -> str:
+        return f"{ActiveRuleVersionResolver.CACHE_PREFIX}:{visa_type_id}"
+
+    @staticmethod
+    def _field_values(rule_version: VisaRuleVersion) -> Dict[str, Any]:
+        """Concrete field values of a rule version (no related objects)."""
+        return {
+            field.attname: getattr(rule_version, field.attname)
+            for field in VisaRuleVersion._meta.concrete_fields
+        }
+
+    @staticmethod
+    def _from_field_values(values: Dict[str, Any]) -> VisaRuleVersion:
+        """Rebuild a rule version instance from cached field values."""
+        field_names = list(values.keys())
+        return VisaRuleVersion.from_db('default', field_names, [values[name] for name in field_names])
+
+    @staticmethod
+    def _interval_contains(interval: Dict[str, Any], evaluation_date: datetime) -> bool:
+        if evaluation_date < interval['valid_from']:
+            return False
+        if interval['effective_to'] is not None and evaluation_date > interval['effective_to']:
+            return False
+        if interval['next_effective_from'] is not None and evaluation_date >= interval['next_effective_from']:
+            return False
+        return True
+
+    @staticmethod
+    def get_cached(visa_type_id: str, evaluation_date: datetime) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached interval covering the evaluation date.
+
+        Args:
+            visa_type_id: UUID of the visa type
+            evaluation_date: Date to resolve
+
+        Returns:
+            Cached interval dict or None on cache miss
+        """
+        try:
+            intervals = cache.get(ActiveRuleVersionResolver._cache_key(visa_type_id))
+        except Exception as e:
+            logger.warning(f"Error reading active rule version cache for visa type {visa_type_id}: {e}")
+            return None
+
+        for interval in intervals or []:
+            if ActiveRuleVersionResolver._interval_contains(interval, evaluation_date):
+                return interval
+        return None
+
+    @staticmethod
+    def store(visa_type_id: str, rule_version: VisaRuleVersion, visa_type_is_active: bool = True):
+        """
+        Cache the interval over which a rule version is the active one.
+
+        Args:
+            visa_type_id: UUID of the visa type
+            rule_version: Active rule version resolved from the database
+            visa_type_is_active: Whether the visa type is active (for warnings on cache hits)
+        """
+        next_effective_from = VisaRuleVersion.objects.filter(
+            visa_type_id=visa_type_id,
+            is_published=True,
+            effective_from__gt=rule_version.effective_from
+        ).order_by('effective_from').values_list('effective_from', flat=True).first()
+
+        interval = {
+            'rule_version': ActiveRuleVersionResolver._field_values(rule_version),
+            'valid_from': rule_version.effective_from,
+            'effective_to': rule_version.effective_to,
+            'next_effective_from': next_effective_from,
+            'visa_type_is_active': visa_type_is_active,
+        }
+
+        cache_key = ActiveRuleVersionResolver._cache_key(visa_type_id)
+        try:
+            intervals: List[Dict[str, Any]] = cache.get(cache_key) or []
+            intervals = [
+                existing for existing in intervals
+                if existing['rule_version']['id'] != rule_version.id
+            ]
+            intervals.insert(0, interval)
+            cache.set(cache_key, intervals[:ActiveRuleVersionResolver.MAX_INTERVALS], ActiveRuleVersionResolver.CACHE_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Error caching active rule version for visa type {visa_type_id}: {e}")
+
+    @staticmethod
+    def resolve(visa_type_id: str, evaluation_date: Optional[datetime] = None) -> Optional[VisaRuleVersion]:
+        """
+        Resolve the active published rule version for a visa type on a date.
+
+        Args:
+            visa_type_id: UUID of the visa type
+            evaluation_date: Date to evaluate against (defaults to now)
+
+        Returns:
+            Active VisaRuleVersion or None if not found
+
+        Raises:
+            ValueError: If visa type not found
+        """
+        if evaluation_date is None:
+            evaluation_date = timezone.now()
+        visa_type_id = str(visa_type_id)
+
+        interval = ActiveRuleVersionResolver.get_cached(visa_type_id, evaluation_date)
+        if interval is not None:
+            if not interval['visa_type_is_active']:
+                logger.warning(f"Visa type {visa_type_id} is not active")
+            rule_version = ActiveRuleVersionResolver._from_field_values(interval['rule_version'])
+            logger.debug(f"Resolved active rule version {rule_version.id} for visa type {visa_type_id} from cache")
+            return rule_version
+
+        # Active means: effective_from <= evaluation_date AND (effective_to IS NULL OR effective_to >= evaluation_date)
+        # AND is_published = True
+        active_versions = VisaRuleVersion.objects.select_related('visa_type').filter(
+            visa_type_id=visa_type_id,
+            is_published=True,
+            effective_from__lte=evaluation_date
+        ).filter(
+            Q(effective_to__isnull=True) | Q(effective_to__gte=evaluation_date)
+        ).order_by('-effective_from')
+
+        candidates = list(active_versions[:2])
+        if not candidates:
+            # Only now distinguish "no active version" from "unknown visa type"
+            if not VisaType.objects.filter(id=visa_type_id).exists():
+                raise ValueError(f"Visa type with ID '{visa_type_id}' not found")
+            logger.warning(f"No active rule version found for visa type {visa_type_id} on {evaluation_date}")
+            return None
+
+        rule_version = candidates[0]
+        if len(candidates) > 1:
+            logger.warning(
+                f"Multiple active rule versions found for visa type {visa_type_id}. "
+                f"Using most recent: {rule_version.id}"
+            )
+
+        visa_type_is_active = getattr(rule_version.visa_type, 'is_active', True)
+        if not visa_type_is_active:
+            logger.warning(f"Visa type {visa_type_id} is not active")
+
+        ActiveRuleVersionResolver.store(visa_type_id, rule_version, visa_type_is_active)
+        logger.debug(f"Loaded active rule version {rule_version.id} for visa type {visa_type_id}")
+        return rule_version
+
+    @staticmethod
+    def invalidate(visa_type_id: str):
+        """
+        Drop cached intervals of a visa type, now and again on transaction commit.
+
+        The second pass covers readers that re-populate the cache from the
+        pre-commit state while the change is still in flight.
+
+        Args:
+            visa_type_id: UUID of the visa type
+        """
+        cache_key = ActiveRuleVersionResolver._cache_key(visa_type_id)
+
+        def delete():
+            try:
+                cache.delete(cache_key)
+            except Exception as e:
+                logger.warning(f"Error invalidating active rule version cache for visa type {visa_type_id}: {e}")
+
+        delete()
+        transaction.on_commit(delete)
@@ -0,0 +1,316 @@
+"""
+Rule Compiler
+
+Lowers JSON Logic expressions from VisaRequirement.condition_expression into
+Python closures so the rule engine does not have to re-validate, re-walk and
+re-interpret every expression for every case.
+
+The operator table below covers the operators of the pinned json_logic
+package (plus the standard "if", "!!", "missing", "missing_some" and
+"merge") with Python 3 semantics. "and", "or", "if" and "?:" short-circuit as
+in the JSON Logic reference implementation. Sub-trees using any other
+operator are delegated to json_logic.jsonLogic unchanged.
+
+Compiled requirements are cached in-process per rule version (see
+CompiledRuleCache) and invalidated when the rule version or its requirements
+change. Alongside each rule version the cache keeps a dependency index from
+fact key to the requirements referencing it, used to re-evaluate only the
+affected requirements when a single fact changes.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from functools import reduce
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import json_logic
+
+logger = logging.getLogger('django')
+
+_NOT_FOUND = object()
+
+
+def _get_var(data: Any, name: Any = None, not_found: Any = None) -> Any:
+    """Resolve a (dotted) variable name against the facts dictionary."""
+    if name is None or name == '':
+        return data
+    for key in str(name).split('.'):
+        if isinstance(data, dict):
+            data = data.get(key, _NOT_FOUND)
+        elif isinstance(data, (list, tuple)) and key.lstrip('-').isdigit():
+            try:
+                data = data[int(key)]
+            except IndexError:
+                data = _NOT_FOUND
+        else:
+            data = _NOT_FOUND
+        if data is _NOT_FOUND:
+            return not_found
+    return data
+
+
+def _missing(data: Any, *names: Any) -> List[Any]:
+    """Return the variable names that cannot be resolved."""
+    if names and isinstance(names[0], (list, tuple)):
+        names = names[0]
+    return [name for name in names if _get_var(data, name, _NOT_FOUND) is _NOT_FOUND]
+
+
+def _missing_some(data: Any, min_required: int, names: List[Any]) -> List[Any]:
+    """Return missing names unless at least min_required of them are present."""
+    missing = _missing(data, names)
+    if len(names) - len(missing) >= min_required:
+        return []
+    return missing
+
+
+def _merge(*args: Any) -> List[Any]:
+    merged = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            merged.extend(arg)
+        else:
+            merged.append(arg)
+    return merged
+
+
+_OPERATIONS: Dict[str, Callable] = {
+    '==': lambda a, b: a == b,
+    '===': lambda a, b: type(a) == type(b) and a == b,
+    '!=': lambda a, b: a != b,
+    '!==': lambda a, b: not (type(a) == type(b) and a == b),
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    '<': lambda a, b, c=None: a < b if c is None else (a < b) and (b < c),
+    '<=': lambda a, b, c=None: a <= b if c is None else (a <= b) and (b <= c),
+    '!': lambda a: not a,
+    '!!': lambda a: bool(a),
+    '%': lambda a, b: a % b,
+    'in': lambda a, b: a in b if hasattr(b, '__contains__') else False,
+    'cat': lambda *args: ''.join(str(arg) for arg in args),
+    '+': lambda *args: reduce(lambda total, arg: total + float(arg), args, 0.0),
+    '*': lambda *args: reduce(lambda total, arg: total * float(arg), args, 1.0),
+    '-': lambda a, b=None: -a if b is None else a - b,
+    '/': lambda a, b=None: a if b is None else float(a) / float(b),
+    'min': lambda *args: min(args),
+    'max': lambda *args: max(args),
+    'count': lambda *args: sum(1 if arg else 0 for arg in args),
+    'merge': _merge,
+}
+
+_DATA_OPERATIONS: Dict[str, Callable] = {
+    'var': _get_var,
+    'missing': _missing,
+    'missing_some': _missing_some,
+}
+
+
+class CompiledRequirement:
+    """Pre-validated, pre-lowered form of a single VisaRequirement expression."""
+
+    __slots__ = ('requirement_id', 'expression', 'variables', 'error', 'vectorizable', '_evaluator')
+
+    def __init__(
+        self,
+        requirement_id: str,
+        expression: Any,
+        variables: List[str],
+        evaluator: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        error: Optional[str] = None,
+        vectorizable: bool = False
+    ):
+        self.requirement_id = requirement_id
+        self.expression = expression
+        self.variables = variables
+        self.error = error  # Structure validation error, if any
+        self.vectorizable = vectorizable  # Can be evaluated column-wise with NumPy
+        self._evaluator = evaluator
+
+    @property
+    def is_valid(self) -> bool:
+        return self.error is None
+
+    def evaluate(self, data: Optional[Dict[str, Any]]) -> Any:
+        """Evaluate the compiled expression against a facts dictionary."""
+        return self._evaluator(data or {})
+
+
+class RuleCompiler:
+    """Compiles JSON Logic expressions into Python closures."""
+
+    @staticmethod
+    def compile_expression(expression: Any) -> Callable[[Dict[str, Any]], Any]:
+        """
+        Lower a JSON Logic expression to a closure taking the facts dict.
+
+        Args:
+            expression: JSON Logic expression (already structure-validated)
+
+        Returns:
+            Callable evaluating the expression against a facts dictionary
+        """
+        return RuleCompiler._lower(expression)
+
+    @staticmethod
+    def _interpreted(node: Any) -> Callable[[Dict[str, Any]], Any]:
+        """Fallback closure delegating a sub-tree to the json_logic interpreter."""
+        def evaluate(data):
+            return json_logic.jsonLogic(node, data)
+        return evaluate
+
+    @staticmethod
+    def _lower(node: Any) -> Callable[[Dict[str, Any]], Any]:
+        """Recursively lower a node into a closure."""
+        # Primitives and literal lists evaluate to themselves
+        if not isinstance(node, dict):
+            return lambda data: node
+
+        # Only single-operator nodes are valid JSON Logic
+        if len(node) != 1:
+            return RuleCompiler._interpreted(node)
+
+        operator, values = next(iter(node.items()))
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+
+        if operator not in _OPERATIONS and operator not in _DATA_OPERATIONS \
+                and operator not in ('and', 'or', 'if', '?:'):
+            return RuleCompiler._interpreted(node)
+
+        args = tuple(RuleCompiler._lower(value) for value in values)
+
+        if operator == 'and':
+            def evaluate_and(data):
+                value = True
+                for arg in args:
+                    value = arg(data)
+                    if not value:
+                        return value
+                return value
+            return evaluate_and
+
+        if operator == 'or':
+            def evaluate_or(data):
+                value = False
+                for arg in args:
+                    value = arg(data)
+                    if value:
+                        return value
+                return value
+            return evaluate_or
+
+        if operator in ('if', '?:'):
+            def evaluate_if(data):
+                for i in range(0, len(args) - 1, 2):
+                    if args[i](data):
+                        return args[i + 1](data)
+                if len(args) % 2:
+                    return args[-1](data)
+                return None
+            return evaluate_if
+
+        data_operation = _DATA_OPERATIONS.get(operator)
+        if data_operation is not None:
+            return lambda data: data_operation(data, *[arg(data) for arg in args])
+
+        operation = _OPERATIONS[operator]
+
+        # Specialise the common arities to avoid building argument lists
+        if len(args) == 1:
+            (first,) = args
+            return lambda data: operation(first(data))
+        if len(args) == 2:
+            first, second = args
+            return lambda data: operation(first(data), second(data))
+        return lambda data: operation(*[arg(data) for arg in args])
+
+
+def build_dependency_index(compiled: Dict[str, CompiledRequirement]) -> Dict[str, Tuple[str, ...]]:
+    """
+    Map each fact key to the ids of the requirements whose expression references it.
+
+    Args:
+        compiled: Dictionary mapping requirement_id -> CompiledRequirement
+
+    Returns:
+        Dictionary mapping fact_key -> tuple of requirement ids
+    """
+    index: Dict[str, List[str]] = {}
+    for requirement_id, compiled_requirement in compiled.items():
+        for variable in compiled_requirement.variables:
+            index.setdefault(variable, []).append(requirement_id)
+    return {fact_key: tuple(requirement_ids) for fact_key, requirement_ids in index.items()}
+
+
+class CompiledRuleCache:
+    """
+    In-process cache of compiled requirements per rule version.
+
+    Entries carry a fingerprint of the requirement rows they were compiled
+    from, so a change made by another process (which cannot reach this
+    process's signal handlers) is still detected on the next lookup.
+    """
+
+    MAX_RULE_VERSIONS = 256
+
+    # rule_version_id -> (fingerprint, compiled requirements, dependency index)
+    _entries: 'OrderedDict[str, Tuple[Tuple, Dict[str, CompiledRequirement], Dict[str, Tuple[str, ...]]]]' = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(requirements: Iterable[Any]) -> Tuple:
+        """Build a fingerprint from requirement ids and modification times."""
+        return tuple(
+            (str(requirement.id), getattr(requirement, 'updated_at', None))
+            for requirement in requirements
+        )
+
+    @classmethod
+    def _get_entry(cls, rule_version_id: str, fingerprint: Tuple) -> Optional[Tuple]:
+        key = str(rule_version_id)
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != fingerprint:
+                del cls._entries[key]
+                logger.debug(f"Compiled rules for rule version {key} are stale, recompiling")
+                return None
+            cls._entries.move_to_end(key)
+            return entry
+
+    @classmethod
+    def get(cls, rule_version_id: str, fingerprint: Tuple) -> Optional[Dict[str, CompiledRequirement]]:
+        """Return compiled requirements for a rule version if still current."""
+        entry = cls._get_entry(rule_version_id, fingerprint)
+        return entry[1] if entry is not None else None
+
+    @classmethod
+    def get_dependency_index(cls, rule_version_id: str, fingerprint: Tuple) -> Optional[Dict[str, Tuple[str, ...]]]:
+        """Return the fact_key -> requirement ids index for a rule version if still current."""
+        entry = cls._get_entry(rule_version_id, fingerprint)
+        return entry[2] if entry is not None else None
+
+    @classmethod
+    def set(cls, rule_version_id: str, fingerprint: Tuple, compiled: Dict[str, CompiledRequirement]):
+        """Store compiled requirements for a rule version."""
+        key = str(rule_version_id)
+        dependency_index = build_dependency_index(compiled)
+        with cls._lock:
+            cls._entries[key] = (fingerprint, compiled, dependency_index)
+            cls._entries.move_to_end(key)
+            while len(cls._entries) > cls.MAX_RULE_VERSIONS:
+                cls._entries.popitem(last=False)
+
+    @classmethod
+    def invalidate(cls, rule_version_id: str):
+        """Drop the compiled form of a rule version."""
+        with cls._lock:
+            if cls._entries.pop(str(rule_version_id), None) is not None:
+                logger.debug(f"Invalidated compiled rules for rule version {rule_version_id}")
+
+    @classmethod
+    def clear(cls):
+        """Drop all compiled rule versions."""
+        with cls._lock:
+            cls._entries.clear()
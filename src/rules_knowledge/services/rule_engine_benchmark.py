@@ -0,0 +1,427 @@
+"""
+Rule Engine Benchmark
+
+Micro-benchmark harness for RuleEngineService. It generates synthetic rule
+versions (configurable requirement count and expression depth) and synthetic
+case fact sets (configurable missing-fact ratio), drives the rule engine
+entry points and reports throughput, latency percentiles and allocations as
+a JSON-serializable dict so results can be compared across releases.
+
+Two modes are supported:
+- in-memory (default): unsaved model instances, no database access.
+  evaluate_all_requirements and run_eligibility_evaluation load from the
+  database, so their in-memory counterparts (evaluate_requirements and
+  evaluate_requirements + aggregate_results) are measured instead.
+- with database: synthetic rows are written inside a transaction that is
+  rolled back at the end, and the database-backed entry points are measured.
+
+Run through the benchmark_rule_engine management command.
+"""
+import logging
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from rules_knowledge.models.visa_requirement import VisaRequirement
+from rules_knowledge.models.visa_rule_version import VisaRuleVersion
+from rules_knowledge.models.visa_type import VisaType
+from rules_knowledge.services.active_rule_version_resolver import ActiveRuleVersionResolver
+from rules_knowledge.services.rule_compiler import CompiledRuleCache
+from rules_knowledge.services.rule_engine_service import RuleEngineService
+
+logger = logging.getLogger('django')
+
+_STRING_VALUES = ['NG', 'GH', 'IN', 'US', 'GB', 'CA', 'AU', 'FR']
+
+
+class _RollbackBenchmarkData(Exception):
+    """Raised to roll back synthetic database rows once measured."""
+
+
+class SyntheticRuleGenerator:
+    """Generates synthetic requirements and case facts for benchmarking."""
+
+    def __init__(self, fact_count: int = 20, seed: int = 42):
+        self.random = random.Random(seed)
+        self.fact_keys = [f"fact_{i}" for i in range(fact_count)]
+        # Half the facts are numeric, half categorical
+        self.numeric_keys = set(self.fact_keys[::2])
+
+    def _leaf(self) -> Dict[str, Any]:
+        fact_key = self.random.choice(self.fact_keys)
+        var = {"var": fact_key}
+        if fact_key in self.numeric_keys:
+            operator = self.random.choice(['>', '>=', '<', '<='])
+            return {operator: [var, self.random.randint(0, 100)]}
+        if self.random.random() < 0.5:
+            return {"==": [var, self.random.choice(_STRING_VALUES)]}
+        return {"in": [var, self.random.sample(_STRING_VALUES, 3)]}
+
+    def expression(self, depth: int) -> Dict[str, Any]:
+        """Build a random expression; depth 1 is a single comparison."""
+        if depth <= 1:
+            return self._leaf()
+        operator = self.random.choice(['and', 'or'])
+        return {
+            operator: [self.expression(depth - 1) for _ in range(self.random.randint(2, 3))]
+        }
+
+    def rule_version(self, visa_type: Optional[VisaType] = None) -> VisaRuleVersion:
+        """Build an unsaved, published rule version."""
+        rule_version = VisaRuleVersion(
+            id=uuid.uuid4(),
+            effective_from=timezone.now() - timedelta(days=1),
+            is_published=True
+        )
+        if visa_type is not None:
+            rule_version.visa_type = visa_type
+        return rule_version
+
+    def requirements(
+        self,
+        rule_version: VisaRuleVersion,
+        requirement_count: int,
+        depth: int
+    ) -> List[VisaRequirement]:
+        """Build unsaved requirements with random expressions."""
+        return [
+            VisaRequirement(
+                id=uuid.uuid4(),
+                rule_version=rule_version,
+                requirement_code=f"BENCH_{i:04d}",
+                rule_type='eligibility',
+                description=f"Synthetic benchmark requirement {i}",
+                condition_expression=self.expression(depth),
+                is_mandatory=self.random.random() < 0.7
+            )
+            for i in range(requirement_count)
+        ]
+
+    def case_facts(self, missing_ratio: float) -> Dict[str, Any]:
+        """Build a facts dictionary with roughly missing_ratio of the keys absent."""
+        facts = {}
+        for fact_key in self.fact_keys:
+            if self.random.random() < missing_ratio:
+                continue
+            if fact_key in self.numeric_keys:
+                facts[fact_key] = self.random.randint(0, 100)
+            else:
+                facts[fact_key] = self.random.choice(_STRING_VALUES)
+        return facts
+
+
+class RuleEngineBenchmark:
+    """Drives RuleEngineService entry points and collects timing statistics."""
+
+    def __init__(
+        self,
+        requirement_count: int = 25,
+        depth: int = 2,
+        case_count: int = 100,
+        missing_ratio: float = 0.1,
+        fact_count: int = 20,
+        iterations: int = 5,
+        allocation_iterations: int = 1,
+        seed: int = 42
+    ):
+        self.requirement_count = requirement_count
+        self.depth = depth
+        self.case_count = case_count
+        self.missing_ratio = missing_ratio
+        self.fact_count = fact_count
+        self.iterations = iterations
+        self.allocation_iterations = allocation_iterations
+        self.seed = seed
+        self.generator = SyntheticRuleGenerator(fact_count=fact_count, seed=seed)
+
+    def config(self) -> Dict[str, Any]:
+        return {
+            'requirement_count': self.requirement_count,
+            'depth': self.depth,
+            'case_count': self.case_count,
+            'missing_ratio': self.missing_ratio,
+            'fact_count': self.fact_count,
+            'iterations': self.iterations,
+            'allocation_iterations': self.allocation_iterations,
+            'seed': self.seed,
+        }
+
+    @staticmethod
+    def measure(
+        name: str,
+        operation: Callable[[Any], Any],
+        inputs: List[Any],
+        iterations: int,
+        allocation_iterations: int = 1,
+        evaluations_per_call: int = 1
+    ) -> Dict[str, Any]:
+        """
+        Time an operation over every input for a number of iterations.
+
+        Latencies are measured per call. Allocations (peak traced memory per
+        call and memory retained after the pass) are measured in a separate
+        pass under tracemalloc so they do not skew the timings.
+
+        Args:
+            name: Name of the measured operation
+            operation: Callable taking one input
+            inputs: Inputs to call the operation with
+            iterations: Number of passes over the inputs
+            allocation_iterations: Number of passes measured under tracemalloc
+            evaluations_per_call: Requirement evaluations performed per call
+
+        Returns:
+            Dict with calls, evaluations/sec, latency percentiles (microseconds)
+            and allocation statistics
+        """
+        # Warm-up pass (fills the compiled rule cache, imports, etc.)
+        for item in inputs:
+            operation(item)
+
+        latencies_ns = []
+        perf_counter_ns = time.perf_counter_ns
+        for _ in range(iterations):
+            for item in inputs:
+                start = perf_counter_ns()
+                operation(item)
+                latencies_ns.append(perf_counter_ns() - start)
+
+        total_seconds = sum(latencies_ns) / 1e9
+        calls = len(latencies_ns)
+        latencies_us = sorted(latency / 1000 for latency in latencies_ns)
+
+        allocations = {'peak_bytes_per_call': None, 'max_peak_bytes': None, 'retained_bytes': None}
+        if allocation_iterations > 0 and inputs:
+            peaks = []
+            tracemalloc.start()
+            try:
+                baseline, _ = tracemalloc.get_traced_memory()
+                for _ in range(allocation_iterations):
+                    for item in inputs:
+                        tracemalloc.reset_peak()
+                        current, _ = tracemalloc.get_traced_memory()
+                        operation(item)
+                        _, peak = tracemalloc.get_traced_memory()
+                        peaks.append(peak - current)
+                retained, _ = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            allocations = {
+                'peak_bytes_per_call': round(statistics.fmean(peaks), 1),
+                'max_peak_bytes': max(peaks),
+                'retained_bytes': retained - baseline,
+            }
+
+        return {
+            'name': name,
+            'calls': calls,
+            'total_seconds': round(total_seconds, 6),
+            'calls_per_second': round(calls / total_seconds, 2) if total_seconds else None,
+            'evaluations_per_second': (
+                round(calls * evaluations_per_call / total_seconds, 2) if total_seconds else None
+            ),
+            'latency_us': {
+                'mean': round(statistics.fmean(latencies_us), 2) if latencies_us else None,
+                'p50': round(RuleEngineBenchmark.percentile(latencies_us, 50), 2) if latencies_us else None,
+                'p99': round(RuleEngineBenchmark.percentile(latencies_us, 99), 2) if latencies_us else None,
+                'max': round(latencies_us[-1], 2) if latencies_us else None,
+            },
+            'allocations': allocations,
+        }
+
+    @staticmethod
+    def percentile(sorted_values: List[float], percent: float) -> Optional[float]:
+        """Nearest-rank percentile of already sorted values."""
+        if not sorted_values:
+            return None
+        rank = max(1, int(round(percent / 100 * len(sorted_values))))
+        return sorted_values[min(rank, len(sorted_values)) - 1]
+
+    def run_in_memory(self) -> List[Dict[str, Any]]:
+        """Benchmark the rule engine without database access."""
+        rule_version = self.generator.rule_version()
+        requirements = self.generator.requirements(rule_version, self.requirement_count, self.depth)
+        facts_list = [self.generator.case_facts(self.missing_ratio) for _ in range(self.case_count)]
+
+        compiled = RuleEngineService.get_compiled_requirements(rule_version, requirements)
+        pairs = [
+            (requirement, facts)
+            for facts in facts_list
+            for requirement in requirements
+        ]
+        evaluation_results = [
+            RuleEngineService.evaluate_requirements(rule_version, requirements, facts)
+            for facts in facts_list
+        ]
+
+        try:
+            return [
+                self.measure(
+                    'evaluate_requirement',
+                    lambda pair: RuleEngineService.evaluate_requirement(
+                        pair[0], pair[1], compiled.get(str(pair[0].id))
+                    ),
+                    pairs,
+                    self.iterations,
+                    self.allocation_iterations
+                ),
+                self.measure(
+                    'evaluate_requirements',
+                    lambda facts: RuleEngineService.evaluate_requirements(rule_version, requirements, facts),
+                    facts_list,
+                    self.iterations,
+                    self.allocation_iterations,
+                    evaluations_per_call=len(requirements)
+                ),
+                self.measure(
+                    'aggregate_results',
+                    lambda results: RuleEngineService.aggregate_results(results, rule_version),
+                    evaluation_results,
+                    self.iterations,
+                    self.allocation_iterations
+                ),
+                self.measure(
+                    'evaluate_and_aggregate',
+                    lambda facts: RuleEngineService.aggregate_results(
+                        RuleEngineService.evaluate_requirements(rule_version, requirements, facts),
+                        rule_version
+                    ),
+                    facts_list,
+                    self.iterations,
+                    self.allocation_iterations,
+                    evaluations_per_call=len(requirements)
+                ),
+            ]
+        finally:
+            CompiledRuleCache.invalidate(rule_version.id)
+
+    def run_with_db(self) -> List[Dict[str, Any]]:
+        """
+        Benchmark the database-backed entry points.
+
+        Synthetic visa type, rule version, requirements, cases and facts are
+        written inside a transaction that is rolled back afterwards.
+        """
+        from django.contrib.auth import get_user_model
+        from immigration_cases.models.case import Case
+        from immigration_cases.models.case_fact import CaseFact
+
+        results: List[Dict[str, Any]] = []
+        visa_type_id = None
+        rule_version_id = None
+        try:
+            with transaction.atomic():
+                visa_type = VisaType.objects.create(
+                    jurisdiction='UK',
+                    code=f"BENCH_{uuid.uuid4().hex[:8].upper()}",
+                    name='Benchmark Visa',
+                    is_active=True
+                )
+                visa_type_id = visa_type.id
+
+                # Created unpublished and published with update() so that the
+                # publishing signal does not notify users about benchmark data
+                rule_version = self.generator.rule_version(visa_type)
+                rule_version.is_published = False
+                rule_version.save()
+                VisaRuleVersion.objects.filter(id=rule_version.id).update(is_published=True)
+                rule_version.is_published = True
+                rule_version_id = rule_version.id
+
+                VisaRequirement.objects.bulk_create(
+                    self.generator.requirements(rule_version, self.requirement_count, self.depth)
+                )
+
+                user = get_user_model().objects.create(email=f"benchmark-{uuid.uuid4().hex}@example.com")
+                cases = Case.objects.bulk_create([
+                    Case(user=user, jurisdiction='UK') for _ in range(self.case_count)
+                ])
+                CaseFact.objects.bulk_create([
+                    CaseFact(case=case, fact_key=fact_key, fact_value=fact_value)
+                    for case in cases
+                    for fact_key, fact_value in self.generator.case_facts(self.missing_ratio).items()
+                ])
+                case_ids = [str(case.id) for case in cases]
+
+                results.append(self.measure(
+                    'load_case_facts',
+                    RuleEngineService.load_case_facts,
+                    case_ids,
+                    self.iterations,
+                    self.allocation_iterations
+                ))
+                results.append(self.measure(
+                    'load_active_rule_version',
+                    lambda _: RuleEngineService.load_active_rule_version(str(visa_type_id)),
+                    case_ids,
+                    self.iterations,
+                    self.allocation_iterations
+                ))
+                case_facts = [RuleEngineService.load_case_facts(case_id) for case_id in case_ids]
+                results.append(self.measure(
+                    'evaluate_all_requirements',
+                    lambda facts: RuleEngineService.evaluate_all_requirements(rule_version, facts),
+                    case_facts,
+                    self.iterations,
+                    self.allocation_iterations,
+                    evaluations_per_call=self.requirement_count
+                ))
+                results.append(self.measure(
+                    'run_eligibility_evaluation',
+                    lambda case_id: RuleEngineService.run_eligibility_evaluation(case_id, str(visa_type_id)),
+                    case_ids,
+                    self.iterations,
+                    self.allocation_iterations,
+                    evaluations_per_call=self.requirement_count
+                ))
+
+                raise _RollbackBenchmarkData()
+        except _RollbackBenchmarkData:
+            pass
+        finally:
+            # Rows are rolled back; drop any cache entries that refer to them
+            if rule_version_id is not None:
+                CompiledRuleCache.invalidate(rule_version_id)
+            if visa_type_id is not None:
+                ActiveRuleVersionResolver.invalidate(visa_type_id)
+
+        return results
+
+    def run(self, with_db: bool = False) -> Dict[str, Any]:
+        """
+        Run the benchmark.
+
+        Args:
+            with_db: Also benchmark the database-backed entry points
+
+        Returns:
+            JSON-serializable report
+        """
+        report = {
+            'benchmark': 'rule_engine',
+            'created_at': timezone.now().isoformat(),
+            'environment': {
+                'python': sys.version.split()[0],
+                'implementation': platform.python_implementation(),
+                'platform': platform.platform(),
+            },
+            'config': self.config(),
+            'in_memory': self.run_in_memory(),
+        }
+        if with_db:
+            report['with_db'] = self.run_with_db()
+
+        logger.info(
+            f"Rule engine benchmark complete: {self.requirement_count} requirements, "
+            f"depth {self.depth}, {self.case_count} cases"
+        )
+        return report
@@ -10,9 +10,8 @@ This service follows the design pattern from implementation.md Section 6.2.
 import logging
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import date, datetime
+from django.core.cache import cache
 from django.utils import timezone
-from django.db.models import Q
-import json_logic
 
 from immigration_cases.models.case import Case
 from immigration_cases.selectors.case_fact_selector import CaseFactSelector
@@ -20,7 +19,14 @@ from rules_knowledge.models.visa_rule_version import VisaRuleVersion
 from rules_knowledge.models.visa_requirement import VisaRequirement
 from rules_knowledge.selectors.visa_rule_version_selector import VisaRuleVersionSelector
 from rules_knowledge.selectors.visa_requirement_selector import VisaRequirementSelector
-from rules_knowledge.selectors.visa_type_selector import VisaTypeSelector
+from rules_knowledge.services.active_rule_version_resolver import ActiveRuleVersionResolver
+from rules_knowledge.services.rule_compiler import (
+    CompiledRequirement,
+    CompiledRuleCache,
+    RuleCompiler,
+    build_dependency_index,
+)
+from rules_knowledge.services.vectorized_rule_evaluator import FactColumns, VectorizedRuleEvaluator
 
 logger = logging.getLogger('django')
 
@@ -79,6 +85,11 @@ class RuleEngineService:
     - Error-resilient: Handles missing facts, invalid expressions gracefully
     """
     
+    # Per-requirement results of the last evaluation of a case, kept so a
+    # single changed fact only re-evaluates the requirements that reference it
+    REQUIREMENT_RESULTS_CACHE_PREFIX = 'rule_engine:requirement_results'
+    REQUIREMENT_RESULTS_CACHE_TIMEOUT = 60 * 60 * 24  # 24 hours
+    
     @staticmethod
     def load_case_facts(case_id: str) -> Dict[str, Any]:
         """
@@ -94,35 +105,26 @@ class RuleEngineService:
         Raises:
             ValueError: If case not found
         """
-        from immigration_cases.selectors.case_selector import CaseSelector
-        
-        case = CaseSelector.get_by_id(case_id)
-        if not case:
-            raise ValueError(f"Case with ID '{case_id}' not found")
-        
-        # Get all facts for the case, ordered by created_at DESC (most recent first)
-        facts = CaseFactSelector.get_by_case(case)
+        # Latest value per fact_key in one indexed query (DISTINCT ON fact_key)
+        facts = list(CaseFactSelector.get_latest_values_by_case(case_id))
         
-        # Edge case: No facts for case
-        if not facts.exists():
+        # Edge case: No facts for case - distinguish from a non-existent case
+        if not facts:
+            if not Case.objects.filter(id=case_id).exists():
+                raise ValueError(f"Case with ID '{case_id}' not found")
             logger.warning(f"Case {case_id} has no facts")
             return {}
         
-        # Convert to dictionary, handling duplicates (latest wins)
         facts_dict = {}
         null_facts = []  # Track facts with null values
         
-        for fact in facts:
-            # Only keep the first occurrence (most recent due to DESC ordering)
-            if fact.fact_key not in facts_dict:
-                # Edge case: Handle null/None fact values
-                if fact.fact_value is None:
-                    null_facts.append(fact.fact_key)
-                    logger.debug(f"Fact {fact.fact_key} has null value for case {case_id}")
-                    # Store None anyway, JSON Logic can handle it
-                    facts_dict[fact.fact_key] = None
-                else:
-                    facts_dict[fact.fact_key] = fact.fact_value
+        for fact_key, fact_value in facts:
+            # Edge case: Handle null/None fact values
+            if fact_value is None:
+                null_facts.append(fact_key)
+                logger.debug(f"Fact {fact_key} has null value for case {case_id}")
+            # Store None anyway, JSON Logic can handle it
+            facts_dict[fact_key] = fact_value
         
         if null_facts:
             logger.debug(f"Case {case_id} has {len(null_facts)} facts with null values: {null_facts}")
@@ -145,50 +147,9 @@ class RuleEngineService:
         Raises:
             ValueError: If visa type not found
         """
-        if evaluation_date is None:
-            evaluation_date = timezone.now()
-        
-        visa_type = VisaTypeSelector.get_by_id(visa_type_id)
-        if not visa_type:
-            raise ValueError(f"Visa type with ID '{visa_type_id}' not found")
-        
-        # Edge case: Check if visa type is active (if there's an is_active field)
-        # Note: This assumes visa types might have an is_active field
-        # If not, this check can be removed
-        if hasattr(visa_type, 'is_active') and not visa_type.is_active:
-            logger.warning(f"Visa type {visa_type_id} is not active")
-            # Still proceed, but log warning
-        
-        # Query for active rule version
-        # Active means: effective_from <= evaluation_date AND (effective_to IS NULL OR effective_to >= evaluation_date)
-        # AND is_published = True
-        active_versions = VisaRuleVersion.objects.select_related(
-            'visa_type',
-            'source_document_version'
-        ).filter(
-            visa_type=visa_type,
-            is_published=True,
-            effective_from__lte=evaluation_date
-        ).filter(
-            Q(effective_to__isnull=True) | Q(effective_to__gte=evaluation_date)
-        ).order_by('-effective_from')
-        
-        rule_version = active_versions.first()
-        
-        if not rule_version:
-            logger.warning(f"No active rule version found for visa type {visa_type_id} on {evaluation_date}")
-            return None
-        
-        # Handle edge case: multiple active versions (shouldn't happen with proper versioning)
-        version_count = active_versions.count()
-        if version_count > 1:
-            logger.warning(
-                f"Multiple active rule versions found for visa type {visa_type_id} "
-                f"({version_count} versions). Using most recent: {rule_version.id}"
-            )
-        
-        logger.debug(f"Loaded active rule version {rule_version.id} for visa type {visa_type_id}")
-        return rule_version
+        # Resolved through the shared Redis cache of active version intervals;
+        # the database is only queried on a cache miss
+        return ActiveRuleVersionResolver.resolve(visa_type_id, evaluation_date)
     
     @staticmethod
     def extract_variables_from_expression(expression: Dict[str, Any]) -> List[str]:
@@ -289,10 +250,101 @@ class RuleEngineService:
         
         return value
     
+    @staticmethod
+    def compile_requirement(requirement: VisaRequirement) -> CompiledRequirement:
+        """
+        Validate and compile a requirement's expression once.
+        
+        Args:
+            requirement: VisaRequirement to compile
+            
+        Returns:
+            CompiledRequirement with precomputed variables and evaluator
+        """
+        expression = requirement.condition_expression
+        is_valid, error_msg = RuleEngineService.validate_expression_structure(expression)
+        if not is_valid:
+            return CompiledRequirement(
+                requirement_id=str(requirement.id),
+                expression=expression,
+                variables=[],
+                error=error_msg
+            )
+        
+        return CompiledRequirement(
+            requirement_id=str(requirement.id),
+            expression=expression,
+            variables=RuleEngineService.extract_variables_from_expression(expression),
+            evaluator=RuleCompiler.compile_expression(expression),
+            vectorizable=VectorizedRuleEvaluator.is_vectorizable(expression)
+        )
+    
+    @staticmethod
+    def get_compiled_requirements(
+        rule_version: VisaRuleVersion,
+        requirements: List[VisaRequirement]
+    ) -> Dict[str, CompiledRequirement]:
+        """
+        Get compiled requirements for a rule version, compiling on cache miss.
+        
+        Args:
+            rule_version: VisaRuleVersion the requirements belong to
+            requirements: Requirements already loaded for the rule version
+            
+        Returns:
+            Dictionary mapping requirement_id -> CompiledRequirement
+        """
+        fingerprint = CompiledRuleCache.fingerprint(requirements)
+        compiled = CompiledRuleCache.get(rule_version.id, fingerprint)
+        if compiled is not None:
+            return compiled
+        
+        compiled = {
+            str(requirement.id): RuleEngineService.compile_requirement(requirement)
+            for requirement in requirements
+        }
+        CompiledRuleCache.set(rule_version.id, fingerprint, compiled)
+        logger.debug(f"Compiled {len(compiled)} requirements for rule version {rule_version.id}")
+        return compiled
+    
+    @staticmethod
+    def compile_rule_version(rule_version: VisaRuleVersion) -> Dict[str, CompiledRequirement]:
+        """
+        Compile and cache all requirements of a rule version (e.g. on publish).
+        
+        Args:
+            rule_version: VisaRuleVersion to compile
+            
+        Returns:
+            Dictionary mapping requirement_id -> CompiledRequirement
+        """
+        requirements = list(VisaRequirementSelector.get_by_rule_version(rule_version))
+        return RuleEngineService.get_compiled_requirements(rule_version, requirements)
+    
+    @staticmethod
+    def _new_requirement_result(requirement: VisaRequirement) -> Dict[str, Any]:
+        """Build the initial (not passed) evaluation result for a requirement."""
+        return {
+            "requirement_id": str(requirement.id),
+            "requirement_code": requirement.requirement_code,
+            "description": requirement.description,
+            "rule_type": requirement.rule_type,
+            "is_mandatory": requirement.is_mandatory,
+            "passed": False,
+            "missing_facts": [],
+            "evaluation_details": {
+                "expression": requirement.condition_expression,
+                "facts_used": {},
+                "result": None
+            },
+            "error": None
+        }
+    
     @staticmethod
     def evaluate_requirement(
         requirement: VisaRequirement,
-        case_facts: Dict[str, Any]
+        case_facts: Dict[str, Any],
+        compiled_requirement: Optional[CompiledRequirement] = None
     ) -> Dict[str, Any]:
         """
         Step 3: Evaluate a single requirement against case facts.
@@ -300,6 +352,8 @@ class RuleEngineService:
         Args:
             requirement: VisaRequirement to evaluate
             case_facts: Dictionary of case facts
+            compiled_requirement: Optional precompiled form of the requirement
+                (compiled on the fly when not provided)
             
         Returns:
             Dictionary with evaluation result:
@@ -312,39 +366,24 @@ class RuleEngineService:
                 "error": Optional[str]
             }
         """
-        result = {
-            "requirement_id": str(requirement.id),
-            "requirement_code": requirement.requirement_code,
-            "description": requirement.description,
-            "rule_type": requirement.rule_type,
-            "is_mandatory": requirement.is_mandatory,
-            "passed": False,
-            "missing_facts": [],
-            "evaluation_details": {
-                "expression": requirement.condition_expression,
-                "facts_used": {},
-                "result": None
-            },
-            "error": None
-        }
+        result = RuleEngineService._new_requirement_result(requirement)
         
         try:
-            # Edge case: Validate expression structure
-            is_valid, error_msg = RuleEngineService.validate_expression_structure(
-                requirement.condition_expression
-            )
-            if not is_valid:
-                result["error"] = error_msg
+            if compiled_requirement is None:
+                compiled_requirement = RuleEngineService.compile_requirement(requirement)
+            
+            # Edge case: Invalid expression structure (detected at compile time)
+            if not compiled_requirement.is_valid:
+                result["error"] = compiled_requirement.error
                 result["evaluation_details"]["result"] = "invalid_structure"
                 logger.error(
-                    f"Invalid expression structure for requirement {requirement.requirement_code}: {error_msg}"
+                    f"Invalid expression structure for requirement {requirement.requirement_code}: "
+                    f"{compiled_requirement.error}"
                 )
                 return result
             
-            # Extract variables from expression
-            required_variables = RuleEngineService.extract_variables_from_expression(
-                requirement.condition_expression
-            )
+            # Variables are precomputed at compile time
+            required_variables = compiled_requirement.variables
             
             # Edge case: Expression has no variables (constant expression)
             if not required_variables:
@@ -353,10 +392,7 @@ class RuleEngineService:
                 )
                 # Evaluate as constant expression
                 try:
-                    evaluation_result = json_logic.jsonLogic(
-                        requirement.condition_expression,
-                        {}
-                    )
+                    evaluation_result = compiled_requirement.evaluate({})
                     result["passed"] = bool(evaluation_result)
                     result["evaluation_details"]["result"] = evaluation_result
                     result["evaluation_details"]["facts_used"] = {}
@@ -388,12 +424,9 @@ class RuleEngineService:
             
             result["evaluation_details"]["facts_used"] = facts_for_evaluation
             
-            # Evaluate JSON Logic expression
+            # Evaluate compiled JSON Logic expression
             try:
-                evaluation_result = json_logic.jsonLogic(
-                    requirement.condition_expression,
-                    facts_for_evaluation
-                )
+                evaluation_result = compiled_requirement.evaluate(facts_for_evaluation)
                 
                 # Edge case: Handle None result from JSON Logic
                 if evaluation_result is None:
@@ -482,25 +515,181 @@ class RuleEngineService:
             List of evaluation results for each requirement
         """
         # Load all requirements for the rule version
-        requirements = VisaRequirementSelector.get_by_rule_version(rule_version)
+        requirements = list(VisaRequirementSelector.get_by_rule_version(rule_version))
         
         # Edge case: No requirements for rule version
-        if not requirements.exists():
+        if not requirements:
             logger.warning(
                 f"Rule version {rule_version.id} has no requirements"
             )
             return []
         
-        evaluation_results = []
-        for requirement in requirements:
-            result = RuleEngineService.evaluate_requirement(requirement, case_facts)
-            evaluation_results.append(result)
+        evaluation_results = RuleEngineService.evaluate_requirements(rule_version, requirements, case_facts)
         
         logger.info(
             f"Evaluated {len(evaluation_results)} requirements for rule version {rule_version.id}"
         )
         return evaluation_results
     
+    @staticmethod
+    def evaluate_requirements(
+        rule_version: VisaRuleVersion,
+        requirements: List[VisaRequirement],
+        case_facts: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate already-loaded requirements of a rule version against case facts.
+        
+        Args:
+            rule_version: VisaRuleVersion the requirements belong to
+            requirements: Requirements loaded for the rule version
+            case_facts: Dictionary of case facts
+            
+        Returns:
+            List of evaluation results for each requirement
+        """
+        # Compiled once per rule version and reused across cases
+        compiled_requirements = RuleEngineService.get_compiled_requirements(rule_version, requirements)
+        
+        return [
+            RuleEngineService.evaluate_requirement(
+                requirement,
+                case_facts,
+                compiled_requirement=compiled_requirements.get(str(requirement.id))
+            )
+            for requirement in requirements
+        ]
+    
+    @staticmethod
+    def evaluate_requirement_for_cases(
+        requirement: VisaRequirement,
+        columns: FactColumns,
+        compiled_requirement: Optional[CompiledRequirement] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate a single requirement against the facts of many cases.
+        
+        Threshold-style expressions are evaluated column-wise with NumPy; rows
+        the vectorized path cannot decide exactly, and any other expression,
+        go through evaluate_requirement.
+        
+        Args:
+            requirement: VisaRequirement to evaluate
+            columns: Packed facts of the cases (see FactColumns)
+            compiled_requirement: Optional precompiled form of the requirement
+            
+        Returns:
+            List of evaluation results, one per case in columns order
+        """
+        if compiled_requirement is None:
+            compiled_requirement = RuleEngineService.compile_requirement(requirement)
+        
+        if not compiled_requirement.vectorizable:
+            return [
+                RuleEngineService.evaluate_requirement(requirement, case_facts, compiled_requirement)
+                for case_facts in columns.facts_list
+            ]
+        
+        variables = compiled_requirement.variables
+        try:
+            column = VectorizedRuleEvaluator.evaluate(compiled_requirement.expression, variables, columns)
+        except Exception as e:
+            logger.warning(
+                f"Vectorized evaluation failed for requirement {requirement.requirement_code}, "
+                f"falling back to per-case evaluation: {e}"
+            )
+            return [
+                RuleEngineService.evaluate_requirement(requirement, case_facts, compiled_requirement)
+                for case_facts in columns.facts_list
+            ]
+        
+        results = []
+        for i, case_facts in enumerate(columns.facts_list):
+            if column.fallback[i] and not column.missing[i]:
+                results.append(
+                    RuleEngineService.evaluate_requirement(requirement, case_facts, compiled_requirement)
+                )
+                continue
+            
+            result = RuleEngineService._new_requirement_result(requirement)
+            if column.missing[i]:
+                result["missing_facts"] = [var for var in variables if var not in case_facts]
+                result["evaluation_details"]["result"] = "missing_facts"
+            else:
+                passed = bool(column.passed[i])
+                result["passed"] = passed
+                result["evaluation_details"]["facts_used"] = {
+                    var: RuleEngineService.normalize_fact_value(case_facts[var]) for var in variables
+                }
+                result["evaluation_details"]["result"] = passed
+            results.append(result)
+        
+        return results
+    
+    @staticmethod
+    def count_requirement_outcomes(
+        requirement: VisaRequirement,
+        facts_list: List[Dict[str, Any]],
+        compiled_requirement: Optional[CompiledRequirement] = None
+    ) -> Dict[str, int]:
+        """
+        Count pass/fail/missing/error outcomes of a requirement over many cases.
+        
+        Threshold-style expressions are counted column-wise with NumPy; rows the
+        vectorized path cannot decide exactly, and every row when it fails, go
+        through evaluate_requirement (as in evaluate_requirement_for_cases).
+        
+        Args:
+            requirement: VisaRequirement to evaluate
+            facts_list: Facts dictionaries of the cases
+            compiled_requirement: Optional precompiled form of the requirement
+            
+        Returns:
+            Dict with 'passed', 'failed', 'missing_facts' and 'errors' counts
+        """
+        if compiled_requirement is None:
+            compiled_requirement = RuleEngineService.compile_requirement(requirement)
+        
+        counts = {'passed': 0, 'failed': 0, 'missing_facts': 0, 'errors': 0}
+        fallback_facts = facts_list
+        
+        column = None
+        if compiled_requirement.vectorizable:
+            try:
+                column = VectorizedRuleEvaluator.evaluate(
+                    compiled_requirement.expression,
+                    compiled_requirement.variables,
+                    FactColumns(facts_list)
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Vectorized evaluation failed for requirement {requirement.requirement_code}, "
+                    f"falling back to per-case evaluation: {e}"
+                )
+        
+        if column is not None:
+            column_counts = column.counts()
+            counts['passed'] = column_counts['passed']
+            counts['failed'] = column_counts['failed']
+            counts['missing_facts'] = column_counts['missing_facts']
+            fallback_facts = [
+                facts for facts, fallback, missing in zip(facts_list, column.fallback, column.missing)
+                if fallback and not missing
+            ]
+        
+        for case_facts in fallback_facts:
+            result = RuleEngineService.evaluate_requirement(requirement, case_facts, compiled_requirement)
+            if result["error"]:
+                counts['errors'] += 1
+            elif result["missing_facts"]:
+                counts['missing_facts'] += 1
+            elif result["passed"]:
+                counts['passed'] += 1
+            else:
+                counts['failed'] += 1
+        
+        return counts
+    
     @staticmethod
     def aggregate_results(
         evaluation_results: List[Dict[str, Any]],
@@ -647,6 +836,10 @@ class RuleEngineService:
         3. Evaluate all requirements
         4. Aggregate results
         
+        The per-requirement results are cached, so a later
+        run_incremental_evaluation of the case only re-evaluates the
+        requirements whose facts changed.
+        
         Args:
             case_id: UUID of the case
             visa_type_id: UUID of the visa type to evaluate
@@ -682,13 +875,11 @@ class RuleEngineService:
                 return None
             
             # Step 3: Evaluate all requirements
-            evaluation_results = RuleEngineService.evaluate_all_requirements(
-                rule_version,
-                case_facts
-            )
+            requirements = list(VisaRequirementSelector.get_by_rule_version(rule_version))
             
             # Edge case: No requirements to evaluate
-            if not evaluation_results:
+            if not requirements:
+                logger.warning(f"Rule version {rule_version.id} has no requirements")
                 result = RuleEngineEvaluationResult()
                 result.rule_version_id = rule_version.id
                 result.rule_effective_from = rule_version.effective_from
@@ -698,6 +889,13 @@ class RuleEngineService:
                 result.confidence = 0.0
                 return result
             
+            evaluation_results = RuleEngineService.evaluate_requirements(
+                rule_version, requirements, case_facts
+            )
+            RuleEngineService.cache_requirement_results(
+                case_id, rule_version, requirements, evaluation_results, case_facts
+            )
+            
             # Step 4: Aggregate results
             result = RuleEngineService.aggregate_results(evaluation_results, rule_version)
             
@@ -713,3 +911,447 @@ class RuleEngineService:
                 exc_info=True
             )
             return None
+    
+    @staticmethod
+    def get_fact_dependency_index(
+        rule_version: VisaRuleVersion,
+        requirements: List[VisaRequirement]
+    ) -> Dict[str, Tuple[str, ...]]:
+        """
+        Get the fact_key -> requirement ids index for a rule version.
+        
+        Args:
+            rule_version: VisaRuleVersion the requirements belong to
+            requirements: Requirements already loaded for the rule version
+            
+        Returns:
+            Dictionary mapping fact_key -> ids of requirements referencing it
+        """
+        fingerprint = CompiledRuleCache.fingerprint(requirements)
+        dependency_index = CompiledRuleCache.get_dependency_index(rule_version.id, fingerprint)
+        if dependency_index is None:
+            compiled_requirements = RuleEngineService.get_compiled_requirements(rule_version, requirements)
+            dependency_index = build_dependency_index(compiled_requirements)
+        return dependency_index
+    
+    @staticmethod
+    def reevaluate_requirements(
+        rule_version: VisaRuleVersion,
+        requirements: List[VisaRequirement],
+        case_facts: Dict[str, Any],
+        previous_results: List[Dict[str, Any]],
+        changed_fact_keys: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Re-evaluate only the requirements affected by changed facts.
+        
+        Requirements that do not reference any changed fact keep their previous
+        result; requirements without a previous result are evaluated.
+        
+        Args:
+            rule_version: VisaRuleVersion the requirements belong to
+            requirements: Requirements loaded for the rule version
+            case_facts: Current dictionary of case facts
+            previous_results: Per-requirement results of the previous evaluation
+            changed_fact_keys: Fact keys added or changed since that evaluation
+            
+        Returns:
+            Merged list of evaluation results, in requirements order
+        """
+        compiled_requirements = RuleEngineService.get_compiled_requirements(rule_version, requirements)
+        dependency_index = RuleEngineService.get_fact_dependency_index(rule_version, requirements)
+        
+        affected_ids = set()
+        for fact_key in changed_fact_keys:
+            affected_ids.update(dependency_index.get(fact_key, ()))
+        
+        previous_by_id = {result["requirement_id"]: result for result in previous_results}
+        
+        evaluation_results = []
+        reevaluated = 0
+        for requirement in requirements:
+            requirement_id = str(requirement.id)
+            previous_result = previous_by_id.get(requirement_id)
+            if previous_result is not None and requirement_id not in affected_ids:
+                evaluation_results.append(previous_result)
+                continue
+            evaluation_results.append(
+                RuleEngineService.evaluate_requirement(
+                    requirement,
+                    case_facts,
+                    compiled_requirement=compiled_requirements.get(requirement_id)
+                )
+            )
+            reevaluated += 1
+        
+        logger.debug(
+            f"Re-evaluated {reevaluated}/{len(requirements)} requirements for rule version "
+            f"{rule_version.id} after changes to {list(changed_fact_keys)}"
+        )
+        return evaluation_results
+    
+    @staticmethod
+    def _requirement_results_cache_key(case_id: str, rule_version_id: str) -> str:
+        return f"{RuleEngineService.REQUIREMENT_RESULTS_CACHE_PREFIX}:{case_id}:{rule_version_id}"
+    
+    @staticmethod
+    def get_cached_requirement_results(
+        case_id: str,
+        rule_version: VisaRuleVersion,
+        requirements: List[VisaRequirement]
+    ) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, Any]]]:
+        """
+        Get the per-requirement results of the last evaluation of a case.
+        
+        Args:
+            case_id: UUID of the case
+            rule_version: VisaRuleVersion that was evaluated
+            requirements: Current requirements of the rule version
+            
+        Returns:
+            Tuple of (requirement results, values of the facts referenced by the
+            requirements at that evaluation), or None if absent or the
+            requirements changed since
+        """
+        cache_key = RuleEngineService._requirement_results_cache_key(case_id, rule_version.id)
+        try:
+            entry = cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Error reading cached requirement results for case {case_id}: {e}")
+            return None
+        
+        if not entry or entry.get('fingerprint') != CompiledRuleCache.fingerprint(requirements):
+            return None
+        if 'facts' not in entry:
+            # Entry written before fact snapshots were stored: cannot be checked
+            return None
+        return entry['results'], entry['facts']
+    
+    @staticmethod
+    def get_changed_fact_keys(
+        dependency_index: Dict[str, Tuple[str, ...]],
+        previous_facts: Dict[str, Any],
+        case_facts: Dict[str, Any]
+    ) -> List[str]:
+        """
+        Referenced fact keys whose value differs from a previous evaluation's snapshot.
+        
+        Args:
+            dependency_index: fact_key -> requirement ids index of the rule version
+            previous_facts: Referenced facts present at the previous evaluation
+            case_facts: Current dictionary of case facts
+            
+        Returns:
+            Fact keys added, removed or changed since the snapshot
+        """
+        return [
+            fact_key for fact_key in dependency_index
+            if (fact_key in previous_facts) != (fact_key in case_facts)
+            or previous_facts.get(fact_key) != case_facts.get(fact_key)
+        ]
+    
+    @staticmethod
+    def cache_requirement_results(
+        case_id: str,
+        rule_version: VisaRuleVersion,
+        requirements: List[VisaRequirement],
+        evaluation_results: List[Dict[str, Any]],
+        case_facts: Dict[str, Any]
+    ):
+        """
+        Store the per-requirement results of an evaluation for incremental re-evaluation.
+        
+        The values of the facts the requirements reference are stored with the
+        results, so the next evaluation can detect every fact changed since.
+        
+        Args:
+            case_id: UUID of the case
+            rule_version: VisaRuleVersion that was evaluated
+            requirements: Requirements the results were computed from
+            evaluation_results: Per-requirement results
+            case_facts: Case facts the results were computed from
+        """
+        cache_key = RuleEngineService._requirement_results_cache_key(case_id, rule_version.id)
+        dependency_index = RuleEngineService.get_fact_dependency_index(rule_version, requirements)
+        try:
+            cache.set(
+                cache_key,
+                {
+                    'fingerprint': CompiledRuleCache.fingerprint(requirements),
+                    'results': evaluation_results,
+                    'facts': {
+                        fact_key: case_facts[fact_key]
+                        for fact_key in dependency_index
+                        if fact_key in case_facts
+                    },
+                },
+                RuleEngineService.REQUIREMENT_RESULTS_CACHE_TIMEOUT
+            )
+        except Exception as e:
+            logger.warning(f"Error caching requirement results for case {case_id}: {e}")
+    
+    @staticmethod
+    def run_incremental_evaluation(
+        case_id: str,
+        visa_type_id: str,
+        changed_fact_keys: Optional[List[str]] = None,
+        evaluation_date: Optional[datetime] = None
+    ) -> Optional[RuleEngineEvaluationResult]:
+        """
+        Re-run eligibility evaluation after facts of a case were added or changed.
+        
+        Only requirements referencing a changed fact are re-evaluated; the
+        other requirement results are reused from the last evaluation of the
+        case against the same rule version and the merged set is aggregated
+        again. Changed facts are found by comparing the current facts with the
+        values stored with the previous results, so facts changed by any path
+        are picked up. Falls back to a full evaluation when there is no
+        previous result (or the requirements changed since).
+        
+        Args:
+            case_id: UUID of the case
+            visa_type_id: UUID of the visa type to evaluate
+            changed_fact_keys: Optional fact keys known to have changed (always
+                re-evaluated, in addition to the detected changes)
+            evaluation_date: Optional date to evaluate against (defaults to now)
+            
+        Returns:
+            RuleEngineEvaluationResult or None if evaluation cannot be performed
+            
+        Raises:
+            ValueError: If case or visa type not found
+        """
+        try:
+            case_facts = RuleEngineService.load_case_facts(case_id)
+            
+            # Edge case: Case has no facts
+            if not case_facts:
+                result = RuleEngineEvaluationResult()
+                result.warnings.append("Case has no facts")
+                result.outcome = "unlikely"
+                result.confidence = 0.0
+                return result
+            
+            rule_version = RuleEngineService.load_active_rule_version(visa_type_id, evaluation_date)
+            if not rule_version:
+                logger.warning(
+                    f"No active rule version found for visa type {visa_type_id}. "
+                    f"Cannot evaluate eligibility."
+                )
+                return None
+            
+            requirements = list(VisaRequirementSelector.get_by_rule_version(rule_version))
+            
+            # Edge case: No requirements to evaluate
+            if not requirements:
+                result = RuleEngineEvaluationResult()
+                result.rule_version_id = rule_version.id
+                result.rule_effective_from = rule_version.effective_from
+                result.evaluation_date = timezone.now()
+                result.warnings.append("Rule version has no requirements")
+                result.outcome = "unlikely"
+                result.confidence = 0.0
+                return result
+            
+            cached = RuleEngineService.get_cached_requirement_results(
+                case_id, rule_version, requirements
+            )
+            if cached is None:
+                logger.debug(
+                    f"No previous requirement results for case {case_id} and rule version "
+                    f"{rule_version.id}, running full evaluation"
+                )
+                evaluation_results = RuleEngineService.evaluate_requirements(
+                    rule_version, requirements, case_facts
+                )
+            else:
+                previous_results, previous_facts = cached
+                changed_keys = set(changed_fact_keys or ())
+                changed_keys.update(RuleEngineService.get_changed_fact_keys(
+                    RuleEngineService.get_fact_dependency_index(rule_version, requirements),
+                    previous_facts,
+                    case_facts
+                ))
+                evaluation_results = RuleEngineService.reevaluate_requirements(
+                    rule_version, requirements, case_facts, previous_results, sorted(changed_keys)
+                )
+            
+            RuleEngineService.cache_requirement_results(
+                case_id, rule_version, requirements, evaluation_results, case_facts
+            )
+            
+            return RuleEngineService.aggregate_results(evaluation_results, rule_version)
+            
+        except ValueError as ve:
+            logger.error(f"Validation error in incremental eligibility evaluation: {ve}")
+            raise
+        except Exception as e:
+            logger.error(
+                f"Error running incremental eligibility evaluation for case {case_id}, "
+                f"visa type {visa_type_id}: {e}",
+                exc_info=True
+            )
+            return None
+    
+    @staticmethod
+    def load_case_facts_bulk(case_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the latest facts for many cases in a single query.
+        
+        Args:
+            case_ids: UUIDs of the cases
+            
+        Returns:
+            Dictionary mapping case_id -> {fact_key: fact_value}
+            (cases without facts map to an empty dict)
+        """
+        facts_by_case: Dict[str, Dict[str, Any]] = {str(case_id): {} for case_id in case_ids}
+        
+        # Only the latest value per (case, fact_key) is returned (DISTINCT ON)
+        for case_id, fact_key, fact_value in CaseFactSelector.get_latest_values_by_cases(case_ids):
+            facts_by_case.setdefault(str(case_id), {})[fact_key] = fact_value
+        
+        logger.debug(f"Loaded facts for {len(facts_by_case)} cases in bulk")
+        return facts_by_case
+    
+    @staticmethod
+    def load_active_rule_versions(
+        visa_type_ids: List[str],
+        evaluation_date: Optional[datetime] = None
+    ) -> Dict[str, VisaRuleVersion]:
+        """
+        Load the active rule version for many visa types in a single query.
+        
+        Args:
+            visa_type_ids: UUIDs of the visa types
+            evaluation_date: Date to evaluate against (defaults to now)
+            
+        Returns:
+            Dictionary mapping visa_type_id -> active VisaRuleVersion
+            (visa types without an active version are omitted)
+        """
+        if evaluation_date is None:
+            evaluation_date = timezone.now()
+        
+        rule_versions: Dict[str, VisaRuleVersion] = {}
+        for rule_version in VisaRuleVersionSelector.get_active_by_visa_types(visa_type_ids, evaluation_date):
+            visa_type_id = str(rule_version.visa_type_id)
+            # Ordered by -effective_from per visa type, so the first one is the most recent
+            if visa_type_id in rule_versions:
+                logger.warning(
+                    f"Multiple active rule versions found for visa type {visa_type_id}. "
+                    f"Using most recent: {rule_versions[visa_type_id].id}"
+                )
+                continue
+            rule_versions[visa_type_id] = rule_version
+        
+        return rule_versions
+    
+    @staticmethod
+    def run_batch_eligibility_evaluation(
+        case_ids: List[str],
+        visa_type_ids: List[str],
+        evaluation_date: Optional[datetime] = None,
+        persist: bool = True
+    ) -> Dict[Tuple[str, str], Optional[RuleEngineEvaluationResult]]:
+        """
+        Run eligibility evaluation for many cases against many visa types in one pass.
+        
+        Facts for all cases, the active rule versions and their requirements are
+        each loaded with a single query, the cross product is evaluated in memory
+        and all EligibilityResult rows are written with bulk_create.
+        
+        Args:
+            case_ids: UUIDs of the cases to evaluate
+            visa_type_ids: UUIDs of the visa types to evaluate against
+            evaluation_date: Optional date to evaluate against (defaults to now)
+            persist: Whether to write EligibilityResult rows
+            
+        Returns:
+            Dictionary mapping (case_id, visa_type_id) -> RuleEngineEvaluationResult,
+            or None where the visa type has no active rule version
+        """
+        case_ids = [str(case_id) for case_id in case_ids]
+        visa_type_ids = [str(visa_type_id) for visa_type_id in visa_type_ids]
+        if evaluation_date is None:
+            evaluation_date = timezone.now()
+        
+        facts_by_case = RuleEngineService.load_case_facts_bulk(case_ids)
+        rule_versions = RuleEngineService.load_active_rule_versions(visa_type_ids, evaluation_date)
+        
+        requirements_by_version: Dict[str, List[VisaRequirement]] = {
+            str(rule_version.id): [] for rule_version in rule_versions.values()
+        }
+        if rule_versions:
+            for requirement in VisaRequirementSelector.get_by_rule_versions(list(rule_versions.values())):
+                requirements_by_version[str(requirement.rule_version_id)].append(requirement)
+        
+        evaluations: Dict[Tuple[str, str], Optional[RuleEngineEvaluationResult]] = {}
+        for visa_type_id in visa_type_ids:
+            rule_version = rule_versions.get(visa_type_id)
+            if not rule_version:
+                logger.warning(
+                    f"No active rule version found for visa type {visa_type_id}. "
+                    f"Skipping {len(case_ids)} cases."
+                )
+                for case_id in case_ids:
+                    evaluations[(case_id, visa_type_id)] = None
+                continue
+            
+            requirements = requirements_by_version[str(rule_version.id)]
+            
+            # Evaluate requirement-by-requirement over all cases with facts, so
+            # threshold-style requirements are decided column-wise in one pass
+            evaluable_case_ids = [case_id for case_id in case_ids if facts_by_case.get(case_id)]
+            results_by_case: Dict[str, List[Dict[str, Any]]] = {case_id: [] for case_id in evaluable_case_ids}
+            if requirements and evaluable_case_ids:
+                compiled_requirements = RuleEngineService.get_compiled_requirements(rule_version, requirements)
+                columns = FactColumns([facts_by_case[case_id] for case_id in evaluable_case_ids])
+                for requirement in requirements:
+                    column_results = RuleEngineService.evaluate_requirement_for_cases(
+                        requirement,
+                        columns,
+                        compiled_requirements.get(str(requirement.id))
+                    )
+                    for case_id, requirement_result in zip(evaluable_case_ids, column_results):
+                        results_by_case[case_id].append(requirement_result)
+            
+            for case_id in case_ids:
+                case_facts = facts_by_case.get(case_id, {})
+                
+                # Edge case: Case has no facts or rule version has no requirements
+                if not case_facts or not requirements:
+                    result = RuleEngineEvaluationResult()
+                    result.rule_version_id = rule_version.id
+                    result.rule_effective_from = rule_version.effective_from
+                    result.evaluation_date = timezone.now()
+                    result.warnings.append(
+                        "Case has no facts" if not case_facts else "Rule version has no requirements"
+                    )
+                    result.outcome = "unlikely"
+                    result.confidence = 0.0
+                    evaluations[(case_id, visa_type_id)] = result
+                    continue
+                
+                try:
+                    evaluations[(case_id, visa_type_id)] = RuleEngineService.aggregate_results(
+                        results_by_case[case_id], rule_version
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Error running eligibility evaluation for case {case_id}, "
+                        f"visa type {visa_type_id}: {e}",
+                        exc_info=True
+                    )
+                    evaluations[(case_id, visa_type_id)] = None
+        
+        logger.info(
+            f"Batch eligibility evaluation complete: {len(case_ids)} cases x "
+            f"{len(visa_type_ids)} visa types"
+        )
+        
+        if persist:
+            from ai_decisions.services.eligibility_result_service import EligibilityResultService
+            EligibilityResultService.bulk_create_from_rule_engine_results(evaluations)
+        
+        return evaluations
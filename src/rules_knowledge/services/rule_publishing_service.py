@@ -25,6 +25,7 @@ from rules_knowledge.repositories.visa_requirement_repository import VisaRequire
 from rules_knowledge.selectors.visa_type_selector import VisaTypeSelector
 from rules_knowledge.selectors.visa_rule_version_selector import VisaRuleVersionSelector
 from rules_knowledge.services.visa_rule_version_service import VisaRuleVersionService
+from rules_knowledge.services.rule_engine_service import RuleEngineService
 from users_access.services.notification_service import NotificationService
 from users_access.tasks.email_tasks import send_rule_change_notification_email_task
 from ai_decisions.services.vector_db_service import VectorDBService
@@ -129,6 +130,12 @@ class RulePublishingService:
                 logger.error(f"Failed to publish rule version {rule_version.id}")
                 return {'success': False, 'error': 'Failed to publish rule version'}
             
+            # Compile the published expressions once so evaluations hit the warm cache
+            try:
+                RuleEngineService.compile_rule_version(published_version)
+            except Exception as e:
+                logger.warning(f"Could not precompile rule version {published_version.id}: {e}")
+            
             # Step 8: Update parsed rule status (mark as published)
             from data_ingestion.repositories.parsed_rule_repository import ParsedRuleRepository
             ParsedRuleRepository.update_parsed_rule(
@@ -443,8 +450,11 @@ class RulePublishingService:
         
         This method:
         1. Chunks the document text
-        2. Generates embeddings
-        3. Stores chunks with embeddings in vector DB
+        2. Generates embeddings in concurrent, token-budgeted batches
+        3. Stores each batch of chunks in the vector DB as it completes
+        
+        Chunks whose chunk_index is already stored are skipped, so a run that
+        failed partway is completed by the next one.
         
         Args:
             document_version: DocumentVersion instance
@@ -452,37 +462,35 @@ class RulePublishingService:
             jurisdiction: Optional jurisdiction for metadata filtering
         """
         try:
-            if not document_version or not document_version.raw_text:
+            document_text = document_version.text if document_version else None
+            if not document_text:
                 logger.warning(f"No text content for document version {document_version.id if document_version else 'None'}")
                 return
             
-            # Check if chunks already exist
-            existing_chunks = VectorDBService.get_chunks_by_document_version(document_version)
-            if existing_chunks:
-                logger.info(
-                    f"Chunks already exist for document version {document_version.id}, skipping embedding generation"
-                )
-                return
-            
             # Step 1: Chunk the document text
-            chunks = EmbeddingService.chunk_document(document_version.raw_text)
+            chunks = EmbeddingService.chunk_document(document_text)
             if not chunks:
                 logger.warning(f"No chunks generated for document version {document_version.id}")
                 return
             
-            # Step 2: Generate embeddings
-            chunk_texts = [chunk['text'] for chunk in chunks]
-            embeddings = EmbeddingService.generate_embeddings(chunk_texts)
-            
-            if len(embeddings) != len(chunks):
-                logger.error(
-                    f"Mismatch: {len(chunks)} chunks but {len(embeddings)} embeddings for "
-                    f"document version {document_version.id}"
+            # Only embed chunks not stored yet (earlier runs store batch by batch)
+            stored_indexes = VectorDBService.get_chunk_indexes_by_document_version(document_version)
+            if stored_indexes:
+                chunks = [
+                    chunk for index, chunk in enumerate(chunks)
+                    if chunk.get('metadata', {}).get('chunk_index', index) not in stored_indexes
+                ]
+                if not chunks:
+                    logger.info(
+                        f"Chunks already exist for document version {document_version.id}, skipping embedding generation"
+                    )
+                    return
+                logger.info(
+                    f"Embedding {len(chunks)} missing chunks for document version {document_version.id}"
                 )
-                return
             
-            # Step 3: Add metadata to chunks
-            for chunk, embedding in zip(chunks, embeddings):
+            # Step 2: Add metadata to chunks
+            for chunk in chunks:
                 chunk_metadata = chunk.get('metadata', {})
                 if visa_code:
                     chunk_metadata['visa_code'] = visa_code
@@ -492,15 +500,29 @@ class RulePublishingService:
                 chunk_metadata['source_url'] = document_version.source_document.source_url
                 chunk['metadata'] = chunk_metadata
             
-            # Step 4: Store in vector DB
-            VectorDBService.store_chunks(
-                document_version=document_version,
-                chunks=chunks,
-                embeddings=embeddings
-            )
+            # Step 3: Generate embeddings in concurrent batches and store each
+            # batch in the vector DB as soon as it completes
+            stored = []
+            
+            def store_batch(indexes, embeddings):
+                stored.extend(VectorDBService.store_chunks(
+                    document_version=document_version,
+                    chunks=[chunks[index] for index in indexes],
+                    embeddings=embeddings
+                ))
+            
+            chunk_texts = [chunk['text'] for chunk in chunks]
+            embeddings = EmbeddingService.generate_embeddings_batched(chunk_texts, on_batch=store_batch)
+            
+            failed = sum(1 for embedding in embeddings if embedding is None)
+            if failed:
+                logger.error(
+                    f"Failed to generate embeddings for {failed}/{len(chunks)} chunks of "
+                    f"document version {document_version.id}"
+                )
             
             logger.info(
-                f"Successfully stored {len(chunks)} chunks with embeddings for document version {document_version.id}"
+                f"Successfully stored {len(stored)} chunks with embeddings for document version {document_version.id}"
             )
             
         except Exception as e:
@@ -0,0 +1,272 @@
+"""
+Vectorized Rule Evaluator
+
+Evaluates threshold-style JSON Logic requirements for a whole column of cases
+at once using NumPy. Supported expressions are:
+
+- numeric comparisons between a variable and number literals
+  ({">=": [{"var": "salary"}, 38700]}, {"<=": [18, {"var": "age"}, 65]})
+- equality tests between a variable and a scalar literal ("==", "!=")
+- membership of a variable in a literal list ({"in": [{"var": "nationality"}, ["NG", "GH"]]})
+- "and", "or" and "!" combinations of the above
+
+Facts are packed per variable into NumPy arrays with a missing-fact mask kept
+alongside. Rows whose values could make the scalar path raise (e.g. a string
+compared against a number) are flagged for fallback so results always match
+RuleEngineService.evaluate_requirement. Any other expression is not
+vectorizable and is evaluated through the scalar path.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger('django')
+
+_NUMERIC_TYPES = (int, float, bool)
+# Integers beyond this magnitude lose precision as float64 and take the scalar path
+_MAX_EXACT_INT = 2 ** 53
+
+
+class FactColumns:
+    """Column-oriented view of the facts of many cases."""
+
+    def __init__(self, facts_list: List[Dict[str, Any]]):
+        self.facts_list = facts_list
+        self.size = len(facts_list)
+        self._objects: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._numeric: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def objects(self, variable: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (object values, present mask) for a variable."""
+        if variable not in self._objects:
+            values = np.empty(self.size, dtype=object)
+            present = np.zeros(self.size, dtype=bool)
+            for i, facts in enumerate(self.facts_list):
+                if variable in facts:
+                    values[i] = facts[variable]
+                    present[i] = True
+            self._objects[variable] = (values, present)
+        return self._objects[variable]
+
+    def numeric(self, variable: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (float values, numeric mask) for a variable; non-numeric rows are NaN."""
+        if variable not in self._numeric:
+            values, _ = self.objects(variable)
+            is_numeric = np.fromiter(
+                (
+                    type(value) in _NUMERIC_TYPES
+                    and not (type(value) is int and abs(value) > _MAX_EXACT_INT)
+                    for value in values
+                ),
+                dtype=bool,
+                count=self.size
+            )
+            numbers = np.full(self.size, np.nan, dtype=np.float64)
+            if is_numeric.any():
+                numbers[is_numeric] = values[is_numeric].astype(np.float64)
+            self._numeric[variable] = (numbers, is_numeric)
+        return self._numeric[variable]
+
+    def missing_mask(self, variables: List[str]) -> np.ndarray:
+        """Rows missing at least one of the variables."""
+        missing = np.zeros(self.size, dtype=bool)
+        for variable in variables:
+            _, present = self.objects(variable)
+            missing |= ~present
+        return missing
+
+
+class ColumnEvaluation:
+    """Result of evaluating one requirement over a column of cases."""
+
+    def __init__(self, passed: np.ndarray, missing: np.ndarray, fallback: np.ndarray):
+        self.passed = passed  # Meaningful only where ~missing & ~fallback
+        self.missing = missing
+        self.fallback = fallback  # Rows that must go through the scalar path
+
+    def counts(self) -> Dict[str, int]:
+        """Pass/fail/missing counts for the vectorized rows."""
+        evaluated = ~self.missing & ~self.fallback
+        passed = int(np.count_nonzero(self.passed & evaluated))
+        return {
+            'passed': passed,
+            'failed': int(np.count_nonzero(evaluated)) - passed,
+            'missing_facts': int(np.count_nonzero(self.missing)),
+            'fallback': int(np.count_nonzero(self.fallback & ~self.missing)),
+        }
+
+
+class VectorizedRuleEvaluator:
+    """Detects and evaluates threshold-style expressions with NumPy."""
+
+    ORDERING_OPERATORS = {
+        '>': np.greater,
+        '>=': np.greater_equal,
+        '<': np.less,
+        '<=': np.less_equal,
+    }
+    EQUALITY_OPERATORS = ('==', '!=')
+    LOGICAL_OPERATORS = ('and', 'or')
+
+    @staticmethod
+    def _var_name(node: Any) -> Optional[str]:
+        """Return the variable name of a {"var": "name"} node, else None."""
+        # Only the plain string form is recognised, matching extract_variables_from_expression
+        if isinstance(node, dict) and len(node) == 1 and 'var' in node:
+            name = node['var']
+            if isinstance(name, str) and name and '.' not in name:
+                return name
+        return None
+
+    @staticmethod
+    def _is_number(value: Any) -> bool:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    @staticmethod
+    def _is_scalar(value: Any) -> bool:
+        return value is None or isinstance(value, (str, int, float, bool))
+
+    @staticmethod
+    def _operands(node: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        operator = next(iter(node))
+        values = node[operator]
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        return operator, list(values)
+
+    @staticmethod
+    def is_vectorizable(expression: Any) -> bool:
+        """
+        Check whether an expression only uses the vectorizable subset.
+
+        Args:
+            expression: JSON Logic expression
+
+        Returns:
+            True if the expression can be evaluated column-wise
+        """
+        if not isinstance(expression, dict) or len(expression) != 1:
+            return False
+
+        operator, operands = VectorizedRuleEvaluator._operands(expression)
+        var_name = VectorizedRuleEvaluator._var_name
+
+        if operator in VectorizedRuleEvaluator.LOGICAL_OPERATORS:
+            return bool(operands) and all(
+                VectorizedRuleEvaluator.is_vectorizable(operand) for operand in operands
+            )
+
+        if operator == '!':
+            return len(operands) == 1 and VectorizedRuleEvaluator.is_vectorizable(operands[0])
+
+        if operator in VectorizedRuleEvaluator.ORDERING_OPERATORS:
+            if len(operands) == 2:
+                left, right = operands
+                return (
+                    (var_name(left) is not None and VectorizedRuleEvaluator._is_number(right))
+                    or (var_name(right) is not None and VectorizedRuleEvaluator._is_number(left))
+                )
+            if len(operands) == 3 and operator in ('<', '<='):
+                low, middle, high = operands
+                return (
+                    var_name(middle) is not None
+                    and VectorizedRuleEvaluator._is_number(low)
+                    and VectorizedRuleEvaluator._is_number(high)
+                )
+            return False
+
+        if operator in VectorizedRuleEvaluator.EQUALITY_OPERATORS:
+            if len(operands) != 2:
+                return False
+            left, right = operands
+            return (
+                (var_name(left) is not None and VectorizedRuleEvaluator._is_scalar(right))
+                or (var_name(right) is not None and VectorizedRuleEvaluator._is_scalar(left))
+            )
+
+        if operator == 'in':
+            if len(operands) != 2:
+                return False
+            needle, haystack = operands
+            return (
+                var_name(needle) is not None
+                and isinstance(haystack, list)
+                and all(VectorizedRuleEvaluator._is_scalar(item) for item in haystack)
+            )
+
+        return False
+
+    @staticmethod
+    def evaluate(
+        expression: Dict[str, Any],
+        variables: List[str],
+        columns: FactColumns
+    ) -> ColumnEvaluation:
+        """
+        Evaluate a vectorizable expression over all cases in the columns.
+
+        Args:
+            expression: Expression for which is_vectorizable() returned True
+            variables: Variables referenced by the expression
+            columns: Packed facts of the cases
+
+        Returns:
+            ColumnEvaluation with passed/missing/fallback masks
+        """
+        missing = columns.missing_mask(variables)
+        passed, clean = VectorizedRuleEvaluator._evaluate_node(expression, columns)
+        return ColumnEvaluation(passed=passed, missing=missing, fallback=~clean)
+
+    @staticmethod
+    def _evaluate_node(node: Dict[str, Any], columns: FactColumns) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (boolean values, clean mask) for a node."""
+        operator, operands = VectorizedRuleEvaluator._operands(node)
+        var_name = VectorizedRuleEvaluator._var_name
+
+        if operator in VectorizedRuleEvaluator.LOGICAL_OPERATORS:
+            combine = np.logical_and if operator == 'and' else np.logical_or
+            values, clean = VectorizedRuleEvaluator._evaluate_node(operands[0], columns)
+            for operand in operands[1:]:
+                operand_values, operand_clean = VectorizedRuleEvaluator._evaluate_node(operand, columns)
+                values = combine(values, operand_values)
+                clean = clean & operand_clean
+            return values, clean
+
+        if operator == '!':
+            values, clean = VectorizedRuleEvaluator._evaluate_node(operands[0], columns)
+            return ~values, clean
+
+        if operator in VectorizedRuleEvaluator.ORDERING_OPERATORS:
+            compare = VectorizedRuleEvaluator.ORDERING_OPERATORS[operator]
+            if len(operands) == 3:
+                low, middle, high = operands
+                numbers, is_numeric = columns.numeric(var_name(middle))
+                return compare(low, numbers) & compare(numbers, high), is_numeric
+            left, right = operands
+            if var_name(left) is not None:
+                numbers, is_numeric = columns.numeric(var_name(left))
+                return compare(numbers, right), is_numeric
+            numbers, is_numeric = columns.numeric(var_name(right))
+            return compare(left, numbers), is_numeric
+
+        if operator in VectorizedRuleEvaluator.EQUALITY_OPERATORS:
+            left, right = operands
+            name, literal = (var_name(left), right) if var_name(left) is not None else (var_name(right), left)
+            values, _ = columns.objects(name)
+            equal = VectorizedRuleEvaluator._equals(values, literal)
+            return (equal if operator == '==' else ~equal), np.ones(columns.size, dtype=bool)
+
+        # operator == 'in'
+        needle, haystack = operands
+        values, _ = columns.objects(var_name(needle))
+        contained = np.zeros(columns.size, dtype=bool)
+        for item in haystack:
+            contained |= VectorizedRuleEvaluator._equals(values, item)
+        return contained, np.ones(columns.size, dtype=bool)
+
+    @staticmethod
+    def _equals(values: np.ndarray, literal: Any) -> np.ndarray:
+        """Element-wise Python equality of an object column against a literal."""
+        equal = np.frompyfunc(lambda value: value == literal, 1, 1)(values)
+        return equal.astype(bool)
@@ -1,6 +1,13 @@
-from .rule_publishing_signals import handle_rule_version_published
+from .rule_publishing_signals import (
+    handle_rule_version_published,
+    invalidate_compiled_rule_version,
+    invalidate_compiled_requirements,
+    invalidate_active_rule_version,
+)
 
 __all__ = [
     'handle_rule_version_published',
+    'invalidate_compiled_rule_version',
+    'invalidate_compiled_requirements',
+    'invalidate_active_rule_version',
 ]
-
@@ -1,6 +1,9 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from rules_knowledge.models.visa_rule_version import VisaRuleVersion
+from rules_knowledge.models.visa_requirement import VisaRequirement
+from rules_knowledge.services.active_rule_version_resolver import ActiveRuleVersionResolver
+from rules_knowledge.services.rule_compiler import CompiledRuleCache
 from users_access.services.notification_service import NotificationService
 from users_access.tasks.email_tasks import send_rule_change_notification_email_task
 from immigration_cases.selectors.case_selector import CaseSelector
@@ -19,6 +22,9 @@ def track_rule_version_state(sender, instance, **kwargs):
         try:
             old_instance = VisaRuleVersion.objects.get(pk=instance.pk)
             _previous_is_published[instance.pk] = old_instance.is_published
+            # Moving a version to another visa type also changes the old visa type's resolution
+            if old_instance.visa_type_id != instance.visa_type_id:
+                ActiveRuleVersionResolver.invalidate(old_instance.visa_type_id)
         except VisaRuleVersion.DoesNotExist:
             _previous_is_published[instance.pk] = False
 
@@ -86,3 +92,23 @@ def handle_rule_version_published(sender, instance, created, **kwargs):
         except Exception as e:
             logger.error(f"Error handling rule version publication: {e}")
 
+
+@receiver(post_save, sender=VisaRuleVersion)
+@receiver(post_delete, sender=VisaRuleVersion)
+def invalidate_compiled_rule_version(sender, instance, **kwargs):
+    """Drop the compiled form of a rule version when it changes."""
+    CompiledRuleCache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=VisaRuleVersion)
+@receiver(post_delete, sender=VisaRuleVersion)
+def invalidate_active_rule_version(sender, instance, **kwargs):
+    """Drop cached active rule version intervals of the visa type when a version changes."""
+    ActiveRuleVersionResolver.invalidate(instance.visa_type_id)
+
+
+@receiver(post_save, sender=VisaRequirement)
+@receiver(post_delete, sender=VisaRequirement)
+def invalidate_compiled_requirements(sender, instance, **kwargs):
+    """Drop the compiled form of a rule version when one of its requirements changes."""
+    CompiledRuleCache.invalidate(instance.rule_version_id)
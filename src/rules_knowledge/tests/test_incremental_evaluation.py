@@ -0,0 +1,133 @@
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.test import override_settings
+from django.utils import timezone
+
+from main_system.tests_base import NoDatabaseTestCase
+from rules_knowledge.models.visa_requirement import VisaRequirement
+from rules_knowledge.models.visa_rule_version import VisaRuleVersion
+from rules_knowledge.services.rule_compiler import CompiledRuleCache
+from rules_knowledge.services.rule_engine_service import RuleEngineService
+
+SERVICE = 'rules_knowledge.services.rule_engine_service'
+
+
+def make_requirement(code, expression):
+    return VisaRequirement(
+        id=uuid.uuid4(),
+        requirement_code=code,
+        rule_type='eligibility',
+        description=code,
+        condition_expression=expression,
+        is_mandatory=True,
+        updated_at=timezone.now(),
+    )
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class IncrementalEvaluationTests(NoDatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        CompiledRuleCache.clear()
+        self.addCleanup(CompiledRuleCache.clear)
+
+        self.case_id = str(uuid.uuid4())
+        self.visa_type_id = str(uuid.uuid4())
+        self.rule_version = VisaRuleVersion(id=uuid.uuid4(), effective_from=timezone.now())
+        self.requirements = [
+            make_requirement('MIN_SALARY', {'>=': [{'var': 'salary'}, 38700]}),
+            make_requirement('AGE', {'<=': [18, {'var': 'age'}, 65]}),
+            make_requirement('SPONSORED_SALARY', {'and': [
+                {'==': [{'var': 'has_sponsor'}, True]},
+                {'>=': [{'var': 'salary'}, 25000]},
+            ]}),
+            make_requirement('ENGLISH', {'==': [{'var': 'english_level'}, 'B1']}),
+        ]
+        self.facts = {'salary': 30000, 'age': 30, 'has_sponsor': True}
+
+        mock.patch.object(RuleEngineService, 'load_case_facts', side_effect=lambda case_id: dict(self.facts)).start()
+        mock.patch.object(RuleEngineService, 'load_active_rule_version', return_value=self.rule_version).start()
+        mock.patch(
+            f'{SERVICE}.VisaRequirementSelector.get_by_rule_version',
+            side_effect=lambda rule_version: list(self.requirements)
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def evaluated_codes(self, run):
+        with mock.patch.object(
+            RuleEngineService, 'evaluate_requirement', wraps=RuleEngineService.evaluate_requirement
+        ) as spy:
+            result = run()
+        return result, sorted(call.args[0].requirement_code for call in spy.call_args_list)
+
+    def run_incremental(self, **kwargs):
+        return RuleEngineService.run_incremental_evaluation(self.case_id, self.visa_type_id, **kwargs)
+
+    def run_full(self):
+        return RuleEngineService.run_eligibility_evaluation(self.case_id, self.visa_type_id)
+
+    def assertSameEvaluation(self, incremental, full):
+        incremental, full = incremental.to_dict(), full.to_dict()
+        incremental.pop('evaluation_date')
+        full.pop('evaluation_date')
+        incremental['missing_facts'].sort()
+        full['missing_facts'].sort()
+        self.assertEqual(incremental, full)
+
+    def test_full_evaluation_caches_results_for_incremental_runs(self):
+        self.run_full()
+
+        _, codes = self.evaluated_codes(self.run_incremental)
+
+        self.assertEqual(codes, [])
+
+    def test_changed_fact_only_reevaluates_requirements_referencing_it(self):
+        self.run_full()
+        self.facts['salary'] = 40000
+
+        result, codes = self.evaluated_codes(self.run_incremental)
+
+        self.assertEqual(codes, ['MIN_SALARY', 'SPONSORED_SALARY'])
+        self.assertSameEvaluation(result, self.run_full())
+
+    def test_added_fact_reevaluates_requirements_missing_it(self):
+        self.run_incremental()
+        self.facts['english_level'] = 'B1'
+
+        result, codes = self.evaluated_codes(self.run_incremental)
+
+        self.assertEqual(codes, ['ENGLISH'])
+        self.assertEqual(result.requirements_with_missing_facts, 0)
+        self.assertSameEvaluation(result, self.run_full())
+
+    def test_removed_fact_is_detected(self):
+        self.run_full()
+        del self.facts['has_sponsor']
+
+        result, codes = self.evaluated_codes(self.run_incremental)
+
+        self.assertEqual(codes, ['SPONSORED_SALARY'])
+        self.assertSameEvaluation(result, self.run_full())
+
+    def test_known_changed_keys_are_always_reevaluated(self):
+        self.run_full()
+
+        _, codes = self.evaluated_codes(lambda: self.run_incremental(changed_fact_keys=['age']))
+
+        self.assertEqual(codes, ['AGE'])
+
+    def test_without_previous_results_evaluates_everything(self):
+        _, codes = self.evaluated_codes(self.run_incremental)
+
+        self.assertEqual(codes, ['AGE', 'ENGLISH', 'MIN_SALARY', 'SPONSORED_SALARY'])
+
+    def test_changed_requirements_evaluate_everything(self):
+        self.run_full()
+        self.requirements[1].updated_at = timezone.now() + timedelta(seconds=1)
+
+        _, codes = self.evaluated_codes(self.run_incremental)
+
+        self.assertEqual(codes, ['AGE', 'ENGLISH', 'MIN_SALARY', 'SPONSORED_SALARY'])
@@ -0,0 +1,234 @@
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.db.models.signals import post_delete, post_save
+from django.test import override_settings
+from django.utils import timezone
+
+from main_system.tests_base import NoDatabaseTestCase
+from rules_knowledge.models.visa_requirement import VisaRequirement
+from rules_knowledge.models.visa_rule_version import VisaRuleVersion
+from rules_knowledge.services.rule_compiler import (
+    CompiledRequirement,
+    CompiledRuleCache,
+    RuleCompiler,
+    build_dependency_index,
+)
+
+COMPILER = 'rules_knowledge.services.rule_compiler'
+
+FACTS = {
+    'salary': 40000,
+    'age': 30,
+    'nationality': 'NG',
+    'has_sponsor': True,
+    'applicant': {'name': 'Ada', 'children': [{'age': 4}, {'age': 9}]},
+    'empty': '',
+    'zero': 0,
+}
+
+# (expression, expected result against FACTS) following the JSON Logic reference semantics
+CASES = [
+    ({'>=': [{'var': 'salary'}, 38700]}, True),
+    ({'<': [18, {'var': 'age'}, 65]}, True),
+    ({'<=': [31, {'var': 'age'}, 65]}, False),
+    ({'==': [{'var': 'has_sponsor'}, True]}, True),
+    ({'===': [{'var': 'zero'}, False]}, False),
+    ({'!==': [{'var': 'zero'}, 0]}, False),
+    ({'!=': [{'var': 'nationality'}, 'GH']}, True),
+    ({'!': [{'var': 'empty'}]}, True),
+    ({'!!': [{'var': 'nationality'}]}, True),
+    ({'!': {'var': 'has_sponsor'}}, False),
+    ({'in': [{'var': 'nationality'}, ['NG', 'GH']]}, True),
+    ({'in': ['Ad', {'var': 'applicant.name'}]}, True),
+    ({'in': ['x', 5]}, False),
+    ({'var': 'applicant.children.1.age'}, 9),
+    ({'var': 'applicant.children.5.age'}, None),
+    ({'var': ['applicant.missing', 'fallback']}, 'fallback'),
+    ({'var': ''}, FACTS),
+    ({'+': [{'var': 'salary'}, '1000', 0.5]}, 41000.5),
+    ({'*': [2, {'var': 'age'}]}, 60.0),
+    ({'-': [{'var': 'age'}]}, -30),
+    ({'-': [{'var': 'age'}, 10]}, 20),
+    ({'/': [{'var': 'salary'}, 8]}, 5000.0),
+    ({'%': [{'var': 'age'}, 7]}, 2),
+    ({'min': [{'var': 'age'}, 18, 65]}, 18),
+    ({'max': [{'var': 'age'}, 18, 65]}, 65),
+    ({'count': [{'var': 'zero'}, {'var': 'age'}, {'var': 'empty'}]}, 1),
+    ({'cat': ['Applicant ', {'var': 'applicant.name'}, ' aged ', {'var': 'age'}]}, 'Applicant Ada aged 30'),
+    ({'merge': [[1, 2], 3, [[4]]]}, [1, 2, 3, [4]]),
+    ({'missing': ['salary', 'visa_history', 'applicant.name']}, ['visa_history']),
+    ({'missing': [['salary', 'visa_history']]}, ['visa_history']),
+    ({'missing_some': [1, ['salary', 'visa_history']]}, []),
+    ({'missing_some': [2, ['salary', 'visa_history', 'offer']]}, ['visa_history', 'offer']),
+    ({'and': [{'var': 'age'}, {'var': 'zero'}, {'var': 'salary'}]}, 0),
+    ({'and': [{'var': 'age'}, {'var': 'salary'}]}, 40000),
+    ({'or': [{'var': 'empty'}, {'var': 'zero'}]}, 0),
+    ({'or': [{'var': 'empty'}, {'var': 'nationality'}]}, 'NG'),
+    ({'if': [{'<': [{'var': 'age'}, 18]}, 'minor', {'<': [{'var': 'age'}, 65]}, 'adult', 'senior']}, 'adult'),
+    ({'if': [False, 'yes']}, None),
+    ({'?:': [{'var': 'has_sponsor'}, 'sponsored', 'unsponsored']}, 'sponsored'),
+    ([1, 'two'], [1, 'two']),
+    (42, 42),
+]
+
+
+class RuleCompilerTests(NoDatabaseTestCase):
+
+    def test_compiled_expressions_follow_json_logic_semantics(self):
+        for expression, expected in CASES:
+            with self.subTest(expression=expression):
+                self.assertEqual(RuleCompiler.compile_expression(expression)(FACTS), expected)
+
+    def test_and_or_if_short_circuit(self):
+        # The second branch would raise ZeroDivisionError if it were evaluated
+        division = {'/': [1, 0]}
+        expressions = [
+            ({'and': [{'var': 'zero'}, division]}, 0),
+            ({'or': [{'var': 'age'}, division]}, 30),
+            ({'if': [{'var': 'has_sponsor'}, 'sponsored', division]}, 'sponsored'),
+            ({'if': [{'var': 'zero'}, division, 'unsponsored']}, 'unsponsored'),
+            ({'?:': [{'var': 'zero'}, division, 'none']}, 'none'),
+        ]
+        for expression, expected in expressions:
+            with self.subTest(expression=expression):
+                self.assertEqual(RuleCompiler.compile_expression(expression)(FACTS), expected)
+
+        with self.assertRaises(ZeroDivisionError):
+            RuleCompiler.compile_expression({'and': [{'var': 'age'}, division]})(FACTS)
+
+    def test_unknown_operators_are_delegated_to_json_logic(self):
+        unknown = {'some': [{'var': 'applicant.children'}, {'>': [{'var': 'age'}, 5]}]}
+        expression = {'and': [{'var': 'has_sponsor'}, unknown]}
+
+        with mock.patch(f'{COMPILER}.json_logic.jsonLogic', return_value='delegated') as json_logic:
+            evaluate = RuleCompiler.compile_expression(expression)
+            json_logic.assert_not_called()
+
+            self.assertEqual(evaluate(FACTS), 'delegated')
+
+        json_logic.assert_called_once_with(unknown, FACTS)
+
+    def test_multi_key_nodes_are_delegated_to_json_logic(self):
+        node = {'==': [1, 1], '!=': [1, 2]}
+
+        with mock.patch(f'{COMPILER}.json_logic.jsonLogic', return_value=False) as json_logic:
+            self.assertFalse(RuleCompiler.compile_expression(node)(FACTS))
+
+        json_logic.assert_called_once_with(node, FACTS)
+
+    def test_compiled_requirement_evaluates_without_facts(self):
+        compiled = CompiledRequirement(
+            'requirement', {'missing': ['salary']}, ['salary'],
+            evaluator=RuleCompiler.compile_expression({'missing': ['salary']})
+        )
+
+        self.assertTrue(compiled.is_valid)
+        self.assertEqual(compiled.evaluate(None), ['salary'])
+
+    def test_build_dependency_index(self):
+        compiled = {
+            'salary_rule': CompiledRequirement('salary_rule', {}, ['salary']),
+            'sponsored_rule': CompiledRequirement('sponsored_rule', {}, ['has_sponsor', 'salary']),
+            'constant_rule': CompiledRequirement('constant_rule', True, []),
+        }
+
+        self.assertEqual(
+            build_dependency_index(compiled),
+            {'salary': ('salary_rule', 'sponsored_rule'), 'has_sponsor': ('sponsored_rule',)}
+        )
+
+
+def make_requirement(rule_version_id):
+    return VisaRequirement(
+        id=uuid.uuid4(),
+        rule_version_id=rule_version_id,
+        requirement_code='MIN_SALARY',
+        rule_type='eligibility',
+        description='Minimum salary',
+        condition_expression={'>=': [{'var': 'salary'}, 38700]},
+        is_mandatory=True,
+        updated_at=timezone.now(),
+    )
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CompiledRuleCacheTests(NoDatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        CompiledRuleCache.clear()
+        self.addCleanup(CompiledRuleCache.clear)
+
+        self.rule_version = VisaRuleVersion(
+            id=uuid.uuid4(), visa_type_id=uuid.uuid4(), effective_from=timezone.now()
+        )
+        self.requirement = make_requirement(self.rule_version.id)
+        self.fingerprint = CompiledRuleCache.fingerprint([self.requirement])
+        self.compiled = {
+            str(self.requirement.id): CompiledRequirement(
+                str(self.requirement.id), self.requirement.condition_expression, ['salary']
+            )
+        }
+        CompiledRuleCache.set(self.rule_version.id, self.fingerprint, self.compiled)
+
+    def test_returns_entry_and_dependency_index_for_current_fingerprint(self):
+        self.assertIs(CompiledRuleCache.get(self.rule_version.id, self.fingerprint), self.compiled)
+        self.assertEqual(
+            CompiledRuleCache.get_dependency_index(str(self.rule_version.id), self.fingerprint),
+            {'salary': (str(self.requirement.id),)}
+        )
+
+    def test_changed_requirement_rows_make_the_entry_stale(self):
+        self.requirement.updated_at = timezone.now() + timedelta(seconds=1)
+        stale_fingerprint = CompiledRuleCache.fingerprint([self.requirement])
+
+        self.assertIsNone(CompiledRuleCache.get(self.rule_version.id, stale_fingerprint))
+        # The stale entry was dropped
+        self.assertIsNone(CompiledRuleCache.get(self.rule_version.id, self.fingerprint))
+
+    def test_least_recently_used_rule_version_is_evicted(self):
+        other_id = uuid.uuid4()
+        CompiledRuleCache.set(other_id, (), {})
+
+        with mock.patch.object(CompiledRuleCache, 'MAX_RULE_VERSIONS', 2):
+            # Reading the first rule version makes the other one the oldest
+            CompiledRuleCache.get(self.rule_version.id, self.fingerprint)
+            CompiledRuleCache.set(uuid.uuid4(), (), {})
+
+        self.assertIsNone(CompiledRuleCache.get(other_id, ()))
+        self.assertIs(CompiledRuleCache.get(self.rule_version.id, self.fingerprint), self.compiled)
+
+    def test_saving_a_requirement_invalidates_its_rule_version(self):
+        post_save.send(
+            sender=VisaRequirement, instance=self.requirement, created=False,
+            raw=False, using='default', update_fields=None
+        )
+
+        self.assertIsNone(CompiledRuleCache.get(self.rule_version.id, self.fingerprint))
+
+    def test_deleting_a_requirement_invalidates_its_rule_version(self):
+        post_delete.send(sender=VisaRequirement, instance=self.requirement, using='default', origin=self.requirement)
+
+        self.assertIsNone(CompiledRuleCache.get(self.rule_version.id, self.fingerprint))
+
+    def test_requirement_of_another_rule_version_keeps_the_entry(self):
+        other_requirement = make_requirement(uuid.uuid4())
+
+        post_delete.send(sender=VisaRequirement, instance=other_requirement, using='default', origin=other_requirement)
+
+        self.assertIs(CompiledRuleCache.get(self.rule_version.id, self.fingerprint), self.compiled)
+
+    def test_deleting_the_rule_version_invalidates_it(self):
+        # The active rule version resolver defers its invalidation to transaction.on_commit
+        with mock.patch(
+            'rules_knowledge.signals.rule_publishing_signals.ActiveRuleVersionResolver.invalidate'
+        ) as invalidate_active:
+            post_delete.send(
+                sender=VisaRuleVersion, instance=self.rule_version, using='default', origin=self.rule_version
+            )
+
+        invalidate_active.assert_called_once_with(self.rule_version.visa_type_id)
+
+        self.assertIsNone(CompiledRuleCache.get(self.rule_version.id, self.fingerprint))
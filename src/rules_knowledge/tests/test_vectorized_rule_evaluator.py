@@ -0,0 +1,112 @@
+import uuid
+from unittest import mock
+
+from main_system.tests_base import NoDatabaseTestCase
+from rules_knowledge.models.visa_requirement import VisaRequirement
+from rules_knowledge.services.rule_engine_service import RuleEngineService
+from rules_knowledge.services.vectorized_rule_evaluator import FactColumns, VectorizedRuleEvaluator
+
+# One case per fact shape the vectorized path has to agree with the scalar path on
+FACTS_LIST = [
+    {'salary': 40000, 'age': 30, 'nationality': 'NG', 'has_sponsor': True},
+    {'salary': 20000.5, 'age': 17, 'nationality': 'GH', 'has_sponsor': False},
+    {'age': 40, 'nationality': 'US'},  # salary missing
+    {},  # everything missing
+    {'salary': None, 'age': None, 'nationality': None, 'has_sponsor': None},
+    {'salary': '40000', 'age': '30', 'nationality': 'ng', 'has_sponsor': 'true'},
+    {'salary': True, 'age': False, 'nationality': True, 'has_sponsor': 1},
+    {'salary': 2 ** 60, 'age': -(2 ** 60), 'nationality': 2 ** 60, 'has_sponsor': 0},
+    {'salary': 38700, 'age': 65, 'nationality': ['NG'], 'has_sponsor': True},
+]
+
+EXPRESSIONS = [
+    {'>=': [{'var': 'salary'}, 38700]},
+    {'<': [18, {'var': 'age'}]},
+    {'<=': [18, {'var': 'age'}, 65]},
+    {'==': [{'var': 'has_sponsor'}, True]},
+    {'!=': [{'var': 'nationality'}, 'NG']},
+    {'in': [{'var': 'nationality'}, ['NG', 'GH', 1]]},
+    {'and': [{'>=': [{'var': 'salary'}, 38700]}, {'<=': [18, {'var': 'age'}, 65]}]},
+    {'or': [{'==': [{'var': 'has_sponsor'}, True]}, {'!': [{'>': [{'var': 'age'}, 60]}]}]},
+]
+
+
+def make_requirement(expression):
+    return VisaRequirement(
+        id=uuid.uuid4(),
+        requirement_code='REQ',
+        rule_type='eligibility',
+        description='Requirement',
+        condition_expression=expression,
+        is_mandatory=True,
+    )
+
+
+class VectorizedRuleEvaluatorTests(NoDatabaseTestCase):
+
+    def test_detects_vectorizable_subset(self):
+        for expression in EXPRESSIONS:
+            self.assertTrue(VectorizedRuleEvaluator.is_vectorizable(expression), expression)
+        self.assertFalse(VectorizedRuleEvaluator.is_vectorizable({'>=': [{'var': 'salary'}, {'var': 'minimum'}]}))
+        self.assertFalse(VectorizedRuleEvaluator.is_vectorizable({'+': [{'var': 'salary'}, 1]}))
+        self.assertFalse(VectorizedRuleEvaluator.is_vectorizable({'>=': [{'var': 'salary'}, '38700']}))
+
+    def test_non_numeric_and_large_int_rows_fall_back(self):
+        expression = {'>=': [{'var': 'salary'}, 38700]}
+        column = VectorizedRuleEvaluator.evaluate(expression, ['salary'], FactColumns(FACTS_LIST))
+
+        self.assertEqual(
+            column.missing.tolist(),
+            [False, False, True, True, False, False, False, False, False]
+        )
+        # None, a numeric string and an int beyond float64 precision are left to the scalar path
+        self.assertEqual(
+            (column.fallback & ~column.missing).tolist(),
+            [False, False, False, False, True, True, False, True, False]
+        )
+
+    def test_column_results_match_scalar_evaluation(self):
+        columns = FactColumns(FACTS_LIST)
+        for expression in EXPRESSIONS:
+            requirement = make_requirement(expression)
+            compiled = RuleEngineService.compile_requirement(requirement)
+            self.assertTrue(compiled.vectorizable)
+
+            column_results = RuleEngineService.evaluate_requirement_for_cases(requirement, columns, compiled)
+
+            for case_facts, column_result in zip(FACTS_LIST, column_results):
+                scalar_result = RuleEngineService.evaluate_requirement(requirement, case_facts, compiled)
+                with self.subTest(expression=expression, facts=case_facts):
+                    self.assertEqual(column_result, scalar_result)
+
+    def test_counts_match_scalar_evaluation(self):
+        for expression in EXPRESSIONS:
+            requirement = make_requirement(expression)
+            expected = {'passed': 0, 'failed': 0, 'missing_facts': 0, 'errors': 0}
+            for case_facts in FACTS_LIST:
+                result = RuleEngineService.evaluate_requirement(requirement, case_facts)
+                if result['error']:
+                    expected['errors'] += 1
+                elif result['missing_facts']:
+                    expected['missing_facts'] += 1
+                elif result['passed']:
+                    expected['passed'] += 1
+                else:
+                    expected['failed'] += 1
+
+            with self.subTest(expression=expression):
+                self.assertEqual(RuleEngineService.count_requirement_outcomes(requirement, FACTS_LIST), expected)
+
+    def test_vectorized_failure_falls_back_to_scalar_path(self):
+        requirement = make_requirement({'>=': [{'var': 'salary'}, 38700]})
+        expected_results = [
+            RuleEngineService.evaluate_requirement(requirement, case_facts) for case_facts in FACTS_LIST
+        ]
+        expected_counts = RuleEngineService.count_requirement_outcomes(requirement, FACTS_LIST)
+
+        with mock.patch.object(VectorizedRuleEvaluator, 'evaluate', side_effect=ValueError('bad column')):
+            results = RuleEngineService.evaluate_requirement_for_cases(requirement, FactColumns(FACTS_LIST))
+            counts = RuleEngineService.count_requirement_outcomes(requirement, FACTS_LIST)
+
+        self.assertEqual(results, expected_results)
+        self.assertEqual(counts, expected_counts)